@@ -1,6 +1,31 @@
+from typing import Any, Dict, List, Sequence
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required, user_passes_test
-from apps.core.models import Cohort, Participant
+from django.db.models import Count, Q
+from apps.core.models import Cohort
+from apps.matching.models import SolverStats
+
+# Most recent solver runs charted on the trend page
+SOLVER_TRENDS_LIMIT = 200
+
+# Run modes that can be solved with CP-SAT
+CPSAT_MODES = ("STRICT", "EXCEPTION")
+
+# Share of the time limit above which a run is flagged as close to it
+NEAR_TIME_LIMIT = 0.8
+
+# Stats the trend page can chart, with their axis labels
+TREND_METRICS = {
+    "time_limit_used": "Share of time limit used",
+    "wall_time": "Wall time (s)",
+    "num_conflicts": "Conflicts",
+    "num_branches": "Branches",
+    "num_variables": "Variables",
+}
+
+# Plot area of a trend chart in SVG units
+CHART_WIDTH = 600
+CHART_HEIGHT = 200
 
 
 def is_admin(user):
@@ -13,16 +38,10 @@ def is_admin(user):
 def admin_dashboard_view(request):
     """Admin dashboard showing all cohorts and quick actions."""
     # Get all cohorts with participant counts
-    cohorts = Cohort.objects.all().order_by("-created_at")
-
-    # Annotate with participant counts
-    for cohort in cohorts:
-        cohort.mentor_count = Participant.objects.filter(
-            cohort=cohort, role_in_cohort="MENTOR"
-        ).count()
-        cohort.mentee_count = Participant.objects.filter(
-            cohort=cohort, role_in_cohort="MENTEE"
-        ).count()
+    cohorts = Cohort.objects.annotate(
+        mentor_count=Count("participant", filter=Q(participant__role_in_cohort="MENTOR")),
+        mentee_count=Count("participant", filter=Q(participant__role_in_cohort="MENTEE")),
+    ).order_by("-created_at")
 
     return render(
         request,
@@ -31,3 +50,73 @@ def admin_dashboard_view(request):
             "cohorts": cohorts,
         },
     )
+
+
+@login_required
+@user_passes_test(is_admin)
+def solver_trends_view(request):
+    """Chart CP-SAT search statistics across recent runs and cohort sizes."""
+    metric = request.GET.get("metric", "time_limit_used")
+    if metric not in TREND_METRICS:
+        metric = "time_limit_used"
+    mode = request.GET.get("mode", "")
+
+    stats = SolverStats.objects.select_related("match_run__cohort")
+    if mode:
+        stats = stats.filter(match_run__mode=mode)
+    # Oldest first, so the run chart reads left to right
+    stats = list(stats[:SOLVER_TRENDS_LIMIT])[::-1]
+
+    values = [float(getattr(row, metric)) for row in stats]
+    labels = [
+        f"Run {row.match_run_id} ({row.match_run.cohort.name}): {value:g}"
+        for row, value in zip(stats, values)
+    ]
+
+    return render(
+        request,
+        "admin_views/solver_trends.html",
+        {
+            "stats": stats[::-1],
+            "metric": metric,
+            "metric_label": TREND_METRICS[metric],
+            "metrics": TREND_METRICS,
+            "mode": mode,
+            "modes": CPSAT_MODES,
+            "by_cohort_size": _plot([row.cohort_size for row in stats], values, labels),
+            "by_run": _plot(list(range(len(stats))), values, labels),
+            "near_limit": [row for row in stats if row.time_limit_used >= NEAR_TIME_LIMIT],
+            "near_time_limit": NEAR_TIME_LIMIT,
+            "chart_width": CHART_WIDTH,
+            "chart_height": CHART_HEIGHT,
+        },
+    )
+
+
+def _plot(xs: Sequence[float], ys: Sequence[float], labels: Sequence[str]) -> Dict[str, Any]:
+    """
+    Scale data points into the chart's plot area.
+
+    Both axes start at zero; SVG's y axis points down, so values are
+    flipped to grow upward.
+
+    Returns:
+        Dict with points (x, y, label), polyline (SVG points string),
+        x_max and y_max
+    """
+    x_max = max(xs, default=0) or 1
+    y_max = max(ys, default=0) or 1
+    points: List[Dict[str, Any]] = [
+        {
+            "x": round(x / x_max * CHART_WIDTH, 1),
+            "y": round(CHART_HEIGHT - y / y_max * CHART_HEIGHT, 1),
+            "label": label,
+        }
+        for x, y, label in zip(xs, ys, labels)
+    ]
+    return {
+        "points": points,
+        "polyline": " ".join(f"{point['x']},{point['y']}" for point in points),
+        "x_max": x_max,
+        "y_max": y_max,
+    }
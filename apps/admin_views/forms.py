@@ -1,8 +1,11 @@
-import csv
 from django import forms
 from django.core.exceptions import ValidationError
-from apps.core.models import Participant
-from apps.matching.models import MentorProfile
+from apps.matching.mentor_import import (
+    IMPORT_CHUNK_SIZE,
+    MENTOR_CSV_HEADERS,
+    parse_mentor_csv,
+)
+from apps.matching.preference_import import detect_import_format
 
 
 class CSVImportForm(forms.Form):
@@ -22,6 +25,29 @@ class CSVImportForm(forms.Form):
         return csv_file
 
 
+class PreferenceImportForm(forms.Form):
+    """Form for uploading a bulk preference file."""
+
+    preference_file = forms.FileField(
+        label="Preference File",
+        help_text="CSV or JSONL with from_email, to_email and rank",
+        widget=forms.FileInput(attrs={"data-testid": "preference-upload-input"}),
+    )
+    dry_run = forms.BooleanField(
+        label="Validate only",
+        required=False,
+        widget=forms.CheckboxInput(
+            attrs={"class": "form-check-input", "data-testid": "preference-dry-run"}
+        ),
+    )
+
+    def clean_preference_file(self):
+        preference_file = self.cleaned_data.get("preference_file")
+        if preference_file and not detect_import_format(preference_file.name):
+            raise ValidationError("File must be a CSV or JSONL file.")
+        return preference_file
+
+
 class MenteeDesiredAttributesForm(forms.Form):
     """Form for mentee desired attributes."""
 
@@ -77,90 +103,31 @@ class MenteeDesiredAttributesForm(forms.Form):
 
 
 class MentorCSVParser:
-    """Parser for mentor CSV files."""
-
-    REQUIRED_HEADERS = [
-        "mentor_email",
-        "organization",
-        "job_title",
-        "function",
-        "expertise_tags",
-        "languages",
-        "location",
-        "years_experience",
-        "coaching_topics",
-        "bio",
-    ]
-
-    def __init__(self, csv_file):
+    """Parser for mentor CSV files.
+
+    The file is read as a stream and validated in chunks of
+    ``IMPORT_CHUNK_SIZE`` rows, with one participant lookup per chunk.
+    """
+
+    REQUIRED_HEADERS = MENTOR_CSV_HEADERS
+
+    def __init__(self, csv_file, chunk_size=IMPORT_CHUNK_SIZE):
         self.csv_file = csv_file
+        self.chunk_size = chunk_size
         self.errors = []
         self.valid_rows = []
         self.invalid_rows = []
 
     def parse(self):
         """Parse the CSV file and validate rows."""
-        decoded_file = self.csv_file.read().decode("utf-8")
-        reader = csv.DictReader(decoded_file.splitlines(), delimiter=",")
-
-        # Check headers
-        headers = reader.fieldnames
-        if not headers:
-            self.errors.append("CSV file is empty or invalid")
-            return False
-
-        missing_headers = set(self.REQUIRED_HEADERS) - set(headers)
-        if missing_headers:
-            self.errors.append(
-                f"Missing required headers: {', '.join(missing_headers)}"
-            )
+        error, chunks = parse_mentor_csv(self.csv_file, chunk_size=self.chunk_size)
+        if error:
+            self.errors.append(error)
             return False
 
         # Process rows
-        for row_num, row in enumerate(
-            reader, start=2
-        ):  # Start at 2 because of header row
-            self._validate_row(row, row_num)
+        for valid_rows, invalid_rows in chunks:
+            self.valid_rows.extend(valid_rows)
+            self.invalid_rows.extend(invalid_rows)
 
         return len(self.errors) == 0
-
-    def _validate_row(self, row, row_num):
-        """Validate a single row of the CSV."""
-        row_errors = []
-
-        # Check required fields
-        if not row.get("mentor_email"):
-            row_errors.append("Email is required")
-        elif not self._validate_email(row["mentor_email"]):
-            row_errors.append("Invalid email format")
-
-        if not row.get("organization"):
-            row_errors.append("Organization is required")
-
-        # Validate years_experience as integer
-        years_exp = row.get("years_experience")
-        if years_exp:
-            try:
-                int(years_exp)
-            except ValueError:
-                row_errors.append("Years of experience must be a number")
-
-        # Try to find participant by email
-        try:
-            participant = Participant.objects.get(
-                user__email=row["mentor_email"], role_in_cohort="MENTOR"
-            )
-            row["participant_obj"] = participant
-        except Participant.DoesNotExist:
-            row_errors.append(f"No mentor found with email {row['mentor_email']}")
-
-        if row_errors:
-            row["errors_list"] = row_errors
-            row["row_number"] = row_num
-            self.invalid_rows.append(row)
-        else:
-            self.valid_rows.append(row)
-
-    def _validate_email(self, email):
-        """Basic email validation."""
-        return "@" in email and "." in email
@@ -1,13 +1,16 @@
 """Admin views for manual override functionality."""
 
+import json
 import logging
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.http import JsonResponse
+from django.views.decorators.http import require_POST
 from apps.core.models import Cohort, Participant
 from apps.matching.models import MatchRun, Match
 from apps.matching import override
+from apps.matching.swap_suggestions import suggest_swap_chains
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +47,10 @@ def override_view(request, match_run_id):
     # Get existing matches for this run
     matches = match_run.matches.select_related("mentor", "mentee").all()
     
+    if request.method == "POST" and match_run.status != "SUCCESS":
+        messages.error(request, override.UNFINISHED_RUN_MESSAGE)
+        return redirect("admin_views:override", match_run_id=match_run.id)
+
     if request.method == "POST":
         # Handle override form submission
         mentor_id = request.POST.get("mentor")
@@ -85,6 +92,11 @@ def override_view(request, match_run_id):
                 },
             )
         
+        # Apply the override together with a suggested swap chain
+        chain = request.POST.get("chain")
+        if chain is not None:
+            return _apply_swap_chain(request, match_run, mentor, mentee, override_reason, chain)
+
         # Check for suggested swap
         swap_suggestion = override.get_swap_suggestion(mentor, mentee, match_run)
         
@@ -103,6 +115,7 @@ def override_view(request, match_run_id):
                     "selected_mentee": mentee_id,
                     "override_reason": override_reason,
                     "swap_suggestion": swap_suggestion,
+                    "swap_chains": _describe_swap_chains(match_run, mentor, mentee),
                 },
             )
         
@@ -129,6 +142,117 @@ def override_view(request, match_run_id):
     )
 
 
+def _describe_swap_chains(match_run, mentor, mentee):
+    """Ranked swap chains for an override, with participant names."""
+    suggestions = suggest_swap_chains(match_run, mentor, mentee)
+    names = dict(
+        Participant.objects.filter(
+            id__in={pid for s in suggestions for pair in s.pairs for pid in pair}
+        ).values_list("id", "display_name")
+    )
+    return [
+        {
+            "index": i,
+            "kind": suggestion.kind,
+            "pairs": [
+                (names.get(m, m), names.get(t, t), exception_type)
+                for (m, t), exception_type in zip(suggestion.pairs, suggestion.exception_types)
+            ],
+            "score_delta": suggestion.score_delta,
+            "exception_delta": suggestion.exception_delta,
+        }
+        for i, suggestion in enumerate(suggestions)
+    ]
+
+
+def _apply_swap_chain(request, match_run, mentor, mentee, override_reason, chain):
+    """Apply an override and the chosen swap chain as one batch."""
+    suggestions = suggest_swap_chains(match_run, mentor, mentee)
+    try:
+        index = int(chain)
+        if index < 0:
+            raise IndexError(index)
+        suggestion = suggestions[index]
+    except (ValueError, IndexError):
+        messages.error(request, "The selected swap suggestion is no longer available.")
+        return redirect("admin_views:override", match_run_id=match_run.id)
+
+    overrides = [(mentor.id, mentee.id, override_reason)] + [
+        (m, t, f"Swap chain for override of {mentor.display_name}")
+        for m, t in suggestion.pairs
+    ]
+    # Only the admin's pair is pinned; the chain's moves stay repairable
+    result = override.apply_batch_overrides(
+        match_run, overrides, request.user, complete_swaps=False, manual_mentor_ids=[mentor.id]
+    )
+    if result.success:
+        messages.success(request, result.message)
+    else:
+        messages.error(
+            request, "; ".join(e["error"] for e in result.errors) or result.message
+        )
+    return redirect("admin_views:override", match_run_id=match_run.id)
+
+
+@login_required
+@user_passes_test(is_admin)
+@require_POST
+def batch_override_view(request, match_run_id):
+    """
+    Apply many overrides in one transaction.
+
+    Body: ``{"overrides": [{"mentor_id", "mentee_id", "reason"}, ...],
+    "complete_swaps": true, "dry_run": false}``
+    """
+    match_run = get_object_or_404(MatchRun, id=match_run_id)
+
+    try:
+        payload = json.loads(request.body)
+        overrides = [
+            (int(item["mentor_id"]), int(item["mentee_id"]), item.get("reason", ""))
+            for item in payload["overrides"]
+        ]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return JsonResponse(
+            {
+                "success": False,
+                "message": "Body must be a JSON object with an overrides list of "
+                "{mentor_id, mentee_id, reason} objects",
+            },
+            status=400,
+        )
+
+    result = override.apply_batch_overrides(
+        match_run,
+        overrides,
+        request.user,
+        complete_swaps=bool(payload.get("complete_swaps", True)),
+        dry_run=bool(payload.get("dry_run", False)),
+    )
+    if result.success:
+        logger.info(
+            f"{request.user} batch override on run {match_run.id}: {result.message}"
+        )
+
+    return JsonResponse(result._asdict(), status=200 if result.success else 400)
+
+
+@login_required
+@user_passes_test(is_admin)
+@require_POST
+def repair_match_run_view(request, match_run_id):
+    """Re-optimize a match run around its manual overrides."""
+    match_run = get_object_or_404(MatchRun, id=match_run_id)
+
+    success, message, _ = override.repair_match_run(match_run, request.user)
+    if success:
+        messages.success(request, message)
+    else:
+        messages.error(request, message)
+
+    return redirect("admin_views:override", match_run_id=match_run.id)
+
+
 @login_required
 @user_passes_test(is_admin)
 def set_active_run_view(request, cohort_id, match_run_id):
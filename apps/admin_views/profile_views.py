@@ -0,0 +1,52 @@
+"""Staff browser for the request profile store."""
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from apps.admin_views import profiling
+
+
+def is_admin(user):
+    """Check if user is admin/staff."""
+    return user.is_staff or user.is_superuser
+
+
+@login_required
+@user_passes_test(is_admin)
+def profile_list_view(request):
+    """List stored request profiles, newest first."""
+    return render(
+        request,
+        "admin_views/profiles.html",
+        {
+            "profiles": profiling.list_profiles(),
+            "profiling_enabled": settings.REQUEST_PROFILING,
+        },
+    )
+
+
+@login_required
+@user_passes_test(is_admin)
+def profile_detail_view(request, profile_id):
+    """Show one request profile: functions, SQL queries and templates."""
+    report = profiling.load_profile(profile_id)
+    if report is None:
+        raise Http404("Profile not found")
+
+    return render(request, "admin_views/profile_detail.html", {"report": report})
+
+
+@login_required
+@user_passes_test(is_admin)
+def download_profile_stats_view(request, profile_id):
+    """Download a profile's raw cProfile stats for pstats or snakeviz."""
+    report = profiling.load_profile(profile_id)
+    if report is None or not report["has_stats"]:
+        raise Http404("Profile stats not found")
+
+    return FileResponse(
+        open(profiling.stats_path(profile_id), "rb"),
+        as_attachment=True,
+        filename=f"{profile_id}.prof",
+    )
@@ -0,0 +1,470 @@
+"""Opt-in per-request profiling for staff.
+
+With ``REQUEST_PROFILING`` enabled, a staff user profiles a request by adding
+``?profile=cprofile`` (or ``?profile=1``) or ``?profile=sample`` to its URL.
+The request then runs under a profiler while its SQL queries and template
+renders are recorded, and the report is saved to the profile store under
+``PROFILE_ROOT``. The response carries the report's id in ``X-Profile-Id``,
+and the report can be read in the staff profile browser.
+
+``cprofile`` traces every Python call, which is exact but slows the request
+down. ``sample`` reads the request thread's stack every SAMPLE_INTERVAL
+seconds, which barely slows it down but misses short calls. Only one cProfile
+can trace a thread at a time, so a cprofile request falls back to sampling
+while another is being traced.
+
+Streaming responses are profiled up to the point the view returns them; the
+body generated while streaming is not covered.
+"""
+
+import contextvars
+import cProfile
+import hashlib
+import json
+import logging
+import pstats
+import re
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.template import base as template_base
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Query parameter that turns profiling on, and the profiler each value picks
+PROFILE_PARAM = "profile"
+PROFILERS = {"1": "cprofile", "cprofile": "cprofile", "sample": "sample"}
+
+# Seconds between stack samples of the sampling profiler
+SAMPLE_INTERVAL = 0.005
+
+# Functions listed in a report, by cumulative time or samples
+MAX_REPORT_FUNCTIONS = 50
+
+# Queries whose SQL is kept in a report; counts and timings cover them all
+MAX_LOGGED_QUERIES = 500
+
+# Reports kept in the store; older ones are deleted when a report is saved
+PROFILE_STORE_LIMIT = 100
+
+# Literal values in SQL, replaced to group queries that differ only in parameters
+SQL_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+# Profile ids are timestamps plus a random suffix, safe to use as file names
+PROFILE_ID = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{8}$")
+
+_active_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "admin_request_profile", default=None
+)
+
+_original_template_render = None
+
+
+class RequestProfile:
+    """
+    Collects the SQL queries and template renders of one request.
+
+    Reports are saved to disk and shown to every staff user, so a query's
+    parameters and literals are never kept. Each query is stored as its SQL
+    shape plus a digest keyed per request, which tells repeats of the exact
+    same query apart without revealing, or allowing a guess at, its values.
+    """
+
+    def __init__(self):
+        self.queries: List[Dict[str, Any]] = []
+        self.templates: List[Dict[str, Any]] = []
+        self._template_depth = 0
+        self._digest_key = secrets.token_bytes(16)
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            digest = hashlib.blake2b(
+                repr((sql, params)).encode(), key=self._digest_key, digest_size=8
+            )
+            self.queries.append(
+                {
+                    "sql": SQL_LITERAL.sub("?", sql),
+                    "digest": digest.hexdigest(),
+                    "duration": time.perf_counter() - start,
+                }
+            )
+
+    @contextmanager
+    def template(self, name: str) -> Iterator[None]:
+        record = {"name": name, "depth": self._template_depth}
+        self._template_depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record["duration"] = time.perf_counter() - start
+            self._template_depth -= 1
+            self.templates.append(record)
+
+    def sql_summary(self) -> Dict[str, Any]:
+        """
+        Summarize the queries with their duplicates.
+
+        Returns:
+            Dict with count, total_time, the first MAX_LOGGED_QUERIES queries,
+            ``duplicates`` (identical SQL and parameters run more than once)
+            and ``similar`` (the same SQL run with different parameters, the
+            usual sign of an N+1 loop), each sorted by total time
+        """
+        exact = defaultdict(list)
+        shaped = defaultdict(list)
+        for query in self.queries:
+            exact[(query["sql"], query["digest"])].append(query["duration"])
+            shaped[query["sql"]].append(query)
+
+        duplicates = [
+            {"sql": sql, "count": len(times), "total_time": sum(times)}
+            for (sql, _), times in exact.items()
+            if len(times) > 1
+        ]
+        similar = []
+        for sql, queries in shaped.items():
+            variants = {query["digest"] for query in queries}
+            if len(variants) > 1:
+                similar.append(
+                    {
+                        "sql": sql,
+                        "count": len(queries),
+                        "variants": len(variants),
+                        "total_time": sum(query["duration"] for query in queries),
+                    }
+                )
+
+        return {
+            "count": len(self.queries),
+            "total_time": sum(query["duration"] for query in self.queries),
+            "queries": self.queries[:MAX_LOGGED_QUERIES],
+            "duplicates": sorted(duplicates, key=lambda d: -d["total_time"]),
+            "similar": sorted(similar, key=lambda s: -s["total_time"]),
+        }
+
+    def template_summary(self) -> Dict[str, Any]:
+        """
+        Summarize template render times.
+
+        Times are inclusive, so a template's time contains the templates it
+        includes; the total only counts outermost renders.
+
+        Returns:
+            Dict with total_time and per-template name, count and time,
+            slowest first
+        """
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for record in self.templates:
+            entry = by_name.setdefault(
+                record["name"], {"name": record["name"], "count": 0, "time": 0.0}
+            )
+            entry["count"] += 1
+            entry["time"] += record["duration"]
+        return {
+            "total_time": sum(r["duration"] for r in self.templates if r["depth"] == 0),
+            "renders": sorted(by_name.values(), key=lambda e: -e["time"]),
+        }
+
+
+def _profiled_template_render(self, context):
+    profile = _active_profile.get()
+    if profile is None:
+        return _original_template_render(self, context)
+    with profile.template(self.origin.template_name or self.origin.name):
+        return _original_template_render(self, context)
+
+
+def _instrument_templates() -> None:
+    """
+    Route template renders through the active profile, once per process.
+
+    ``Template._render`` is the hook Django's test instrumentation uses; it
+    also runs for the parents of ``{% extends %}``, which ``render`` doesn't.
+    """
+    global _original_template_render
+    if _original_template_render is None:
+        _original_template_render = template_base.Template._render
+        template_base.Template._render = _profiled_template_render
+
+
+class SamplingProfiler:
+    """Samples one thread's stack from a background thread."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.own = Counter()
+        self.cumulative = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.own[_frame_key(frame)] += 1
+            seen = set()
+            while frame is not None:
+                key = _frame_key(frame)
+                if key not in seen:
+                    seen.add(key)
+                    self.cumulative[key] += 1
+                frame = frame.f_back
+
+    def functions(self) -> List[Dict[str, Any]]:
+        """
+        Functions seen in the samples, by share of samples on the stack.
+
+        Returns:
+            List of function, file, line, samples, own_samples, share and
+            own_share dicts
+        """
+        rows = []
+        for key, samples in self.cumulative.most_common(MAX_REPORT_FUNCTIONS):
+            filename, line, function = key
+            own = self.own.get(key, 0)
+            rows.append(
+                {
+                    "function": function,
+                    "file": filename,
+                    "line": line,
+                    "samples": samples,
+                    "own_samples": own,
+                    "share": samples / self.samples if self.samples else 0,
+                    "own_share": own / self.samples if self.samples else 0,
+                }
+            )
+        return rows
+
+
+def _frame_key(frame):
+    code = frame.f_code
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def _cprofile_functions(stats: pstats.Stats) -> List[Dict[str, Any]]:
+    """
+    The most expensive functions of a cProfile run, by cumulative time.
+
+    Returns:
+        List of function, file, line, calls, own_time and cumulative_time dicts
+    """
+    rows = [
+        {
+            "function": function,
+            "file": filename,
+            "line": line,
+            "calls": calls,
+            "own_time": own_time,
+            "cumulative_time": cumulative_time,
+        }
+        for (filename, line, function), (_, calls, own_time, cumulative_time, _) in (
+            stats.stats.items()
+        )
+    ]
+    rows.sort(key=lambda row: -row["cumulative_time"])
+    return rows[:MAX_REPORT_FUNCTIONS]
+
+
+class ProfilingMiddleware:
+    """
+    Profile staff requests that ask for it with ``?profile=``.
+
+    Removed at startup unless ``REQUEST_PROFILING`` is enabled, so it costs
+    nothing when off.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_PROFILING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _instrument_templates()
+
+    def __call__(self, request):
+        profiler = PROFILERS.get(request.GET.get(PROFILE_PARAM, ""))
+        user = getattr(request, "user", None)
+        if profiler is None or user is None or not user.is_staff:
+            return self.get_response(request)
+        return self._profile(request, profiler)
+
+    def _profile(self, request, profiler: str):
+        profile = RequestProfile()
+        token = _active_profile.set(profile)
+        tracer = None
+        sampler = None
+        if profiler == "cprofile":
+            tracer = cProfile.Profile()
+            try:
+                tracer.enable()
+            except ValueError:
+                # Another request is being traced
+                tracer = None
+                profiler = "sample"
+        if tracer is None:
+            sampler = SamplingProfiler(threading.get_ident())
+            sampler.start()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            with connection.execute_wrapper(profile.record_query):
+                response = self.get_response(request)
+        finally:
+            cpu_time = time.thread_time() - cpu_start
+            wall_time = time.perf_counter() - wall_start
+            if tracer is not None:
+                tracer.disable()
+            if sampler is not None:
+                sampler.stop()
+            _active_profile.reset(token)
+
+        report = {
+            "method": request.method,
+            "path": request.get_full_path(),
+            "user": request.user.get_username(),
+            "status_code": response.status_code,
+            "streaming": response.streaming,
+            "profiler": profiler,
+            "wall_time": wall_time,
+            "cpu_time": cpu_time,
+            "sql": profile.sql_summary(),
+            "templates": profile.template_summary(),
+        }
+        stats = None
+        if tracer is not None:
+            stats = pstats.Stats(tracer)
+            report["functions"] = _cprofile_functions(stats)
+        else:
+            report["samples"] = sampler.samples
+            report["sample_interval"] = sampler.interval
+            report["functions"] = sampler.functions()
+
+        try:
+            profile_id = save_profile(report, stats)
+        except OSError as e:
+            logger.error(f"Could not save profile of {report['path']}: {str(e)}")
+        else:
+            response["X-Profile-Id"] = profile_id
+            logger.info(
+                f"Profiled {report['method']} {report['path']} as {profile_id}: "
+                f"{wall_time:.3f}s, {report['sql']['count']} queries"
+            )
+        return response
+
+
+def _store_dir() -> Path:
+    return Path(settings.PROFILE_ROOT)
+
+
+def save_profile(report: Dict[str, Any], stats: Optional[pstats.Stats] = None) -> str:
+    """
+    Write a report, and the raw cProfile stats if any, to the profile store.
+
+    The stats file can be opened with ``pstats`` or a viewer like snakeviz.
+
+    Returns:
+        The new profile's id
+    """
+    store = _store_dir()
+    store.mkdir(parents=True, exist_ok=True)
+    now = timezone.now()
+    profile_id = f"{now:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+    report = {"id": profile_id, "created_at": now.isoformat(), **report}
+    with open(store / f"{profile_id}.json", "w") as f:
+        json.dump(report, f)
+    if stats is not None:
+        stats.dump_stats(store / f"{profile_id}.prof")
+    _prune_store(store)
+    return profile_id
+
+
+def _prune_store(store: Path) -> None:
+    reports = sorted(store.glob("*.json"))
+    for path in reports[:-PROFILE_STORE_LIMIT]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """
+    Summaries of the stored reports, newest first.
+
+    Returns:
+        List of dicts with id, created_at, method, path, user, status_code,
+        profiler, wall_time, query_count, duplicate_count and template_time
+    """
+    store = _store_dir()
+    if not store.is_dir():
+        return []
+    summaries = []
+    for path in sorted(store.glob("*.json"), reverse=True):
+        try:
+            with open(path) as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            continue
+        summaries.append(
+            {
+                "id": report["id"],
+                "created_at": datetime.fromisoformat(report["created_at"]),
+                "method": report["method"],
+                "path": report["path"],
+                "user": report["user"],
+                "status_code": report["status_code"],
+                "profiler": report["profiler"],
+                "wall_time": report["wall_time"],
+                "query_count": report["sql"]["count"],
+                "duplicate_count": sum(d["count"] - 1 for d in report["sql"]["duplicates"]),
+                "template_time": report["templates"]["total_time"],
+            }
+        )
+    return summaries
+
+
+def load_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a stored report.
+
+    Returns:
+        The report, or None if the id is malformed or not in the store
+    """
+    if not PROFILE_ID.match(profile_id):
+        return None
+    try:
+        with open(_store_dir() / f"{profile_id}.json") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return None
+    report["created_at"] = datetime.fromisoformat(report["created_at"])
+    report["has_stats"] = stats_path(profile_id).exists()
+    return report
+
+
+def stats_path(profile_id: str) -> Path:
+    """Path of a report's raw cProfile stats file."""
+    return _store_dir() / f"{profile_id}.prof"
@@ -4,12 +4,14 @@ import logging
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.http import HttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, Http404, StreamingHttpResponse
 from apps.core.models import Cohort
 from apps.matching.models import MatchRun
-from apps.matching.service import run_matching
+from apps.matching.service import queue_matching, request_stop, run_matching
 from apps.matching.services import export_match_run_csv
 from apps.matching.export import export_match_run_xlsx
+from apps.matching.progress import format_event, get_progress_state, subscribe_progress
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +29,19 @@ def run_matching_view(request, cohort_id):
 
     if request.method == "POST":
         mode = request.POST.get("mode", "STRICT")
+        backend = request.POST.get("backend") or None
+
+        if request.POST.get("anytime"):
+            # Solve in the background, showing the best solution so far
+            match_run = queue_matching(cohort, request.user, mode, backend)
+            messages.info(
+                request,
+                f"{mode.title()} matching queued. Provisional results appear as the solver improves them.",
+            )
+            return redirect("admin_views:match_results", match_run_id=match_run.id)
 
         # Run matching using unified service
-        match_run = run_matching(cohort, request.user, mode)
+        match_run = run_matching(cohort, request.user, mode, backend)
 
         if match_run.status == "SUCCESS":
             messages.success(
@@ -98,10 +110,64 @@ def match_results_view(request, match_run_id):
             "total_matches": total_matches,
             "ambiguous_count": ambiguous_count,
             "exception_count": exception_count,
+            # Only an ASGI server can hold the progress stream open cheaply
+            "stream_progress": isinstance(request, ASGIRequest),
         },
     )
 
 
+@login_required
+@user_passes_test(is_admin)
+def stop_match_run_view(request, match_run_id):
+    """Stop a background match run early, keeping its best solution."""
+    match_run = get_object_or_404(MatchRun, id=match_run_id)
+
+    if request.method == "POST":
+        success, message = request_stop(match_run)
+        if success:
+            messages.success(request, message)
+        else:
+            messages.error(request, message)
+
+    return redirect("admin_views:match_results", match_run_id=match_run.id)
+
+
+@login_required
+@user_passes_test(is_admin)
+async def match_run_events_view(request, match_run_id):
+    """
+    Stream a background run's progress as server-sent events.
+
+    Each ``progress`` event carries the phase, incumbent objective, bound,
+    gap and elapsed time; the stream ends once the run finishes. Only served
+    under ASGI: a WSGI worker would be held for the whole run, so there the
+    view answers 204, which stops EventSource from reconnecting, and pages
+    poll ``match_run_progress_view`` instead.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    if not await MatchRun.objects.filter(id=match_run_id).aexists():
+        raise Http404("Match run not found")
+
+    async def events():
+        yield "retry: 5000\n\n"
+        async for state in subscribe_progress(match_run_id):
+            yield format_event(state)
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@login_required
+@user_passes_test(is_admin)
+def match_run_progress_view(request, match_run_id):
+    """Report a background run's progress as JSON for polling."""
+    match_run = get_object_or_404(MatchRun, id=match_run_id)
+    return JsonResponse(get_progress_state(match_run))
+
+
 @login_required
 @user_passes_test(is_admin)
 def export_match_run_view(request, match_run_id):
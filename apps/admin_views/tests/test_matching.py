@@ -149,3 +149,89 @@ class AdminMatchingViewTest(TestCase):
         content = response.content.decode("utf-8")
         self.assertIn("mentor_name", content)
         self.assertIn("mentee_name", content)
+
+    def test_batch_override_view(self):
+        """Test applying a batch of overrides through the JSON endpoint."""
+        from apps.matching.services import run_strict_matching
+
+        match_run = run_strict_matching(self.cohort, self.admin_user)
+        url = reverse("admin_views:batch_override", kwargs={"match_run_id": match_run.id})
+
+        response = self.client.post(
+            url,
+            data={
+                "overrides": [
+                    {"mentor_id": self.mentor1.id, "mentee_id": self.mentee2.id, "reason": "Review"}
+                ],
+                "dry_run": True,
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["results"][0]["exception_type"], "E3")
+        self.assertEqual(len(data["swaps"]), 1)
+        self.assertFalse(match_run.matches.filter(is_manual_override=True).exists())
+
+        response = self.client.post(url, data={"overrides": "bad"}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_repair_match_run_view(self):
+        """Test re-optimizing a run around a manual override."""
+        from apps.matching.services import run_strict_matching
+        from apps.matching.models import Match
+
+        match_run = run_strict_matching(self.cohort, self.admin_user)
+        Match.objects.filter(match_run=match_run, mentor=self.mentor1).update(
+            is_manual_override=True
+        )
+        url = reverse("admin_views:repair_match_run", kwargs={"match_run_id": match_run.id})
+
+        self.assertEqual(self.client.get(url).status_code, 405)
+
+        response = self.client.post(url)
+        self.assertRedirects(
+            response, reverse("admin_views:override", kwargs={"match_run_id": match_run.id})
+        )
+        match_run.refresh_from_db()
+        self.assertEqual(match_run.objective_summary["repair"]["pinned_count"], 1)
+        self.assertEqual(match_run.objective_summary["repair"]["changed_count"], 0)
+
+    def test_override_with_swap_chain(self):
+        """Test applying an override together with a ranked swap chain."""
+        from apps.matching.services import run_strict_matching
+        from apps.matching.models import Match
+
+        match_run = run_strict_matching(self.cohort, self.admin_user)
+        current = Match.objects.get(match_run=match_run, mentor=self.mentor1).mentee
+        target = self.mentee2 if current == self.mentee1 else self.mentee1
+        url = reverse("admin_views:override", kwargs={"match_run_id": match_run.id})
+        data = {"mentor": self.mentor1.id, "mentee": target.id, "override_reason": "Review"}
+
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["swap_chains"][0]["kind"], "SWAP")
+
+        # Negative indices don't wrap around to the last suggestion
+        response = self.client.post(url, {**data, "chain": "-1"})
+        self.assertRedirects(response, url)
+        self.assertEqual(
+            Match.objects.get(match_run=match_run, mentor=self.mentor1).mentee, current
+        )
+
+        response = self.client.post(url, {**data, "chain": "0"})
+        self.assertRedirects(response, url)
+        self.assertEqual(
+            Match.objects.get(match_run=match_run, mentor=self.mentor1).mentee, target
+        )
+        self.assertEqual(
+            Match.objects.get(match_run=match_run, mentor=self.mentor2).mentee, current
+        )
+        self.assertEqual(
+            list(
+                match_run.matches.filter(is_manual_override=True).values_list(
+                    "mentor_id", flat=True
+                )
+            ),
+            [self.mentor1.id],
+        )
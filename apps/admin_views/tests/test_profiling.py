@@ -0,0 +1,147 @@
+"""Tests for opt-in request profiling and the profile browser."""
+
+import json
+import shutil
+import tempfile
+import time
+from django.contrib.auth.models import User
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from apps.admin_views.profiling import RequestProfile, load_profile, list_profiles
+from apps.core.models import Cohort, Participant
+
+
+class RequestProfileTest(TestCase):
+    """Test query and template summaries."""
+
+    def _record(self, profile, sql, params):
+        profile.record_query(lambda *args: None, sql, params, False, {})
+
+    def test_duplicate_and_similar_queries(self):
+        profile = RequestProfile()
+        for _ in range(3):
+            self._record(profile, 'SELECT * FROM "core_cohort" WHERE "id" = %s', (1,))
+        for participant_id in (1, 2):
+            self._record(
+                profile, 'SELECT * FROM "core_participant" WHERE "id" = %s', (participant_id,)
+            )
+        self._record(profile, 'SELECT COUNT(*) FROM "auth_user" LIMIT 21', ())
+
+        summary = profile.sql_summary()
+
+        self.assertEqual(summary["count"], 6)
+        self.assertEqual([d["count"] for d in summary["duplicates"]], [3])
+        self.assertEqual(
+            [(s["sql"], s["variants"]) for s in summary["similar"]],
+            [('SELECT * FROM "core_participant" WHERE "id" = %s', 2)],
+        )
+
+    def test_parameters_and_literals_are_not_kept(self):
+        profile = RequestProfile()
+        self._record(
+            profile,
+            "SELECT * FROM \"auth_user\" WHERE \"email\" = %s AND \"password\" = 'hunter2'",
+            ("alice@example.com",),
+        )
+
+        report = json.dumps(profile.sql_summary())
+
+        self.assertNotIn("alice@example.com", report)
+        self.assertNotIn("hunter2", report)
+        self.assertEqual(
+            profile.queries[0]["sql"],
+            "SELECT * FROM \"auth_user\" WHERE \"email\" = %s AND \"password\" = ?",
+        )
+
+    def test_template_total_counts_outermost_renders(self):
+        profile = RequestProfile()
+        with profile.template("page.html"):
+            with profile.template("base.html"):
+                time.sleep(0.01)
+
+        summary = profile.template_summary()
+
+        self.assertEqual([r["name"] for r in summary["renders"]], ["page.html", "base.html"])
+        self.assertEqual(summary["total_time"], summary["renders"][0]["time"])
+
+
+class ProfilingMiddlewareTest(TestCase):
+    """Test profiling requests end to end."""
+
+    def setUp(self):
+        self.store = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.store)
+        profiling_settings = override_settings(REQUEST_PROFILING=True, PROFILE_ROOT=self.store)
+        profiling_settings.enable()
+        self.addCleanup(profiling_settings.disable)
+        self.admin_user = User.objects.create_user("admin", "admin@example.com", is_staff=True)
+        self.regular_user = User.objects.create_user("regular", "regular@example.com")
+        Participant.objects.create(
+            cohort=Cohort.objects.create(name="Profiled Cohort"),
+            user=self.regular_user,
+            role_in_cohort="MENTEE",
+            display_name="Regular",
+            organization="Org",
+        )
+        self.url = reverse("admin_views:admin_dashboard")
+
+    def _get(self, user, url):
+        client = Client()
+        client.force_login(user)
+        return client.get(url)
+
+    def test_cprofile_report_is_stored(self):
+        response = self._get(self.admin_user, self.url + "?profile=cprofile")
+
+        report = load_profile(response["X-Profile-Id"])
+        self.assertEqual(report["profiler"], "cprofile")
+        self.assertEqual(report["path"], self.url + "?profile=cprofile")
+        self.assertGreater(report["sql"]["count"], 0)
+        templates = [t["name"] for t in report["templates"]["renders"]]
+        self.assertIn("admin_views/admin_dashboard.html", templates)
+        self.assertIn("base.html", templates)
+        self.assertTrue(report["functions"])
+        self.assertTrue(report["has_stats"])
+
+    def test_sampling_report_is_stored(self):
+        response = self._get(self.admin_user, self.url + "?profile=sample")
+
+        report = load_profile(response["X-Profile-Id"])
+        self.assertEqual(report["profiler"], "sample")
+        self.assertFalse(report["has_stats"])
+
+    def test_only_staff_requests_are_profiled(self):
+        response = self._get(self.regular_user, reverse("core:home") + "?profile=1")
+
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(list_profiles(), [])
+
+    def test_disabled_by_setting(self):
+        with override_settings(REQUEST_PROFILING=False):
+            response = self._get(self.admin_user, self.url + "?profile=1")
+
+        self.assertNotIn("X-Profile-Id", response)
+
+    def test_browser_lists_and_shows_profiles(self):
+        profile_id = self._get(self.admin_user, self.url + "?profile=1")["X-Profile-Id"]
+
+        response = self._get(self.admin_user, reverse("admin_views:profile_list"))
+        self.assertContains(response, reverse("admin_views:profile_detail", args=[profile_id]))
+
+        response = self._get(
+            self.admin_user, reverse("admin_views:profile_detail", args=[profile_id])
+        )
+        self.assertContains(response, 'data-testid="functions-table"')
+        self.assertContains(response, "admin_views/admin_dashboard.html")
+
+        response = self._get(
+            self.admin_user, reverse("admin_views:download_profile_stats", args=[profile_id])
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_profile_is_404(self):
+        response = self._get(
+            self.admin_user, reverse("admin_views:profile_detail", args=["not-a-profile"])
+        )
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,216 @@
+"""Query-count regression tests for every admin and participant endpoint.
+
+Each URL in the admin_views, matching and core URL confs is requested
+against data seeded at two sizes, and must issue the same number of queries
+at both. A view that queries once per participant, match or cohort fails
+here, however fast it looks on a small cohort.
+"""
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from apps.admin_views import urls as admin_views_urls
+from apps.core import urls as core_urls
+from apps.core.models import Cohort, Participant
+from apps.matching import urls as matching_urls
+from apps.matching.models import (
+    ActiveMatchRun,
+    ImportJob,
+    Match,
+    MatchRun,
+    MenteeProfile,
+    MentorProfile,
+    PairScore,
+    Preference,
+)
+
+# Mentors (and mentees) per side, and cohorts, in the two seeded states
+SMALL = 3
+LARGE = 9
+
+URL_MODULES = (admin_views_urls, matching_urls, core_urls)
+
+# Endpoints a participant uses; every other admin_views URL is requested
+# by a staff user
+PARTICIPANT_URLS = {"admin_views:mentee_desired_attributes", "admin_views:my_match"}
+
+# Requests other than a plain GET, by URL name: (method, data, content type).
+# String bodies are formatted with the seeded ids. Form posts carry what
+# the page submits, so the solve, submit and repair paths are the ones measured.
+REQUESTS = {
+    "admin_views:run_matching": ("post", {"mode": "STRICT", "backend": ""}, None),
+    "admin_views:confirm_import": ("post", {}, None),
+    "admin_views:stop_match_run": ("post", {}, None),
+    "admin_views:set_active_run": ("post", {}, None),
+    "admin_views:repair_match_run": ("post", {}, None),
+    "admin_views:batch_override": (
+        "post",
+        '{{"overrides": [{{"mentor_id": {candidate_id}, "mentee_id": {mentee_id}, '
+        '"reason": "Check"}}], "dry_run": true}}',
+        "application/json",
+    ),
+    "matching:submit_preferences": ("post", {}, None),
+    "matching:candidate_rank_api": ("patch", '{{"rank": 1}}', "application/json"),
+}
+
+
+def _drain(response):
+    """Read a streaming response to the end, so the queries behind it run."""
+    if response.is_async:
+
+        async def read():
+            return [chunk async for chunk in response.streaming_content]
+
+        return async_to_sync(read)()
+    return list(response.streaming_content)
+
+
+def _url_names():
+    for module in URL_MODULES:
+        for pattern in module.urlpatterns:
+            if isinstance(pattern, URLPattern):
+                yield f"{module.app_name}:{pattern.name}", list(pattern.pattern.converters)
+
+
+class QueryCountTest(TestCase):
+    """Every endpoint issues a constant number of queries."""
+
+    def test_query_counts_do_not_grow_with_data(self):
+        small = self._measure(SMALL)
+        large = self._measure(LARGE)
+
+        self.assertEqual(set(small), {name for name, _ in _url_names()})
+        for name in small:
+            with self.subTest(url=name):
+                self.assertEqual(
+                    small[name][0],
+                    large[name][0],
+                    f"{name} issued {small[name][0]} queries with {SMALL} participants "
+                    f"per side and {large[name][0]} with {LARGE}:\n"
+                    + "\n".join(large[name][1]),
+                )
+
+    def _measure(self, size):
+        """Seed data of the given size and count each endpoint's queries."""
+        counts = {}
+        with transaction.atomic():
+            seeded = _seed(size)
+            for name, converters in _url_names():
+                kwargs = {converter: seeded[converter] for converter in converters}
+                client = Client()
+                client.force_login(
+                    seeded["participant_user"]
+                    if name in PARTICIPANT_URLS or not name.startswith("admin_views:")
+                    else seeded["admin_user"]
+                )
+                method, data, content_type = REQUESTS.get(name, ("get", {}, None))
+                if isinstance(data, str):
+                    data = data.format(**seeded)
+                url = reverse(name, kwargs=kwargs)
+                # Sessions and auth cost the same everywhere; load them first
+                client.get(reverse("core:register"))
+
+                with transaction.atomic():
+                    with CaptureQueriesContext(connection) as queries:
+                        response = getattr(client, method)(
+                            url, data, **({"content_type": content_type} if content_type else {})
+                        )
+                        if response.streaming:
+                            _drain(response)
+                    transaction.set_rollback(True)
+
+                self.assertLess(response.status_code, 500, name)
+                counts[name] = (len(queries), [query["sql"] for query in queries.captured_queries])
+            transaction.set_rollback(True)
+        return counts
+
+
+def _seed(size):
+    """
+    Create ``size`` mentors and mentees with profiles, preferences, scores and a
+    successful match run, plus ``size`` further cohorts for the list pages.
+    """
+    admin_user = User.objects.create_user(f"admin{size}", is_staff=True)
+    cohort = Cohort.objects.create(name=f"Query Cohort {size}", status="OPEN")
+    mentors, mentees = [], []
+    # One mentee more than mentors, so the cohort stays balanced once the
+    # participant below is unsubmitted and a run can actually solve
+    for i in range(size + 1):
+        for role, group in (("MENTOR", mentors), ("MENTEE", mentees)):
+            if role == "MENTOR" and i == size:
+                continue
+            user = User.objects.create_user(
+                f"{role.lower()}{size}_{i}", f"{role.lower()}{i}@example.com"
+            )
+            group.append(
+                Participant.objects.create(
+                    cohort=cohort,
+                    user=user,
+                    role_in_cohort=role,
+                    display_name=f"{role.title()} {i}",
+                    organization=f"Org{i % 3}",
+                    is_submitted=True,
+                )
+            )
+    for mentor in mentors:
+        MentorProfile.objects.create(
+            participant=mentor, job_title="Engineer", expertise_tags="python,career"
+        )
+    for mentee in mentees:
+        MenteeProfile.objects.create(
+            participant=mentee, desired_attributes={"preferred_expertise": ["python"]}
+        )
+    for mentor in mentors:
+        for rank, mentee in enumerate(mentees, 1):
+            Preference.objects.create(from_participant=mentor, to_participant=mentee, rank=rank)
+            Preference.objects.create(from_participant=mentee, to_participant=mentor, rank=rank)
+            PairScore.objects.create(cohort=cohort, mentor=mentor, mentee=mentee, score=50.0)
+
+    match_run = MatchRun.objects.create(
+        cohort=cohort, created_by=admin_user, mode="EXCEPTION", status="SUCCESS"
+    )
+    for i, (mentor, mentee) in enumerate(zip(mentors, mentees)):
+        Match.objects.create(
+            match_run=match_run,
+            mentor=mentor,
+            mentee=mentee,
+            score_percent=50,
+            ambiguity_flag=i % 2 == 0,
+            exception_flag=i % 3 == 0,
+            exception_type="E1" if i % 3 == 0 else "",
+            # Repair keeps this pair and re-solves around it
+            is_manual_override=i == 0,
+        )
+    ActiveMatchRun.objects.create(cohort=cohort, match_run=match_run, set_by=admin_user)
+    job = ImportJob.objects.create(name=f"import{size}", status="PREVIEW", created_by=admin_user)
+
+    # The participant is an unsubmitted mentee, so the preference form renders
+    participant = mentees[0]
+    participant.is_submitted = False
+    participant.save()
+
+    for i in range(size):
+        other = Cohort.objects.create(name=f"Other Cohort {size}_{i}")
+        Participant.objects.create(
+            cohort=other,
+            user=participant.user,
+            role_in_cohort="MENTEE",
+            display_name="Elsewhere",
+            organization="OrgX",
+        )
+
+    return {
+        "admin_user": admin_user,
+        "participant_user": participant.user,
+        "cohort_id": cohort.id,
+        "match_run_id": match_run.id,
+        "job_id": job.id,
+        "candidate_id": mentors[1].id,
+        # Overriding mentors[1] onto this mentee displaces two pairs
+        "mentee_id": mentees[2].id,
+        # Profiles live in files, not the database; any id costs the same
+        "profile_id": "20261019T000000-00000000",
+    }
@@ -1,8 +1,11 @@
-from django.test import TestCase, Client
+import tempfile
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth.models import User
 from apps.core.models import Cohort, Participant
-from apps.matching.models import MentorProfile, MenteeProfile
+from apps.matching.models import MentorProfile, MenteeProfile, ImportJob, Preference
+from apps.matching.import_jobs import claim_next_import_job, process_import_job
 
 
 class AdminViewsTest(TestCase):
@@ -137,3 +140,77 @@ class AdminViewsTest(TestCase):
         self.assertEqual(mentee_profile.notes, "Looking for experienced backend mentor")
         self.assertTrue(mentee_profile.desired_attributes["same_organization_ok"])
         self.assertFalse(mentee_profile.desired_attributes["remote_ok"])
+
+    def test_import_mentor_csv_preview_and_confirm(self):
+        """Test uploading a mentor CSV, previewing the job and confirming it."""
+        csv_content = (
+            "mentor_email,organization,job_title,function,expertise_tags,"
+            "languages,location,years_experience,coaching_topics,bio\n"
+            "regular@example.com,Test Org,Engineer,Engineering,backend,EN,NYC,5,leadership,Bio\n"
+            "unknown@example.com,Test Org,Engineer,Engineering,backend,EN,NYC,5,leadership,Bio\n"
+        )
+        csv_file = SimpleUploadedFile(
+            "mentors.csv", csv_content.encode(), content_type="text/csv"
+        )
+
+        with tempfile.TemporaryDirectory() as media_root, override_settings(
+            MEDIA_ROOT=media_root
+        ):
+            response = self.admin_client.post(
+                reverse("admin_views:import_mentor_csv"), {"csv_file": csv_file}
+            )
+            job = ImportJob.objects.get()
+            self.assertRedirects(
+                response, reverse("admin_views:import_job", args=[job.id])
+            )
+            self.assertEqual(job.status, "PENDING")
+
+            # Validation pass
+            process_import_job(claim_next_import_job())
+            response = self.admin_client.get(
+                reverse("admin_views:import_job", args=[job.id])
+            )
+            self.assertContains(response, "Valid Rows: 1")
+            self.assertContains(response, "Invalid Rows: 1")
+
+            response = self.admin_client.post(
+                reverse("admin_views:confirm_import", args=[job.id])
+            )
+            self.assertEqual(response.status_code, 302)
+
+            # Import pass
+            process_import_job(claim_next_import_job())
+
+        response = self.admin_client.get(
+            reverse("admin_views:import_job_progress", args=[job.id])
+        )
+        progress = response.json()
+        self.assertEqual(progress["status"], "COMPLETED")
+        self.assertEqual(progress["imported_rows"], 1)
+
+        profile = MentorProfile.objects.get(participant=self.mentor_participant)
+        self.assertEqual(profile.job_title, "Engineer")
+        self.assertEqual(profile.years_experience, 5)
+
+    def test_import_preferences_view(self):
+        """Test bulk-loading preferences for a cohort from the admin upload."""
+        csv_file = SimpleUploadedFile(
+            "prefs.csv",
+            b"from_email,to_email,rank\nmentee@example.com,regular@example.com,1\n",
+            content_type="text/csv",
+        )
+
+        response = self.admin_client.post(
+            reverse("admin_views:import_preferences", args=[self.cohort.id]),
+            {"preference_file": csv_file},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Imported 1 preferences for 1 participants")
+        self.assertTrue(
+            Preference.objects.filter(
+                from_participant=self.mentee_participant,
+                to_participant=self.mentor_participant,
+                rank=1,
+            ).exists()
+        )
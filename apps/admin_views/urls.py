@@ -3,13 +3,36 @@ from . import views
 from . import run_matching
 from . import override_views
 from . import admin_dashboard
+from . import profile_views
 
 app_name = "admin_views"
 
 urlpatterns = [
     path("dashboard/", admin_dashboard.admin_dashboard_view, name="admin_dashboard"),
+    path("solver-trends/", admin_dashboard.solver_trends_view, name="solver_trends"),
+    path("profiles/", profile_views.profile_list_view, name="profile_list"),
+    path(
+        "profiles/<slug:profile_id>/",
+        profile_views.profile_detail_view,
+        name="profile_detail",
+    ),
+    path(
+        "profiles/<slug:profile_id>/stats/",
+        profile_views.download_profile_stats_view,
+        name="download_profile_stats",
+    ),
     path("import/mentor-csv/", views.import_mentor_csv_view, name="import_mentor_csv"),
-    path("import/confirm/", views.confirm_import_view, name="confirm_import"),
+    path("import/jobs/<int:job_id>/", views.import_job_view, name="import_job"),
+    path(
+        "import/jobs/<int:job_id>/progress/",
+        views.import_job_progress_view,
+        name="import_job_progress",
+    ),
+    path(
+        "import/jobs/<int:job_id>/confirm/",
+        views.confirm_import_view,
+        name="confirm_import",
+    ),
     path(
         "download-csv-template/",
         views.download_csv_template_view,
@@ -25,6 +48,11 @@ urlpatterns = [
         views.cohort_dashboard_view,
         name="cohort_dashboard",
     ),
+    path(
+        "cohort/<int:cohort_id>/import-preferences/",
+        views.import_preferences_view,
+        name="import_preferences",
+    ),
     path(
         "cohort/<int:cohort_id>/run-matching/",
         run_matching.run_matching_view,
@@ -35,6 +63,21 @@ urlpatterns = [
         run_matching.match_results_view,
         name="match_results",
     ),
+    path(
+        "match-run/<int:match_run_id>/events/",
+        run_matching.match_run_events_view,
+        name="match_run_events",
+    ),
+    path(
+        "match-run/<int:match_run_id>/progress/",
+        run_matching.match_run_progress_view,
+        name="match_run_progress",
+    ),
+    path(
+        "match-run/<int:match_run_id>/stop/",
+        run_matching.stop_match_run_view,
+        name="stop_match_run",
+    ),
     path(
         "match-run/<int:match_run_id>/export/",
         run_matching.export_match_run_view,
@@ -45,6 +88,16 @@ urlpatterns = [
         override_views.override_view,
         name="override",
     ),
+    path(
+        "match-run/<int:match_run_id>/override/batch/",
+        override_views.batch_override_view,
+        name="batch_override",
+    ),
+    path(
+        "match-run/<int:match_run_id>/repair/",
+        override_views.repair_match_run_view,
+        name="repair_match_run",
+    ),
     path(
         "cohort/<int:cohort_id>/match-run/<int:match_run_id>/set-active/",
         override_views.set_active_run_view,
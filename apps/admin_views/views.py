@@ -8,9 +8,19 @@ from django.http import HttpResponse, JsonResponse
 from django.conf import settings
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
-from .forms import CSVImportForm, MenteeDesiredAttributesForm, MentorCSVParser
+from .forms import (
+    CSVImportForm,
+    MenteeDesiredAttributesForm,
+    PreferenceImportForm,
+)
 from apps.core.models import Cohort, Participant
-from apps.matching.models import MentorProfile, MenteeProfile, ImportJob, PairScore
+from apps.matching.models import MenteeProfile, ImportJob, PairScore
+from apps.matching.import_jobs import (
+    confirm_import_job,
+    create_mentor_import_job,
+    get_import_job_progress,
+)
+from apps.matching.preference_import import detect_import_format, import_preferences
 
 
 def is_admin(user):
@@ -21,174 +31,99 @@ def is_admin(user):
 @login_required
 @user_passes_test(is_admin)
 def import_mentor_csv_view(request):
-    """View for importing mentor data from CSV."""
+    """View for uploading a mentor CSV as a background import job."""
     if request.method == "POST":
         form = CSVImportForm(request.POST, request.FILES)
         if form.is_valid():
-            csv_file = request.FILES["csv_file"]
-
-            # Parse the CSV file
-            parser = MentorCSVParser(csv_file)
-            is_valid = parser.parse()
-
-            if not is_valid:
-                for error in parser.errors:
-                    messages.error(request, error)
-                return render(
-                    request, "admin_views/import_mentor_csv.html", {"form": form}
-                )
-
-            # Store parsed data in session for confirmation step
-            # Convert participant objects to serializable data
-            valid_rows_serializable = []
-            for row in parser.valid_rows:
-                row_copy = row.copy()
-                if "participant_obj" in row_copy:
-                    # Store only the participant ID instead of the object
-                    row_copy["participant_id"] = row_copy["participant_obj"].id
-                    del row_copy["participant_obj"]
-                valid_rows_serializable.append(row_copy)
-
-            invalid_rows_serializable = []
-            for row in parser.invalid_rows:
-                row_copy = row.copy()
-                if "participant_obj" in row_copy:
-                    # Store only the participant ID instead of the object
-                    row_copy["participant_id"] = row_copy["participant_obj"].id
-                    del row_copy["participant_obj"]
-                invalid_rows_serializable.append(row_copy)
-
-            request.session["csv_valid_rows"] = valid_rows_serializable
-            request.session["csv_invalid_rows"] = invalid_rows_serializable
-
-            # Render preview
-            # Reconstruct participant objects for display
-            valid_rows_with_objects = []
-            for row in valid_rows_serializable:
-                row_copy = row.copy()
-                if "participant_id" in row_copy:
-                    try:
-                        participant = Participant.objects.get(
-                            id=row_copy["participant_id"]
-                        )
-                        row_copy["participant_obj"] = participant
-                        del row_copy["participant_id"]
-                    except Participant.DoesNotExist:
-                        row_copy["participant_obj"] = None
-                valid_rows_with_objects.append(row_copy)
-
-            invalid_rows_with_objects = []
-            for row in invalid_rows_serializable:
-                row_copy = row.copy()
-                if "participant_id" in row_copy:
-                    try:
-                        participant = Participant.objects.get(
-                            id=row_copy["participant_id"]
-                        )
-                        row_copy["participant_obj"] = participant
-                        del row_copy["participant_id"]
-                    except Participant.DoesNotExist:
-                        row_copy["participant_obj"] = None
-                invalid_rows_with_objects.append(row_copy)
-
-            return render(
-                request,
-                "admin_views/csv_preview.html",
-                {
-                    "valid_rows": valid_rows_with_objects,
-                    "invalid_rows": invalid_rows_with_objects,
-                    "form": form,
-                },
+            job = create_mentor_import_job(request.FILES["csv_file"], request.user)
+            messages.success(
+                request, "Upload received. Rows are being validated in the background."
             )
+            return redirect("admin_views:import_job", job_id=job.id)
     else:
         form = CSVImportForm()
 
-    return render(request, "admin_views/import_mentor_csv.html", {"form": form})
+    recent_jobs = ImportJob.objects.order_by("-created_at")[:10]
+
+    return render(
+        request,
+        "admin_views/import_mentor_csv.html",
+        {"form": form, "recent_jobs": recent_jobs},
+    )
+
+
+@login_required
+@user_passes_test(is_admin)
+def import_job_view(request, job_id):
+    """Show validation preview and progress for an import job."""
+    job = get_object_or_404(ImportJob, id=job_id)
+
+    return render(
+        request,
+        "admin_views/import_job.html",
+        {
+            "job": job,
+            "progress": get_import_job_progress(job),
+        },
+    )
+
+
+@login_required
+@user_passes_test(is_admin)
+def import_job_progress_view(request, job_id):
+    """Report import job progress as JSON for polling."""
+    job = get_object_or_404(ImportJob, id=job_id)
+    return JsonResponse(get_import_job_progress(job))
 
 
 @login_required
 @user_passes_test(is_admin)
-def confirm_import_view(request):
-    """Confirm and process the CSV import."""
+def confirm_import_view(request, job_id):
+    """Confirm a previewed import job so the worker imports its valid rows."""
     if request.method != "POST":
         messages.error(request, "Invalid request method.")
-        return redirect("admin_views:import_mentor_csv")
-
-    # Get data from session
-    valid_rows = request.session.get("csv_valid_rows", [])
-    invalid_rows = request.session.get("csv_invalid_rows", [])
-
-    if not valid_rows and not invalid_rows:
-        messages.error(request, "No data to import.")
-        return redirect("admin_views:import_mentor_csv")
-
-    # Reconstruct participant objects from IDs
-    valid_rows_with_objects = []
-    for row in valid_rows:
-        row_copy = row.copy()
-        if "participant_id" in row_copy:
-            try:
-                participant = Participant.objects.get(id=row_copy["participant_id"])
-                row_copy["participant_obj"] = participant
-                del row_copy["participant_id"]
-            except Participant.DoesNotExist:
-                messages.error(
-                    request,
-                    f"Participant with ID {row_copy['participant_id']} not found.",
-                )
-                return redirect("admin_views:import_mentor_csv")
-        valid_rows_with_objects.append(row_copy)
-
-    # Process valid rows
-    imported_count = 0
-    for row in valid_rows_with_objects:
-        participant = row["participant_obj"]
-
-        # Get or create mentor profile
-        mentor_profile, created = MentorProfile.objects.get_or_create(
-            participant=participant,
-            defaults={
-                "job_title": row.get("job_title", ""),
-                "function": row.get("function", ""),
-                "expertise_tags": row.get("expertise_tags", ""),
-                "languages": row.get("languages", ""),
-                "location": row.get("location", ""),
-                "years_experience": int(row.get("years_experience"))
-                if row.get("years_experience")
-                else None,
-                "coaching_topics": row.get("coaching_topics", ""),
-                "bio": row.get("bio", ""),
-            },
-        )
+        return redirect("admin_views:import_job", job_id=job_id)
 
-        # If profile exists, update it
-        if not created:
-            mentor_profile.job_title = row.get("job_title", "")
-            mentor_profile.function = row.get("function", "")
-            mentor_profile.expertise_tags = row.get("expertise_tags", "")
-            mentor_profile.languages = row.get("languages", "")
-            mentor_profile.location = row.get("location", "")
-            mentor_profile.years_experience = (
-                int(row.get("years_experience"))
-                if row.get("years_experience")
-                else None
-            )
-            mentor_profile.coaching_topics = row.get("coaching_topics", "")
-            mentor_profile.bio = row.get("bio", "")
-            mentor_profile.save()
+    job = get_object_or_404(ImportJob, id=job_id)
+
+    success, message = confirm_import_job(job)
+    if success:
+        messages.success(request, message)
+    else:
+        messages.error(request, message)
 
-        imported_count += 1
+    return redirect("admin_views:import_job", job_id=job_id)
 
-    # Clean up session
-    if "csv_valid_rows" in request.session:
-        del request.session["csv_valid_rows"]
-    if "csv_invalid_rows" in request.session:
-        del request.session["csv_invalid_rows"]
 
-    messages.success(
-        request, f"Successfully imported {imported_count} mentor profiles."
+@login_required
+@user_passes_test(is_admin)
+def import_preferences_view(request, cohort_id):
+    """View for bulk-loading a cohort's preferences from CSV or JSONL."""
+    cohort = get_object_or_404(Cohort, id=cohort_id)
+    result = None
+
+    if request.method == "POST":
+        form = PreferenceImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            preference_file = form.cleaned_data["preference_file"]
+            result = import_preferences(
+                cohort,
+                preference_file,
+                detect_import_format(preference_file.name),
+                dry_run=form.cleaned_data["dry_run"],
+            )
+            if result.success:
+                messages.success(request, result.message)
+            else:
+                messages.error(request, result.message)
+    else:
+        form = PreferenceImportForm()
+
+    return render(
+        request,
+        "admin_views/import_preferences.html",
+        {"cohort": cohort, "form": form, "result": result},
     )
-    return redirect("admin_views:import_mentor_csv")
 
 
 @login_required
@@ -319,7 +254,11 @@ def cohort_dashboard_view(request, cohort_id):
     diagnostics = get_diagnostics_report(cohort)
 
     # Get top pair scores for display
-    top_pairs = PairScore.objects.filter(cohort=cohort).order_by("-score")[:10]
+    top_pairs = (
+        PairScore.objects.filter(cohort=cohort)
+        .select_related("mentor", "mentee")
+        .order_by("-score")[:10]
+    )
 
     return render(
         request,
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Preference, MentorProfile, MenteeProfile, ImportJob
+from .models import Preference, MentorProfile, MenteeProfile, ImportJob, SolverStats
 
 
 @admin.register(Preference)
@@ -72,8 +72,27 @@ class ImportJobAdmin(admin.ModelAdmin):
         "status",
         "total_rows",
         "processed_rows",
+        "imported_rows",
+        "created_by",
         "created_at",
     )
-    list_filter = ("status", "created_at")
+    list_filter = ("status", "is_confirmed", "created_at")
     search_fields = ("name",)
     ordering = ("-created_at",)
+
+
+@admin.register(SolverStats)
+class SolverStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "match_run",
+        "status",
+        "mentor_count",
+        "mentee_count",
+        "num_conflicts",
+        "num_branches",
+        "wall_time",
+        "time_limit",
+        "created_at",
+    )
+    list_filter = ("status", "match_run__mode", "match_run__cohort")
+    ordering = ("-created_at",)
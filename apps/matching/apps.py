@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MatchingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.matching"
+
+    def ready(self):
+        from . import receivers  # noqa: F401
@@ -0,0 +1,137 @@
+"""Candidate lookup for preference entry - paged, searchable and filterable."""
+
+from typing import Any, Dict, List, Optional
+from django.core.paginator import Paginator
+from django.db.models import F, OuterRef, Q, QuerySet, Subquery
+from apps.core.models import Participant
+from apps.matching.models import Preference
+
+CANDIDATE_PAGE_SIZE = 25
+MAX_CANDIDATE_PAGE_SIZE = 100
+
+
+def get_opposite_role(participant: Participant) -> str:
+    """Return the role a participant ranks."""
+    return "MENTEE" if participant.role_in_cohort == "MENTOR" else "MENTOR"
+
+
+def candidate_queryset(
+    participant: Participant,
+    search: str = "",
+    organization: str = "",
+    show_blocked: bool = False,
+    ranked: Optional[bool] = None,
+) -> QuerySet:
+    """
+    Candidates for a participant, each annotated with the participant's rank.
+
+    Ranked candidates come first in rank order, then the rest by name.
+    """
+    rank_subquery = Preference.objects.filter(
+        from_participant=participant, to_participant=OuterRef("pk")
+    ).values("rank")[:1]
+
+    candidates = (
+        Participant.objects.filter(
+            cohort_id=participant.cohort_id,
+            role_in_cohort=get_opposite_role(participant),
+        )
+        .select_related("mentor_profile", "mentee_profile")
+        .annotate(rank=Subquery(rank_subquery))
+    )
+
+    if not show_blocked:
+        candidates = candidates.exclude(organization=participant.organization)
+    if organization:
+        candidates = candidates.filter(organization=organization)
+    if search:
+        candidates = candidates.filter(
+            Q(display_name__icontains=search)
+            | Q(organization__icontains=search)
+            | Q(mentor_profile__job_title__icontains=search)
+            | Q(mentor_profile__expertise_tags__icontains=search)
+        )
+    if ranked is True:
+        candidates = candidates.filter(rank__isnull=False)
+    elif ranked is False:
+        candidates = candidates.filter(rank__isnull=True)
+
+    return candidates.order_by(F("rank").asc(nulls_last=True), "display_name", "id")
+
+
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def serialize_candidate(candidate: Participant, participant: Participant) -> Dict[str, Any]:
+    """Describe a candidate for the preference-entry API."""
+    profile: Dict[str, Any] = {}
+    if candidate.role_in_cohort == "MENTOR" and hasattr(candidate, "mentor_profile"):
+        mentor_profile = candidate.mentor_profile
+        profile = {
+            "job_title": mentor_profile.job_title,
+            "function": mentor_profile.function,
+            "expertise_tags": _split_list(mentor_profile.expertise_tags),
+            "languages": _split_list(mentor_profile.languages),
+            "location": mentor_profile.location,
+            "years_experience": mentor_profile.years_experience,
+        }
+    elif candidate.role_in_cohort == "MENTEE" and hasattr(candidate, "mentee_profile"):
+        desired = candidate.mentee_profile.desired_attributes or {}
+        profile = {
+            "preferred_expertise": desired.get("preferred_expertise", []),
+            "preferred_location": desired.get("preferred_location", ""),
+        }
+
+    return {
+        "id": candidate.id,
+        "display_name": candidate.display_name,
+        "organization": candidate.organization,
+        "role": candidate.role_in_cohort,
+        "is_blocked": candidate.organization == participant.organization,
+        "rank": candidate.rank,
+        "profile": profile,
+    }
+
+
+def _parse_bool(value: Optional[str]) -> Optional[bool]:
+    if value in ("true", "1"):
+        return True
+    if value in ("false", "0"):
+        return False
+    return None
+
+
+def get_candidate_page(participant: Participant, params) -> Dict[str, Any]:
+    """
+    Build one page of candidates from request query parameters.
+
+    Supported parameters: ``q``, ``organization``, ``show_blocked``,
+    ``ranked``, ``page`` and ``page_size``.
+    """
+    try:
+        page_size = int(params.get("page_size", CANDIDATE_PAGE_SIZE))
+    except ValueError:
+        page_size = CANDIDATE_PAGE_SIZE
+    page_size = max(1, min(page_size, MAX_CANDIDATE_PAGE_SIZE))
+
+    candidates = candidate_queryset(
+        participant,
+        search=params.get("q", "").strip(),
+        organization=params.get("organization", "").strip(),
+        show_blocked=_parse_bool(params.get("show_blocked")) is True,
+        ranked=_parse_bool(params.get("ranked")),
+    )
+
+    paginator = Paginator(candidates, page_size)
+    page = paginator.get_page(params.get("page"))
+
+    return {
+        "count": paginator.count,
+        "page": page.number,
+        "num_pages": paginator.num_pages,
+        "has_next": page.has_next(),
+        "has_previous": page.has_previous(),
+        "ranked_count": Preference.objects.filter(from_participant=participant).count(),
+        "results": [serialize_candidate(c, participant) for c in page.object_list],
+    }
@@ -4,7 +4,8 @@ import logging
 from typing import Dict, List, Tuple, Set, NamedTuple
 from django.db.models import Max
 from apps.core.models import Participant, Cohort
-from apps.matching.models import Preference, PairScore
+from apps.matching.models import MentorProfile, Preference, PairScore
+from apps.matching.timing import span
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,12 @@ class PreparedInputs(NamedTuple):
     # Configuration
     config: Dict[str, any]
 
+    # Ranked opposite-role participant ids per participant, best first
+    preference_lists: Dict[int, List[int]] = {}
+
+    # Mentees each mentor can take, where a mentor's profile sets it
+    mentor_capacity: Dict[int, int] = {}
+
 
 def prepare_inputs(cohort: Cohort) -> PreparedInputs:
     """
@@ -41,16 +48,17 @@ def prepare_inputs(cohort: Cohort) -> PreparedInputs:
     logger.info(f"Preparing inputs for cohort {cohort.id}")
 
     # Get participants
-    mentors = list(
-        Participant.objects.filter(
-            cohort=cohort, role_in_cohort="MENTOR", is_submitted=True
+    with span("prepare_inputs.participants"):
+        mentors = list(
+            Participant.objects.filter(
+                cohort=cohort, role_in_cohort="MENTOR", is_submitted=True
+            )
         )
-    )
-    mentees = list(
-        Participant.objects.filter(
-            cohort=cohort, role_in_cohort="MENTEE", is_submitted=True
+        mentees = list(
+            Participant.objects.filter(
+                cohort=cohort, role_in_cohort="MENTEE", is_submitted=True
+            )
         )
-    )
 
     logger.info(f"Found {len(mentors)} mentors and {len(mentees)} mentees")
 
@@ -59,13 +67,24 @@ def prepare_inputs(cohort: Cohort) -> PreparedInputs:
     mentee_ids = [m.id for m in mentees]
 
     # Build organization matrix
-    same_org = _build_same_org_matrix(mentors, mentees)
+    with span("prepare_inputs.same_org"):
+        same_org = _build_same_org_matrix(mentors, mentees)
 
     # Build acceptability matrix
-    acceptability = _build_acceptability_matrix(mentors, mentees)
+    with span("prepare_inputs.acceptability"):
+        acceptability = _build_acceptability_matrix(mentors, mentees)
 
     # Get scores
-    score = _get_scaled_scores(mentors, mentees, cohort)
+    with span("prepare_inputs.scores"):
+        score = _get_scaled_scores(mentors, mentees, cohort)
+
+    # Ranked preference lists
+    with span("prepare_inputs.preference_lists"):
+        preference_lists = _build_preference_lists(mentors, mentees)
+
+    # Per-mentor capacities from profiles
+    with span("prepare_inputs.mentor_capacities"):
+        mentor_capacity = _get_mentor_capacities(mentor_ids)
 
     # Configuration
     config = _get_config(cohort)
@@ -77,6 +96,8 @@ def prepare_inputs(cohort: Cohort) -> PreparedInputs:
         acceptability=acceptability,
         score=score,
         config=config,
+        preference_lists=preference_lists,
+        mentor_capacity=mentor_capacity,
     )
 
 
@@ -144,17 +165,45 @@ def _build_acceptability_matrix(
     return acceptability
 
 
+def _build_preference_lists(
+    mentors: List[Participant], mentees: List[Participant]
+) -> Dict[int, List[int]]:
+    """
+    Build each participant's ranked list of submitted opposite-role candidates.
+
+    Equal ranks are ordered by candidate id so the lists are deterministic.
+    """
+    mentor_ids = {m.id for m in mentors}
+    mentee_ids = {m.id for m in mentees}
+
+    preferences = (
+        Preference.objects.filter(from_participant__in=mentors + mentees)
+        .order_by("from_participant_id", "rank", "to_participant_id")
+        .values_list("from_participant_id", "to_participant_id")
+    )
+
+    preference_lists = {}
+    for from_id, to_id in preferences:
+        candidates = mentee_ids if from_id in mentor_ids else mentor_ids
+        if to_id in candidates:
+            preference_lists.setdefault(from_id, []).append(to_id)
+
+    return preference_lists
+
+
 def _get_scaled_scores(
     mentors: List[Participant], mentees: List[Participant], cohort: Cohort
 ) -> Dict[Tuple[int, int], int]:
     """Get scaled scores for all mentor-mentee pairs."""
     # Get all pair scores for this cohort
-    pair_scores = PairScore.objects.filter(cohort=cohort)
+    pair_scores = PairScore.objects.filter(cohort=cohort).values_list(
+        "mentor_id", "mentee_id", "score"
+    )
 
     # Create lookup dictionary
     score_lookup = {}
-    for ps in pair_scores:
-        score_lookup[(ps.mentor.id, ps.mentee.id)] = ps.score
+    for mentor_id, mentee_id, score in pair_scores:
+        score_lookup[(mentor_id, mentee_id)] = score
 
     # Scale scores to integers for solver
     score_scale = 1000  # As defined in original solver
@@ -168,6 +217,15 @@ def _get_scaled_scores(
     return scores
 
 
+def _get_mentor_capacities(mentor_ids: List[int]) -> Dict[int, int]:
+    """Get the capacity of each mentor whose profile sets one."""
+    return dict(
+        MentorProfile.objects.filter(
+            participant_id__in=mentor_ids, max_mentees__isnull=False
+        ).values_list("participant_id", "max_mentees")
+    )
+
+
 def _get_config(cohort: Cohort) -> Dict[str, any]:
     """Get configuration parameters."""
     # Default configuration values (from scoring.py)
@@ -177,12 +235,24 @@ def _get_config(cohort: Cohort) -> Dict[str, any]:
         "attribute_match_weight": 0.2,
         "min_options_strict": 3,
         "strict_time_limit": 5,  # seconds
+        "strict_presolve": True,
         "exception_time_limit": 10,  # seconds
+        "exception_objective": "WEIGHTED",  # or "LEXICOGRAPHIC"
+        "exception_candidate_k": 0,  # top-k pairs per participant; 0 = all pairs
+        "mentor_capacity": 1,  # mentees per mentor without a profile setting
+        "allow_partial_matching": False,
+        "solver_backend": "CPSAT",  # or "ASSIGNMENT", "MIN_COST_FLOW", "PORTFOLIO"
+        "solver_num_workers": 0,  # 0 = all cores
+        "solver_random_seed": 1,
+        "solver_deterministic": False,
+        "solver_relative_gap_limit": 0.0,
+        "solver_log_search": False,
         "penalty_org": 1000000,
         "penalty_one_sided": 100000,
         "penalty_neither": 300000,
         "score_scale": 1000,
         "ambiguity_gap_threshold": 5.0,
+        "stable_proposing_side": "MENTOR",  # or "MENTEE"
     }
 
     config = DEFAULT_CONFIG.copy()
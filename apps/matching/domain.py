@@ -1,6 +1,6 @@
 """Domain logic layer - pure functions for business rules."""
 
-from typing import Dict, Tuple, NamedTuple
+from typing import Any, Dict, List, Tuple, NamedTuple
 from .data_prep import PreparedInputs
 
 
@@ -197,6 +197,67 @@ def detect_ambiguity(matches: list, inputs: PreparedInputs) -> list:
     return ambiguities
 
 
+def normalize_ranks(ranks_data: List[Tuple[int, Any]]) -> Tuple[bool, Dict[int, Any]]:
+    """
+    Renumber ranked candidates to consecutive ranks starting at 1.
+
+    Entries are ordered by (rank, candidate id); candidates sharing a rank keep
+    that order and are pushed down one rank each. Candidates may be model
+    instances or raw IDs.
+
+    Returns:
+        Tuple of (duplicate_warning, {normalized_rank: candidate})
+    """
+    ordered = sorted(ranks_data, key=lambda x: (x[0], getattr(x[1], "id", x[1])))
+    original_ranks = [rank for rank, _ in ordered]
+    duplicate_warning = len(set(original_ranks)) != len(original_ranks)
+
+    normalized_ranks = {
+        new_rank: candidate
+        for new_rank, (_, candidate) in enumerate(ordered, start=1)
+    }
+    return duplicate_warning, normalized_ranks
+
+
+def find_blocking_pairs(matches: list, inputs: PreparedInputs) -> List[Tuple[int, int]]:
+    """
+    Find pairs who would both rather be matched to each other.
+
+    This is a pure function that operates on prepared inputs. Only mutually
+    ranked, cross-organization pairs can block, and an unmatched participant
+    prefers any such partner. Runs in time linear in the preference lists.
+
+    Returns:
+        List of (mentor_id, mentee_id) blocking pairs
+    """
+    partner = {}
+    for match in matches:
+        partner[match["mentor_id"]] = match["mentee_id"]
+        partner[match["mentee_id"]] = match["mentor_id"]
+
+    mentee_positions = {
+        mentee_id: dict(
+            zip(inputs.preference_lists.get(mentee_id, []), range(len(inputs.mentor_ids)))
+        )
+        for mentee_id in inputs.mentee_ids
+    }
+
+    blocking = []
+    for mentor_id in inputs.mentor_ids:
+        current = partner.get(mentor_id)
+        for mentee_id in inputs.preference_lists.get(mentor_id, []):
+            if mentee_id == current:
+                break  # The rest of the list is worse than the current match
+            positions = mentee_positions.get(mentee_id, {})
+            if mentor_id not in positions or inputs.same_org[(mentor_id, mentee_id)]:
+                continue
+            mentee_current = partner.get(mentee_id)
+            if positions[mentor_id] < positions.get(mentee_current, len(positions)):
+                blocking.append((mentor_id, mentee_id))
+
+    return blocking
+
+
 def _get_org_name(participant_id: int, inputs: PreparedInputs) -> str:
     """
     Helper to get organization name for a participant.
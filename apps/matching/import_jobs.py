@@ -0,0 +1,228 @@
+"""Background execution of mentor CSV import jobs.
+
+Uploads are saved to storage and tracked by an ``ImportJob``. A worker
+(``manage.py process_import_jobs``) picks jobs up and runs them in two passes:
+
+1. Validation: the file is streamed and checked chunk by chunk, and the job
+   ends in PREVIEW with row counts and a sample of invalid rows.
+2. Import: after an admin confirms, each chunk's profiles are upserted in
+   the same transaction that advances ``processed_rows``. A crashed import
+   therefore resumes after its last committed chunk.
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+from django.db import transaction
+from django.db.models import Q
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from apps.matching.models import ImportJob
+from apps.matching.mentor_import import parse_mentor_csv, upsert_mentor_profiles
+
+logger = logging.getLogger(__name__)
+
+# Storage directory for uploaded mentor CSV files
+IMPORT_UPLOAD_DIR = "imports/mentor_csv"
+
+# A PROCESSING job without progress for this long is assumed to be orphaned
+STALE_JOB_SECONDS = 300
+
+# Invalid rows kept on the job for the preview page
+MAX_STORED_ROW_ERRORS = 500
+
+FINISHED_STATUSES = ("PREVIEW", "COMPLETED", "FAILED")
+
+
+def create_mentor_import_job(uploaded_file, user) -> ImportJob:
+    """Save an uploaded mentor CSV to storage and queue it for validation."""
+    file_path = default_storage.save(
+        f"{IMPORT_UPLOAD_DIR}/{uuid.uuid4().hex}.csv", uploaded_file
+    )
+    job = ImportJob.objects.create(
+        name=uploaded_file.name,
+        status="PENDING",
+        file_path=file_path,
+        created_by=user,
+    )
+    logger.info(f"Queued import job {job.id} for {uploaded_file.name}")
+    return job
+
+
+def confirm_import_job(job: ImportJob) -> Tuple[bool, str]:
+    """
+    Queue a previewed job for import.
+
+    Returns:
+        Tuple of (success, message)
+    """
+    if job.status != "PREVIEW":
+        return False, "Only previewed imports can be confirmed"
+
+    if job.valid_rows == 0:
+        return False, "No valid rows to import"
+
+    updated = ImportJob.objects.filter(id=job.id, status="PREVIEW").update(
+        status="PENDING",
+        is_confirmed=True,
+        processed_rows=0,
+        imported_rows=0,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        return False, "Import has already been confirmed"
+
+    job.refresh_from_db()
+    return True, f"Import of {job.valid_rows} rows queued"
+
+
+def claim_next_import_job() -> Optional[ImportJob]:
+    """
+    Claim the oldest runnable job for this worker.
+
+    Runnable jobs are PENDING ones, plus PROCESSING ones whose worker stopped
+    reporting progress. The claim is a conditional UPDATE, so two workers
+    never pick the same job.
+    """
+    stale_before = timezone.now() - timedelta(seconds=STALE_JOB_SECONDS)
+    candidates = ImportJob.objects.filter(
+        Q(status="PENDING") | Q(status="PROCESSING", updated_at__lt=stale_before)
+    ).order_by("created_at")
+
+    for job in candidates[:10]:
+        claimed = ImportJob.objects.filter(
+            id=job.id, status=job.status, updated_at=job.updated_at
+        ).update(status="PROCESSING", updated_at=timezone.now())
+        if claimed:
+            job.refresh_from_db()
+            if job.processed_rows:
+                logger.info(
+                    f"Resuming import job {job.id} after row {job.processed_rows}"
+                )
+            return job
+
+    return None
+
+
+def process_import_job(job: ImportJob) -> ImportJob:
+    """Run the next pass of a claimed job and record its outcome."""
+    try:
+        with default_storage.open(job.file_path, "rb") as csv_file:
+            if job.is_confirmed:
+                _run_import(job, csv_file)
+            else:
+                _run_validation(job, csv_file)
+    except Exception as e:
+        logger.error(f"Import job {job.id} failed: {e}", exc_info=True)
+        job.status = "FAILED"
+        job.error_message = str(e)
+        job.save(update_fields=["status", "error_message", "updated_at"])
+
+    # PREVIEW jobs keep the upload for the confirmed import pass
+    if job.status in ("COMPLETED", "FAILED"):
+        _delete_upload(job)
+
+    return job
+
+
+def _delete_upload(job: ImportJob) -> None:
+    """Remove a finished job's uploaded CSV from storage."""
+    try:
+        if default_storage.exists(job.file_path):
+            default_storage.delete(job.file_path)
+    except OSError as e:
+        logger.warning(f"Could not delete upload for import job {job.id}: {e}")
+
+
+def _run_validation(job: ImportJob, csv_file) -> None:
+    """Validate every row and leave the job in PREVIEW."""
+    # Validation writes nothing but counters, so it always restarts from the top
+    job.processed_rows = 0
+    job.valid_rows = 0
+    job.invalid_rows = 0
+    job.row_errors = []
+
+    error, chunks = parse_mentor_csv(csv_file)
+    if error:
+        job.status = "FAILED"
+        job.error_message = error
+        job.save(update_fields=["status", "error_message", "updated_at"])
+        return
+
+    for valid_rows, invalid_rows in chunks:
+        job.valid_rows += len(valid_rows)
+        job.invalid_rows += len(invalid_rows)
+        job.processed_rows += len(valid_rows) + len(invalid_rows)
+
+        room = MAX_STORED_ROW_ERRORS - len(job.row_errors)
+        for row in invalid_rows[:room]:
+            job.row_errors.append(
+                {
+                    "row_number": row["row_number"],
+                    "mentor_email": row.get("mentor_email") or "",
+                    "organization": row.get("organization") or "",
+                    "errors": row["errors_list"],
+                }
+            )
+
+        job.save(
+            update_fields=[
+                "processed_rows",
+                "valid_rows",
+                "invalid_rows",
+                "row_errors",
+                "updated_at",
+            ]
+        )
+
+    job.total_rows = job.processed_rows
+    job.status = "PREVIEW"
+    job.save(update_fields=["total_rows", "status", "updated_at"])
+    logger.info(
+        f"Validated import job {job.id}: {job.valid_rows} valid, "
+        f"{job.invalid_rows} invalid"
+    )
+
+
+def _run_import(job: ImportJob, csv_file) -> None:
+    """Import valid rows chunk by chunk, committing progress with each chunk."""
+    error, chunks = parse_mentor_csv(csv_file, skip_rows=job.processed_rows)
+    if error:
+        job.status = "FAILED"
+        job.error_message = error
+        job.save(update_fields=["status", "error_message", "updated_at"])
+        return
+
+    for valid_rows, invalid_rows in chunks:
+        with transaction.atomic():
+            job.imported_rows += upsert_mentor_profiles(valid_rows)
+            job.processed_rows += len(valid_rows) + len(invalid_rows)
+            job.save(update_fields=["processed_rows", "imported_rows", "updated_at"])
+
+    job.status = "COMPLETED"
+    job.save(update_fields=["status", "updated_at"])
+    logger.info(f"Import job {job.id} imported {job.imported_rows} profiles")
+
+
+def get_import_job_progress(job: ImportJob) -> Dict[str, Any]:
+    """Summarize a job's state for the progress endpoint."""
+    percent = None
+    if job.total_rows:
+        percent = round(min(job.processed_rows / job.total_rows, 1.0) * 100, 1)
+
+    return {
+        "id": job.id,
+        "name": job.name,
+        "status": job.status,
+        "phase": "import" if job.is_confirmed else "validation",
+        "total_rows": job.total_rows,
+        "processed_rows": job.processed_rows,
+        "valid_rows": job.valid_rows,
+        "invalid_rows": job.invalid_rows,
+        "imported_rows": job.imported_rows,
+        "percent": percent,
+        "error_message": job.error_message,
+        "is_finished": job.status in FINISHED_STATUSES,
+        "updated_at": job.updated_at.isoformat(),
+    }
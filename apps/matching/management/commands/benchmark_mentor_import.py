@@ -0,0 +1,125 @@
+"""Benchmark the mentor CSV import job pipeline on a synthetic file."""
+
+import csv
+import io
+import time
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from apps.core.models import Cohort, Participant
+from apps.matching.import_jobs import (
+    confirm_import_job,
+    create_mentor_import_job,
+    process_import_job,
+)
+from apps.matching.mentor_import import MENTOR_CSV_HEADERS
+
+
+class Command(BaseCommand):
+    help = (
+        "Time validating and importing a synthetic mentor CSV through an import "
+        "job, as the worker runs it. All data is created inside a transaction "
+        "that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000)
+        parser.add_argument(
+            "--invalid-every",
+            type=int,
+            default=50,
+            help="Make every Nth row reference an unknown email (0 disables)",
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        invalid_every = options["invalid_every"]
+
+        with transaction.atomic():
+            user = self._seed_mentors(rows)
+            csv_bytes = self._build_csv(rows, invalid_every)
+            self.stdout.write(
+                f"Generated {rows} rows ({len(csv_bytes) / 1024 / 1024:.1f} MiB)"
+            )
+
+            # First pass inserts profiles, second pass updates them
+            for label in ("insert", "update"):
+                self._run_pass(label, csv_bytes, user)
+
+            transaction.set_rollback(True)
+
+    def _seed_mentors(self, rows):
+        cohort = Cohort.objects.create(name=f"benchmark-import-{time.time_ns()}")
+        users = User.objects.bulk_create(
+            [
+                User(username=f"bench_mentor_{i}", email=f"bench_mentor_{i}@example.com")
+                for i in range(rows)
+            ],
+            batch_size=1000,
+        )
+        Participant.objects.bulk_create(
+            [
+                Participant(
+                    cohort=cohort,
+                    user=user,
+                    role_in_cohort="MENTOR",
+                    display_name=user.username,
+                    organization=f"Org{i % 20}",
+                )
+                for i, user in enumerate(users)
+            ],
+            batch_size=1000,
+        )
+        return User.objects.create_user(f"bench_admin_{time.time_ns()}", is_staff=True)
+
+    def _build_csv(self, rows, invalid_every):
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(MENTOR_CSV_HEADERS)
+        for i in range(rows):
+            email = f"bench_mentor_{i}@example.com"
+            if invalid_every and i % invalid_every == 0:
+                email = f"unknown_{i}@example.com"
+            writer.writerow(
+                [
+                    email,
+                    f"Org{i % 20}",
+                    "Senior Engineer",
+                    "Engineering",
+                    "backend,python,career growth",
+                    "EN,ES",
+                    "New York",
+                    str(i % 30),
+                    "technical leadership,architecture",
+                    "Benchmark mentor",
+                ]
+            )
+        return output.getvalue().encode("utf-8")
+
+    def _run_pass(self, label, csv_bytes, user):
+        csv_file = SimpleUploadedFile("benchmark.csv", csv_bytes, content_type="text/csv")
+        job = create_mentor_import_job(csv_file, user)
+
+        with CaptureQueriesContext(connection) as validate_queries:
+            start = time.perf_counter()
+            process_import_job(job)
+            validate_time = time.perf_counter() - start
+
+        success, message = confirm_import_job(job)
+        if not success:
+            self.stdout.write(f"[{label}] validation ended in {job.status}: {message}")
+            return
+
+        with CaptureQueriesContext(connection) as import_queries:
+            start = time.perf_counter()
+            process_import_job(job)
+            import_time = time.perf_counter() - start
+
+        self.stdout.write(
+            f"[{label}] validate: {validate_time:.2f}s ({len(validate_queries)} queries, "
+            f"{job.valid_rows} valid / {job.invalid_rows} invalid); "
+            f"import: {import_time:.2f}s ({len(import_queries)} queries, "
+            f"{job.imported_rows} rows, {job.status})"
+        )
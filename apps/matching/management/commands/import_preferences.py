@@ -0,0 +1,71 @@
+"""Bulk-load ranked preferences for a cohort from a CSV or JSONL file."""
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.models import Cohort
+from apps.matching.preference_import import (
+    PREFERENCE_IMPORT_FORMATS,
+    detect_import_format,
+    import_preferences,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import preferences (from_email, to_email, rank) into a cohort. Each "
+        "participant listed as from_email has their preference list replaced."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("cohort", help="Cohort ID or name")
+        parser.add_argument("path", help="CSV or JSONL file")
+        parser.add_argument(
+            "--format",
+            choices=PREFERENCE_IMPORT_FORMATS,
+            help="File format (defaults to the file extension)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the file without writing preferences",
+        )
+
+    def handle(self, *args, **options):
+        cohort = self._get_cohort(options["cohort"])
+
+        file_format = options["format"] or detect_import_format(options["path"])
+        if not file_format:
+            raise CommandError("Cannot infer format from file name; pass --format")
+
+        try:
+            with open(options["path"], "rb") as preference_file:
+                result = import_preferences(
+                    cohort, preference_file, file_format, dry_run=options["dry_run"]
+                )
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+
+        for error in result.errors:
+            self.stderr.write(f"Row {error['row_number']}: {'; '.join(error['errors'])}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... {result.error_count - len(result.errors)} more")
+
+        if not result.success:
+            raise CommandError(result.message)
+
+        self.stdout.write(self.style.SUCCESS(result.message))
+        if result.renumbered_participants:
+            self.stdout.write(
+                f"Renumbered duplicate ranks for {len(result.renumbered_participants)} participants"
+            )
+        if not options["dry_run"]:
+            self.stdout.write(
+                f"Inserted {result.inserted}, updated {result.updated}, "
+                f"deleted {result.deleted}"
+            )
+
+    def _get_cohort(self, value):
+        lookup = {"id": value} if value.isdigit() else {"name": value}
+        try:
+            return Cohort.objects.get(**lookup)
+        except Cohort.DoesNotExist:
+            raise CommandError(f"Cohort {value} not found")
@@ -0,0 +1,36 @@
+"""Worker that runs queued ImportJob records in the background."""
+
+import time
+from django.core.management.base import BaseCommand
+from apps.matching.import_jobs import claim_next_import_job, process_import_job
+
+
+class Command(BaseCommand):
+    help = "Process queued mentor CSV import jobs, resuming interrupted ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when no runnable jobs are left instead of polling",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls when the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_import_job()
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["poll_interval"])
+                continue
+
+            phase = "import" if job.is_confirmed else "validation"
+            self.stdout.write(f"Running {phase} for import job {job.id} ({job.name})")
+            process_import_job(job)
+            self.stdout.write(f"Import job {job.id} finished with status {job.status}")
@@ -0,0 +1,37 @@
+"""Worker that runs queued anytime MatchRun records in the background."""
+
+import time
+from django.core.management.base import BaseCommand
+from apps.matching.service import claim_next_match_run, process_match_run
+
+
+class Command(BaseCommand):
+    help = "Process queued anytime matching runs, saving provisional snapshots as they improve."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when no queued runs are left instead of polling",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls when the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            match_run = claim_next_match_run()
+            if match_run is None:
+                if options["once"]:
+                    return
+                time.sleep(options["poll_interval"])
+                continue
+
+            self.stdout.write(
+                f"Running {match_run.mode.lower()} match run {match_run.id} for cohort {match_run.cohort_id}"
+            )
+            process_match_run(match_run)
+            self.stdout.write(f"Match run {match_run.id} finished with status {match_run.status}")
@@ -0,0 +1,154 @@
+"""Run the matching pipeline scale benchmarks and compare them with a baseline."""
+
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from benchmarks.cohorts import CohortSpec
+from benchmarks.pipeline import (
+    DEFAULT_TOLERANCE,
+    STAGE_SIZE_LIMITS,
+    compare_to_baseline,
+    run_pipeline,
+)
+
+DEFAULT_SIZES = "50,200,1000,2000"
+
+# Default cohort shape: enough mentees rank back a mentor who ranked them
+# that mutual cross-org pairs admit a strict matching at every default size
+DEFAULT_LIST_LENGTH = 20
+DEFAULT_RECIPROCITY = 0.7
+
+# Default cohort config. CP-SAT can't prove N=1000 optimal within any
+# practical time limit, so its stages would only time the limit; the
+# assignment backend solves both modes exactly
+DEFAULT_CONFIG = '{"solver_backend": "ASSIGNMENT"}'
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, "benchmarks", "baseline.json")
+DEFAULT_OUTPUT = os.path.join(settings.BASE_DIR, "benchmarks", "results", "latest.json")
+
+
+class Command(BaseCommand):
+    help = (
+        "Time each matching pipeline stage on synthetic cohorts of growing size, "
+        "write the results as JSON and flag stages slower than the baseline. "
+        "All data is created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default=DEFAULT_SIZES, help="Comma-separated mentors per side"
+        )
+        parser.add_argument("--list-length", type=int, default=DEFAULT_LIST_LENGTH)
+        parser.add_argument("--unranked-rate", type=float, default=0.0)
+        parser.add_argument("--organizations", type=int, default=8)
+        parser.add_argument("--org-affinity", type=float, default=0.0)
+        parser.add_argument("--popularity-skew", type=float, default=0.0)
+        parser.add_argument("--reciprocity", type=float, default=DEFAULT_RECIPROCITY)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--config",
+            default=DEFAULT_CONFIG,
+            help="JSON cohort config for the generated cohorts, e.g. solver time limits",
+        )
+        parser.add_argument(
+            "--limit",
+            action="append",
+            default=[],
+            metavar="STAGE=SIZE",
+            help=f"Override a stage's size limit (defaults: {STAGE_SIZE_LIMITS})",
+        )
+        parser.add_argument("--output", default=DEFAULT_OUTPUT)
+        parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+        parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Store these results as the new baseline instead of comparing",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",")]
+            config = json.loads(options["config"])
+            limits = {
+                stage: int(size)
+                for stage, size in (item.split("=", 1) for item in options["limit"])
+            }
+        except ValueError as e:
+            raise CommandError(f"Invalid argument: {e}")
+
+        results = []
+        for size in sizes:
+            spec = CohortSpec(
+                size=size,
+                list_length=options["list_length"],
+                unranked_rate=options["unranked_rate"],
+                organizations=options["organizations"],
+                org_affinity=options["org_affinity"],
+                popularity_skew=options["popularity_skew"],
+                reciprocity=options["reciprocity"],
+                seed=options["seed"],
+                config=config,
+            )
+            with transaction.atomic():
+                user = User.objects.create(username=f"benchmark-runner-{size}")
+                entry = run_pipeline(spec, user, limits)
+                transaction.set_rollback(True)
+            results.append(entry)
+            self._report(entry)
+
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "machine": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "processor": platform.processor(),
+                "cpu_count": os.cpu_count(),
+                "database": connection.vendor,
+            },
+            "results": results,
+        }
+        target = options["baseline"] if options["update_baseline"] else options["output"]
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        with open(target, "w") as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(f"Wrote {target}")
+
+        if options["update_baseline"] or not os.path.exists(options["baseline"]):
+            return
+        with open(options["baseline"]) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_to_baseline(results, baseline, options["tolerance"])
+        for regression in regressions:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"REGRESSION N={regression['size']} {regression['stage']}: "
+                    f"{regression['baseline']:.3f}s -> {regression['current']:.3f}s"
+                )
+            )
+        if regressions:
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
+
+    def _report(self, entry):
+        self.stdout.write(f"N={entry['size']}")
+        for stage, metrics in entry["stages"].items():
+            self.stdout.write(
+                f"  {stage}: {metrics['wall_time']:.3f}s, {metrics['queries']} queries, "
+                f"max RSS {metrics['max_rss_kb'] / 1024:.0f} MiB "
+                f"(+{metrics['rss_growth_kb'] / 1024:.0f} MiB)"
+                + (
+                    f", traced peak {metrics['peak_traced_kb'] / 1024:.1f} MiB"
+                    if "peak_traced_kb" in metrics
+                    else ""
+                )
+            )
+        for mode, outcome in entry["outcomes"].items():
+            self.stdout.write(f"  {mode}: {outcome['status']} {outcome['reason']}".rstrip())
+        if entry["skipped"]:
+            self.stdout.write(f"  skipped (over size limit): {', '.join(entry['skipped'])}")
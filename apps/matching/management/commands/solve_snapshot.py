@@ -0,0 +1,155 @@
+"""Solve an offline input snapshot without touching the database."""
+
+import json
+import statistics
+from django.core.management.base import BaseCommand, CommandError
+from apps.matching.domain import detect_ambiguity
+from apps.matching.service import solve_inputs
+from apps.matching.snapshot import SnapshotError, read_snapshot
+from apps.matching.solvers.portfolio import BACKEND_CHOICES
+from apps.matching.timing import record_spans, span
+
+MODES = ("STRICT", "EXCEPTION", "STABLE", "FAIR")
+
+# CP-SAT statistics printed after a solve, when the backend reports them
+REPORTED_SOLVER_STATS = ("status", "num_variables", "num_conflicts", "num_branches", "wall_time")
+
+
+class Command(BaseCommand):
+    help = (
+        "Solve a snapshot written by export_match_inputs with any mode and "
+        "backend, and print per-phase timings and the result. Runs no queries, "
+        "so it works without a database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Snapshot file (.npz)")
+        parser.add_argument("--mode", choices=MODES, default="STRICT")
+        parser.add_argument(
+            "--backend",
+            choices=BACKEND_CHOICES,
+            help="STRICT and EXCEPTION backend (defaults to the snapshot's solver_backend)",
+        )
+        parser.add_argument(
+            "--set",
+            action="append",
+            default=[],
+            metavar="KEY=VALUE",
+            help="Override a config value, parsed as JSON when possible, "
+            "e.g. --set strict_time_limit=30",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=1, help="Solve this many times and report each"
+        )
+        parser.add_argument("--show-matches", action="store_true", help="Print every pair")
+        parser.add_argument("--json", help="Also write the last result as JSON to this path")
+
+    def handle(self, *args, **options):
+        try:
+            overrides = dict(item.split("=", 1) for item in options["set"])
+        except ValueError:
+            raise CommandError("--set takes KEY=VALUE")
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+
+        with record_spans() as recorder:
+            with span("load_snapshot"):
+                try:
+                    inputs, metadata = read_snapshot(options["path"])
+                except SnapshotError as e:
+                    raise CommandError(str(e))
+        self._report_spans(recorder.spans)
+
+        for key, value in overrides.items():
+            try:
+                inputs.config[key] = json.loads(value)
+            except ValueError:
+                inputs.config[key] = value
+
+        self.stdout.write(
+            f"Snapshot of {metadata.get('cohort_name', '?')} (cohort "
+            f"{metadata.get('cohort_id', '?')}, exported {metadata.get('exported_at', '?')}): "
+            f"{len(inputs.mentor_ids)} mentors, {len(inputs.mentee_ids)} mentees"
+        )
+
+        mode = options["mode"]
+        solve_times = []
+        for attempt in range(1, options["repeat"] + 1):
+            with record_spans() as recorder:
+                try:
+                    with span("solve"):
+                        result, backend, summary = solve_inputs(inputs, mode, options["backend"])
+                except ValueError as e:
+                    raise CommandError(str(e))
+                if result.success:
+                    with span("ambiguity_detection"):
+                        ambiguities = detect_ambiguity(result.matches, inputs)
+
+            if options["repeat"] > 1:
+                self.stdout.write(f"Run {attempt}/{options['repeat']}")
+            self._report_spans(recorder.spans)
+            solve_times.append(recorder.spans[0]["wall_time"])
+
+        backend_used = summary.get("backend", backend)
+        self.stdout.write(f"{mode} with {backend_used}" if backend_used else mode)
+        if len(solve_times) > 1:
+            self.stdout.write(
+                f"Solve time over {len(solve_times)} runs: min {min(solve_times):.3f}s, "
+                f"median {statistics.median(solve_times):.3f}s, max {max(solve_times):.3f}s"
+            )
+        self._report_result(result, ambiguities if result.success else [])
+        if options["show_matches"]:
+            for match in result.matches:
+                self.stdout.write(
+                    f"  {match['mentor_id']} - {match['mentee_id']}: {match['score']:.1f}"
+                    + (f" {match['exception_type']}" if match.get("exception_type") else "")
+                )
+
+        if options["json"]:
+            report = {
+                "metadata": metadata,
+                "mode": mode,
+                "backend": backend_used,
+                "objective_summary": summary,
+                "solve_times": solve_times,
+                "result": result._asdict(),
+            }
+            with open(options["json"], "w") as f:
+                json.dump(report, f, indent=2, default=str)
+            self.stdout.write(f"Wrote {options['json']}")
+
+    def _report_spans(self, spans):
+        for record in spans:
+            indent = "  " * (record["depth"] + 1)
+            self.stdout.write(
+                f"{indent}{record['name']}: {record['wall_time']:.3f}s wall, "
+                f"{record['cpu_time']:.3f}s CPU, {record['queries']} queries"
+            )
+
+    def _report_result(self, result, ambiguities):
+        if result.success:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{len(result.matches)} matches, total score {result.total_score:.1f}, "
+                    f"average {result.avg_score:.1f}"
+                )
+            )
+            exceptions = [m["exception_type"] for m in result.matches if m.get("exception_type")]
+            if exceptions:
+                counts = {t: exceptions.count(t) for t in sorted(set(exceptions))}
+                self.stdout.write(f"Exceptions: {counts}")
+            self.stdout.write(f"Ambiguous pairs: {len(ambiguities)}")
+            if getattr(result, "optimal", False):
+                self.stdout.write("Proven optimal")
+        else:
+            report = result.failure_report
+            message = f"Failed: {report.get('reason', 'UNKNOWN')} {report.get('message', '')}"
+            self.stdout.write(self.style.ERROR(message.rstrip()))
+
+        # Search statistics explain a timeout as much as a slow success
+        stats = getattr(result, "solver_stats", {})
+        if stats:
+            self.stdout.write(
+                "CP-SAT: "
+                + ", ".join(f"{key} {stats[key]}" for key in REPORTED_SOLVER_STATS if key in stats)
+            )
@@ -0,0 +1,238 @@
+"""Bulk mentor profile import pipeline.
+
+Rows are read from the uploaded CSV as a stream, validated in fixed-size
+chunks with one participant lookup per chunk, and written with batched
+upserts instead of one ``get_or_create``/``save`` round trip per row.
+"""
+
+import codecs
+import csv
+import logging
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from apps.core.models import Participant
+from apps.matching.models import MentorProfile
+
+logger = logging.getLogger(__name__)
+
+MENTOR_CSV_HEADERS = [
+    "mentor_email",
+    "organization",
+    "job_title",
+    "function",
+    "expertise_tags",
+    "languages",
+    "location",
+    "years_experience",
+    "coaching_topics",
+    "bio",
+]
+
+# Profile columns written by the import (participant is the conflict target)
+PROFILE_FIELDS = [
+    "job_title",
+    "function",
+    "expertise_tags",
+    "languages",
+    "location",
+    "years_experience",
+    "coaching_topics",
+    "bio",
+]
+
+# Rows validated per participant lookup
+IMPORT_CHUNK_SIZE = 1000
+
+# Rows written per INSERT ... ON CONFLICT statement
+UPSERT_BATCH_SIZE = 1000
+
+
+def iter_csv_lines(csv_file, encoding: str = "utf-8") -> Iterator[str]:
+    """Decode an uploaded file line by line without reading it into memory."""
+    if hasattr(csv_file, "seek"):
+        csv_file.seek(0)
+    return codecs.iterdecode(csv_file, encoding)
+
+
+def iter_chunks(iterable: Iterable, chunk_size: int) -> Iterator[List]:
+    """Yield successive lists of at most ``chunk_size`` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_row_fields(row: Dict[str, Any]) -> List[str]:
+    """Validate the fields of a single row that need no database access."""
+    row_errors = []
+
+    # Check required fields
+    email = row.get("mentor_email")
+    if not email:
+        row_errors.append("Email is required")
+    elif not ("@" in email and "." in email):
+        row_errors.append("Invalid email format")
+
+    if not row.get("organization"):
+        row_errors.append("Organization is required")
+
+    # Validate years_experience as integer
+    years_exp = row.get("years_experience")
+    if years_exp:
+        try:
+            int(years_exp)
+        except ValueError:
+            row_errors.append("Years of experience must be a number")
+
+    return row_errors
+
+
+def resolve_mentor_emails(emails: Iterable[str]) -> Dict[str, List[int]]:
+    """
+    Resolve mentor emails to participant IDs with a single ``__in`` query.
+
+    Returns:
+        Mapping of email -> list of matching mentor participant IDs
+    """
+    unique_emails = {email for email in emails if email}
+    resolved: Dict[str, List[int]] = {}
+    if not unique_emails:
+        return resolved
+
+    rows = Participant.objects.filter(
+        user__email__in=unique_emails, role_in_cohort="MENTOR"
+    ).values_list("user__email", "id")
+    for email, participant_id in rows:
+        resolved.setdefault(email, []).append(participant_id)
+
+    return resolved
+
+
+def validate_chunk(
+    chunk: List[Tuple[int, Dict[str, Any]]],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Validate a chunk of ``(row_number, row)`` tuples.
+
+    Valid rows get ``participant_id`` set; invalid rows get ``errors_list`` and
+    ``row_number`` set, matching what the preview template renders.
+
+    Returns:
+        Tuple of (valid_rows, invalid_rows)
+    """
+    resolved = resolve_mentor_emails(row.get("mentor_email") for _, row in chunk)
+
+    valid_rows = []
+    invalid_rows = []
+    for row_num, row in chunk:
+        row_errors = validate_row_fields(row)
+
+        email = row.get("mentor_email") or ""
+        participant_ids = resolved.get(email, [])
+        if not participant_ids:
+            row_errors.append(f"No mentor found with email {email}")
+        elif len(participant_ids) > 1:
+            row_errors.append(f"Multiple mentors found with email {email}")
+        else:
+            row["participant_id"] = participant_ids[0]
+
+        if row_errors:
+            row["errors_list"] = row_errors
+            row["row_number"] = row_num
+            invalid_rows.append(row)
+        else:
+            valid_rows.append(row)
+
+    return valid_rows, invalid_rows
+
+
+def build_profile_values(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a validated CSV row into MentorProfile field values."""
+    years_experience = row.get("years_experience")
+    return {
+        "job_title": row.get("job_title", ""),
+        "function": row.get("function", ""),
+        "expertise_tags": row.get("expertise_tags", ""),
+        "languages": row.get("languages", ""),
+        "location": row.get("location", ""),
+        "years_experience": int(years_experience) if years_experience else None,
+        "coaching_topics": row.get("coaching_topics", ""),
+        "bio": row.get("bio", ""),
+    }
+
+
+def upsert_mentor_profiles(
+    rows: Iterable[Dict[str, Any]], batch_size: int = UPSERT_BATCH_SIZE
+) -> int:
+    """
+    Create or update mentor profiles for validated rows in batches.
+
+    Each batch is a single ``INSERT ... ON CONFLICT (participant_id) DO UPDATE``
+    statement. When a participant appears more than once, the last row wins,
+    as it did with the per-row ``save`` loop.
+
+    Returns:
+        Number of rows imported
+    """
+    imported_count = 0
+    pending: Dict[int, MentorProfile] = {}
+
+    def flush():
+        MentorProfile.objects.bulk_create(
+            list(pending.values()),
+            update_conflicts=True,
+            unique_fields=["participant"],
+            update_fields=PROFILE_FIELDS + ["updated_at"],
+        )
+        pending.clear()
+
+    for row in rows:
+        participant_id = row["participant_id"]
+        if participant_id in pending:
+            # Two rows for one participant in the same statement would conflict
+            flush()
+        pending[participant_id] = MentorProfile(
+            participant_id=participant_id, **build_profile_values(row)
+        )
+        imported_count += 1
+        if len(pending) >= batch_size:
+            flush()
+
+    if pending:
+        flush()
+
+    logger.info(f"Upserted {imported_count} mentor profiles")
+    return imported_count
+
+
+def parse_mentor_csv(
+    csv_file, chunk_size: int = IMPORT_CHUNK_SIZE, skip_rows: int = 0
+) -> Tuple[Optional[str], Iterator[Tuple[List[Dict], List[Dict]]]]:
+    """
+    Stream a mentor CSV and validate it chunk by chunk.
+
+    ``skip_rows`` data rows are read past without validation, so an
+    interrupted import can resume after its last committed chunk.
+
+    Returns:
+        Tuple of (error, chunks). ``error`` is a message when the header row is
+        unusable; otherwise ``chunks`` yields ``(valid_rows, invalid_rows)``
+        per chunk of input rows.
+    """
+    reader = csv.DictReader(iter_csv_lines(csv_file), delimiter=",")
+
+    # Check headers
+    headers = reader.fieldnames
+    if not headers:
+        return "CSV file is empty or invalid", iter(())
+
+    missing_headers = set(MENTOR_CSV_HEADERS) - set(headers)
+    if missing_headers:
+        return f"Missing required headers: {', '.join(missing_headers)}", iter(())
+
+    # Start at 2 because of header row
+    numbered_rows = islice(enumerate(reader, start=2), skip_rows, None)
+    chunks = (validate_chunk(chunk) for chunk in iter_chunks(numbered_rows, chunk_size))
+    return None, chunks
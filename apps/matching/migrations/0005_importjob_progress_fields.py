@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-19 02:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0004_add_match_models'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='created_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='imported_rows',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='invalid_rows',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='is_confirmed',
+            field=models.BooleanField(default=False, help_text='Whether an admin confirmed the import after preview'),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='row_errors',
+            field=models.JSONField(blank=True, default=list, help_text='Sample of invalid rows with their errors'),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='valid_rows',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='processed_rows',
+            field=models.IntegerField(default=0, help_text='Data rows committed so far; resume point after a crash'),
+        ),
+        migrations.AddIndex(
+            model_name='importjob',
+            index=models.Index(fields=['status', 'updated_at'], name='matching_im_status_d10c08_idx'),
+        ),
+    ]
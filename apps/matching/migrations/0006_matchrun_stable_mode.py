@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0005_importjob_progress_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='matchrun',
+            name='mode',
+            field=models.CharField(choices=[('STRICT', 'Strict'), ('EXCEPTION', 'Exception'), ('STABLE', 'Stable')], max_length=10),
+        ),
+    ]
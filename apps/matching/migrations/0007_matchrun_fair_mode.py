@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0006_matchrun_stable_mode'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='matchrun',
+            name='mode',
+            field=models.CharField(choices=[('STRICT', 'Strict'), ('EXCEPTION', 'Exception'), ('STABLE', 'Stable'), ('FAIR', 'Fair')], max_length=10),
+        ),
+    ]
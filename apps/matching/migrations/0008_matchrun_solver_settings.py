@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0007_matchrun_fair_mode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchrun',
+            name='solver_log',
+            field=models.TextField(blank=True, help_text='Captured CP-SAT search log'),
+        ),
+        migrations.AddField(
+            model_name='matchrun',
+            name='solver_settings',
+            field=models.JSONField(blank=True, default=dict, help_text='CP-SAT workers, seed and limits used'),
+        ),
+    ]
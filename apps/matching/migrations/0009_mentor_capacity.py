@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_cohort_cohort_config'),
+        ('matching', '0008_matchrun_solver_settings'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='match',
+            unique_together={('match_run', 'mentee')},
+        ),
+        migrations.AddField(
+            model_name='mentorprofile',
+            name='max_mentees',
+            field=models.PositiveIntegerField(blank=True, help_text='Mentees this mentor can take; blank uses the cohort setting', null=True),
+        ),
+    ]
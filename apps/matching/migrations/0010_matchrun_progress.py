@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0009_mentor_capacity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchrun',
+            name='progress',
+            field=models.JSONField(blank=True, default=dict, help_text='Latest provisional snapshot: objective, bound, gap and elapsed time'),
+        ),
+        migrations.AddField(
+            model_name='matchrun',
+            name='stop_requested',
+            field=models.BooleanField(default=False, help_text='Whether an admin asked a background run to stop early'),
+        ),
+        migrations.AddField(
+            model_name='matchrun',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name='matchrun',
+            name='status',
+            field=models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('SUCCESS', 'Success'), ('FAILED', 'Failed')], max_length=10),
+        ),
+    ]
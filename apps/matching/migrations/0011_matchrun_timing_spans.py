@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0010_matchrun_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchrun',
+            name='timing_spans',
+            field=models.JSONField(blank=True, default=list, help_text='Wall time, CPU time, query count and peak memory per phase'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.1 on 2026-10-19 14:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0011_matchrun_timing_spans'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolverStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mentor_count', models.PositiveIntegerField()),
+                ('mentee_count', models.PositiveIntegerField()),
+                ('status', models.CharField(help_text='CP-SAT status of the last solve', max_length=20)),
+                ('num_solves', models.PositiveIntegerField(default=1, help_text='CP-SAT solves in the run (lexicographic stages, sparse rounds)')),
+                ('num_variables', models.PositiveIntegerField()),
+                ('num_constraints', models.PositiveIntegerField()),
+                ('presolved_booleans', models.PositiveIntegerField(help_text='Boolean variables CP-SAT searched over after its presolve')),
+                ('fixed_booleans', models.PositiveIntegerField(help_text='Boolean variables CP-SAT fixed during presolve and search')),
+                ('num_conflicts', models.BigIntegerField()),
+                ('num_branches', models.BigIntegerField()),
+                ('objective_value', models.FloatField(blank=True, null=True)),
+                ('best_objective_bound', models.FloatField(blank=True, null=True)),
+                ('wall_time', models.FloatField(help_text='Seconds CP-SAT spent searching')),
+                ('user_time', models.FloatField()),
+                ('deterministic_time', models.FloatField()),
+                ('time_limit', models.FloatField(help_text='Configured CP-SAT time limit in seconds')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('match_run', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='solver_stats', to='matching.matchrun')),
+            ],
+            options={
+                'verbose_name_plural': 'Solver Stats',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
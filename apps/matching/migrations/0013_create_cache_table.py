@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-19 18:40
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    # The shared DatabaseCache is written on every participant, preference
+    # and override change, so its table must exist once migrations have run
+    call_command("createcachetable", database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0012_solver_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
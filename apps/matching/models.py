@@ -43,6 +43,9 @@ class MentorProfile(models.Model):
     years_experience = models.IntegerField(null=True, blank=True)
     coaching_topics = models.TextField(blank=True, help_text="Comma-separated topics")
     bio = models.TextField(blank=True)
+    max_mentees = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Mentees this mentor can take; blank uses the cohort setting"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -105,12 +108,29 @@ class ImportJob(models.Model):
     file_path = models.CharField(max_length=500, blank=True)
     error_message = models.TextField(blank=True)
     total_rows = models.IntegerField(default=0)  # type: ignore
-    processed_rows = models.IntegerField(default=0)  # type: ignore
+    processed_rows = models.IntegerField(
+        default=0, help_text="Data rows committed so far; resume point after a crash"
+    )  # type: ignore
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    is_confirmed = models.BooleanField(
+        default=False, help_text="Whether an admin confirmed the import after preview"
+    )
+    valid_rows = models.IntegerField(default=0)  # type: ignore
+    invalid_rows = models.IntegerField(default=0)  # type: ignore
+    imported_rows = models.IntegerField(default=0)  # type: ignore
+    row_errors = models.JSONField(
+        default=list, blank=True, help_text="Sample of invalid rows with their errors"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Import Jobs"
+        indexes = [
+            models.Index(fields=["status", "updated_at"]),
+        ]
 
     def __str__(self):
         return f"Import Job: {self.name} ({self.status})"
@@ -153,9 +173,13 @@ class MatchRun(models.Model):
     MODE_CHOICES = [
         ("STRICT", "Strict"),
         ("EXCEPTION", "Exception"),
+        ("STABLE", "Stable"),
+        ("FAIR", "Fair"),
     ]
 
     STATUS_CHOICES = [
+        ("QUEUED", "Queued"),
+        ("RUNNING", "Running"),
         ("SUCCESS", "Success"),
         ("FAILED", "Failed"),
     ]
@@ -173,7 +197,25 @@ class MatchRun(models.Model):
     input_signature = models.TextField(
         blank=True, help_text="Hash of relevant input for traceability"
     )
+    solver_settings = models.JSONField(
+        default=dict, blank=True, help_text="CP-SAT workers, seed and limits used"
+    )
+    solver_log = models.TextField(blank=True, help_text="Captured CP-SAT search log")
+    timing_spans = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Wall time, CPU time, query count and peak memory per phase",
+    )
+    progress = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Latest provisional snapshot: objective, bound, gap and elapsed time",
+    )
+    stop_requested = models.BooleanField(
+        default=False, help_text="Whether an admin asked a background run to stop early"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Match Runs"
@@ -183,6 +225,62 @@ class MatchRun(models.Model):
         return f"Match Run {self.id} ({self.mode}, {self.status}) - {self.cohort.name}"
 
 
+class SolverStats(models.Model):
+    """CP-SAT search statistics for a match run, for tracking solve difficulty over time."""
+
+    match_run = models.OneToOneField(
+        MatchRun, on_delete=models.CASCADE, related_name="solver_stats"
+    )
+    mentor_count = models.PositiveIntegerField()
+    mentee_count = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, help_text="CP-SAT status of the last solve")
+    num_solves = models.PositiveIntegerField(
+        default=1, help_text="CP-SAT solves in the run (lexicographic stages, sparse rounds)"
+    )
+    num_variables = models.PositiveIntegerField()
+    num_constraints = models.PositiveIntegerField()
+    presolved_booleans = models.PositiveIntegerField(
+        help_text="Boolean variables CP-SAT searched over after its presolve"
+    )
+    fixed_booleans = models.PositiveIntegerField(
+        help_text="Boolean variables CP-SAT fixed during presolve and search"
+    )
+    num_conflicts = models.BigIntegerField()
+    num_branches = models.BigIntegerField()
+    objective_value = models.FloatField(null=True, blank=True)
+    best_objective_bound = models.FloatField(null=True, blank=True)
+    wall_time = models.FloatField(help_text="Seconds CP-SAT spent searching")
+    user_time = models.FloatField()
+    deterministic_time = models.FloatField()
+    time_limit = models.FloatField(help_text="Configured CP-SAT time limit in seconds")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "Solver Stats"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Solver Stats for Match Run {self.match_run_id} ({self.status})"
+
+    @property
+    def cohort_size(self):
+        return self.mentor_count + self.mentee_count
+
+    @property
+    def time_limit_used(self):
+        """Share of the time limit the search took, 0 when there was no limit."""
+        return self.wall_time / self.time_limit if self.time_limit else 0
+
+    @property
+    def relative_gap(self):
+        """Relative distance between the objective and its bound, None without a solution."""
+        if self.objective_value is None or self.best_objective_bound is None:
+            return None
+        return abs(self.best_objective_bound - self.objective_value) / max(
+            abs(self.objective_value), 1
+        )
+
+
 class Match(models.Model):
     """A single mentor-mentee match from a match run."""
 
@@ -208,10 +306,8 @@ class Match(models.Model):
 
     class Meta:
         verbose_name_plural = "Matches"
-        unique_together = (
-            ("match_run", "mentor"),
-            ("match_run", "mentee"),
-        )
+        # Mentors with capacity can have several mentees in a run
+        unique_together = (("match_run", "mentee"),)
 
     def __str__(self):
         return f"{self.mentor.display_name} <-> {self.mentee.display_name} ({self.score_percent}%)"
@@ -1,11 +1,48 @@
 """Manual override functionality for match results."""
 
-from typing import Tuple, Optional
+import logging
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Set, Tuple, Optional
 from django.db import transaction
 from django.contrib.auth.models import User
+from django.utils import timezone
 from apps.core.models import Cohort, Participant
-from apps.matching.models import MatchRun, Match, ActiveMatchRun
-from apps.matching.exceptions import classify_exception
+from apps.matching.data_prep import PreparedInputs, prepare_inputs
+from apps.matching.domain import detect_ambiguity
+from apps.matching.models import MatchRun, Match, ActiveMatchRun, PairScore
+from apps.matching.override_engine import (
+    CohortIndex,
+    build_cohort_index,
+    get_cohort_index,
+    invalidate_match_run_index,
+    store_cohort_index,
+)
+from apps.matching.solvers.repair import RepairSolverResult, solve_repair
+
+logger = logging.getLogger(__name__)
+
+# Overrides and repair assume every mentor has at most one mentee
+SHARED_MENTOR_MESSAGE = "Overrides aren't supported for runs where mentors have several mentees"
+
+# Queued and running runs still rewrite their matches; failed runs have none
+UNFINISHED_RUN_MESSAGE = "Only successful match runs can be overridden"
+
+
+def _get_index_for(match_run: MatchRun, *participants: Participant) -> CohortIndex:
+    """Return the cohort index, recompiling it if it predates a participant."""
+    index = get_cohort_index(match_run)
+    if any(
+        p.cohort_id == match_run.cohort_id and p.id not in index.roles
+        for p in participants
+    ):
+        index = build_cohort_index(match_run)
+        store_cohort_index(match_run, index)
+    return index
+
+
+def _has_shared_mentors(match_run: MatchRun) -> bool:
+    """Whether any mentor in the run was given several mentees."""
+    return (match_run.objective_summary or {}).get("max_mentor_load", 1) > 1
 
 
 def validate_override_pair(
@@ -21,7 +58,7 @@ def validate_override_pair(
         Tuple of (is_valid, error_message)
     """
     # Check that both participants are in the same cohort
-    if mentor.cohort != cohort or mentee.cohort != cohort:
+    if mentor.cohort_id != cohort.id or mentee.cohort_id != cohort.id:
         return False, "Both participants must be in the same cohort"
     
     # Check that mentor is actually a mentor and mentee is actually a mentee
@@ -50,36 +87,16 @@ def get_swap_suggestion(
         Tuple of (existing_mentor, existing_mentee) that would need to be swapped,
         or None if this would create a new pairing without breaking existing ones.
     """
-    # Find existing matches for these participants
-    try:
-        mentor_existing_match = Match.objects.get(
-            match_run=match_run, 
-            mentor=mentor
-        )
-        mentor_current_mentee = mentor_existing_match.mentee
-    except Match.DoesNotExist:
-        mentor_current_mentee = None
-    
-    try:
-        mentee_existing_match = Match.objects.get(
-        match_run=match_run, 
-        mentee=mentee
-    )
-        mentee_current_mentor = mentee_existing_match.mentor
-    except Match.DoesNotExist:
-        mentee_current_mentor = None
-    
-    # If both participants are already matched to each other, no swap needed
-    if mentor_current_mentee == mentee and mentee_current_mentor == mentor:
+    index = _get_index_for(match_run, mentor, mentee)
+    if mentor.id not in index.roles or mentee.id not in index.roles:
         return None
-    
-    # If both have existing matches that are different, suggest a swap
-    if mentor_current_mentee and mentee_current_mentor and mentor_current_mentee != mentee:
-        return (mentee_current_mentor, mentor_current_mentee)
-    
-    # If only one has an existing match, we'd be breaking a pairing
-    # This is allowed but requires explicit confirmation
-    return None
+
+    partners = index.swap_partners(mentor.id, mentee.id)
+    if partners is None:
+        return None
+
+    participants = Participant.objects.in_bulk(partners)
+    return participants[partners[0]], participants[partners[1]]
 
 
 def create_manual_override(
@@ -95,17 +112,20 @@ def create_manual_override(
     Returns:
         Tuple of (success, message, match_object)
     """
+    if match_run.status != "SUCCESS":
+        return False, UNFINISHED_RUN_MESSAGE, None
+    if _has_shared_mentors(match_run):
+        return False, SHARED_MENTOR_MESSAGE, None
+
+    index = _get_index_for(match_run, mentor, mentee)
+
     # Validate the pair
-    is_valid, error_msg = validate_override_pair(mentor, mentee, match_run.cohort, match_run)
+    is_valid, error_msg = index.validate_pair(mentor.id, mentee.id)
     if not is_valid:
         return False, error_msg, None
     
     # Check if this creates an exception
-    exception_type, exception_reason = classify_exception(
-        mentor, mentee, 
-        list(Participant.objects.filter(cohort=match_run.cohort, role_in_cohort="MENTOR")),
-        list(Participant.objects.filter(cohort=match_run.cohort, role_in_cohort="MENTEE"))
-    )
+    exception_type, exception_reason = index.classify(mentor.id, mentee.id)
     
     # If it's an exception, override reason is required
     if exception_type and not override_reason.strip():
@@ -113,41 +133,464 @@ def create_manual_override(
     
     try:
         with transaction.atomic():
-            # Look for existing match with this mentor
-            try:
-                mentor_match = Match.objects.get(match_run=match_run, mentor=mentor)
-                # Update existing match
-                mentor_match.mentee = mentee
-                mentor_match.is_manual_override = True
-                mentor_match.override_reason = override_reason
-                mentor_match.exception_flag = bool(exception_type)
-                mentor_match.exception_type = exception_type
-                mentor_match.exception_reason = exception_reason
-                mentor_match.save()
-                match_obj = mentor_match
-            except Match.DoesNotExist:
-                # Create new match
-                match_obj = Match.objects.create(
-                    match_run=match_run,
-                    mentor=mentor,
-                    mentee=mentee,
-                    score_percent=0,  # Manual overrides don't have computed scores
-                    is_manual_override=True,
-                    override_reason=override_reason,
-                    exception_flag=bool(exception_type),
-                    exception_type=exception_type,
-                    exception_reason=exception_reason,
-                )
-            
-            # Also ensure the mentee isn't matched to someone else
-            Match.objects.filter(match_run=match_run, mentee=mentee).exclude(mentor=mentor).delete()
-            
+            # Free the mentee first so the (match_run, mentee) constraint holds
+            Match.objects.filter(match_run=match_run, mentee=mentee).exclude(
+                mentor=mentor
+            ).delete()
+
+            override_fields = {
+                "mentee": mentee,
+                "is_manual_override": True,
+                "override_reason": override_reason,
+                "exception_flag": bool(exception_type),
+                "exception_type": exception_type,
+                "exception_reason": exception_reason,
+            }
+            match_obj, _ = Match.objects.update_or_create(
+                match_run=match_run,
+                mentor=mentor,
+                defaults=override_fields,
+                # Manual overrides don't have computed scores
+                create_defaults={**override_fields, "score_percent": 0},
+            )
     except Exception as e:
         return False, f"Error creating override: {str(e)}", None
+
+    index.assign(mentor.id, mentee.id, match_obj.id)
+    store_cohort_index(match_run, index)
     
     return True, "Override created successfully", match_obj
 
 
+class BatchOverrideResult(NamedTuple):
+    """Outcome of applying a batch of overrides."""
+
+    success: bool
+    message: str
+    results: List[Dict[str, Any]]  # One entry per requested pair
+    swaps: List[Dict[str, Any]]  # Displaced partners paired with each other
+    unmatched_mentor_ids: List[int]
+    unmatched_mentee_ids: List[int]
+    errors: List[Dict[str, Any]]  # [{"index", "error"}]
+
+
+def apply_batch_overrides(
+    match_run: MatchRun,
+    overrides: Iterable[Tuple[int, int, str]],
+    set_by: User,
+    complete_swaps: bool = True,
+    dry_run: bool = False,
+    manual_mentor_ids: Optional[Iterable[int]] = None,
+) -> BatchOverrideResult:
+    """
+    Validate and apply many (mentor_id, mentee_id, reason) overrides at once.
+
+    The batch must be a partial permutation: no mentor or mentee may appear
+    twice. Each override displaces the mentor's current mentee and the
+    mentee's current mentor. With ``complete_swaps`` those two are paired with
+    each other when neither is claimed by another override, which is the
+    swap ``get_swap_suggestion`` proposes for a single override. Everything is
+    written in one transaction or not at all.
+
+    Only the pairs of ``manual_mentor_ids`` (every override by default) are
+    flagged as manual overrides, which repair keeps pinned. Completed swaps,
+    and overrides outside that set such as the moves of a swap chain, are
+    written as ordinary matches.
+    """
+    overrides = [(int(m), int(t), (reason or "").strip()) for m, t, reason in overrides]
+    index = get_cohort_index(match_run)
+    if any(m not in index.roles or t not in index.roles for m, t, _ in overrides):
+        # The index may predate newly added participants
+        index = build_cohort_index(match_run)
+
+    def failed(message, errors):
+        return BatchOverrideResult(False, message, [], [], [], [], errors)
+
+    if not overrides:
+        return failed("No overrides given", [])
+    if match_run.status != "SUCCESS":
+        return failed(UNFINISHED_RUN_MESSAGE, [])
+    if _has_shared_mentors(match_run):
+        return failed(SHARED_MENTOR_MESSAGE, [])
+
+    errors = []
+    seen_mentors: Dict[int, int] = {}
+    seen_mentees: Dict[int, int] = {}
+    classifications = []
+    for i, (mentor_id, mentee_id, reason) in enumerate(overrides):
+        is_valid, error_msg = index.validate_pair(mentor_id, mentee_id)
+        if not is_valid:
+            errors.append({"index": i, "error": error_msg})
+            classifications.append(None)
+            continue
+
+        if mentor_id in seen_mentors:
+            errors.append(
+                {
+                    "index": i,
+                    "error": f"Mentor already overridden in pair {seen_mentors[mentor_id]}",
+                }
+            )
+        if mentee_id in seen_mentees:
+            errors.append(
+                {
+                    "index": i,
+                    "error": f"Mentee already overridden in pair {seen_mentees[mentee_id]}",
+                }
+            )
+        seen_mentors.setdefault(mentor_id, i)
+        seen_mentees.setdefault(mentee_id, i)
+
+        exception_type, exception_reason = index.classify(mentor_id, mentee_id)
+        if exception_type and not reason:
+            errors.append(
+                {
+                    "index": i,
+                    "error": "Override reason is required when creating an exception match",
+                }
+            )
+        classifications.append((exception_type, exception_reason))
+
+    if errors:
+        return failed(f"{len(errors)} invalid overrides; nothing was applied", errors)
+
+    # Resolve the final assignment
+    final = dict(index.mentor_to_mentee)
+    results = []
+    for (mentor_id, mentee_id, reason), (exception_type, exception_reason) in zip(
+        overrides, classifications
+    ):
+        results.append(
+            {
+                "mentor_id": mentor_id,
+                "mentee_id": mentee_id,
+                "exception_type": exception_type,
+                "exception_reason": exception_reason,
+                "displaced_mentee_id": _other(index.mentor_to_mentee.get(mentor_id), mentee_id),
+                "displaced_mentor_id": _other(index.mentee_to_mentor.get(mentee_id), mentor_id),
+            }
+        )
+
+    owners = dict(index.mentee_to_mentor)
+    for mentor_id, mentee_id, _ in overrides:
+        old_mentee = final.pop(mentor_id, None)
+        if old_mentee is not None:
+            owners.pop(old_mentee, None)
+        old_mentor = owners.pop(mentee_id, None)
+        if old_mentor is not None:
+            final.pop(old_mentor, None)
+        final[mentor_id] = mentee_id
+        owners[mentee_id] = mentor_id
+
+    swaps = []
+    if complete_swaps:
+        for result in results:
+            mentor_id = result["displaced_mentor_id"]
+            mentee_id = result["displaced_mentee_id"]
+            if (
+                mentor_id is not None
+                and mentee_id is not None
+                and mentor_id not in final
+                and mentee_id not in owners
+            ):
+                final[mentor_id] = mentee_id
+                owners[mentee_id] = mentor_id
+                exception_type, exception_reason = index.classify(mentor_id, mentee_id)
+                swaps.append(
+                    {
+                        "mentor_id": mentor_id,
+                        "mentee_id": mentee_id,
+                        "exception_type": exception_type,
+                        "exception_reason": exception_reason,
+                    }
+                )
+
+    unmatched_mentor_ids = sorted(m for m in index.mentor_to_mentee if m not in final)
+    unmatched_mentee_ids = sorted(t for t in index.mentee_to_mentor if t not in owners)
+
+    message = f"{len(results)} overrides and {len(swaps)} swaps"
+    if dry_run:
+        return BatchOverrideResult(
+            True,
+            f"Validated {message}",
+            results,
+            swaps,
+            unmatched_mentor_ids,
+            unmatched_mentee_ids,
+            [],
+        )
+
+    reasons = {mentor_id: reason for mentor_id, _, reason in overrides}
+    for swap in swaps:
+        reasons[swap["mentor_id"]] = "Swapped to accommodate a manual override"
+    if manual_mentor_ids is None:
+        manual = set(reasons) - {swap["mentor_id"] for swap in swaps}
+    else:
+        manual = set(manual_mentor_ids)
+
+    try:
+        with transaction.atomic():
+            _write_assignment(match_run, index, final, reasons, results + swaps, manual)
+    except Exception as e:
+        return failed(f"Error applying overrides: {str(e)}", [])
+
+    # Refresh the assignment maps from what was written
+    index.mentor_to_mentee.clear()
+    index.mentee_to_mentor.clear()
+    index.match_ids.clear()
+    for match_id, mentor_id, mentee_id in Match.objects.filter(
+        match_run=match_run
+    ).values_list("id", "mentor_id", "mentee_id"):
+        index.assign(mentor_id, mentee_id, match_id)
+    store_cohort_index(match_run, index)
+
+    return BatchOverrideResult(
+        True,
+        f"Applied {message}",
+        results,
+        swaps,
+        unmatched_mentor_ids,
+        unmatched_mentee_ids,
+        [],
+    )
+
+
+def _other(participant_id: Optional[int], exclude_id: int) -> Optional[int]:
+    return None if participant_id == exclude_id else participant_id
+
+
+def _write_assignment(
+    match_run: MatchRun,
+    index: CohortIndex,
+    final: Dict[int, int],
+    reasons: Dict[int, str],
+    classified: List[Dict[str, Any]],
+    manual: Set[int],
+) -> None:
+    """
+    Persist a changed assignment with bulk statements.
+
+    New pairs of mentors in ``manual`` are flagged as manual overrides;
+    confirmed pairs keep a flag they already had.
+
+    Pairs that change are deleted and re-inserted rather than updated in
+    place: a swap updated row by row would briefly violate the non-deferrable
+    (match_run, mentee) unique constraint.
+    """
+    exceptions = {
+        item["mentor_id"]: (item["exception_type"], item["exception_reason"])
+        for item in classified
+    }
+
+    changed_mentors = [
+        mentor_id
+        for mentor_id, mentee_id in index.mentor_to_mentee.items()
+        if final.get(mentor_id) != mentee_id
+    ]
+    new_pairs = {
+        mentor_id: mentee_id
+        for mentor_id, mentee_id in final.items()
+        if index.mentor_to_mentee.get(mentor_id) != mentee_id
+    }
+    confirmed = [
+        index.match_ids[mentor_id]
+        for mentor_id in exceptions
+        if mentor_id not in new_pairs and mentor_id in index.match_ids
+    ]
+
+    Match.objects.filter(
+        match_run=match_run, mentor_id__in=changed_mentors
+    ).delete()
+
+    scores = {
+        (mentor_id, mentee_id): score
+        for mentor_id, mentee_id, score in PairScore.objects.filter(
+            cohort_id=match_run.cohort_id, mentor_id__in=list(new_pairs)
+        ).values_list("mentor_id", "mentee_id", "score")
+    }
+    Match.objects.bulk_create(
+        [
+            Match(
+                match_run=match_run,
+                mentor_id=mentor_id,
+                mentee_id=mentee_id,
+                score_percent=int(round(scores.get((mentor_id, mentee_id), 0))),
+                is_manual_override=mentor_id in manual,
+                override_reason=reasons.get(mentor_id, ""),
+                exception_flag=bool(exceptions[mentor_id][0]),
+                exception_type=exceptions[mentor_id][0],
+                exception_reason=exceptions[mentor_id][1],
+            )
+            for mentor_id, mentee_id in new_pairs.items()
+        ]
+    )
+
+    # Overrides that confirm an existing pair only change their flags
+    to_update = list(Match.objects.filter(id__in=confirmed))
+    for match in to_update:
+        exception_type, exception_reason = exceptions[match.mentor_id]
+        match.is_manual_override = match.is_manual_override or match.mentor_id in manual
+        match.override_reason = reasons[match.mentor_id]
+        match.exception_flag = bool(exception_type)
+        match.exception_type = exception_type
+        match.exception_reason = exception_reason
+    Match.objects.bulk_update(
+        to_update,
+        [
+            "is_manual_override",
+            "override_reason",
+            "exception_flag",
+            "exception_type",
+            "exception_reason",
+        ],
+    )
+
+
+def repair_match_run(
+    match_run: MatchRun, set_by: User
+) -> Tuple[bool, str, Dict[str, Any]]:
+    """
+    Re-optimize a match run around its manual overrides.
+
+    Manual override pairs are kept as hard constraints and every other
+    submitted participant is re-matched optimally under the run's mode,
+    which also re-pairs participants orphaned by an override. Pairs the
+    solver keeps are left untouched; only changed pairs are rewritten.
+
+    Returns:
+        Tuple of (success, message, repair_summary or failure_report)
+    """
+    if match_run.status != "SUCCESS":
+        return False, "Only successful match runs can be repaired", {}
+    if _has_shared_mentors(match_run):
+        return False, SHARED_MENTOR_MESSAGE, {}
+
+    start_time = time.time()
+    existing = list(
+        Match.objects.filter(match_run=match_run).values_list(
+            "mentor_id", "mentee_id", "is_manual_override"
+        )
+    )
+    pinned = {mentor_id: mentee_id for mentor_id, mentee_id, manual in existing if manual}
+    current = {mentor_id: mentee_id for mentor_id, mentee_id, _ in existing}
+
+    inputs = prepare_inputs(match_run.cohort)
+    # Only exception runs may contain policy exceptions
+    result = solve_repair(inputs, pinned, current, strict=match_run.mode != "EXCEPTION")
+    if not result.success:
+        reason = result.failure_report.get("reason", "UNKNOWN")
+        return False, f"Repair failed: {reason}", result.failure_report
+
+    new_matches = [
+        m for m in result.matches if current.get(m["mentor_id"]) != m["mentee_id"]
+    ]
+    final = {m["mentor_id"]: m["mentee_id"] for m in result.matches}
+    final.update(pinned)
+    changed_mentors = [
+        mentor_id for mentor_id, mentee_id in current.items() if final.get(mentor_id) != mentee_id
+    ]
+
+    # A pair's ambiguity only depends on its own scores
+    ambiguities = {
+        (amb["participant_id"], amb["matched_with_id"]): amb["reason"]
+        for amb in detect_ambiguity(new_matches, inputs)
+    }
+
+    try:
+        with transaction.atomic():
+            Match.objects.filter(
+                match_run=match_run, mentor_id__in=changed_mentors
+            ).delete()
+            Match.objects.bulk_create(
+                [
+                    Match(
+                        match_run=match_run,
+                        mentor_id=m["mentor_id"],
+                        mentee_id=m["mentee_id"],
+                        score_percent=int(round(m["score"])),
+                        ambiguity_flag=_ambiguity_reason(ambiguities, m) != "",
+                        ambiguity_reason=_ambiguity_reason(ambiguities, m),
+                        exception_flag=m["exception_flag"],
+                        exception_type=m["exception_type"],
+                        exception_reason=m["exception_reason"],
+                    )
+                    for m in new_matches
+                ]
+            )
+            _update_repair_summary(match_run, inputs, pinned, result, set_by, start_time)
+    except Exception as e:
+        return False, f"Error repairing match run: {str(e)}", {}
+
+    invalidate_match_run_index(match_run.id)
+
+    summary = match_run.objective_summary["repair"]
+    logger.info(
+        f"Repaired match run {match_run.id} around {len(pinned)} overrides: "
+        f"{summary['changed_count']} pairs changed in {summary['total_duration']:.2f}s"
+    )
+    return (
+        True,
+        f"Re-optimized {summary['changed_count']} pairs around {len(pinned)} manual overrides",
+        summary,
+    )
+
+
+def _ambiguity_reason(ambiguities: Dict[Tuple[int, int], str], match: Dict[str, Any]) -> str:
+    return ambiguities.get(
+        (match["mentee_id"], match["mentor_id"]),
+        ambiguities.get((match["mentor_id"], match["mentee_id"]), ""),
+    )
+
+
+def _update_repair_summary(
+    match_run: MatchRun,
+    inputs: PreparedInputs,
+    pinned: Dict[int, int],
+    result: RepairSolverResult,
+    set_by: User,
+    start_time: float,
+) -> None:
+    """Recompute the run's totals from the repaired assignment."""
+    score_scale = inputs.config.get("score_scale", 1000)
+    total_score = 0
+    match_count = 0
+    ambiguity_count = 0
+    exception_summary = {"E1": 0, "E2": 0, "E3": 0}
+    for mentor_id, mentee_id, score_percent, exception_type, ambiguous in Match.objects.filter(
+        match_run=match_run
+    ).values_list("mentor_id", "mentee_id", "score_percent", "exception_type", "ambiguity_flag"):
+        scaled = inputs.score.get((mentor_id, mentee_id))
+        total_score += scaled / score_scale if scaled is not None else score_percent
+        match_count += 1
+        ambiguity_count += ambiguous
+        if exception_type in exception_summary:
+            exception_summary[exception_type] += 1
+
+    summary = dict(match_run.objective_summary)
+    summary.update(
+        {
+            "total_score": total_score,
+            "avg_score": total_score / match_count if match_count else 0,
+            "match_count": match_count,
+            "ambiguity_count": ambiguity_count,
+            "exception_count": sum(exception_summary.values()),
+            "exception_summary": exception_summary,
+            "repair": {
+                "pinned_count": len(pinned),
+                "changed_count": result.changed_count,
+                "unmatched_mentor_ids": result.unmatched_mentor_ids,
+                "unmatched_mentee_ids": result.unmatched_mentee_ids,
+                "solve_time": result.solve_time,
+                "total_duration": time.time() - start_time,
+                "repaired_by": set_by.username,
+                "repaired_at": timezone.now().isoformat(),
+            },
+        }
+    )
+    match_run.objective_summary = summary
+    match_run.save(update_fields=["objective_summary"])
+
+
 def set_active_match_run(cohort: Cohort, match_run: MatchRun, set_by: User) -> Tuple[bool, str]:
     """
     Set a match run as the active run for a cohort.
@@ -0,0 +1,247 @@
+"""Compiled cohort index for manual overrides.
+
+``CohortIndex`` holds everything override checks need for one match run:
+participant roles and submission state, integer organization codes,
+preference adjacency bitmaps and the current mentor<->mentee assignment.
+It is built with three queries and cached, so validating, classifying and
+finding swaps for an override are dictionary and bit lookups.
+
+The cache key carries two versions. ``invalidate_cohort_indexes`` bumps a
+per-cohort version whenever participants or preferences change, and
+``invalidate_match_run_index`` bumps a per-run version whenever the run's
+Match rows are rewritten; the override engine stores its own updates under
+a new run version. Versions only reach other processes through a shared
+``CACHES`` backend, which the settings configure.
+"""
+
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from django.core.cache import cache
+from apps.core.models import Participant
+from apps.matching.models import Match, MatchRun, Preference
+
+logger = logging.getLogger(__name__)
+
+# Seconds a compiled index stays cached
+OVERRIDE_INDEX_TIMEOUT = 3600
+
+
+class CohortIndex(NamedTuple):
+    """In-memory view of a match run's cohort."""
+
+    match_run_id: int
+    cohort_id: int
+    roles: Dict[int, str]  # participant_id -> role_in_cohort
+    submitted: Dict[int, bool]  # participant_id -> is_submitted
+    org_codes: Dict[int, int]  # participant_id -> index into org_names
+    org_names: List[str]
+    positions: Dict[int, int]  # participant_id -> bit position within its role
+    accepts: Dict[int, int]  # participant_id -> bitmap of ranked candidates
+    mentor_to_mentee: Dict[int, int]
+    mentee_to_mentor: Dict[int, int]
+    match_ids: Dict[int, int]  # mentor_id -> Match id
+
+    def ranked(self, from_id: int, to_id: int) -> bool:
+        """Whether ``from_id`` ranked ``to_id``."""
+        return bool(self.accepts.get(from_id, 0) >> self.positions[to_id] & 1)
+
+    def validate_pair(self, mentor_id: int, mentee_id: int) -> Tuple[bool, str]:
+        """
+        Validate that a manual override pair is valid.
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        if mentor_id not in self.roles or mentee_id not in self.roles:
+            return False, "Both participants must be in the same cohort"
+
+        if self.roles[mentor_id] != "MENTOR":
+            return False, "First participant must be a mentor"
+
+        if self.roles[mentee_id] != "MENTEE":
+            return False, "Second participant must be a mentee"
+
+        if not self.submitted[mentor_id] or not self.submitted[mentee_id]:
+            return False, "Both participants must have submitted their preferences"
+
+        return True, ""
+
+    def classify(self, mentor_id: int, mentee_id: int) -> Tuple[str, str]:
+        """
+        Classify a pair the same way as ``exceptions.classify_exception``.
+
+        Returns:
+            Tuple of (exception_type, exception_reason)
+        """
+        org_code = self.org_codes[mentor_id]
+        if org_code == self.org_codes[mentee_id]:
+            return "E3", f"Same organization: {self.org_names[org_code]}"
+
+        mentor_ranked = self.ranked(mentor_id, mentee_id)
+        mentee_ranked = self.ranked(mentee_id, mentor_id)
+
+        if not mentor_ranked and not mentee_ranked:
+            return "E2", "Neither participant ranked the other"
+        if not mentor_ranked:
+            return "E1", "Mentor did not rank mentee"
+        if not mentee_ranked:
+            return "E1", "Mentee did not rank mentor"
+
+        return "", "No exception"
+
+    def swap_partners(self, mentor_id: int, mentee_id: int) -> Optional[Tuple[int, int]]:
+        """
+        Find the pairing an override would break.
+
+        Returns:
+            (mentee's current mentor, mentor's current mentee) when both are
+            matched elsewhere, otherwise None
+        """
+        current_mentee = self.mentor_to_mentee.get(mentor_id)
+        current_mentor = self.mentee_to_mentor.get(mentee_id)
+
+        if current_mentee == mentee_id and current_mentor == mentor_id:
+            return None
+        if current_mentee is not None and current_mentor is not None:
+            return current_mentor, current_mentee
+        return None
+
+    def assign(self, mentor_id: int, mentee_id: int, match_id: int) -> None:
+        """Record that ``mentor_id`` is now matched to ``mentee_id``."""
+        old_mentee = self.mentor_to_mentee.pop(mentor_id, None)
+        if old_mentee is not None:
+            self.mentee_to_mentor.pop(old_mentee, None)
+
+        old_mentor = self.mentee_to_mentor.pop(mentee_id, None)
+        if old_mentor is not None:
+            self.mentor_to_mentee.pop(old_mentor, None)
+            self.match_ids.pop(old_mentor, None)
+
+        self.mentor_to_mentee[mentor_id] = mentee_id
+        self.mentee_to_mentor[mentee_id] = mentor_id
+        self.match_ids[mentor_id] = match_id
+
+
+def build_cohort_index(match_run: MatchRun) -> CohortIndex:
+    """Compile the cohort index for a match run (three queries)."""
+    roles = {}
+    submitted = {}
+    org_codes = {}
+    org_lookup: Dict[str, int] = {}
+    positions = {}
+    role_counts = {"MENTOR": 0, "MENTEE": 0}
+
+    participants = Participant.objects.filter(cohort_id=match_run.cohort_id).values_list(
+        "id", "role_in_cohort", "organization", "is_submitted"
+    )
+    for participant_id, role, organization, is_submitted in participants:
+        roles[participant_id] = role
+        submitted[participant_id] = is_submitted
+        org_codes[participant_id] = org_lookup.setdefault(organization, len(org_lookup))
+        positions[participant_id] = role_counts[role]
+        role_counts[role] += 1
+
+    accepts: Dict[int, int] = {}
+    preferences = Preference.objects.filter(
+        from_participant__cohort_id=match_run.cohort_id
+    ).values_list("from_participant_id", "to_participant_id")
+    for from_id, to_id in preferences:
+        if to_id in positions:
+            accepts[from_id] = accepts.get(from_id, 0) | (1 << positions[to_id])
+
+    mentor_to_mentee = {}
+    mentee_to_mentor = {}
+    match_ids = {}
+    for match_id, mentor_id, mentee_id in Match.objects.filter(
+        match_run=match_run
+    ).values_list("id", "mentor_id", "mentee_id"):
+        mentor_to_mentee[mentor_id] = mentee_id
+        mentee_to_mentor[mentee_id] = mentor_id
+        match_ids[mentor_id] = match_id
+
+    return CohortIndex(
+        match_run_id=match_run.id,
+        cohort_id=match_run.cohort_id,
+        roles=roles,
+        submitted=submitted,
+        org_codes=org_codes,
+        org_names=list(org_lookup),
+        positions=positions,
+        accepts=accepts,
+        mentor_to_mentee=mentor_to_mentee,
+        mentee_to_mentor=mentee_to_mentor,
+        match_ids=match_ids,
+    )
+
+
+def _version_key(cohort_id: int) -> str:
+    return f"matching:override-index-version:{cohort_id}"
+
+
+def _match_version_key(match_run_id: int) -> str:
+    return f"matching:override-index-matches:{match_run_id}"
+
+
+def _index_key(match_run: MatchRun, version: int, match_version: int) -> str:
+    created = match_run.created_at.timestamp() if match_run.created_at else 0
+    return f"matching:override-index:{match_run.id}:{created}:{version}:{match_version}"
+
+
+def _current_key(match_run: MatchRun) -> str:
+    version_key = _version_key(match_run.cohort_id)
+    match_version_key = _match_version_key(match_run.id)
+    versions = cache.get_many([version_key, match_version_key])
+    return _index_key(
+        match_run, versions.get(version_key, 0), versions.get(match_version_key, 0)
+    )
+
+
+def get_cohort_index(match_run: MatchRun) -> CohortIndex:
+    """Return the cached index for a match run, compiling it on a miss."""
+    key = _current_key(match_run)
+
+    index = cache.get(key)
+    if index is None:
+        index = build_cohort_index(match_run)
+        cache.set(key, index, OVERRIDE_INDEX_TIMEOUT)
+        logger.info(
+            f"Compiled override index for match run {match_run.id} "
+            f"({len(index.roles)} participants)"
+        )
+    return index
+
+
+def store_cohort_index(match_run: MatchRun, index: CohortIndex) -> None:
+    """Publish an updated index under a new run version."""
+    invalidate_match_run_index(match_run.id)
+    cache.set(_current_key(match_run), index, OVERRIDE_INDEX_TIMEOUT)
+
+
+def invalidate_cohort_indexes(cohort_id: int) -> int:
+    """
+    Make every cached index of a cohort stale.
+
+    Returns:
+        The new cohort version
+    """
+    return _bump_version(_version_key(cohort_id))
+
+
+def invalidate_match_run_index(match_run_id: int) -> int:
+    """
+    Make the cached index of a run stale after its Match rows change.
+
+    Returns:
+        The new run version
+    """
+    return _bump_version(_match_version_key(match_run_id))
+
+
+def _bump_version(key: str) -> int:
+    cache.add(key, 0, None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Evicted between add and incr
+        cache.set(key, 1, None)
+        return 1
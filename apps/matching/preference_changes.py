@@ -0,0 +1,146 @@
+"""Diff-based preference writes and the change sets they produce."""
+
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from django.db import transaction
+from apps.core.models import Participant
+from apps.matching.models import Preference
+from apps.matching.signals import preferences_changed
+
+logger = logging.getLogger(__name__)
+
+
+class PreferenceChangeSet(NamedTuple):
+    """Exact changes made to one participant's ranked preferences."""
+
+    from_participant_id: int
+    inserted: Dict[int, int]  # to_participant_id -> rank
+    updated: Dict[int, Tuple[int, int]]  # to_participant_id -> (old_rank, new_rank)
+    deleted: Dict[int, int]  # to_participant_id -> old rank
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.inserted or self.updated or self.deleted)
+
+    @property
+    def changed_candidate_ids(self) -> List[int]:
+        """Candidates whose preference from this participant changed."""
+        return sorted({*self.inserted, *self.updated, *self.deleted})
+
+
+def diff_preferences(
+    from_participant_id: int, existing: Dict[int, int], desired: Dict[int, int]
+) -> PreferenceChangeSet:
+    """
+    Compare stored ranks with desired ranks.
+
+    Both arguments map to_participant_id -> rank.
+    """
+    inserted = {to_id: rank for to_id, rank in desired.items() if to_id not in existing}
+    updated = {
+        to_id: (existing[to_id], rank)
+        for to_id, rank in desired.items()
+        if to_id in existing and existing[to_id] != rank
+    }
+    deleted = {to_id: rank for to_id, rank in existing.items() if to_id not in desired}
+    return PreferenceChangeSet(from_participant_id, inserted, updated, deleted)
+
+
+def apply_preference_ranks(
+    participant: Participant, desired: Dict[int, int]
+) -> PreferenceChangeSet:
+    """
+    Make the participant's stored preferences equal ``desired``.
+
+    ``desired`` maps to_participant_id -> rank. Only the rows that differ are
+    written: one ``bulk_create``, one ``bulk_update`` and one delete at most.
+    ``preferences_changed`` is sent once the transaction commits.
+
+    Returns:
+        The PreferenceChangeSet that was applied
+    """
+    with transaction.atomic():
+        # Serialize concurrent saves for the same participant
+        Participant.objects.select_for_update().filter(id=participant.id).exists()
+
+        existing_rows = {
+            pref.to_participant_id: pref
+            for pref in Preference.objects.filter(from_participant=participant)
+        }
+        change_set = diff_preferences(
+            participant.id,
+            {to_id: pref.rank for to_id, pref in existing_rows.items()},
+            desired,
+        )
+        if change_set.is_empty:
+            return change_set
+
+        if change_set.deleted:
+            Preference.objects.filter(
+                id__in=[existing_rows[to_id].id for to_id in change_set.deleted]
+            ).delete()
+
+        if change_set.updated:
+            to_update = []
+            for to_id, (_, new_rank) in change_set.updated.items():
+                pref = existing_rows[to_id]
+                pref.rank = new_rank
+                to_update.append(pref)
+            Preference.objects.bulk_update(to_update, ["rank"])
+
+        if change_set.inserted:
+            Preference.objects.bulk_create(
+                [
+                    Preference(
+                        from_participant=participant,
+                        to_participant_id=to_id,
+                        rank=rank,
+                    )
+                    for to_id, rank in change_set.inserted.items()
+                ]
+            )
+
+        logger.info(
+            f"Preferences for participant {participant.id}: "
+            f"{len(change_set.inserted)} inserted, {len(change_set.updated)} updated, "
+            f"{len(change_set.deleted)} deleted"
+        )
+        transaction.on_commit(
+            lambda: preferences_changed.send(
+                sender=Preference,
+                change_set=change_set,
+                cohort_id=participant.cohort_id,
+            )
+        )
+
+    return change_set
+
+
+def set_candidate_rank(
+    participant: Participant, candidate_id: int, rank: Optional[int]
+) -> PreferenceChangeSet:
+    """
+    Move one candidate to ``rank`` in the participant's list, or remove it.
+
+    Candidates at and below the target position shift down by one and the
+    list stays numbered 1..n. Ranks past the end append the candidate.
+
+    Returns:
+        The PreferenceChangeSet that was applied
+    """
+    with transaction.atomic():
+        Participant.objects.select_for_update().filter(id=participant.id).exists()
+
+        order = [
+            to_id
+            for to_id in Preference.objects.filter(from_participant=participant)
+            .order_by("rank", "to_participant_id")
+            .values_list("to_participant_id", flat=True)
+            if to_id != candidate_id
+        ]
+        if rank is not None:
+            order.insert(min(rank, len(order) + 1) - 1, candidate_id)
+
+        return apply_preference_ranks(
+            participant, {to_id: i for i, to_id in enumerate(order, start=1)}
+        )
@@ -0,0 +1,417 @@
+"""Bulk preference import from CSV or JSONL.
+
+Each file row is one ranked preference (``from_email``, ``to_email``,
+``rank``) within a cohort. Every participant that appears as ``from_email``
+has their preference list replaced by the rows in the file. Ranks are
+normalized the same way ``PreferencesForm.save`` does.
+
+Participants are resolved with chunked ``__in`` queries. On PostgreSQL the
+rows are loaded with ``COPY`` into a temporary staging table and merged into
+``Preference`` in one statement. Other backends use batched ORM writes.
+"""
+
+import csv
+import io
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from django.db import connection, transaction
+from apps.core.models import Cohort, Participant
+from apps.matching.domain import normalize_ranks
+from apps.matching.mentor_import import IMPORT_CHUNK_SIZE, iter_chunks, iter_csv_lines
+from apps.matching.models import Preference
+from apps.matching.override_engine import invalidate_cohort_indexes
+
+logger = logging.getLogger(__name__)
+
+PREFERENCE_IMPORT_FIELDS = ["from_email", "to_email", "rank"]
+
+PREFERENCE_IMPORT_FORMATS = ("csv", "jsonl")
+
+# Rows written per statement by the non-PostgreSQL loader
+PREFERENCE_BATCH_SIZE = 1000
+
+# Row errors reported back to the caller
+MAX_REPORTED_ERRORS = 500
+
+OPPOSITE_ROLE = {"MENTOR": "MENTEE", "MENTEE": "MENTOR"}
+
+
+class PreferenceImportResult(NamedTuple):
+    """Outcome of a bulk preference import."""
+
+    success: bool
+    message: str
+    total_rows: int
+    participant_count: int
+    preference_count: int
+    renumbered_participants: List[int]  # IDs whose duplicate ranks were renumbered
+    errors: List[Dict[str, Any]]  # [{"row_number", "errors"}], capped
+    error_count: int
+    deleted: int
+    inserted: int
+    updated: int
+
+
+def detect_import_format(filename: str) -> Optional[str]:
+    """Infer the import format from a file name."""
+    lowered = filename.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def iter_preference_records(
+    preference_file, file_format: str
+) -> Tuple[Optional[str], Iterator[Tuple[int, Dict[str, Any]]]]:
+    """
+    Stream ``(row_number, record)`` pairs from a CSV or JSONL file.
+
+    Returns:
+        Tuple of (error, records). ``error`` is a message when the file header
+        is unusable.
+    """
+    lines = iter_csv_lines(preference_file)
+
+    if file_format == "csv":
+        reader = csv.DictReader(lines)
+        if not reader.fieldnames:
+            return "CSV file is empty or invalid", iter(())
+        missing_headers = [f for f in PREFERENCE_IMPORT_FIELDS if f not in reader.fieldnames]
+        if missing_headers:
+            return f"Missing required headers: {', '.join(missing_headers)}", iter(())
+        # Start at 2 because of header row
+        return None, enumerate(reader, start=2)
+
+    if file_format == "jsonl":
+        return None, _iter_jsonl_records(lines)
+
+    return f"Unsupported format: {file_format}", iter(())
+
+
+def _iter_jsonl_records(lines: Iterable[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Parse JSON Lines, passing undecodable lines through as error records."""
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            record = {"_error": f"Invalid JSON: {e}"}
+        if not isinstance(record, dict):
+            record = {"_error": "Each line must be a JSON object"}
+        yield line_number, record
+
+
+def _parse_rank(value: Any) -> Optional[int]:
+    """Return a positive integer rank, or None when the value is not one."""
+    if isinstance(value, bool):
+        return None
+    try:
+        rank = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return rank if rank >= 1 else None
+
+
+def resolve_cohort_emails(
+    cohort: Cohort, emails: Iterable[str]
+) -> Dict[str, List[Tuple[int, str]]]:
+    """
+    Resolve emails to cohort participants with chunked ``__in`` queries.
+
+    Returns:
+        Mapping of email -> list of (participant_id, role_in_cohort)
+    """
+    resolved: Dict[str, List[Tuple[int, str]]] = {}
+    unique_emails = sorted({email for email in emails if email})
+    for chunk in iter_chunks(unique_emails, IMPORT_CHUNK_SIZE):
+        rows = Participant.objects.filter(
+            cohort=cohort, user__email__in=chunk
+        ).values_list("user__email", "id", "role_in_cohort")
+        for email, participant_id, role in rows:
+            resolved.setdefault(email, []).append((participant_id, role))
+    return resolved
+
+
+def validate_preference_records(
+    cohort: Cohort, records: Iterable[Tuple[int, Dict[str, Any]]]
+) -> Tuple[Dict[int, List[Tuple[int, int]]], List[Dict[str, Any]], int]:
+    """
+    Validate records against the cohort.
+
+    Returns:
+        Tuple of (ranks_by_participant, errors, total_rows) where
+        ``ranks_by_participant`` maps from_participant_id -> [(rank, to_id)]
+    """
+    rows = []
+    emails = set()
+    for row_number, record in records:
+        from_email = str(record.get("from_email") or "").strip()
+        to_email = str(record.get("to_email") or "").strip()
+        rows.append((row_number, record, from_email, to_email))
+        emails.update((from_email, to_email))
+
+    resolved = resolve_cohort_emails(cohort, emails)
+
+    def lookup(email: str, label: str, row_errors: List[str]):
+        if not email:
+            row_errors.append(f"{label} is required")
+            return None
+        matches = resolved.get(email, [])
+        if not matches:
+            row_errors.append(f"No participant found in cohort with email {email}")
+            return None
+        if len(matches) > 1:
+            row_errors.append(f"Multiple participants found with email {email}")
+            return None
+        return matches[0]
+
+    ranks_by_participant: Dict[int, List[Tuple[int, int]]] = {}
+    seen_pairs = set()
+    errors = []
+    for row_number, record, from_email, to_email in rows:
+        row_errors = []
+        if "_error" in record:
+            errors.append({"row_number": row_number, "errors": [record["_error"]]})
+            continue
+
+        source = lookup(from_email, "from_email", row_errors)
+        target = lookup(to_email, "to_email", row_errors)
+
+        rank = _parse_rank(record.get("rank"))
+        if rank is None:
+            row_errors.append("Rank must be a positive integer")
+
+        if source and target:
+            if OPPOSITE_ROLE.get(source[1]) != target[1]:
+                row_errors.append(
+                    f"{from_email} ({source[1].lower()}) cannot rank "
+                    f"{to_email} ({target[1].lower()})"
+                )
+            elif (source[0], target[0]) in seen_pairs:
+                row_errors.append(f"Duplicate preference for {from_email} -> {to_email}")
+
+        if row_errors:
+            errors.append({"row_number": row_number, "errors": row_errors})
+            continue
+
+        seen_pairs.add((source[0], target[0]))
+        ranks_by_participant.setdefault(source[0], []).append((rank, target[0]))
+
+    return ranks_by_participant, errors, len(rows)
+
+
+def build_preference_rows(
+    ranks_by_participant: Dict[int, List[Tuple[int, int]]],
+) -> Tuple[List[Tuple[int, int, int]], List[int]]:
+    """
+    Normalize each participant's ranks.
+
+    Returns:
+        Tuple of (rows, renumbered_participants) where rows are
+        (from_participant_id, to_participant_id, rank)
+    """
+    rows = []
+    renumbered = []
+    for from_id, ranks_data in ranks_by_participant.items():
+        duplicate_warning, normalized_ranks = normalize_ranks(ranks_data)
+        if duplicate_warning:
+            renumbered.append(from_id)
+        rows.extend((from_id, to_id, rank) for rank, to_id in normalized_ranks.items())
+    return rows, renumbered
+
+
+def load_preferences(
+    rows: List[Tuple[int, int, int]], from_participant_ids: Iterable[int]
+) -> Dict[str, int]:
+    """
+    Replace the preference lists of ``from_participant_ids`` with ``rows``.
+
+    Rows that already exist with the same rank are left untouched.
+
+    Returns:
+        Dict with ``deleted``, ``inserted`` and ``updated`` counts
+    """
+    from_participant_ids = list(from_participant_ids)
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            return _load_with_copy(rows)
+        return _load_with_orm(rows, from_participant_ids)
+
+
+def _copy_rows(cursor, sql: str, rows: List[Tuple[int, int, int]]) -> None:
+    """Stream rows to ``COPY ... FROM STDIN`` on psycopg2 or psycopg 3."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, "copy_expert"):
+        raw_cursor.copy_expert(sql, buffer)
+    else:
+        with raw_cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def _load_with_copy(rows: List[Tuple[int, int, int]]) -> Dict[str, int]:
+    """COPY rows into a staging table, then merge them in one statement."""
+    table = connection.ops.quote_name(Preference._meta.db_table)
+
+    with connection.cursor() as cursor:
+        # The table lives until the outer transaction commits, so a second
+        # import in the same transaction reuses it and clears the last rows
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS preference_import_staging ("
+            " from_participant_id bigint NOT NULL,"
+            " to_participant_id bigint NOT NULL,"
+            " rank integer NOT NULL"
+            ") ON COMMIT DROP"
+        )
+        cursor.execute("TRUNCATE preference_import_staging")
+        _copy_rows(
+            cursor,
+            "COPY preference_import_staging (from_participant_id, to_participant_id, rank) "
+            "FROM STDIN WITH (FORMAT csv)",
+            rows,
+        )
+        # The DELETE and the upsert touch disjoint rows, so they can share
+        # one snapshot
+        cursor.execute(
+            f"""
+            WITH deleted AS (
+                DELETE FROM {table} p
+                WHERE p.from_participant_id IN (
+                    SELECT DISTINCT from_participant_id FROM preference_import_staging
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM preference_import_staging s
+                    WHERE s.from_participant_id = p.from_participant_id
+                    AND s.to_participant_id = p.to_participant_id
+                )
+                RETURNING 1
+            ),
+            merged AS (
+                INSERT INTO {table} (from_participant_id, to_participant_id, rank)
+                SELECT from_participant_id, to_participant_id, rank
+                FROM preference_import_staging
+                ON CONFLICT (from_participant_id, to_participant_id)
+                DO UPDATE SET rank = EXCLUDED.rank
+                WHERE {table}.rank IS DISTINCT FROM EXCLUDED.rank
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                (SELECT COUNT(*) FROM deleted),
+                (SELECT COUNT(*) FROM merged WHERE inserted),
+                (SELECT COUNT(*) FROM merged WHERE NOT inserted)
+            """
+        )
+        deleted, inserted, updated = cursor.fetchone()
+
+    return {"deleted": deleted, "inserted": inserted, "updated": updated}
+
+
+def _load_with_orm(
+    rows: List[Tuple[int, int, int]], from_participant_ids: List[int]
+) -> Dict[str, int]:
+    """Apply the same merge with batched ORM statements."""
+    incoming = {(from_id, to_id): rank for from_id, to_id, rank in rows}
+
+    existing = {}
+    for chunk in iter_chunks(from_participant_ids, IMPORT_CHUNK_SIZE):
+        for pref in Preference.objects.filter(from_participant_id__in=chunk):
+            existing[(pref.from_participant_id, pref.to_participant_id)] = pref
+
+    stale_ids = [pref.id for key, pref in existing.items() if key not in incoming]
+    to_update = []
+    to_create = []
+    for (from_id, to_id), rank in incoming.items():
+        pref = existing.get((from_id, to_id))
+        if pref is None:
+            to_create.append(
+                Preference(from_participant_id=from_id, to_participant_id=to_id, rank=rank)
+            )
+        elif pref.rank != rank:
+            pref.rank = rank
+            to_update.append(pref)
+
+    for chunk in iter_chunks(stale_ids, PREFERENCE_BATCH_SIZE):
+        Preference.objects.filter(id__in=chunk).delete()
+    Preference.objects.bulk_update(to_update, ["rank"], batch_size=PREFERENCE_BATCH_SIZE)
+    Preference.objects.bulk_create(to_create, batch_size=PREFERENCE_BATCH_SIZE)
+
+    return {"deleted": len(stale_ids), "inserted": len(to_create), "updated": len(to_update)}
+
+
+def import_preferences(
+    cohort: Cohort, preference_file, file_format: str, dry_run: bool = False
+) -> PreferenceImportResult:
+    """
+    Validate and load a preference file for a cohort.
+
+    The import is all-or-nothing: any invalid row aborts it before writing.
+    """
+
+    def failed(message, errors=(), error_count=0, total_rows=0):
+        return PreferenceImportResult(
+            success=False,
+            message=message,
+            total_rows=total_rows,
+            participant_count=0,
+            preference_count=0,
+            renumbered_participants=[],
+            errors=list(errors)[:MAX_REPORTED_ERRORS],
+            error_count=error_count,
+            deleted=0,
+            inserted=0,
+            updated=0,
+        )
+
+    error, records = iter_preference_records(preference_file, file_format)
+    if error:
+        return failed(error)
+
+    ranks_by_participant, errors, total_rows = validate_preference_records(
+        cohort, records
+    )
+    if errors:
+        return failed(
+            f"{len(errors)} invalid rows; nothing was imported",
+            errors,
+            len(errors),
+            total_rows,
+        )
+    if not ranks_by_participant:
+        return failed("File contains no preferences")
+
+    rows, renumbered = build_preference_rows(ranks_by_participant)
+
+    counts = {"deleted": 0, "inserted": 0, "updated": 0}
+    if not dry_run:
+        counts = load_preferences(rows, ranks_by_participant.keys())
+        invalidate_cohort_indexes(cohort.id)
+        logger.info(
+            f"Imported {len(rows)} preferences for {len(ranks_by_participant)} "
+            f"participants in cohort {cohort.id}: {counts}"
+        )
+
+    verb = "Validated" if dry_run else "Imported"
+    return PreferenceImportResult(
+        success=True,
+        message=(
+            f"{verb} {len(rows)} preferences for "
+            f"{len(ranks_by_participant)} participants"
+        ),
+        total_rows=total_rows,
+        participant_count=len(ranks_by_participant),
+        preference_count=len(rows),
+        renumbered_participants=renumbered,
+        errors=[],
+        error_count=0,
+        deleted=counts["deleted"],
+        inserted=counts["inserted"],
+        updated=counts["updated"],
+    )
@@ -0,0 +1,328 @@
+"""Presolve layer - shrinks a perfect-matching problem before it is solved.
+
+Every mentor must be matched to exactly one allowed mentee and vice versa, so
+two reductions never change the optimum:
+
+* Forced assignments: a participant with a single allowed partner must take
+  it. The pair is fixed and both participants leave the problem, which can
+  force further participants in turn.
+* Dulmage-Mendelsohn elimination: a pair that lies in no perfect matching can
+  never be chosen. Given one perfect matching, an unmatched pair (u, v) lies
+  in some perfect matching exactly when u and v's current mentor sit in the
+  same strongly connected component of the alternating graph.
+
+These are pure functions that operate only on in-memory data.
+"""
+
+import time
+import logging
+from collections import deque
+from typing import Dict, List, Any, NamedTuple, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PresolveResult(NamedTuple):
+    """Result of presolving a perfect-matching problem."""
+
+    feasible: bool  # False when presolve proved no perfect matching exists
+    forced_pairs: List[Tuple[int, int]]  # (mentor_id, mentee_id) pairs fixed by presolve
+    mentor_ids: List[int]  # Mentors left for the solver
+    mentee_ids: List[int]  # Mentees left for the solver
+    allowed: Dict[int, List[int]]  # mentor_id -> mentee ids still allowed
+    stats: Dict[str, Any]
+
+
+def presolve_assignment(
+    mentor_ids: List[int], mentee_ids: List[int], allowed: Dict[int, List[int]]
+) -> PresolveResult:
+    """
+    Fix forced assignments and drop pairs that fit in no perfect matching.
+
+    ``allowed`` maps every mentor to the mentees it may be matched with. Forced
+    assignments are applied until none remain, then pairs outside every perfect
+    matching are eliminated, and forced assignments are applied once more since
+    elimination can leave participants with a single option.
+
+    Returns:
+        PresolveResult with the reduced problem and shrink statistics
+    """
+    start_time = time.time()
+    allowed = {m: list(allowed.get(m, [])) for m in mentor_ids}
+    original_pairs = sum(len(mentees) for mentees in allowed.values())
+    stats = {
+        "original_mentors": len(mentor_ids),
+        "original_mentees": len(mentee_ids),
+        "original_pairs": original_pairs,
+    }
+
+    forced_pairs, mentors, mentees, feasible = _fix_forced(mentor_ids, mentee_ids, allowed)
+
+    eliminated = 0
+    if feasible and mentors:
+        eliminated, feasible = _eliminate_unmatchable(mentors, mentees, allowed)
+        if feasible and eliminated:
+            more_forced, mentors, mentees, feasible = _fix_forced(mentors, mentees, allowed)
+            forced_pairs += more_forced
+
+    remaining_pairs = sum(len(allowed[m]) for m in mentors)
+    stats.update(
+        {
+            "forced_count": len(forced_pairs),
+            "eliminated_pairs": eliminated,
+            "remaining_mentors": len(mentors),
+            "remaining_mentees": len(mentees),
+            "remaining_pairs": remaining_pairs,
+            "presolve_time": time.time() - start_time,
+        }
+    )
+
+    logger.info(
+        f"Presolve {'reduced' if feasible else 'proved infeasible'}: "
+        f"{len(forced_pairs)} forced, {eliminated} pairs eliminated, "
+        f"{len(mentors)} mentors and {remaining_pairs} pairs left of "
+        f"{len(mentor_ids)} and {original_pairs}"
+    )
+
+    return PresolveResult(
+        feasible=feasible,
+        forced_pairs=forced_pairs,
+        mentor_ids=mentors,
+        mentee_ids=mentees,
+        allowed={m: allowed[m] for m in mentors},
+        stats=stats,
+    )
+
+
+def _fix_forced(
+    mentor_ids: List[int], mentee_ids: List[int], allowed: Dict[int, List[int]]
+) -> Tuple[List[Tuple[int, int]], List[int], List[int], bool]:
+    """
+    Repeatedly fix participants with exactly one allowed partner.
+
+    ``allowed`` is pruned in place.
+
+    Returns:
+        Tuple of (forced pairs, remaining mentors, remaining mentees, feasible)
+    """
+    mentor_options = {m: set(allowed[m]) for m in mentor_ids}
+    mentee_options = {t: set() for t in mentee_ids}
+    for mentor_id, mentees in mentor_options.items():
+        for mentee_id in mentees:
+            mentee_options[mentee_id].add(mentor_id)
+
+    if any(not options for options in mentor_options.values()) or any(
+        not options for options in mentee_options.values()
+    ):
+        return [], list(mentor_ids), list(mentee_ids), False
+
+    queue = deque(("MENTOR", m) for m, options in mentor_options.items() if len(options) == 1)
+    queue.extend(("MENTEE", t) for t, options in mentee_options.items() if len(options) == 1)
+    forced_pairs = []
+
+    while queue:
+        side, participant_id = queue.popleft()
+        if side == "MENTOR":
+            if participant_id not in mentor_options:
+                continue
+            (mentee_id,) = mentor_options[participant_id]
+            mentor_id = participant_id
+        else:
+            if participant_id not in mentee_options:
+                continue
+            (mentor_id,) = mentee_options[participant_id]
+            mentee_id = participant_id
+
+        forced_pairs.append((mentor_id, mentee_id))
+        # Everyone who could have taken either participant loses that option
+        for other in mentee_options.pop(mentee_id):
+            if other != mentor_id:
+                options = mentor_options[other]
+                options.discard(mentee_id)
+                if not options:
+                    return forced_pairs, [], [], False
+                if len(options) == 1:
+                    queue.append(("MENTOR", other))
+        for other in mentor_options.pop(mentor_id):
+            if other != mentee_id:
+                options = mentee_options[other]
+                options.discard(mentor_id)
+                if not options:
+                    return forced_pairs, [], [], False
+                if len(options) == 1:
+                    queue.append(("MENTEE", other))
+
+    mentors = [m for m in mentor_ids if m in mentor_options]
+    mentees = [t for t in mentee_ids if t in mentee_options]
+    for mentor_id in mentors:
+        allowed[mentor_id] = [t for t in allowed[mentor_id] if t in mentor_options[mentor_id]]
+    return forced_pairs, mentors, mentees, True
+
+
+def _eliminate_unmatchable(
+    mentor_ids: List[int], mentee_ids: List[int], allowed: Dict[int, List[int]]
+) -> Tuple[int, bool]:
+    """
+    Drop the pairs that lie in no perfect matching.
+
+    ``allowed`` is pruned in place.
+
+    Returns:
+        Tuple of (pairs eliminated, whether a perfect matching exists)
+    """
+    n = len(mentor_ids)
+    if len(mentee_ids) != n:
+        return 0, False
+    mentee_index_map = {t: j for j, t in enumerate(mentee_ids)}
+    adj = [[mentee_index_map[t] for t in allowed[m]] for m in mentor_ids]
+
+    match_l = [-1] * n
+    match_r = [-1] * n
+    if maximum_matching(adj, [len(row) for row in adj], match_l, match_r) < n:
+        return 0, False
+
+    # Alternating graph on mentors: u -> the current mentor of any mentee u
+    # could switch to
+    successors = [
+        [match_r[v] for v in row if v != match_l[u]] for u, row in enumerate(adj)
+    ]
+    component = _strongly_connected_components(successors)
+
+    eliminated = 0
+    for u, mentor_id in enumerate(mentor_ids):
+        kept = [
+            mentee_ids[v]
+            for v in adj[u]
+            if v == match_l[u] or component[match_r[v]] == component[u]
+        ]
+        eliminated += len(adj[u]) - len(kept)
+        allowed[mentor_id] = kept
+    return eliminated, True
+
+
+def _strongly_connected_components(successors: List[List[int]]) -> List[int]:
+    """
+    Label the strongly connected components of a directed graph (Tarjan).
+
+    Returns:
+        Component label of every vertex
+    """
+    n = len(successors)
+    index = [-1] * n
+    low = [0] * n
+    component = [-1] * n
+    on_stack = [False] * n
+    stack = []
+    counter = 0
+    labels = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            u, k = work[-1]
+            if k < len(successors[u]):
+                work[-1] = (u, k + 1)
+                w = successors[u][k]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w] and index[w] < low[u]:
+                    low[u] = index[w]
+                continue
+
+            work.pop()
+            if work and low[u] < low[work[-1][0]]:
+                low[work[-1][0]] = low[u]
+            if low[u] == index[u]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = labels
+                    if w == u:
+                        break
+                labels += 1
+
+    return component
+
+
+def maximum_matching(
+    adj: List[List[int]], cut: List[int], match_l: List[int], match_r: List[int]
+) -> int:
+    """
+    Grow a bipartite matching to maximum size with Hopcroft-Karp.
+
+    Left vertex ``i`` may use ``adj[i][:cut[i]]``. ``match_l``/``match_r``
+    hold the starting matching and are updated in place.
+
+    Returns:
+        Size of the maximum matching
+    """
+    n_left = len(adj)
+    unreached = n_left + 1
+
+    while True:
+        # Layer the graph from the free left vertices
+        dist = [unreached] * n_left
+        queue = deque()
+        for u in range(n_left):
+            if match_l[u] == -1:
+                dist[u] = 0
+                queue.append(u)
+        found = False
+        while queue:
+            u = queue.popleft()
+            row = adj[u]
+            for k in range(cut[u]):
+                w = match_r[row[k]]
+                if w == -1:
+                    found = True
+                elif dist[w] == unreached:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        if not found:
+            break
+
+        # Vertex-disjoint shortest augmenting paths, searched iteratively
+        pointer = [0] * n_left
+        for root in range(n_left):
+            if match_l[root] != -1:
+                continue
+            stack = [root]
+            path = []
+            while stack:
+                u = stack[-1]
+                row = adj[u]
+                advanced = False
+                while pointer[u] < cut[u]:
+                    v = row[pointer[u]]
+                    pointer[u] += 1
+                    w = match_r[v]
+                    if w == -1:
+                        path.append(v)
+                        for uu, vv in zip(stack, path):
+                            match_l[uu] = vv
+                            match_r[vv] = uu
+                        stack = []
+                        advanced = True
+                        break
+                    if dist[w] == dist[u] + 1:
+                        path.append(v)
+                        stack.append(w)
+                        advanced = True
+                        break
+                if not advanced:
+                    dist[u] = unreached  # Dead end for this phase
+                    stack.pop()
+                    if path:
+                        path.pop()
+
+    return sum(1 for v in match_l if v != -1)
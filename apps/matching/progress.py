@@ -0,0 +1,77 @@
+"""Progress feed for background matching runs.
+
+A small publish/subscribe channel over ``MatchRun.progress``. The worker
+publishes by merging fields into the run's progress and bumping its ``seq``
+counter; subscribers read the row from the database and yield each state
+they haven't seen yet. Nothing besides the database is shared, so the
+worker and the web processes can live on different hosts.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+from apps.matching.models import MatchRun
+
+logger = logging.getLogger(__name__)
+
+# Phases a background run reports, in order
+PROGRESS_PHASES = ("QUEUED", "PREPARE", "PRESOLVE", "BUILD", "SOLVE", "PERSIST", "DONE")
+
+# Seconds between database reads by a subscriber
+SUBSCRIBE_POLL_INTERVAL = 0.5
+
+# Seconds without news before a subscriber yields a keep-alive
+KEEPALIVE_SECONDS = 15
+
+FINISHED_STATUSES = ("SUCCESS", "FAILED")
+
+
+def publish_progress(match_run: MatchRun, **fields: Any) -> None:
+    """Merge fields into a run's progress and publish the new state."""
+    match_run.progress.update(fields)
+    match_run.progress["seq"] = match_run.progress.get("seq", 0) + 1
+    match_run.save(update_fields=["progress", "updated_at"])
+
+
+def get_progress_state(match_run: MatchRun) -> Dict[str, Any]:
+    """A run's current progress state, as subscribers receive it."""
+    return {**(match_run.progress or {}), "status": match_run.status}
+
+
+async def subscribe_progress(match_run_id: int) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Yield each new progress state of a run until it finishes.
+
+    States carry the run's status next to its progress fields. ``None`` is
+    yielded after KEEPALIVE_SECONDS without a new state, so a stream can
+    keep its connection alive.
+    """
+    last_seq = None
+    last_sent = time.monotonic()
+    while True:
+        row = await MatchRun.objects.filter(id=match_run_id).values("status", "progress").afirst()
+        if row is None:
+            return
+
+        progress = row["progress"] or {}
+        finished = row["status"] in FINISHED_STATUSES
+        if progress.get("seq") != last_seq or finished:
+            last_seq = progress.get("seq")
+            last_sent = time.monotonic()
+            yield {**progress, "status": row["status"]}
+        elif time.monotonic() - last_sent >= KEEPALIVE_SECONDS:
+            last_sent = time.monotonic()
+            yield None
+
+        if finished:
+            return
+        await asyncio.sleep(SUBSCRIBE_POLL_INTERVAL)
+
+
+def format_event(state: Optional[Dict[str, Any]]) -> str:
+    """Encode a progress state, or a keep-alive for ``None``, as a server-sent event."""
+    if state is None:
+        return ": keep-alive\n\n"
+    return f"id: {state.get('seq', 0)}\nevent: progress\ndata: {json.dumps(state)}\n\n"
@@ -61,50 +61,48 @@ def check_missing_submissions(cohort: Cohort) -> Tuple[bool, str]:
     return True, "All participants have submitted preferences"
 
 
+def get_mutual_option_counts(cohort: Cohort) -> List[Tuple[Participant, int]]:
+    """
+    Count each participant's mutual cross-org options.
+
+    An option is an opposite-role participant from another organization
+    where both have ranked each other. Loads the cohort's participants and
+    preferences in two queries.
+
+    Returns:
+        List of (participant, mutual option count) in participant order
+    """
+    participants = list(Participant.objects.filter(cohort=cohort))
+    by_id = {participant.id: participant for participant in participants}
+    ranked = set(
+        Preference.objects.filter(
+            from_participant__cohort=cohort, to_participant__cohort=cohort
+        ).values_list("from_participant_id", "to_participant_id")
+    )
+
+    mutual_counts = {participant.id: 0 for participant in participants}
+    for from_id, to_id in ranked:
+        if from_id < to_id and (to_id, from_id) in ranked:
+            first, second = by_id[from_id], by_id[to_id]
+            if (
+                first.role_in_cohort != second.role_in_cohort
+                and first.organization != second.organization
+            ):
+                mutual_counts[from_id] += 1
+                mutual_counts[to_id] += 1
+
+    return [(participant, mutual_counts[participant.id]) for participant in participants]
+
+
 def check_mutual_acceptability(cohort: Cohort) -> Tuple[bool, str]:
     """Check if all participants have mutual acceptability with sufficient options."""
     config = get_cohort_config(cohort)
     min_options = config["min_options_strict"]
 
-    # Get all participants
-    participants = Participant.objects.filter(cohort=cohort)
-
     # For each participant, count how many cross-org options they have
     problematic_participants = []
 
-    for participant in participants:
-        if participant.role_in_cohort == "MENTOR":
-            opposite_role = "MENTEE"
-        else:
-            opposite_role = "MENTOR"
-
-        # Count cross-org candidates (excluding same org)
-        cross_org_candidates = Participant.objects.filter(
-            cohort=cohort, role_in_cohort=opposite_role
-        ).exclude(organization=participant.organization)
-
-        # Count how many of these candidates have mutual preferences
-        mutual_count = 0
-        for candidate in cross_org_candidates:
-            # Check if both participants have preferences for each other
-            mentor_participant = (
-                participant if participant.role_in_cohort == "MENTOR" else candidate
-            )
-            mentee_participant = (
-                candidate if participant.role_in_cohort == "MENTOR" else participant
-            )
-
-            has_mentor_preference = Preference.objects.filter(
-                from_participant=mentor_participant, to_participant=mentee_participant
-            ).exists()
-
-            has_mentee_preference = Preference.objects.filter(
-                from_participant=mentee_participant, to_participant=mentor_participant
-            ).exists()
-
-            if has_mentor_preference and has_mentee_preference:
-                mutual_count += 1
-
+    for participant, mutual_count in get_mutual_option_counts(cohort):
         if mutual_count < min_options:
             problematic_participants.append(
                 {
@@ -159,42 +157,9 @@ def check_readiness(cohort: Cohort) -> Dict[str, Any]:
 
 def get_zero_option_participants(cohort: Cohort) -> List[Dict[str, Any]]:
     """Get participants with zero mutual cross-org options."""
-    participants = Participant.objects.filter(cohort=cohort)
     zero_option_participants = []
 
-    for participant in participants:
-        if participant.role_in_cohort == "MENTOR":
-            opposite_role = "MENTEE"
-        else:
-            opposite_role = "MENTOR"
-
-        # Count cross-org candidates (excluding same org)
-        cross_org_candidates = Participant.objects.filter(
-            cohort=cohort, role_in_cohort=opposite_role
-        ).exclude(organization=participant.organization)
-
-        # Count how many of these candidates have mutual preferences
-        mutual_count = 0
-        for candidate in cross_org_candidates:
-            # Check if both participants have preferences for each other
-            mentor_participant = (
-                participant if participant.role_in_cohort == "MENTOR" else candidate
-            )
-            mentee_participant = (
-                candidate if participant.role_in_cohort == "MENTOR" else participant
-            )
-
-            has_mentor_preference = Preference.objects.filter(
-                from_participant=mentor_participant, to_participant=mentee_participant
-            ).exists()
-
-            has_mentee_preference = Preference.objects.filter(
-                from_participant=mentee_participant, to_participant=mentor_participant
-            ).exists()
-
-            if has_mentor_preference and has_mentee_preference:
-                mutual_count += 1
-
+    for participant, mutual_count in get_mutual_option_counts(cohort):
         if mutual_count == 0:
             zero_option_participants.append(
                 {
@@ -213,42 +178,9 @@ def get_lowest_option_participants(
     cohort: Cohort, limit: int = 5
 ) -> List[Dict[str, Any]]:
     """Get participants with the lowest mutual cross-org option counts."""
-    participants = Participant.objects.filter(cohort=cohort)
     option_counts = []
 
-    for participant in participants:
-        if participant.role_in_cohort == "MENTOR":
-            opposite_role = "MENTEE"
-        else:
-            opposite_role = "MENTOR"
-
-        # Count cross-org candidates (excluding same org)
-        cross_org_candidates = Participant.objects.filter(
-            cohort=cohort, role_in_cohort=opposite_role
-        ).exclude(organization=participant.organization)
-
-        # Count how many of these candidates have mutual preferences
-        mutual_count = 0
-        for candidate in cross_org_candidates:
-            # Check if both participants have preferences for each other
-            mentor_participant = (
-                participant if participant.role_in_cohort == "MENTOR" else candidate
-            )
-            mentee_participant = (
-                candidate if participant.role_in_cohort == "MENTOR" else participant
-            )
-
-            has_mentor_preference = Preference.objects.filter(
-                from_participant=mentor_participant, to_participant=mentee_participant
-            ).exists()
-
-            has_mentee_preference = Preference.objects.filter(
-                from_participant=mentee_participant, to_participant=mentor_participant
-            ).exists()
-
-            if has_mentor_preference and has_mentee_preference:
-                mutual_count += 1
-
+    for participant, mutual_count in get_mutual_option_counts(cohort):
         option_counts.append(
             {
                 "participant": participant,
@@ -0,0 +1,23 @@
+"""Signal receivers that keep matching caches in step with the data."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.core.models import Participant
+from apps.matching.override_engine import invalidate_cohort_indexes
+from apps.matching.signals import preferences_changed
+
+
+@receiver(post_save, sender=Participant)
+@receiver(post_delete, sender=Participant)
+def participant_changed(sender, instance, **kwargs):
+    """Roles, organizations and submission state feed the override index."""
+    # Fixture loading can run before anything has cached an index
+    if kwargs.get("raw"):
+        return
+    invalidate_cohort_indexes(instance.cohort_id)
+
+
+@receiver(preferences_changed)
+def participant_preferences_changed(sender, change_set, cohort_id, **kwargs):
+    """Preference bitmaps in the override index are now stale."""
+    invalidate_cohort_indexes(cohort_id)
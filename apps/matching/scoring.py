@@ -6,6 +6,7 @@ from django.db import models
 from django.db.models import QuerySet, Max
 from apps.core.models import Cohort, Participant
 from apps.matching.models import Preference, MentorProfile, MenteeProfile, PairScore
+from apps.matching.swap_suggestions import invalidate_score_neighbors
 
 
 # Default configuration values
@@ -253,3 +254,5 @@ def compute_all_pair_scores(cohort: Cohort) -> None:
                 score=score,
                 score_breakdown=breakdown,
             )
+
+    invalidate_score_neighbors(cohort.id)
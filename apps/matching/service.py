@@ -4,20 +4,42 @@ import hashlib
 import json
 import logging
 import time
-from typing import Dict, List, Any
+from datetime import timedelta
+from typing import Dict, List, Any, Optional, Tuple
+from django.conf import settings
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import Q
 from apps.core.models import Cohort, Participant
-from .models import MatchRun, Match
-from .data_prep import prepare_inputs
-from .solvers.strict import solve_strict
-from .solvers.exception import solve_exception
+from .models import MatchRun, Match, Preference, SolverStats
+from .data_prep import PreparedInputs, prepare_inputs
+from .solvers.stable import solve_stable
+from .solvers.fair import solve_fair
+from .solvers.cpsat import MAX_SOLVER_LOG_CHARS, SolutionListener, get_solver_settings
+from .solvers.assignment import build_failure
+from .solvers.flow import needs_flow
+from .solvers.portfolio import BACKEND_CHOICES, solve_portfolio, solve_with_backend
 from .domain import detect_ambiguity
+from .override_engine import invalidate_match_run_index
+from .progress import publish_progress
+from .timing import SpanRecorder, record_spans, span
 
 logger = logging.getLogger(__name__)
 
+# Blocking pairs listed in a run's objective summary
+MAX_REPORTED_BLOCKING_PAIRS = 50
 
-def run_matching(cohort: Cohort, user, mode: str = "STRICT") -> MatchRun:
+# Seconds a RUNNING run can go without a heartbeat before another worker
+# reclaims it
+STALE_RUN_SECONDS = 300
+
+# Seconds between heartbeats of a running solve
+RUN_HEARTBEAT_SECONDS = 60
+
+
+def run_matching(
+    cohort: Cohort, user, mode: str = "STRICT", backend: Optional[str] = None
+) -> MatchRun:
     """
     Run matching for a cohort in specified mode.
 
@@ -30,34 +52,232 @@ def run_matching(cohort: Cohort, user, mode: str = "STRICT") -> MatchRun:
     Args:
         cohort: The cohort to match
         user: The user initiating the run
-        mode: "STRICT" or "EXCEPTION"
+        mode: "STRICT", "EXCEPTION", "STABLE" or "FAIR"
+        backend: Solver backend for STRICT and EXCEPTION runs ("CPSAT",
+            "ASSIGNMENT", "MIN_COST_FLOW" or "PORTFOLIO"); defaults to the
+            cohort's ``solver_backend`` setting
 
     Returns:
         MatchRun object with results
     """
     logger.info(f"Running {mode} matching for cohort {cohort.id}")
-    start_time = time.time()
 
-    # Create match run record
+    with record_spans(settings.MATCHING_TRACE_MEMORY) as recorder:
+        with span("input_signature"):
+            input_signature = _get_input_signature(cohort)
+
+        # Create match run record
+        match_run = MatchRun.objects.create(
+            cohort=cohort,
+            created_by=user,
+            mode=mode,
+            status="FAILED",  # Default to failed, update on success
+            input_signature=input_signature,
+        )
+        return _execute_match_run(match_run, backend, recorder=recorder)
+
+
+def queue_matching(
+    cohort: Cohort, user, mode: str = "STRICT", backend: Optional[str] = None
+) -> MatchRun:
+    """
+    Queue an anytime matching run for the background worker.
+
+    The worker (``manage.py process_match_runs``) runs it with solution
+    streaming: every improving CP-SAT solution is saved on the run as a
+    provisional snapshot, with its objective, bound and gap, until the solve
+    finishes or an admin stops it with ``request_stop``.
+
+    Returns:
+        MatchRun in QUEUED status
+    """
     match_run = MatchRun.objects.create(
         cohort=cohort,
         created_by=user,
         mode=mode,
-        status="FAILED",  # Default to failed, update on success
+        status="QUEUED",
         input_signature=_get_input_signature(cohort),
+        progress={"phase": "QUEUED", "backend": backend} if backend else {"phase": "QUEUED"},
     )
+    logger.info(f"Queued {mode} matching run {match_run.id} for cohort {cohort.id}")
+    return match_run
+
+
+def claim_next_match_run() -> Optional[MatchRun]:
+    """
+    Claim the oldest runnable run for this worker.
+
+    Runnable runs are QUEUED ones, plus RUNNING ones whose worker stopped
+    sending heartbeats; those start over. The claim is a conditional UPDATE,
+    so two workers never pick the same run.
+    """
+    stale_before = timezone.now() - timedelta(seconds=STALE_RUN_SECONDS)
+    candidates = MatchRun.objects.filter(
+        Q(status="QUEUED") | Q(status="RUNNING", updated_at__lt=stale_before)
+    ).order_by("created_at")
+
+    for match_run in candidates[:10]:
+        claimed = MatchRun.objects.filter(
+            id=match_run.id, status=match_run.status, updated_at=match_run.updated_at
+        ).update(status="RUNNING", updated_at=timezone.now())
+        if claimed:
+            if match_run.status == "RUNNING":
+                logger.warning(f"Reclaiming match run {match_run.id} from a stopped worker")
+            match_run.refresh_from_db()
+            return match_run
+    return None
+
+
+def process_match_run(match_run: MatchRun) -> MatchRun:
+    """Run a claimed background run, saving provisional snapshots as it improves."""
+    if match_run.stop_requested:
+        match_run.status = "FAILED"
+        match_run.failure_report = {
+            "reason": "CANCELLED",
+            "message": "Stopped before the solve started",
+        }
+        match_run.save()
+        return match_run
+
+    listener = SnapshotListener(match_run)
+    with record_spans(settings.MATCHING_TRACE_MEMORY) as recorder:
+        return _execute_match_run(
+            match_run, match_run.progress.get("backend"), listener, recorder
+        )
+
+
+def request_stop(match_run: MatchRun) -> Tuple[bool, str]:
+    """
+    Ask a queued or running background run to stop early.
+
+    A running solve stops at its next check and keeps its best solution.
+
+    Returns:
+        Tuple of (success, message)
+    """
+    updated = MatchRun.objects.filter(
+        id=match_run.id, status__in=("QUEUED", "RUNNING")
+    ).update(stop_requested=True)
+    if not updated:
+        return False, "Only queued or running match runs can be stopped"
+    match_run.stop_requested = True
+    return True, "Stop requested; the best solution so far will be kept"
+
+
+class SnapshotListener(SolutionListener):
+    """
+    Publish a background run's progress and save each improving solution as
+    a provisional snapshot of it.
+    """
+
+    def __init__(self, match_run: MatchRun):
+        self.match_run = match_run
+        self.inputs = None  # Set once inputs are prepared
+        self.start_time = time.time()
+        self.solutions = 0
+        self.stopped = False
+        self.last_heartbeat = time.time()
+
+    def on_phase(self, phase: str) -> None:
+        publish_progress(self.match_run, phase=phase, elapsed=time.time() - self.start_time)
+
+    def on_solution(
+        self, pairs: List[Tuple[int, int]], objective: float, bound: float
+    ) -> None:
+        self.solutions += 1
+        score_scale = self.inputs.config.get("score_scale", 1000)
+        with transaction.atomic():
+            Match.objects.filter(match_run=self.match_run).delete()
+            Match.objects.bulk_create(
+                Match(
+                    match_run=self.match_run,
+                    mentor_id=mentor_id,
+                    mentee_id=mentee_id,
+                    score_percent=int(round(self.inputs.score[(mentor_id, mentee_id)] / score_scale)),
+                )
+                for mentor_id, mentee_id in pairs
+            )
+            publish_progress(
+                self.match_run,
+                objective=objective / score_scale,
+                bound=bound / score_scale,
+                gap=abs(bound - objective) / max(abs(objective), 1),
+                solutions=self.solutions,
+                match_count=len(pairs),
+                elapsed=time.time() - self.start_time,
+            )
+        invalidate_match_run_index(self.match_run.id)
+
+    def on_bound(self, bound: float) -> None:
+        score_scale = self.inputs.config.get("score_scale", 1000)
+        fields = {"bound": bound / score_scale, "elapsed": time.time() - self.start_time}
+        if "objective" in self.match_run.progress:
+            objective = self.match_run.progress["objective"]
+            fields["gap"] = abs(fields["bound"] - objective) / max(abs(objective), 1 / score_scale)
+        publish_progress(self.match_run, **fields)
+
+    def should_stop(self) -> bool:
+        # Checked every few seconds during a solve, so it doubles as the
+        # heartbeat that keeps other workers from reclaiming the run
+        if time.time() - self.last_heartbeat >= RUN_HEARTBEAT_SECONDS:
+            MatchRun.objects.filter(id=self.match_run.id).update(updated_at=timezone.now())
+            self.last_heartbeat = time.time()
+        self.stopped = MatchRun.objects.filter(
+            id=self.match_run.id, stop_requested=True
+        ).exists()
+        return self.stopped
+
+    def finish(self) -> None:
+        """Mark the progress as done; it is saved with the run's outcome."""
+        progress = self.match_run.progress
+        progress.update(
+            {"phase": "DONE", "elapsed": time.time() - self.start_time, "seq": progress.get("seq", 0) + 1}
+        )
+
+
+def _execute_match_run(
+    match_run: MatchRun,
+    backend: Optional[str],
+    listener: Optional[SnapshotListener] = None,
+    recorder: Optional[SpanRecorder] = None,
+) -> MatchRun:
+    """
+    Prepare inputs, solve and persist the outcome of a match run.
+
+    Spans opened under ``recorder`` are saved on the run once it is persisted.
+    """
+    mode = match_run.mode
+    start_time = time.time()
 
     try:
         # Step 1: Prepare inputs (ORM isolation layer)
-        inputs = prepare_inputs(cohort)
+        if listener is not None:
+            listener.on_phase("PREPARE")
+        with span("prepare_inputs"):
+            inputs = prepare_inputs(match_run.cohort)
+        if listener is not None:
+            listener.inputs = inputs
 
         # Step 2: Solve with appropriate solver (pure functions)
-        if mode == "STRICT":
-            solver_result = solve_strict(inputs)
-        elif mode == "EXCEPTION":
-            solver_result = solve_exception(inputs)
-        else:
-            raise ValueError(f"Unsupported mode: {mode}")
+        with span("solve"):
+            solver_result, backend, summary = solve_inputs(inputs, mode, backend, listener)
+        if summary:
+            match_run.objective_summary = summary
+
+        # Record CP-SAT settings so the run can be replayed
+        if mode in ("STRICT", "EXCEPTION") and backend in ("CPSAT", "PORTFOLIO"):
+            match_run.solver_settings = get_solver_settings(inputs.config)
+            match_run.solver_log = solver_result.solver_log[-MAX_SOLVER_LOG_CHARS:]
+
+        # Keep CP-SAT's search statistics for the trend dashboard
+        if getattr(solver_result, "solver_stats", None):
+            _save_solver_stats(match_run, inputs, solver_result.solver_stats)
+
+        if listener is not None:
+            if listener.stopped:
+                match_run.objective_summary["stopped_early"] = True
+            listener.on_phase("PERSIST")
+            listener.finish()
 
         # Step 3: Handle results (persistence layer)
         if solver_result.success:
@@ -67,12 +287,107 @@ def run_matching(cohort: Cohort, user, mode: str = "STRICT") -> MatchRun:
 
     except Exception as e:
         logger.error(f"Error during {mode} matching: {e}", exc_info=True)
+        match_run.status = "FAILED"
         match_run.failure_report = {"reason": "INTERNAL_ERROR", "message": str(e)}
+        if listener is not None:
+            listener.finish()
         match_run.save()
 
+    if recorder is not None:
+        match_run.timing_spans = recorder.spans
+        MatchRun.objects.filter(id=match_run.id).update(timing_spans=recorder.spans)
+
     return match_run
 
 
+def solve_inputs(
+    inputs: PreparedInputs,
+    mode: str,
+    backend: Optional[str] = None,
+    listener: Optional[SolutionListener] = None,
+) -> Tuple[object, Optional[str], Dict[str, Any]]:
+    """
+    Solve prepared inputs with the solver for a run mode.
+
+    Touches no database, so a snapshot of a cohort's inputs can be solved
+    offline exactly as a match run would solve it.
+
+    Returns:
+        Tuple of (solver result, backend setting that was applied, objective
+        summary entries for the backend used)
+    """
+    if mode in ("STRICT", "EXCEPTION"):
+        return _solve_with_backend(inputs, mode, backend, listener)
+    if mode in ("STABLE", "FAIR"):
+        if listener is not None:
+            listener.on_phase("SOLVE")
+        solver_result = solve_stable(inputs) if mode == "STABLE" else solve_fair(inputs)
+        return solver_result, backend, {}
+    raise ValueError(f"Unsupported mode: {mode}")
+
+
+def _solve_with_backend(
+    inputs: PreparedInputs,
+    mode: str,
+    backend: Optional[str],
+    listener: Optional[SolutionListener] = None,
+) -> Tuple[object, str, Dict[str, Any]]:
+    """
+    Solve a STRICT or EXCEPTION run with the requested backend.
+
+    The backend used (for PORTFOLIO, the race winner and every backend's
+    finish) is returned as objective summary entries.
+
+    Returns:
+        Tuple of (solver result, backend setting that was applied, summary)
+    """
+    backend = str(backend or inputs.config.get("solver_backend", "CPSAT")).upper()
+    if backend not in BACKEND_CHOICES:
+        raise ValueError(f"Unsupported solver backend: {backend}")
+
+    objective = str(inputs.config.get("exception_objective", "WEIGHTED")).upper()
+    if needs_flow(inputs):
+        # Only the flow backend handles mentor capacities and partial matching
+        summary = {"backend": "MIN_COST_FLOW"}
+        if mode == "EXCEPTION" and objective != "WEIGHTED":
+            return (
+                build_failure(
+                    inputs,
+                    False,
+                    {
+                        "reason": "INVALID_CONFIG",
+                        "message": (
+                            f"The {objective.lower()} objective can't be combined with "
+                            "mentor capacities or partial matching"
+                        ),
+                    },
+                ),
+                "MIN_COST_FLOW",
+                summary,
+            )
+        if backend != "MIN_COST_FLOW":
+            logger.info(f"Mentor capacities or partial matching need min-cost flow; ignoring {backend} backend")
+        if listener is not None:
+            listener.on_phase("SOLVE")
+        return solve_with_backend(inputs, mode, "MIN_COST_FLOW"), "MIN_COST_FLOW", summary
+
+    if mode == "EXCEPTION" and objective != "WEIGHTED" and backend != "CPSAT":
+        # Only CP-SAT solves the staged objective
+        logger.info(f"{objective.title()} objective needs CP-SAT; ignoring {backend} backend")
+        backend = "CPSAT"
+
+    if listener is not None and backend != "CPSAT":
+        # Only CP-SAT reports its own phases
+        listener.on_phase("SOLVE")
+
+    if backend == "PORTFOLIO":
+        outcome = solve_portfolio(inputs, mode)
+        summary = {"backend": outcome.winner, "portfolio": outcome.race}
+        return outcome.result, backend, summary
+
+    return solve_with_backend(inputs, mode, backend, listener), backend, {"backend": backend}
+
+
 def _handle_successful_result(
     match_run: MatchRun, solver_result: object, inputs: object, start_time: float
 ) -> None:
@@ -82,18 +397,21 @@ def _handle_successful_result(
     total_duration = end_time - start_time
 
     # Detect ambiguities
-    ambiguities = detect_ambiguity(solver_result.matches, inputs)
+    with span("ambiguity_detection"):
+        ambiguities = detect_ambiguity(solver_result.matches, inputs)
 
     # Update match run
     match_run.status = "SUCCESS"
-    match_run.objective_summary = {
-        "total_score": solver_result.total_score,
-        "avg_score": solver_result.avg_score,
-        "match_count": len(solver_result.matches),
-        "ambiguity_count": len(ambiguities),
-        "solve_time": solver_result.solve_time,
-        "total_duration": total_duration,
-    }
+    match_run.objective_summary.update(
+        {
+            "total_score": solver_result.total_score,
+            "avg_score": solver_result.avg_score,
+            "match_count": len(solver_result.matches),
+            "ambiguity_count": len(ambiguities),
+            "solve_time": solver_result.solve_time,
+            "total_duration": total_duration,
+        }
+    )
 
     # Add exception info if available
     if hasattr(solver_result, "exception_count"):
@@ -101,56 +419,113 @@ def _handle_successful_result(
         match_run.objective_summary["exception_summary"] = (
             solver_result.exception_summary
         )
-
-    match_run.save()
+        if solver_result.stages:
+            match_run.objective_summary["stages"] = solver_result.stages
+        if solver_result.sparsification:
+            match_run.objective_summary["sparsification"] = solver_result.sparsification
+
+    # Add capacity and partial matching info if relevant
+    mentor_loads: Dict[int, int] = {}
+    for match_data in solver_result.matches:
+        mentor_loads[match_data["mentor_id"]] = mentor_loads.get(match_data["mentor_id"], 0) + 1
+    if mentor_loads and max(mentor_loads.values()) > 1:
+        match_run.objective_summary["max_mentor_load"] = max(mentor_loads.values())
+    if getattr(solver_result, "unmatched_mentor_ids", None) or getattr(
+        solver_result, "unmatched_mentee_ids", None
+    ):
+        match_run.objective_summary["unmatched_mentor_ids"] = solver_result.unmatched_mentor_ids
+        match_run.objective_summary["unmatched_mentee_ids"] = solver_result.unmatched_mentee_ids
+
+    # Add presolve stats if available
+    if hasattr(solver_result, "presolve") and solver_result.presolve:
+        match_run.objective_summary["presolve"] = solver_result.presolve
+
+    # Add fairness info if available
+    if hasattr(solver_result, "min_score"):
+        match_run.objective_summary["min_score"] = solver_result.min_score
+        match_run.objective_summary["threshold_checks"] = solver_result.threshold_checks
+
+    # Add stability info if available
+    if hasattr(solver_result, "blocking_pairs"):
+        match_run.objective_summary["stability"] = {
+            "proposing_side": solver_result.proposing_side,
+            "blocking_pair_count": len(solver_result.blocking_pairs),
+            "blocking_pairs": solver_result.blocking_pairs[:MAX_REPORTED_BLOCKING_PAIRS],
+            "rank_stats": solver_result.rank_stats,
+            "unmatched_mentor_ids": solver_result.unmatched_mentor_ids,
+            "unmatched_mentee_ids": solver_result.unmatched_mentee_ids,
+        }
 
     logger.info(
         f"{match_run.mode} matching completed for cohort {match_run.cohort.id} in {total_duration:.2f}s "
         f"with {len(solver_result.matches)} matches"
     )
 
-    # Create match records in a transaction
-    with transaction.atomic():
+    # First ambiguity reported for each pair, whichever side reported it
+    ambiguity_reasons: Dict[Tuple[int, int], str] = {}
+    for amb in ambiguities:
+        pair = tuple(sorted((amb["participant_id"], amb["matched_with_id"])))
+        ambiguity_reasons.setdefault(pair, amb["reason"])
+
+    # Create match records in a transaction, replacing any provisional snapshot
+    with span("persist"), transaction.atomic():
+        participant_ids = {
+            match_data[key]
+            for match_data in solver_result.matches
+            for key in ("mentor_id", "mentee_id")
+        }
+        found_ids = set(
+            Participant.objects.filter(id__in=participant_ids).values_list("id", flat=True)
+        )
+        if participant_ids - found_ids:
+            raise Participant.DoesNotExist(
+                f"Unknown participants in solver result: {sorted(participant_ids - found_ids)}"
+            )
+
+        Match.objects.filter(match_run=match_run).delete()
+        matches = []
         for match_data in solver_result.matches:
             mentor_id = match_data["mentor_id"]
             mentee_id = match_data["mentee_id"]
-            score = match_data["score"]
-
-            # Resolve participant objects
-            mentor = Participant.objects.get(id=mentor_id)
-            mentee = Participant.objects.get(id=mentee_id)
-
-            # Check if this match is ambiguous
-            is_ambiguous = False
-            ambiguity_reason = ""
-            for amb in ambiguities:
-                if (
-                    amb["participant_id"] == mentor_id
-                    and amb["matched_with_id"] == mentee_id
-                ) or (
-                    amb["participant_id"] == mentee_id
-                    and amb["matched_with_id"] == mentor_id
-                ):
-                    is_ambiguous = True
-                    ambiguity_reason = amb["reason"]
-                    break
-
-            # Get exception info if available
-            exception_flag = match_data.get("exception_flag", False)
-            exception_type = match_data.get("exception_type", "")
-            exception_reason = match_data.get("exception_reason", "")
-
-            Match.objects.create(
-                match_run=match_run,
-                mentor=mentor,
-                mentee=mentee,
-                score_percent=int(round(score)),
-                ambiguity_flag=is_ambiguous,
-                ambiguity_reason=ambiguity_reason,
-                exception_flag=exception_flag,
-                exception_type=exception_type,
-                exception_reason=exception_reason,
+            pair = tuple(sorted((mentor_id, mentee_id)))
+            matches.append(
+                Match(
+                    match_run=match_run,
+                    mentor_id=mentor_id,
+                    mentee_id=mentee_id,
+                    score_percent=int(round(match_data["score"])),
+                    ambiguity_flag=pair in ambiguity_reasons,
+                    ambiguity_reason=ambiguity_reasons.get(pair, ""),
+                    exception_flag=match_data.get("exception_flag", False),
+                    exception_type=match_data.get("exception_type", ""),
+                    exception_reason=match_data.get("exception_reason", ""),
+                )
             )
+        Match.objects.bulk_create(matches)
+
+        # SUCCESS becomes visible with the final rows, so overrides can't
+        # start on a provisional snapshot
+        match_run.save()
+
+    invalidate_match_run_index(match_run.id)
+
+
+def _save_solver_stats(match_run: MatchRun, inputs: object, stats: Dict[str, Any]) -> None:
+    """Store a run's CP-SAT search statistics with its cohort size and time limit."""
+    if match_run.mode == "STRICT":
+        time_limit = inputs.config.get("strict_time_limit", 5)
+    else:
+        time_limit = inputs.config.get("exception_time_limit", 10)
+
+    SolverStats.objects.update_or_create(
+        match_run=match_run,
+        defaults={
+            "mentor_count": len(inputs.mentor_ids),
+            "mentee_count": len(inputs.mentee_ids),
+            "time_limit": time_limit,
+            **stats,
+        },
+    )
 
 
 def _handle_failed_result(match_run: MatchRun, solver_result: object) -> None:
@@ -158,6 +533,8 @@ def _handle_failed_result(match_run: MatchRun, solver_result: object) -> None:
     match_run.status = "FAILED"
     match_run.failure_report = solver_result.failure_report
     match_run.save()
+    Match.objects.filter(match_run=match_run).delete()
+    invalidate_match_run_index(match_run.id)
 
     reason = solver_result.failure_report.get("reason", "UNKNOWN")
     logger.info(f"{match_run.mode} matching failed: {reason}")
@@ -169,21 +546,23 @@ def _get_input_signature(cohort: Cohort) -> str:
 
     This helps detect if inputs have changed between runs.
     """
-    # Get all relevant data that affects matching
-    participants = Participant.objects.filter(cohort=cohort).order_by("id")
-    data_parts = []
+    # Preferences given by each participant, in to_participant order
+    preferences: Dict[int, List[str]] = {}
+    for from_id, to_id, rank in (
+        Preference.objects.filter(from_participant__cohort=cohort)
+        .order_by("from_participant_id", "to_participant_id")
+        .values_list("from_participant_id", "to_participant_id", "rank")
+    ):
+        preferences.setdefault(from_id, []).append(f"pref:{from_id}->{to_id}:{rank}")
 
-    for participant in participants:
-        data_parts.append(
-            f"{participant.id}:{participant.role_in_cohort}:{participant.organization}"
-        )
-
-        # Add preferences
-        prefs = participant.given_preferences.all().order_by("to_participant_id")
-        for pref in prefs:
-            data_parts.append(
-                f"pref:{participant.id}->{pref.to_participant.id}:{pref.rank}"
-            )
+    data_parts = []
+    for participant_id, role, organization in (
+        Participant.objects.filter(cohort=cohort)
+        .order_by("id")
+        .values_list("id", "role_in_cohort", "organization")
+    ):
+        data_parts.append(f"{participant_id}:{role}:{organization}")
+        data_parts.extend(preferences.get(participant_id, []))
 
     # Add cohort config
     config_str = json.dumps(cohort.cohort_config, sort_keys=True)
@@ -204,7 +583,7 @@ def get_match_run_results(match_run: MatchRun) -> List[Dict[str, Any]]:
     if match_run.status != "SUCCESS":
         return []
 
-    matches = match_run.matches.select_related("mentor", "mentee").all()
+    matches = match_run.matches.select_related("mentor__user", "mentee__user").all()
 
     results = []
     for match in matches:
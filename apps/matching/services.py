@@ -1,7 +1,5 @@
 """Business logic services for matching operations."""
 
-import hashlib
-import json
 import logging
 import time
 from typing import Dict, List, Any
@@ -14,6 +12,7 @@ from apps.matching.solver import (
     detect_ambiguity,
     get_pair_scores,
 )
+from apps.matching.service import _get_input_signature
 
 logger = logging.getLogger(__name__)
 
@@ -24,29 +23,7 @@ def get_input_signature(cohort: Cohort) -> str:
 
     This helps detect if inputs have changed between runs.
     """
-    # Get all relevant data that affects matching
-    participants = Participant.objects.filter(cohort=cohort).order_by("id")
-    data_parts = []
-
-    for participant in participants:
-        data_parts.append(
-            f"{participant.id}:{participant.role_in_cohort}:{participant.organization}"
-        )
-
-        # Add preferences
-        prefs = participant.given_preferences.all().order_by("to_participant_id")
-        for pref in prefs:
-            data_parts.append(
-                f"pref:{participant.id}->{pref.to_participant.id}:{pref.rank}"
-            )
-
-    # Add cohort config
-    config_str = json.dumps(cohort.cohort_config, sort_keys=True)
-    data_parts.append(f"config:{config_str}")
-
-    # Create hash
-    data_string = "|".join(data_parts)
-    return hashlib.sha256(data_string.encode()).hexdigest()
+    return _get_input_signature(cohort)
 
 
 def run_strict_matching(cohort: Cohort, user) -> MatchRun:
@@ -350,7 +327,7 @@ def get_match_run_results(match_run: MatchRun) -> List[Dict[str, Any]]:
     if match_run.status != "SUCCESS":
         return []
 
-    matches = match_run.matches.select_related("mentor", "mentee").all()
+    matches = match_run.matches.select_related("mentor__user", "mentee__user").all()
 
     results = []
     for match in matches:
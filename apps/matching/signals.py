@@ -0,0 +1,7 @@
+"""Signals sent by the matching app."""
+
+from django.dispatch import Signal
+
+# Sent after a transaction that changed one participant's preferences commits.
+# Receivers get ``change_set``, a ``PreferenceChangeSet``, and ``cohort_id``.
+preferences_changed = Signal()
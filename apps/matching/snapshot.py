@@ -0,0 +1,136 @@
+"""Offline snapshots of prepared solver inputs.
+
+A snapshot holds a cohort's ``PreparedInputs`` in a compressed ``.npz``
+file, so a production run can be replayed and tuned with no database. The
+pair dictionaries are stored as dense [mentor][mentee] arrays in the order
+of ``mentor_ids`` and ``mentee_ids``, with a mask for inputs that don't
+cover every pair. Preference lists are stored in compressed sparse row
+form, and the config and metadata as JSON. Nothing is pickled, so loading
+a snapshot can't run code.
+"""
+
+import json
+import zipfile
+from typing import Any, Dict, Tuple
+import numpy as np
+from .data_prep import PreparedInputs
+
+# Bumped whenever the array layout changes
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Acceptability values, stored as their index
+ACCEPTABILITY_CODES = ("MUTUAL", "ONE_SIDED_MENTOR_ONLY", "ONE_SIDED_MENTEE_ONLY", "NEITHER")
+
+
+class SnapshotError(Exception):
+    """A snapshot file can't be read."""
+
+
+def write_snapshot(file, inputs: PreparedInputs, metadata: Dict[str, Any]) -> None:
+    """Write inputs and JSON-serializable metadata to a path or binary file."""
+    mentor_index = {mentor_id: i for i, mentor_id in enumerate(inputs.mentor_ids)}
+    mentee_index = {mentee_id: j for j, mentee_id in enumerate(inputs.mentee_ids)}
+    shape = (len(inputs.mentor_ids), len(inputs.mentee_ids))
+    has_pair = np.zeros(shape, dtype=bool)
+    same_org = np.zeros(shape, dtype=bool)
+    acceptability = np.zeros(shape, dtype=np.uint8)
+    score = np.zeros(shape, dtype=np.int64)
+    codes = {value: code for code, value in enumerate(ACCEPTABILITY_CODES)}
+    for (mentor_id, mentee_id), value in inputs.score.items():
+        i, j = mentor_index[mentor_id], mentee_index[mentee_id]
+        has_pair[i, j] = True
+        score[i, j] = value
+        same_org[i, j] = inputs.same_org[(mentor_id, mentee_id)]
+        acceptability[i, j] = codes[inputs.acceptability[(mentor_id, mentee_id)]]
+
+    owners = list(inputs.preference_lists)
+    offsets = np.cumsum([0] + [len(inputs.preference_lists[owner]) for owner in owners])
+    targets = [target for owner in owners for target in inputs.preference_lists[owner]]
+
+    np.savez_compressed(
+        file,
+        version=np.array(SNAPSHOT_FORMAT_VERSION),
+        mentor_ids=np.array(inputs.mentor_ids, dtype=np.int64),
+        mentee_ids=np.array(inputs.mentee_ids, dtype=np.int64),
+        has_pair=has_pair,
+        same_org=same_org,
+        acceptability=acceptability,
+        score=score,
+        preference_owners=np.array(owners, dtype=np.int64),
+        preference_offsets=offsets.astype(np.int64),
+        preference_targets=np.array(targets, dtype=np.int64),
+        capacity_mentor_ids=np.array(list(inputs.mentor_capacity), dtype=np.int64),
+        capacities=np.array(list(inputs.mentor_capacity.values()), dtype=np.int64),
+        config=np.array(json.dumps(inputs.config)),
+        metadata=np.array(json.dumps(metadata)),
+    )
+
+
+def read_snapshot(file) -> Tuple[PreparedInputs, Dict[str, Any]]:
+    """
+    Read a snapshot written by ``write_snapshot``.
+
+    Returns:
+        Tuple of (inputs, metadata)
+
+    Raises:
+        SnapshotError: If the file isn't a snapshot or has another format version
+    """
+    try:
+        with np.load(file, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile) as e:
+        raise SnapshotError(f"Not a snapshot file: {e}")
+
+    version = int(arrays["version"]) if "version" in arrays else None
+    if version != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(
+            f"Snapshot format version {version} is not supported "
+            f"(expected {SNAPSHOT_FORMAT_VERSION})"
+        )
+
+    try:
+        return _build_inputs(arrays), json.loads(str(arrays["metadata"]))
+    except KeyError as e:
+        raise SnapshotError(f"Snapshot is missing {e}")
+
+
+def _build_inputs(arrays: Dict[str, np.ndarray]) -> PreparedInputs:
+    mentor_ids = arrays["mentor_ids"].tolist()
+    mentee_ids = arrays["mentee_ids"].tolist()
+    # Plain lists index far faster than numpy scalars
+    has_pair = arrays["has_pair"].tolist()
+    same_org_rows = arrays["same_org"].tolist()
+    acceptability_rows = arrays["acceptability"].tolist()
+    score_rows = arrays["score"].tolist()
+
+    same_org = {}
+    acceptability = {}
+    score = {}
+    for i, mentor_id in enumerate(mentor_ids):
+        for j, mentee_id in enumerate(mentee_ids):
+            if has_pair[i][j]:
+                pair = (mentor_id, mentee_id)
+                same_org[pair] = same_org_rows[i][j]
+                acceptability[pair] = ACCEPTABILITY_CODES[acceptability_rows[i][j]]
+                score[pair] = score_rows[i][j]
+
+    offsets = arrays["preference_offsets"].tolist()
+    targets = arrays["preference_targets"].tolist()
+    preference_lists = {
+        owner: targets[offsets[k] : offsets[k + 1]]
+        for k, owner in enumerate(arrays["preference_owners"].tolist())
+    }
+
+    return PreparedInputs(
+        mentor_ids=mentor_ids,
+        mentee_ids=mentee_ids,
+        same_org=same_org,
+        acceptability=acceptability,
+        score=score,
+        config=json.loads(str(arrays["config"])),
+        preference_lists=preference_lists,
+        mentor_capacity=dict(
+            zip(arrays["capacity_mentor_ids"].tolist(), arrays["capacities"].tolist())
+        ),
+    )
@@ -0,0 +1,274 @@
+"""Assignment backend - solves strict and weighted exception runs exactly.
+
+With one partner per participant, both objectives are linear assignment
+problems: strict keeps only mutual, cross-organization pairs at their score,
+and weighted exception mode allows every pair at its score minus the
+exception penalty. OR-Tools' assignment solver finds the optimum directly
+instead of searching like CP-SAT.
+"""
+
+import time
+import logging
+from typing import Dict, Iterator, List, Any, Tuple
+from ortools.graph.python import linear_sum_assignment
+from ..data_prep import PreparedInputs
+from ..domain import classify_exception
+from .exception import ExceptionSolverResult
+from .strict import StrictSolverResult
+
+logger = logging.getLogger(__name__)
+
+
+def allowed_pairs(
+    inputs: PreparedInputs, mentor_ids: List[int], mentee_ids: List[int], strict: bool
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yield (mentor index, mentee index, penalty) for every pair a run may use.
+
+    Penalties mirror get_penalty_info. Strict runs only get mutual,
+    cross-organization pairs, as in strict._get_strict_feasible_pairs; a
+    penalty configured as zero doesn't make an exception pair strict.
+    """
+    config = inputs.config
+    penalty_org = config["penalty_org"]
+    penalties = {
+        "MUTUAL": 0,
+        "ONE_SIDED_MENTOR_ONLY": config["penalty_one_sided"],
+        "ONE_SIDED_MENTEE_ONLY": config["penalty_one_sided"],
+        "NEITHER": config["penalty_neither"],
+    }
+    same_org, acceptability = inputs.same_org, inputs.acceptability
+
+    for i, mentor_id in enumerate(mentor_ids):
+        for j, mentee_id in enumerate(mentee_ids):
+            pair = (mentor_id, mentee_id)
+            if same_org[pair]:
+                if strict:
+                    continue
+                yield i, j, penalty_org
+            elif acceptability[pair] == "MUTUAL":
+                yield i, j, 0
+            elif not strict:
+                yield i, j, penalties[acceptability[pair]]
+
+
+def build_arcs(
+    inputs: PreparedInputs, strict: bool
+) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Build the (mentor index, mentee index, cost) arcs of a run's objective.
+
+    Costs mirror get_penalty_info: penalty minus score, so minimizing cost
+    maximizes the exception objective. Strict mode leaves exception pairs out.
+
+    Returns:
+        Tuple of (mentor indices, mentee indices, costs)
+    """
+    mentor_ids, mentee_ids, scores = inputs.mentor_ids, inputs.mentee_ids, inputs.score
+
+    left, right, costs = [], [], []
+    for i, j, penalty in allowed_pairs(inputs, mentor_ids, mentee_ids, strict):
+        left.append(i)
+        right.append(j)
+        costs.append(penalty - scores[(mentor_ids[i], mentee_ids[j])])
+    return left, right, costs
+
+
+def build_result(
+    inputs: PreparedInputs,
+    strict: bool,
+    chosen: List[Tuple[int, int]],
+    solve_time: float,
+):
+    """
+    Turn chosen (mentor index, mentee index) pairs into the mode's result.
+
+    Returns:
+        StrictSolverResult or ExceptionSolverResult, marked optimal
+    """
+    score_scale = inputs.config.get("score_scale", 1000)
+    matches = []
+    total_score = 0
+    exception_summary = {"E1": 0, "E2": 0, "E3": 0}
+
+    for i, j in chosen:
+        mentor_id, mentee_id = inputs.mentor_ids[i], inputs.mentee_ids[j]
+        score = inputs.score[(mentor_id, mentee_id)] / score_scale
+        match = {"mentor_id": mentor_id, "mentee_id": mentee_id, "score": score}
+        if not strict:
+            classification = classify_exception(mentor_id, mentee_id, inputs)
+            match["exception_flag"] = classification.exception_type != ""
+            match["exception_type"] = classification.exception_type
+            match["exception_reason"] = classification.reason
+            if classification.exception_type:
+                exception_summary[classification.exception_type] += 1
+        matches.append(match)
+        total_score += score
+
+    avg_score = total_score / len(matches) if matches else 0
+    matched_mentors = {m["mentor_id"] for m in matches}
+    matched_mentees = {m["mentee_id"] for m in matches}
+    unmatched_mentor_ids = [m for m in inputs.mentor_ids if m not in matched_mentors]
+    unmatched_mentee_ids = [t for t in inputs.mentee_ids if t not in matched_mentees]
+    if strict:
+        return StrictSolverResult(
+            success=True,
+            matches=matches,
+            total_score=total_score,
+            avg_score=avg_score,
+            solve_time=solve_time,
+            failure_report={},
+            optimal=True,
+            unmatched_mentor_ids=unmatched_mentor_ids,
+            unmatched_mentee_ids=unmatched_mentee_ids,
+        )
+    return ExceptionSolverResult(
+        success=True,
+        matches=matches,
+        total_score=total_score,
+        avg_score=avg_score,
+        solve_time=solve_time,
+        exception_count=sum(exception_summary.values()),
+        exception_summary=exception_summary,
+        failure_report={},
+        optimal=True,
+        unmatched_mentor_ids=unmatched_mentor_ids,
+        unmatched_mentee_ids=unmatched_mentee_ids,
+    )
+
+
+def build_failure(
+    inputs: PreparedInputs,
+    strict: bool,
+    failure_report: Dict[str, Any],
+    solve_time: float = 0,
+):
+    """
+    Build the mode's failed result.
+
+    Returns:
+        StrictSolverResult or ExceptionSolverResult with the failure report
+    """
+    logger.info(f"Backend solve failed: {failure_report['reason']}")
+    if strict:
+        return StrictSolverResult(
+            success=False,
+            matches=[],
+            total_score=0,
+            avg_score=0,
+            solve_time=solve_time,
+            failure_report=failure_report,
+        )
+    return ExceptionSolverResult(
+        success=False,
+        matches=[],
+        total_score=0,
+        avg_score=0,
+        solve_time=solve_time,
+        exception_count=0,
+        exception_summary={},
+        failure_report=failure_report,
+    )
+
+
+def check_counts(inputs: PreparedInputs) -> Dict[str, Any]:
+    """
+    Check that every participant can get exactly one partner.
+
+    Returns:
+        Failure report, empty when the counts are usable
+    """
+    if len(inputs.mentor_ids) != len(inputs.mentee_ids):
+        return {
+            "reason": "COUNT_MISMATCH",
+            "mentors_count": len(inputs.mentor_ids),
+            "mentees_count": len(inputs.mentee_ids),
+            "message": f"Unequal counts: {len(inputs.mentor_ids)} mentors vs {len(inputs.mentee_ids)} mentees",
+        }
+    if len(inputs.mentor_ids) == 0:
+        return {
+            "reason": "NO_PARTICIPANTS",
+            "message": "No submitted participants found",
+        }
+    return {}
+
+
+def infeasible_report(
+    inputs: PreparedInputs, left: List[int], right: List[int], solve_time: float
+) -> Dict[str, Any]:
+    """Failure report for a problem without a complete matching."""
+    mentors_with_options = set(left)
+    mentees_with_options = set(right)
+    return {
+        "reason": "INFEASIBLE",
+        "mentors_count": len(inputs.mentor_ids),
+        "mentees_count": len(inputs.mentee_ids),
+        "feasible_pairs_count": len(left),
+        "solve_time": solve_time,
+        "zero_mentor_options": [
+            {"id": mentor_id}
+            for i, mentor_id in enumerate(inputs.mentor_ids)
+            if i not in mentors_with_options
+        ],
+        "zero_mentee_options": [
+            {"id": mentee_id}
+            for j, mentee_id in enumerate(inputs.mentee_ids)
+            if j not in mentees_with_options
+        ],
+    }
+
+
+def solve_assignment(inputs: PreparedInputs, strict: bool):
+    """
+    Solve a strict or weighted exception run with the assignment solver.
+
+    This is a pure function that operates only on in-memory data.
+
+    Returns:
+        StrictSolverResult or ExceptionSolverResult with solution or failure report
+    """
+    logger.info(
+        f"Solving {'strict' if strict else 'exception'} matching with the assignment backend "
+        f"for {len(inputs.mentor_ids)} mentors and {len(inputs.mentee_ids)} mentees"
+    )
+
+    failure_report = check_counts(inputs)
+    if failure_report:
+        return build_failure(inputs, strict, failure_report)
+
+    start_time = time.time()
+    left, right, costs = build_arcs(inputs, strict)
+    n = len(inputs.mentor_ids)
+    if len(set(left)) < n or len(set(right)) < n:
+        # The assignment solver can't be given participants without arcs
+        solve_time = time.time() - start_time
+        return build_failure(
+            inputs, strict, infeasible_report(inputs, left, right, solve_time), solve_time
+        )
+
+    assignment = linear_sum_assignment.SimpleLinearSumAssignment()
+    assignment.add_arcs_with_cost(left, right, costs)
+    status = assignment.solve()
+    solve_time = time.time() - start_time
+
+    logger.info(f"Assignment backend status: {status}, time: {solve_time:.2f}s")
+
+    if status == assignment.INFEASIBLE:
+        return build_failure(
+            inputs, strict, infeasible_report(inputs, left, right, solve_time), solve_time
+        )
+    if status != assignment.OPTIMAL:
+        return build_failure(
+            inputs,
+            strict,
+            {
+                "reason": "OVERFLOW",
+                "mentors_count": len(inputs.mentor_ids),
+                "mentees_count": len(inputs.mentee_ids),
+                "solve_time": solve_time,
+            },
+            solve_time,
+        )
+
+    chosen = [(i, assignment.right_mate(i)) for i in range(len(inputs.mentor_ids))]
+    return build_result(inputs, strict, chosen, solve_time)
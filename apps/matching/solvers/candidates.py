@@ -0,0 +1,120 @@
+"""Candidate sparsification for weighted exception runs.
+
+A weighted exception run is an assignment problem over every mentor-mentee
+pair, which at large cohorts is too many CP-SAT variables. Almost every pair
+in an optimal matching is among the best few options of its mentor or its
+mentee, so the model can be restricted to each participant's top-k pairs by
+net value (score minus penalty) and grown only when needed.
+
+Optimality of a restricted solution is checked with LP duality: shortest-path
+potentials on the restricted alternating graph give dual prices, and if no
+left-out pair has a positive reduced value at those prices, the restricted
+optimum is also optimal over all pairs.
+
+These are pure functions that operate only on in-memory data.
+"""
+
+import heapq
+from collections import deque
+from typing import List, Optional, Set, Tuple
+from ..data_prep import PreparedInputs
+from ..domain import get_penalty_info
+
+
+def build_net_values(inputs: PreparedInputs) -> List[List[int]]:
+    """
+    Net objective value of every pair: scaled score minus exception penalty.
+
+    Returns:
+        Matrix indexed [mentor index][mentee index]
+    """
+    values = []
+    for mentor_id in inputs.mentor_ids:
+        row = []
+        for mentee_id in inputs.mentee_ids:
+            penalty_info = get_penalty_info(mentor_id, mentee_id, inputs)
+            row.append(inputs.score[(mentor_id, mentee_id)] - penalty_info.penalty_value)
+        values.append(row)
+    return values
+
+
+def top_k_pairs(values: List[List[int]], k: int) -> Set[Tuple[int, int]]:
+    """
+    Pairs among the k best of their mentor's row or their mentee's column.
+
+    Returns:
+        Set of (mentor index, mentee index) pairs
+    """
+    n_rows = len(values)
+    n_cols = len(values[0]) if values else 0
+    pairs = set()
+    for i, row in enumerate(values):
+        pairs.update((i, j) for j in heapq.nlargest(k, range(n_cols), key=row.__getitem__))
+    for j in range(n_cols):
+        pairs.update(
+            (i, j) for i in heapq.nlargest(k, range(n_rows), key=lambda i: values[i][j])
+        )
+    return pairs
+
+
+def find_reduced_cost_violations(
+    values: List[List[int]],
+    candidates: Set[Tuple[int, int]],
+    chosen: List[Tuple[int, int]],
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    Find left-out pairs that could improve an optimal restricted matching.
+
+    ``chosen`` must be a maximum-value perfect matching over ``candidates``.
+    Mentor prices are shortest-path distances (queue-based Bellman-Ford) in
+    the alternating graph, where mentor i reaches the current mentor of any
+    candidate mentee j at the cost of giving up that mentor's pair for (i, j).
+    Each mentee is then priced at its own pair's value below its mentor's
+    price, the lowest price the matching allows. A left-out pair (i, j)
+    violates dual feasibility when its value exceeds the gap between mentor
+    i's and mentee j's prices.
+
+    Returns:
+        Violating pairs, empty when the matching is optimal over all pairs,
+        or None if the prices can't be computed (``chosen`` isn't optimal
+        over the candidates)
+    """
+    n = len(values)
+    mentor_of = [0] * n
+    for i, j in chosen:
+        mentor_of[j] = i
+    matched_value = [values[mentor_of[j]][j] for j in range(n)]
+
+    successors: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+    for i, j in candidates:
+        if mentor_of[j] != i:
+            successors[i].append((mentor_of[j], matched_value[j] - values[i][j]))
+
+    price = [0] * n
+    relaxations = [0] * n
+    queue = deque(range(n))
+    queued = [True] * n
+    while queue:
+        u = queue.popleft()
+        queued[u] = False
+        for v, cost in successors[u]:
+            if price[u] + cost < price[v]:
+                price[v] = price[u] + cost
+                if not queued[v]:
+                    relaxations[v] += 1
+                    if relaxations[v] > n:
+                        return None  # Improving cycle: not optimal over candidates
+                    queued[v] = True
+                    queue.append(v)
+
+    mentee_price = [price[mentor_of[j]] - matched_value[j] for j in range(n)]
+    max_mentee_price = max(mentee_price)
+    violations = []
+    for i, row in enumerate(values):
+        # Every value at or below this bound passes for any mentee
+        if max(row) <= price[i] - max_mentee_price:
+            continue
+        for j, value in enumerate(row):
+            if value > price[i] - mentee_price[j] and (i, j) not in candidates:
+                violations.append((i, j))
+    return violations
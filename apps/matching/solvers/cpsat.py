@@ -0,0 +1,220 @@
+"""Shared CP-SAT configuration for the strict and exception solvers."""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ortools.sat.python import cp_model
+
+# Workers used in deterministic mode when solver_num_workers is 0 (automatic),
+# since the automatic count depends on the machine the run happens on
+DETERMINISTIC_WORKERS = 8
+
+# Characters of captured search log kept on a match run
+MAX_SOLVER_LOG_CHARS = 200000
+
+# Seconds between hand-offs of the best solution to a listener, and between
+# its stop checks, during a streaming solve
+STREAM_INTERVAL_SECONDS = 2.0
+
+
+def get_solver_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve the cohort's CP-SAT settings into the values a solve will use.
+
+    Returns:
+        Dict with num_workers, random_seed, deterministic, relative_gap_limit
+        and log_search
+    """
+    deterministic = bool(config.get("solver_deterministic", False))
+    num_workers = int(config.get("solver_num_workers", 0))
+    if deterministic and num_workers == 0:
+        num_workers = DETERMINISTIC_WORKERS
+
+    return {
+        "num_workers": num_workers,  # 0 lets CP-SAT use every core
+        "random_seed": int(config.get("solver_random_seed", 1)),
+        "deterministic": deterministic,
+        "relative_gap_limit": float(config.get("solver_relative_gap_limit", 0.0)),
+        "log_search": bool(config.get("solver_log_search", False)),
+    }
+
+
+def create_cp_solver(
+    config: Dict[str, Any], time_limit: float, log_lines: Optional[List[str]] = None
+) -> cp_model.CpSolver:
+    """
+    Create a CpSolver configured from the cohort's solver settings.
+
+    In deterministic mode the workers search interleaved and the limit is
+    applied as deterministic time rather than wall time, so the same inputs,
+    seed and worker count always give the same solution. When log capture is
+    on, search log lines are appended to ``log_lines``.
+
+    Returns:
+        Configured CpSolver
+    """
+    settings = get_solver_settings(config)
+    solver = cp_model.CpSolver()
+    parameters = solver.parameters
+    parameters.num_workers = settings["num_workers"]
+    parameters.random_seed = settings["random_seed"]
+    parameters.relative_gap_limit = settings["relative_gap_limit"]
+
+    if settings["deterministic"]:
+        parameters.interleave_search = True
+        parameters.max_deterministic_time = time_limit
+    else:
+        parameters.max_time_in_seconds = time_limit
+
+    if settings["log_search"] and log_lines is not None:
+        parameters.log_search_progress = True
+        parameters.log_to_stdout = False
+        solver.log_callback = log_lines.append
+
+    return solver
+
+
+def add_solver_stats(
+    stats: Dict[str, Any], solver: cp_model.CpSolver, model: cp_model.CpModel, status: int
+) -> None:
+    """
+    Fold the search statistics of one finished solve into ``stats``.
+
+    Conflicts, branches and times add up over the solves of a run
+    (lexicographic stages, sparse rounds). Model size, presolve counts,
+    status, objective and bound are the last solve's; objective and bound
+    are in CP-SAT's units, so only their ratio compares across runs.
+    """
+    response = solver.response_proto
+    proto = model.Proto()
+    stats["num_solves"] = stats.get("num_solves", 0) + 1
+    stats["num_conflicts"] = stats.get("num_conflicts", 0) + response.num_conflicts
+    stats["num_branches"] = stats.get("num_branches", 0) + response.num_branches
+    stats["wall_time"] = stats.get("wall_time", 0.0) + response.wall_time
+    stats["user_time"] = stats.get("user_time", 0.0) + response.user_time
+    stats["deterministic_time"] = stats.get("deterministic_time", 0.0) + response.deterministic_time
+    stats.update(
+        {
+            "status": solver.StatusName(status),
+            "num_variables": len(proto.variables),
+            "num_constraints": len(proto.constraints),
+            # Booleans CP-SAT searched over after its presolve, and those it fixed outright
+            "presolved_booleans": response.num_booleans,
+            "fixed_booleans": response.num_fixed_booleans,
+        }
+    )
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        stats["objective_value"] = solver.ObjectiveValue()
+        stats["best_objective_bound"] = solver.BestObjectiveBound()
+    else:
+        stats.pop("objective_value", None)
+        stats.pop("best_objective_bound", None)
+
+
+class SolutionListener:
+    """
+    Receives improving solutions from a streaming solve.
+
+    Both methods are called on the thread that started the solve, never on
+    CP-SAT's worker threads, so they may use the database.
+    """
+
+    def on_solution(
+        self, pairs: List[Tuple[int, int]], objective: float, bound: float
+    ) -> None:
+        """Handle the best (mentor_id, mentee_id) matching found so far."""
+
+    def should_stop(self) -> bool:
+        """Whether the search should stop and keep its best solution."""
+        return False
+
+    def on_phase(self, phase: str) -> None:
+        """Handle the solver moving to a new phase (PRESOLVE, BUILD, SOLVE)."""
+
+    def on_bound(self, bound: float) -> None:
+        """Handle an improved objective bound between solutions."""
+
+
+class _SolutionCollector(cp_model.CpSolverSolutionCallback):
+    """Keep the latest improving solution for the streaming loop to pick up."""
+
+    def __init__(self, x: Dict, to_pairs: Callable, offset: float):
+        super().__init__()
+        self._x = x
+        self._to_pairs = to_pairs
+        self._offset = offset
+        self._lock = threading.Lock()
+        self._latest = None
+        self._bound = None
+
+    def on_solution_callback(self) -> None:
+        chosen = [pair for pair, var in self._x.items() if self.BooleanValue(var)]
+        latest = (
+            self._to_pairs(chosen),
+            self.ObjectiveValue() + self._offset,
+            self.BestObjectiveBound() + self._offset,
+        )
+        with self._lock:
+            self._latest = latest
+
+    def on_bound(self, bound: float) -> None:
+        with self._lock:
+            self._bound = bound + self._offset
+
+    def take(self):
+        with self._lock:
+            latest, self._latest = self._latest, None
+        return latest
+
+    def take_bound(self):
+        with self._lock:
+            bound, self._bound = self._bound, None
+        return bound
+
+
+def solve_streaming(
+    solver: cp_model.CpSolver,
+    model: cp_model.CpModel,
+    x: Dict,
+    listener: SolutionListener,
+    to_pairs: Callable,
+    offset: float = 0,
+) -> int:
+    """
+    Solve while handing improving solutions to a listener.
+
+    CP-SAT runs on a background thread. Every STREAM_INTERVAL_SECONDS the
+    calling thread passes the newest solution (``to_pairs`` turns chosen x
+    keys into participant pairs, and ``offset`` is added to the objective
+    and bound) to ``listener.on_solution`` and stops the search if
+    ``listener.should_stop()``. Bound improvements without a new solution
+    go to ``listener.on_bound``. The final solution is always delivered.
+
+    Returns:
+        CP-SAT status
+    """
+    collector = _SolutionCollector(x, to_pairs, offset)
+    solver.best_bound_callback = collector.on_bound
+    outcome = {}
+
+    def run():
+        outcome["status"] = solver.Solve(model, collector)
+
+    thread = threading.Thread(target=run, name="cpsat-streaming", daemon=True)
+    thread.start()
+    stop_requested = False
+    while thread.is_alive():
+        thread.join(STREAM_INTERVAL_SECONDS)
+        latest = collector.take()
+        bound = collector.take_bound()
+        if latest:
+            listener.on_solution(*latest)
+        elif bound is not None:
+            listener.on_bound(bound)
+        if not stop_requested and thread.is_alive() and listener.should_stop():
+            stop_requested = True
+            solver.stop_search()
+
+    latest = collector.take()
+    if latest:
+        listener.on_solution(*latest)
+    return outcome.get("status", cp_model.UNKNOWN)
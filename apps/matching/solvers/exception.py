@@ -2,13 +2,28 @@
 
 import time
 import logging
-from typing import Dict, List, Tuple, Any, NamedTuple
+from typing import Dict, List, Tuple, Any, NamedTuple, Optional
 from ortools.sat.python import cp_model
 from ..data_prep import PreparedInputs
 from ..domain import get_penalty_info
+from ..timing import span
+from .candidates import build_net_values, find_reduced_cost_violations, top_k_pairs
+from .cpsat import (
+    SolutionListener,
+    add_solver_stats,
+    create_cp_solver,
+    get_solver_settings,
+    solve_streaming,
+)
 
 logger = logging.getLogger(__name__)
 
+# Ways to combine exception counts and scores into an objective
+EXCEPTION_OBJECTIVES = ("WEIGHTED", "LEXICOGRAPHIC")
+
+# Lexicographic stages, most severe exception type first
+LEXICOGRAPHIC_STAGES = ("E3", "E2", "E1", "SCORE")
+
 
 class ExceptionSolverResult(NamedTuple):
     """Result from exception solver."""
@@ -21,22 +36,61 @@ class ExceptionSolverResult(NamedTuple):
     exception_count: int
     exception_summary: Dict[str, int]  # Count by exception type
     failure_report: Dict[str, Any]  # Only populated when success=False
-
-
-def solve_exception(inputs: PreparedInputs) -> ExceptionSolverResult:
+    stages: List[Dict[str, Any]] = []  # Per-stage results of a lexicographic solve
+    solver_log: str = ""  # CP-SAT search log, when solver_log_search is on
+    solver_stats: Dict[str, Any] = {}  # CP-SAT search statistics, summed over solves
+    optimal: bool = False  # Whether the solution is proven optimal
+    unmatched_mentor_ids: List[int] = []  # Only with partial matching
+    unmatched_mentee_ids: List[int] = []  # Only with partial matching
+    sparsification: Dict[str, Any] = {}  # Candidate rounds, when exception_candidate_k is set
+
+
+def solve_exception(
+    inputs: PreparedInputs, listener: Optional[SolutionListener] = None
+) -> ExceptionSolverResult:
     """
     Solve exception matching problem using OR-Tools CP-SAT.
 
     This is a pure function that operates only on in-memory data.
     Allows all pairs but applies penalties for policy violations.
 
+    ``exception_objective`` in the config picks how violations are traded
+    off. WEIGHTED (the default) maximizes score minus the configured
+    penalties in a single solve. LEXICOGRAPHIC solves in stages: minimize
+    the E3 count, then E2, then E1, then maximize score, fixing each
+    stage's optimum before the next and warm-starting from its solution.
+
+    With ``exception_candidate_k`` set, a weighted solve only models each
+    participant's top-k pairs by net value and grows k until a reduced-cost
+    check proves the restricted optimum optimal over all pairs.
+
+    With a ``listener``, a single weighted solve over all pairs hands each
+    improving matching to it, and the listener can stop the search early.
+    Staged and sparsified solves don't stream.
+
     Returns:
         ExceptionSolverResult with solution or failure report
     """
+    objective = str(inputs.config.get("exception_objective", "WEIGHTED")).upper()
     logger.info(
-        f"Solving exception matching for {len(inputs.mentor_ids)} mentors and {len(inputs.mentee_ids)} mentees"
+        f"Solving exception matching ({objective.lower()}) for {len(inputs.mentor_ids)} mentors and {len(inputs.mentee_ids)} mentees"
     )
 
+    if objective not in EXCEPTION_OBJECTIVES:
+        return ExceptionSolverResult(
+            success=False,
+            matches=[],
+            total_score=0,
+            avg_score=0,
+            solve_time=0,
+            exception_count=0,
+            exception_summary={},
+            failure_report={
+                "reason": "INVALID_CONFIG",
+                "message": f"exception_objective must be one of {', '.join(EXCEPTION_OBJECTIVES)}",
+            },
+        )
+
     # Check for basic infeasibility conditions
     if len(inputs.mentor_ids) != len(inputs.mentee_ids):
         return ExceptionSolverResult(
@@ -70,75 +124,62 @@ def solve_exception(inputs: PreparedInputs) -> ExceptionSolverResult:
             },
         )
 
-    # Create the model
-    model = cp_model.CpModel()
-
-    # Create variables
-    x = {}  # x[i,j] = 1 if mentor i is matched to mentee j
-    mentor_index_map = {mid: i for i, mid in enumerate(inputs.mentor_ids)}
-    mentee_index_map = {mid: j for j, mid in enumerate(inputs.mentee_ids)}
-
-    for mentor_id in inputs.mentor_ids:
-        i = mentor_index_map[mentor_id]
-        for mentee_id in inputs.mentee_ids:
-            j = mentee_index_map[mentee_id]
-            x[(i, j)] = model.NewBoolVar(f"x[{i},{j}]")
-
-    # Assignment constraints - each participant matched exactly once
-    # Each mentor matched exactly once
-    for i in range(len(inputs.mentor_ids)):
-        model.AddExactlyOne(x[(i, j)] for j in range(len(inputs.mentee_ids)))
-
-    # Each mentee matched exactly once
-    for j in range(len(inputs.mentee_ids)):
-        model.AddExactlyOne(x[(i, j)] for i in range(len(inputs.mentor_ids)))
-
-    # Objective: maximize total score - penalties
-    # We'll create penalty variables for each match
-    penalty_vars = []
-    penalty_coeffs = []
-
-    for mentor_id in inputs.mentor_ids:
-        i = mentor_index_map[mentor_id]
-        for mentee_id in inputs.mentee_ids:
-            j = mentee_index_map[mentee_id]
-
-            # Apply penalties based on exception type
-            penalty_info = get_penalty_info(mentor_id, mentee_id, inputs)
-
-            if penalty_info.penalty_type:  # Has penalty
-                penalty_var = model.NewIntVar(
-                    0, 1, f"penalty_{penalty_info.penalty_type}_{i}_{j}"
-                )
-                model.Add(penalty_var == x[(i, j)])  # penalty = 1 if matched
-                penalty_vars.append(penalty_var)
-                penalty_coeffs.append(penalty_info.penalty_value)
-
-    # Objective: maximize score - penalties
-    score_term = sum(
-        x[(i, j)] * inputs.score[(mentor_id, mentee_id)]
-        for (i, j), var in x.items()
-        for mentor_id, mentee_id in [(inputs.mentor_ids[i], inputs.mentee_ids[j])]
-    )
-
-    if penalty_vars:
-        penalty_term = sum(
-            penalty_var * penalty_coeff
-            for penalty_var, penalty_coeff in zip(penalty_vars, penalty_coeffs)
-        )
-        model.Maximize(score_term - penalty_term)
+    n = len(inputs.mentor_ids)
+    candidate_k = int(inputs.config.get("exception_candidate_k", 0))
+    solver_log: List[str] = []
+    solver_stats: Dict[str, Any] = {}
+    stages = []
+    sparsification = {}
+    if listener is not None:
+        listener.on_phase("BUILD")
+    if objective == "LEXICOGRAPHIC":
+        with span("build_model"):
+            model, x = _build_model(n, [(i, j) for i in range(n) for j in range(n)])
+        if listener is not None:
+            listener.on_phase("SOLVE")
+        start_time = time.time()
+        with span("cpsat_solve"):
+            status, chosen, stages = _solve_stages(
+                model, x, inputs, solver_log, solver_stats
+            )
+        solve_time = time.time() - start_time
+    elif 0 < candidate_k < n:
+        if listener is not None:
+            listener.on_phase("SOLVE")
+        start_time = time.time()
+        with span("sparse_solve"):
+            status, chosen, sparsification = _solve_sparse(
+                inputs, candidate_k, solver_log, solver_stats
+            )
+        solve_time = time.time() - start_time
     else:
-        model.Maximize(score_term)
+        with span("build_model"):
+            model, x = _build_model(n, [(i, j) for i in range(n) for j in range(n)])
+            _set_weighted_objective(model, x, inputs)
 
-    # Solve
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = inputs.config.get(
-        "exception_time_limit", 10
-    )
+        # Solve
+        solver = create_cp_solver(
+            inputs.config, inputs.config.get("exception_time_limit", 10), solver_log
+        )
 
-    start_time = time.time()
-    status = solver.Solve(model)
-    solve_time = time.time() - start_time
+        start_time = time.time()
+        with span("cpsat_solve"):
+            if listener is not None:
+                listener.on_phase("SOLVE")
+                status = solve_streaming(
+                    solver,
+                    model,
+                    x,
+                    listener,
+                    lambda chosen: [(inputs.mentor_ids[i], inputs.mentee_ids[j]) for i, j in chosen],
+                )
+            else:
+                status = solver.Solve(model)
+        solve_time = time.time() - start_time
+        add_solver_stats(solver_stats, solver, model, status)
+        chosen = []
+        if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            chosen = [pair for pair, var in x.items() if solver.Value(var) == 1]
 
     logger.info(f"Exception solver status: {status}, time: {solve_time:.2f}s")
 
@@ -149,37 +190,36 @@ def solve_exception(inputs: PreparedInputs) -> ExceptionSolverResult:
         exception_count = 0
         exception_summary = {"E1": 0, "E2": 0, "E3": 0}
 
-        for (i, j), var in x.items():
-            if solver.Value(var) == 1:
-                mentor_id = inputs.mentor_ids[i]
-                mentee_id = inputs.mentee_ids[j]
-                score = inputs.score[(mentor_id, mentee_id)] / inputs.config.get(
-                    "score_scale", 1000
-                )
-
-                # Check for exceptions
-                from ..domain import classify_exception
-
-                exception_classification = classify_exception(
-                    mentor_id, mentee_id, inputs
-                )
-                is_exception = exception_classification.exception_type != ""
-
-                if is_exception:
-                    exception_count += 1
-                    exception_summary[exception_classification.exception_type] += 1
-
-                matches.append(
-                    {
-                        "mentor_id": mentor_id,
-                        "mentee_id": mentee_id,
-                        "score": score,
-                        "exception_flag": is_exception,
-                        "exception_type": exception_classification.exception_type,
-                        "exception_reason": exception_classification.reason,
-                    }
-                )
-                total_score += score
+        for i, j in chosen:
+            mentor_id = inputs.mentor_ids[i]
+            mentee_id = inputs.mentee_ids[j]
+            score = inputs.score[(mentor_id, mentee_id)] / inputs.config.get(
+                "score_scale", 1000
+            )
+
+            # Check for exceptions
+            from ..domain import classify_exception
+
+            exception_classification = classify_exception(
+                mentor_id, mentee_id, inputs
+            )
+            is_exception = exception_classification.exception_type != ""
+
+            if is_exception:
+                exception_count += 1
+                exception_summary[exception_classification.exception_type] += 1
+
+            matches.append(
+                {
+                    "mentor_id": mentor_id,
+                    "mentee_id": mentee_id,
+                    "score": score,
+                    "exception_flag": is_exception,
+                    "exception_type": exception_classification.exception_type,
+                    "exception_reason": exception_classification.reason,
+                }
+            )
+            total_score += score
 
         avg_score = total_score / len(matches) if matches else 0
 
@@ -197,6 +237,13 @@ def solve_exception(inputs: PreparedInputs) -> ExceptionSolverResult:
             exception_count=exception_count,
             exception_summary=exception_summary,
             failure_report={},
+            stages=stages,
+            solver_log="\n".join(solver_log),
+            solver_stats=solver_stats,
+            optimal=status == cp_model.OPTIMAL
+            and all(stage["status"] in ("OPTIMAL", "SKIPPED") for stage in stages)
+            and sparsification.get("verified", True),
+            sparsification=sparsification,
         )
 
     else:
@@ -207,6 +254,10 @@ def solve_exception(inputs: PreparedInputs) -> ExceptionSolverResult:
             "mentees_count": len(inputs.mentee_ids),
             "solve_time": solve_time,
         }
+        if stages:
+            failure_report["stages"] = stages
+        if sparsification:
+            failure_report["sparsification"] = sparsification
 
         logger.info(f"Exception solve failed: {failure_report['reason']}")
 
@@ -219,4 +270,258 @@ def solve_exception(inputs: PreparedInputs) -> ExceptionSolverResult:
             exception_count=0,
             exception_summary={},
             failure_report=failure_report,
+            solver_log="\n".join(solver_log),
+            solver_stats=solver_stats,
+        )
+
+
+def _build_model(n: int, pairs: List[Tuple[int, int]]) -> Tuple[cp_model.CpModel, Dict]:
+    """
+    Build the perfect-matching model over the given (mentor index, mentee index) pairs.
+
+    Returns:
+        Tuple of (model, x) where x[i, j] = 1 if mentor i is matched to mentee j
+    """
+    model = cp_model.CpModel()
+    x = {(i, j): model.NewBoolVar(f"x[{i},{j}]") for i, j in sorted(pairs)}
+
+    # Each participant matched exactly once
+    mentor_vars: List[List] = [[] for _ in range(n)]
+    mentee_vars: List[List] = [[] for _ in range(n)]
+    for (i, j), var in x.items():
+        mentor_vars[i].append(var)
+        mentee_vars[j].append(var)
+    for variables in mentor_vars + mentee_vars:
+        model.AddExactlyOne(variables)
+
+    return model, x
+
+
+def _solve_sparse(
+    inputs: PreparedInputs, k: int, solver_log: List[str], solver_stats: Dict[str, Any]
+) -> Tuple[int, List[Tuple[int, int]], Dict[str, Any]]:
+    """
+    Solve the weighted objective over each participant's top-k pairs.
+
+    After an optimal restricted solve, a reduced-cost check decides whether
+    any left-out pair could improve the matching; if so (or if the top-k
+    pairs admit no perfect matching) k is doubled and the model re-solved,
+    warm-started from the previous matching. Rounds share the
+    ``exception_time_limit`` budget: each takes whatever wall time is left,
+    or in deterministic mode an equal share of the deterministic time, since
+    that can't be read off a clock. Once k reaches the cohort size the model
+    holds every pair, so the loop always ends.
+
+    Returns:
+        Tuple of (CP-SAT status, chosen (i, j) pairs, sparsification summary)
+    """
+    n = len(inputs.mentor_ids)
+    values = build_net_values(inputs)
+    time_limit = inputs.config.get("exception_time_limit", 10)
+    deadline = time.time() + time_limit
+    # Doubling k from its start reaches n in this many rounds at most
+    max_rounds = 1
+    while k << (max_rounds - 1) < n:
+        max_rounds += 1
+    status = cp_model.UNKNOWN
+    chosen: List[Tuple[int, int]] = []
+    rounds = []
+    verified = False
+
+    while True:
+        if k < n:
+            candidates = top_k_pairs(values, k)
+        else:
+            candidates = {(i, j) for i in range(n) for j in range(n)}
+        model, x = _build_model(n, list(candidates))
+        _set_weighted_objective(model, x, inputs)
+        for pair in chosen:
+            model.AddHint(x[pair], 1)
+
+        if get_solver_settings(inputs.config)["deterministic"]:
+            round_limit = time_limit / max_rounds
+        else:
+            round_limit = max(deadline - time.time(), 0.0)
+        solver = create_cp_solver(inputs.config, round_limit, solver_log)
+        round_start = time.time()
+        round_status = solver.Solve(model)
+        add_solver_stats(solver_stats, solver, model, round_status)
+        round_record = {
+            "k": k,
+            "pairs": len(candidates),
+            "status": solver.StatusName(round_status),
+            "violations": None,
+            "solve_time": time.time() - round_start,
+        }
+        rounds.append(round_record)
+
+        if round_status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            status = round_status
+            chosen = [pair for pair, var in x.items() if solver.Value(var) == 1]
+        elif round_status != cp_model.INFEASIBLE:
+            break  # Out of time; keep the previous round's matching, if any
+
+        if round_status == cp_model.OPTIMAL:
+            if k >= n:
+                verified = True
+                break
+            violations = find_reduced_cost_violations(values, candidates, chosen)
+            if violations is None:
+                break  # Gap limit left the solution short of optimal; can't certify
+            round_record["violations"] = len(violations)
+            if not violations:
+                verified = True
+                break
+        elif round_status == cp_model.FEASIBLE or k >= n:
+            break
+
+        logger.info(f"Top-{k} candidates aren't enough for exception matching; growing k")
+        k = min(2 * k, n)
+
+    logger.info(
+        f"Sparse exception solve {'verified' if verified else 'unverified'} at k={k} "
+        f"after {len(rounds)} round(s)"
+    )
+    return status, chosen, {"verified": verified, "final_k": k, "rounds": rounds}
+
+
+def _set_weighted_objective(model: cp_model.CpModel, x: Dict, inputs: PreparedInputs) -> None:
+    """Maximize total score minus the configured exception penalties."""
+    # We'll create penalty variables for each match
+    penalty_vars = []
+    penalty_coeffs = []
+
+    for (i, j), var in x.items():
+        mentor_id, mentee_id = inputs.mentor_ids[i], inputs.mentee_ids[j]
+
+        # Apply penalties based on exception type
+        penalty_info = get_penalty_info(mentor_id, mentee_id, inputs)
+
+        if penalty_info.penalty_type:  # Has penalty
+            penalty_var = model.NewIntVar(
+                0, 1, f"penalty_{penalty_info.penalty_type}_{i}_{j}"
+            )
+            model.Add(penalty_var == var)  # penalty = 1 if matched
+            penalty_vars.append(penalty_var)
+            penalty_coeffs.append(penalty_info.penalty_value)
+
+    # Objective: maximize score - penalties
+    score_term = sum(
+        var * inputs.score[(inputs.mentor_ids[i], inputs.mentee_ids[j])]
+        for (i, j), var in x.items()
+    )
+
+    if penalty_vars:
+        penalty_term = sum(
+            penalty_var * penalty_coeff
+            for penalty_var, penalty_coeff in zip(penalty_vars, penalty_coeffs)
         )
+        model.Maximize(score_term - penalty_term)
+    else:
+        model.Maximize(score_term)
+
+
+def _solve_stages(
+    model: cp_model.CpModel,
+    x: Dict,
+    inputs: PreparedInputs,
+    solver_log: List[str],
+    solver_stats: Dict[str, Any],
+) -> Tuple[int, List[Tuple[int, int]], List[Dict[str, Any]]]:
+    """
+    Solve the lexicographic objective one stage at a time.
+
+    Each count stage adds ``count <= optimum`` before the next stage runs, and
+    every stage is hinted with the previous solution. Stages share the
+    ``exception_time_limit`` budget; time a stage doesn't use carries over,
+    except in deterministic mode where every stage gets an equal share.
+    If a later stage finds nothing in time, the previous stage's solution is
+    kept, since it already satisfies every bound fixed so far.
+
+    Returns:
+        Tuple of (CP-SAT status, chosen (i, j) pairs, per-stage results)
+    """
+    exception_vars = {"E1": [], "E2": [], "E3": []}
+    for (i, j), var in x.items():
+        penalty_info = get_penalty_info(inputs.mentor_ids[i], inputs.mentee_ids[j], inputs)
+        if penalty_info.penalty_type:
+            exception_vars[penalty_info.penalty_type].append(var)
+
+    pairs = list(x)
+    variables = [x[pair] for pair in pairs]
+    score_term = cp_model.LinearExpr.WeightedSum(
+        variables,
+        [inputs.score[(inputs.mentor_ids[i], inputs.mentee_ids[j])] for i, j in pairs],
+    )
+
+    time_limit = inputs.config.get("exception_time_limit", 10)
+    deadline = time.time() + time_limit
+    settings = get_solver_settings(inputs.config)
+    status = cp_model.UNKNOWN
+    chosen: List[Tuple[int, int]] = []
+    stages: List[Dict[str, Any]] = []
+
+    for position, stage in enumerate(LEXICOGRAPHIC_STAGES):
+        if stage == "SCORE":
+            expression = score_term
+            model.Maximize(expression)
+        elif exception_vars[stage]:
+            expression = cp_model.LinearExpr.Sum(exception_vars[stage])
+            model.Minimize(expression)
+        else:
+            # No pair of this type exists, so its count is already zero
+            stages.append({"stage": stage, "status": "SKIPPED", "value": 0, "solve_time": 0.0})
+            continue
+
+        if settings["deterministic"]:
+            stage_limit = time_limit / len(LEXICOGRAPHIC_STAGES)
+        else:
+            remaining = max(deadline - time.time(), 0.0)
+            stage_limit = remaining / (len(LEXICOGRAPHIC_STAGES) - position)
+        if settings["log_search"]:
+            solver_log.append(f"# Stage {stage}")
+        solver = create_cp_solver(inputs.config, stage_limit, solver_log)
+
+        stage_start = time.time()
+        stage_status = solver.Solve(model)
+        stage_time = time.time() - stage_start
+        add_solver_stats(solver_stats, solver, model, stage_status)
+
+        if stage_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            stages.append(
+                {
+                    "stage": stage,
+                    "status": "TIMEOUT" if stage_status == cp_model.UNKNOWN else "INFEASIBLE",
+                    "value": None,
+                    "solve_time": stage_time,
+                }
+            )
+            logger.info(f"Exception stage {stage} found no solution in {stage_time:.2f}s")
+            if not chosen:
+                status = stage_status
+            break
+
+        status = stage_status
+        value = int(round(solver.ObjectiveValue()))
+        stages.append(
+            {
+                "stage": stage,
+                "status": solver.StatusName(stage_status),
+                "value": value,
+                "solve_time": stage_time,
+            }
+        )
+        logger.info(
+            f"Exception stage {stage}: {value} ({solver.StatusName(stage_status)}) in {stage_time:.2f}s"
+        )
+
+        chosen = [pair for pair, var in zip(pairs, variables) if solver.Value(var) == 1]
+        if stage != "SCORE":
+            model.Add(expression <= value)
+
+        # Warm-start the next stage from this solution
+        model.ClearHints()
+        for var in variables:
+            model.AddHint(var, solver.Value(var))
+
+    return status, chosen, stages
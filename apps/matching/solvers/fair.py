@@ -0,0 +1,215 @@
+"""Fair mode solver - bottleneck (max-min) assignment, then max total score."""
+
+import bisect
+import time
+import logging
+from typing import Dict, List, Any, NamedTuple
+from ortools.graph.python import linear_sum_assignment
+from ..data_prep import PreparedInputs
+from ..presolve import maximum_matching
+
+logger = logging.getLogger(__name__)
+
+
+class FairSolverResult(NamedTuple):
+    """Result from fair solver."""
+
+    success: bool
+    matches: List[Dict[str, Any]]  # List of match dictionaries
+    total_score: float
+    avg_score: float
+    solve_time: float
+    min_score: float  # Lowest matched score, the best achievable
+    threshold_checks: int  # Matching feasibility checks run by the search
+    failure_report: Dict[str, Any]  # Only populated when success=False
+
+
+def solve_fair(inputs: PreparedInputs) -> FairSolverResult:
+    """
+    Solve fair matching: maximize the lowest matched score, then the total.
+
+    This is a pure function that operates only on in-memory data. Pairs must
+    satisfy the strict rules (different organizations, mutual ranking).
+
+    1. Binary search over the integer score range for the highest floor that
+       still admits a perfect matching. Each check runs Hopcroft-Karp on the
+       pairs at or above the floor, warm-started from the previous check's
+       matching, so later checks only repair a few broken pairs.
+    2. Maximize total score over the pairs at or above that floor with an
+       exact assignment solve.
+
+    Returns:
+        FairSolverResult with solution or failure report
+    """
+    logger.info(
+        f"Solving fair matching for {len(inputs.mentor_ids)} mentors and {len(inputs.mentee_ids)} mentees"
+    )
+
+    if len(inputs.mentor_ids) != len(inputs.mentee_ids):
+        return _failed(
+            {
+                "reason": "COUNT_MISMATCH",
+                "mentors_count": len(inputs.mentor_ids),
+                "mentees_count": len(inputs.mentee_ids),
+                "message": f"Unequal counts: {len(inputs.mentor_ids)} mentors vs {len(inputs.mentee_ids)} mentees",
+            }
+        )
+
+    if len(inputs.mentor_ids) == 0:
+        return _failed(
+            {
+                "reason": "NO_PARTICIPANTS",
+                "message": "No submitted participants found",
+            }
+        )
+
+    start_time = time.time()
+    n = len(inputs.mentor_ids)
+    mentor_index_map = {mid: i for i, mid in enumerate(inputs.mentor_ids)}
+    mentee_index_map = {mid: j for j, mid in enumerate(inputs.mentee_ids)}
+
+    # Feasible pairs per mentor, best score first
+    rows: List[List[tuple]] = [[] for _ in range(n)]
+    for pair, acceptability in inputs.acceptability.items():
+        if acceptability == "MUTUAL" and not inputs.same_org[pair]:
+            mentor_id, mentee_id = pair
+            rows[mentor_index_map[mentor_id]].append(
+                (-inputs.score[pair], mentee_index_map[mentee_id])
+            )
+    for row in rows:
+        row.sort()
+    neg_scores = [[neg for neg, _ in row] for row in rows]
+    adj = [[j for _, j in row] for row in rows]
+
+    # The floor can't exceed anyone's best option
+    col_best = [None] * n
+    for row in rows:
+        for neg, j in row:
+            if col_best[j] is None or -neg > col_best[j]:
+                col_best[j] = -neg
+    if any(not row for row in rows) or any(best is None for best in col_best):
+        return _failed(
+            {
+                "reason": "INFEASIBLE",
+                "mentors_count": n,
+                "mentees_count": n,
+                "zero_mentor_options": [
+                    {"id": inputs.mentor_ids[i]} for i, row in enumerate(rows) if not row
+                ],
+                "zero_mentee_options": [
+                    {"id": inputs.mentee_ids[j]} for j, best in enumerate(col_best) if best is None
+                ],
+            }
+        )
+    upper = min(min(-row[0][0] for row in rows), min(col_best))
+    lower = min(-row[-1][0] for row in rows)
+
+    match_l = [-1] * n
+    match_r = [-1] * n
+    checks = 0
+
+    def perfect_at(threshold: int) -> bool:
+        nonlocal checks
+        checks += 1
+        cut = [bisect.bisect_right(row, -threshold) for row in neg_scores]
+        # Drop pairs below the threshold, keep the rest as a warm start
+        for i in range(n):
+            j = match_l[i]
+            if j != -1 and inputs.score[(inputs.mentor_ids[i], inputs.mentee_ids[j])] < threshold:
+                match_l[i] = -1
+                match_r[j] = -1
+        return maximum_matching(adj, cut, match_l, match_r) == n
+
+    # Highest feasible threshold. Scores are integers, so the search runs over
+    # the score range. Checks start high, where the graph is sparse, and the
+    # lowest threshold is only checked if nothing else works.
+    lo, hi = lower, upper
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if perfect_at(mid):
+            lo = mid
+        else:
+            hi = mid - 1
+
+    if lo == lower and not perfect_at(lower):
+        solve_time = time.time() - start_time
+        return _failed(
+            {
+                "reason": "INFEASIBLE",
+                "mentors_count": n,
+                "mentees_count": n,
+                "matched_count": sum(1 for j in match_l if j != -1),
+                "solve_time": solve_time,
+            },
+            solve_time,
+        )
+    floor = lo
+
+    # Maximize total score above the floor
+    left, right, costs = [], [], []
+    for i in range(n):
+        cut = bisect.bisect_right(neg_scores[i], -floor)
+        left.extend([i] * cut)
+        right.extend(adj[i][:cut])
+        costs.extend(neg_scores[i][:cut])
+
+    assignment = linear_sum_assignment.SimpleLinearSumAssignment()
+    assignment.add_arcs_with_cost(left, right, costs)
+    status = assignment.solve()
+    solve_time = time.time() - start_time
+
+    logger.info(
+        f"Fair solver status: {status}, floor: {floor}, "
+        f"{checks} threshold checks, time: {solve_time:.2f}s"
+    )
+
+    if status != assignment.OPTIMAL:
+        return _failed(
+            {
+                "reason": "INFEASIBLE" if status == assignment.INFEASIBLE else "OVERFLOW",
+                "mentors_count": n,
+                "mentees_count": n,
+                "solve_time": solve_time,
+            },
+            solve_time,
+        )
+
+    score_scale = inputs.config.get("score_scale", 1000)
+    matches = []
+    total_score = 0
+    for i, mentor_id in enumerate(inputs.mentor_ids):
+        mentee_id = inputs.mentee_ids[assignment.right_mate(i)]
+        score = inputs.score[(mentor_id, mentee_id)] / score_scale
+        matches.append({"mentor_id": mentor_id, "mentee_id": mentee_id, "score": score})
+        total_score += score
+
+    min_score = min(match["score"] for match in matches)
+    logger.info(
+        f"Fair matching completed with {len(matches)} matches, "
+        f"min score: {min_score}, total score: {total_score}"
+    )
+
+    return FairSolverResult(
+        success=True,
+        matches=matches,
+        total_score=total_score,
+        avg_score=total_score / len(matches),
+        solve_time=solve_time,
+        min_score=min_score,
+        threshold_checks=checks,
+        failure_report={},
+    )
+
+
+def _failed(failure_report: Dict[str, Any], solve_time: float = 0) -> FairSolverResult:
+    logger.info(f"Fair solve failed: {failure_report['reason']}")
+    return FairSolverResult(
+        success=False,
+        matches=[],
+        total_score=0,
+        avg_score=0,
+        solve_time=solve_time,
+        min_score=0,
+        threshold_checks=0,
+        failure_report=failure_report,
+    )
@@ -0,0 +1,160 @@
+"""Min-cost-flow backend - strict and weighted exception runs as a flow network.
+
+Flow runs source -> mentor -> mentee -> sink, one unit per match. Each
+mentor -> mentee arc costs the pair's penalty minus its score, and each
+source -> mentor arc carries the mentor's capacity, so mentors can take
+several mentees and the cohort sides don't need to be the same size.
+"""
+
+import time
+import logging
+from typing import List
+from ortools.graph.python import min_cost_flow
+from ..data_prep import PreparedInputs
+from .assignment import (
+    build_arcs,
+    build_failure,
+    build_result,
+    infeasible_report,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_mentor_capacities(inputs: PreparedInputs) -> List[int]:
+    """Capacity of every mentor, in ``inputs.mentor_ids`` order."""
+    default = int(inputs.config.get("mentor_capacity", 1))
+    return [inputs.mentor_capacity.get(m, default) for m in inputs.mentor_ids]
+
+
+def needs_flow(inputs: PreparedInputs) -> bool:
+    """Whether a run uses capacities or partial matching, which only flow supports."""
+    return bool(inputs.config.get("allow_partial_matching", False)) or any(
+        capacity != 1 for capacity in get_mentor_capacities(inputs)
+    )
+
+
+def solve_min_cost_flow(inputs: PreparedInputs, strict: bool):
+    """
+    Solve a strict or weighted exception run as a min-cost flow.
+
+    This is a pure function that operates only on in-memory data.
+
+    Without ``allow_partial_matching`` every mentee is matched and every
+    mentor gets between one and their capacity of mentees; with it, as many
+    participants as possible are matched and the rest are reported unmatched.
+    With all capacities at one and equal sides both reduce to the usual
+    perfect matching.
+
+    Returns:
+        StrictSolverResult or ExceptionSolverResult with solution or failure report
+    """
+    n_mentors = len(inputs.mentor_ids)
+    n_mentees = len(inputs.mentee_ids)
+    partial = bool(inputs.config.get("allow_partial_matching", False))
+    capacities = get_mentor_capacities(inputs)
+
+    logger.info(
+        f"Solving {'strict' if strict else 'exception'} matching with the min-cost-flow backend "
+        f"for {n_mentors} mentors (capacity {sum(capacities)}) and {n_mentees} mentees"
+        f"{', partial' if partial else ''}"
+    )
+
+    if n_mentors == 0 or n_mentees == 0:
+        return build_failure(
+            inputs,
+            strict,
+            {
+                "reason": "NO_PARTICIPANTS",
+                "message": "No submitted participants found",
+            },
+        )
+
+    if any(capacity < 1 for capacity in capacities):
+        return build_failure(
+            inputs,
+            strict,
+            {
+                "reason": "INVALID_CONFIG",
+                "message": "Mentor capacities must be at least 1",
+            },
+        )
+
+    if not partial and not n_mentors <= n_mentees <= sum(capacities):
+        return build_failure(
+            inputs,
+            strict,
+            {
+                "reason": "COUNT_MISMATCH",
+                "mentors_count": n_mentors,
+                "mentees_count": n_mentees,
+                "mentor_capacity": sum(capacities),
+                "message": (
+                    f"{n_mentees} mentees can't be shared among {n_mentors} mentors "
+                    f"with total capacity {sum(capacities)}"
+                ),
+            },
+        )
+
+    start_time = time.time()
+    source = n_mentors + n_mentees
+    sink = source + 1
+
+    left, right, costs = build_arcs(inputs, strict)
+    flow = min_cost_flow.SimpleMinCostFlow()
+    pair_arcs = flow.add_arcs_with_capacity_and_unit_cost(
+        left, [n_mentors + j for j in right], [1] * len(left), costs
+    )
+    flow.add_arcs_with_capacity_and_unit_cost(
+        [n_mentors + j for j in range(n_mentees)],
+        [sink] * n_mentees,
+        [1] * n_mentees,
+        [0] * n_mentees,
+    )
+
+    if partial:
+        # Route as much flow as possible, cheapest first
+        flow.add_arcs_with_capacity_and_unit_cost(
+            [source] * n_mentors, list(range(n_mentors)), capacities, [0] * n_mentors
+        )
+        flow.set_node_supply(source, min(sum(capacities), n_mentees))
+        flow.set_node_supply(sink, -min(sum(capacities), n_mentees))
+        status = flow.solve_max_flow_with_min_cost()
+    else:
+        # Every mentor supplies their first unit directly; the source hands out
+        # the remaining mentees up to each mentor's spare capacity
+        flow.add_arcs_with_capacity_and_unit_cost(
+            [source] * n_mentors,
+            list(range(n_mentors)),
+            [capacity - 1 for capacity in capacities],
+            [0] * n_mentors,
+        )
+        for i in range(n_mentors):
+            flow.set_node_supply(i, 1)
+        flow.set_node_supply(source, n_mentees - n_mentors)
+        flow.set_node_supply(sink, -n_mentees)
+        status = flow.solve()
+    solve_time = time.time() - start_time
+
+    logger.info(f"Min-cost-flow backend status: {status}, time: {solve_time:.2f}s")
+
+    if status == flow.INFEASIBLE:
+        return build_failure(
+            inputs, strict, infeasible_report(inputs, left, right, solve_time), solve_time
+        )
+    if status != flow.OPTIMAL:
+        return build_failure(
+            inputs,
+            strict,
+            {
+                "reason": "OVERFLOW" if status == flow.BAD_COST_RANGE else "INFEASIBLE",
+                "mentors_count": n_mentors,
+                "mentees_count": n_mentees,
+                "solve_time": solve_time,
+            },
+            solve_time,
+        )
+
+    flows = flow.flows(pair_arcs)
+    chosen = [(left[k], right[k]) for k in range(len(left)) if flows[k] > 0]
+    return build_result(inputs, strict, chosen, solve_time)
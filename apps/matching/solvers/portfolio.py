@@ -0,0 +1,181 @@
+"""Portfolio solving - races the solver backends and keeps the first proof.
+
+Strict and weighted exception runs can be solved by CP-SAT, the assignment
+backend or the min-cost-flow backend, and which one is fastest depends on the
+cohort's shape. The portfolio starts every backend in its own process, takes
+the first conclusive answer (a proven optimum or a proof that no matching
+exists) and stops the others.
+"""
+
+import multiprocessing
+import queue
+import time
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional
+from ..data_prep import PreparedInputs
+from .assignment import build_failure, solve_assignment
+from .cpsat import SolutionListener
+from .exception import solve_exception
+from .flow import solve_min_cost_flow
+from .strict import solve_strict
+
+logger = logging.getLogger(__name__)
+
+# Backends for strict and exception runs
+BACKENDS = ("CPSAT", "ASSIGNMENT", "MIN_COST_FLOW")
+
+# Values of the solver_backend setting
+BACKEND_CHOICES = BACKENDS + ("PORTFOLIO",)
+
+# Failures that settle the race as firmly as a proven optimum
+CONCLUSIVE_FAILURES = ("INFEASIBLE", "COUNT_MISMATCH", "NO_PARTICIPANTS")
+
+# Seconds on top of the CP-SAT limit before an unfinished race is abandoned
+PORTFOLIO_GRACE_SECONDS = 30
+
+# Seconds between checks on the racing processes
+PORTFOLIO_POLL_INTERVAL = 0.05
+
+
+class PortfolioOutcome(NamedTuple):
+    """Winning result of a portfolio race."""
+
+    result: Any  # StrictSolverResult or ExceptionSolverResult
+    winner: str  # Backend whose result was kept, or "" if none finished
+    race: Dict[str, Any]  # Per-backend finish times and outcomes
+
+
+def solve_with_backend(
+    inputs: PreparedInputs,
+    mode: str,
+    backend: str,
+    listener: Optional[SolutionListener] = None,
+):
+    """
+    Solve a strict or exception run with one backend.
+
+    Only CP-SAT streams improving solutions to ``listener``; the other
+    backends return their optimum directly.
+
+    Returns:
+        StrictSolverResult or ExceptionSolverResult
+    """
+    strict = mode == "STRICT"
+    if backend == "ASSIGNMENT":
+        return solve_assignment(inputs, strict)
+    if backend == "MIN_COST_FLOW":
+        return solve_min_cost_flow(inputs, strict)
+    return solve_strict(inputs, listener) if strict else solve_exception(inputs, listener)
+
+
+def solve_portfolio(
+    inputs: PreparedInputs, mode: str, backends: List[str] = BACKENDS
+) -> PortfolioOutcome:
+    """
+    Race backends in parallel processes and keep the first conclusive result.
+
+    Each backend runs in a forked process, so the prepared inputs aren't
+    copied up front. If no backend is conclusive, the first successful result
+    is kept once they have all finished.
+
+    Returns:
+        PortfolioOutcome with the kept result and the race record
+    """
+    logger.info(f"Racing {', '.join(backends)} for {mode.lower()} matching")
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    processes = {
+        backend: context.Process(
+            target=_race_backend,
+            args=(results, inputs, mode, backend),
+            name=f"matching-{backend.lower()}",
+            daemon=True,
+        )
+        for backend in backends
+    }
+
+    start_time = time.time()
+    time_limit = inputs.config.get(
+        "strict_time_limit" if mode == "STRICT" else "exception_time_limit", 10
+    )
+    deadline = start_time + time_limit + PORTFOLIO_GRACE_SECONDS
+    for process in processes.values():
+        process.start()
+
+    race: Dict[str, Any] = {}
+    finished: Dict[str, Any] = {}
+    winner = ""
+    try:
+        while len(finished) < len(processes) and time.time() < deadline:
+            try:
+                backend, result = results.get(timeout=PORTFOLIO_POLL_INTERVAL)
+            except queue.Empty:
+                # A backend that died without reporting is out of the race
+                for backend, process in processes.items():
+                    if backend not in finished and not process.is_alive() and results.empty():
+                        finished[backend] = None
+                        race[backend] = {"status": "CRASHED", "time": time.time() - start_time}
+                continue
+
+            finished[backend] = result
+            race[backend] = {
+                "status": _describe(result),
+                "time": time.time() - start_time,
+                "solve_time": result.solve_time,
+            }
+            if _is_conclusive(result):
+                winner = backend
+                break
+    finally:
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in processes.values():
+            process.join()
+        results.close()
+        results.cancel_join_thread()
+
+    for backend in backends:
+        race.setdefault(backend, {"status": "CANCELLED", "time": time.time() - start_time})
+
+    if not winner:
+        # Nobody proved anything: keep the first answer that came back,
+        # preferring one with a matching
+        reported = [b for b, r in finished.items() if r is not None]
+        reported.sort(key=lambda b: not finished[b].success)
+        winner = reported[0] if reported else ""
+
+    logger.info(f"Portfolio winner: {winner or 'none'} ({race})")
+
+    if not winner:
+        result = build_failure(
+            inputs,
+            mode == "STRICT",
+            {
+                "reason": "TIMEOUT",
+                "mentors_count": len(inputs.mentor_ids),
+                "mentees_count": len(inputs.mentee_ids),
+                "solve_time": time.time() - start_time,
+            },
+            time.time() - start_time,
+        )
+        return PortfolioOutcome(result=result, winner="", race=race)
+    return PortfolioOutcome(result=finished[winner], winner=winner, race=race)
+
+
+def _race_backend(results, inputs: PreparedInputs, mode: str, backend: str) -> None:
+    """Process target: solve with one backend and report the result."""
+    results.put((backend, solve_with_backend(inputs, mode, backend)))
+
+
+def _is_conclusive(result) -> bool:
+    if result.success:
+        return result.optimal
+    return result.failure_report.get("reason") in CONCLUSIVE_FAILURES
+
+
+def _describe(result) -> str:
+    if result.success:
+        return "OPTIMAL" if result.optimal else "FEASIBLE"
+    return result.failure_report.get("reason", "FAILED")
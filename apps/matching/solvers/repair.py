@@ -0,0 +1,180 @@
+"""Repair solver - re-optimizes an assignment around pinned pairs."""
+
+import time
+import logging
+from typing import Dict, List, Any, NamedTuple
+from ortools.graph.python import linear_sum_assignment
+from ..data_prep import PreparedInputs
+from ..domain import classify_exception
+from .assignment import allowed_pairs
+
+logger = logging.getLogger(__name__)
+
+
+class RepairSolverResult(NamedTuple):
+    """Result from repair solver."""
+
+    success: bool
+    matches: List[Dict[str, Any]]  # Pairs for the participants that were not pinned
+    total_score: float
+    avg_score: float
+    solve_time: float
+    changed_count: int  # Free mentors whose partner differs from ``current``
+    unmatched_mentor_ids: List[int]
+    unmatched_mentee_ids: List[int]
+    failure_report: Dict[str, Any]  # Only populated when success=False
+
+
+def solve_repair(
+    inputs: PreparedInputs,
+    pinned: Dict[int, int],
+    current: Dict[int, int],
+    strict: bool = False,
+) -> RepairSolverResult:
+    """
+    Re-solve the participants that are not pinned, keeping pins fixed.
+
+    This is a pure function that operates only on in-memory data. Pinned
+    mentor -> mentee pairs are left out of the problem entirely, so they hold
+    as hard constraints. The remaining participants are matched optimally
+    under the objective of the run's mode: strict allows only mutual,
+    cross-organization pairs; otherwise every pair is allowed at its score
+    minus the exception penalty. When the free sides differ in size the
+    larger side keeps ``abs(difference)`` participants unmatched.
+
+    The remaining problem is a linear assignment, so it is solved exactly
+    with OR-Tools' assignment solver instead of CP-SAT. Ties are broken in
+    favour of ``current``, so an untouched assignment is returned unchanged.
+
+    Returns:
+        RepairSolverResult with solution or failure report
+    """
+    pinned_mentees = set(pinned.values())
+    free_mentors = [m for m in inputs.mentor_ids if m not in pinned]
+    free_mentees = [t for t in inputs.mentee_ids if t not in pinned_mentees]
+
+    logger.info(
+        f"Repairing {len(free_mentors)} mentors and {len(free_mentees)} mentees "
+        f"around {len(pinned)} pinned pairs"
+    )
+
+    if not free_mentors or not free_mentees:
+        return RepairSolverResult(
+            success=True,
+            matches=[],
+            total_score=0,
+            avg_score=0,
+            solve_time=0,
+            changed_count=sum(1 for m in free_mentors if m in current),
+            unmatched_mentor_ids=free_mentors,
+            unmatched_mentee_ids=free_mentees,
+            failure_report={},
+        )
+
+    # Costs mirror get_penalty_info; strict mode leaves exception pairs out.
+    # Weights are doubled so keeping a current pair breaks ties without
+    # outweighing any real score difference.
+    scores = inputs.score
+    left, right, costs = [], [], []
+    for i, j, penalty in allowed_pairs(inputs, free_mentors, free_mentees, strict):
+        mentor_id, mentee_id = free_mentors[i], free_mentees[j]
+        left.append(i)
+        right.append(j)
+        costs.append(
+            2 * (penalty - scores[(mentor_id, mentee_id)]) - (mentee_id == current.get(mentor_id))
+        )
+
+    # The assignment solver needs a square problem: pad the smaller side
+    # with dummy nodes that can take anyone at no cost
+    dummies = abs(len(free_mentors) - len(free_mentees))
+    if len(free_mentors) < len(free_mentees):
+        for i in range(len(free_mentors), len(free_mentees)):
+            left.extend([i] * len(free_mentees))
+            right.extend(range(len(free_mentees)))
+            costs.extend([0] * len(free_mentees))
+    elif dummies:
+        for j in range(len(free_mentees), len(free_mentors)):
+            left.extend(range(len(free_mentors)))
+            right.extend([j] * len(free_mentors))
+            costs.extend([0] * len(free_mentors))
+
+    assignment = linear_sum_assignment.SimpleLinearSumAssignment()
+    assignment.add_arcs_with_cost(left, right, costs)
+
+    start_time = time.time()
+    size = max(len(free_mentors), len(free_mentees))
+    if len(set(left)) < size or len(set(right)) < size:
+        # Someone has no allowed partner; the solver mustn't see arc-less nodes
+        status = assignment.INFEASIBLE
+    else:
+        status = assignment.solve()
+    solve_time = time.time() - start_time
+
+    logger.info(f"Repair solver status: {status}, time: {solve_time:.3f}s")
+
+    if status != assignment.OPTIMAL:
+        failure_report = {
+            "reason": "INFEASIBLE" if status == assignment.INFEASIBLE else "OVERFLOW",
+            "mentors_count": len(free_mentors),
+            "mentees_count": len(free_mentees),
+            "pinned_count": len(pinned),
+            "solve_time": solve_time,
+        }
+        logger.info(f"Repair solve failed: {failure_report['reason']}")
+        return RepairSolverResult(
+            success=False,
+            matches=[],
+            total_score=0,
+            avg_score=0,
+            solve_time=solve_time,
+            changed_count=0,
+            unmatched_mentor_ids=[],
+            unmatched_mentee_ids=[],
+            failure_report=failure_report,
+        )
+
+    score_scale = inputs.config.get("score_scale", 1000)
+    matches = []
+    total_score = 0
+    changed_count = 0
+    matched_mentees = set()
+    for i, mentor_id in enumerate(free_mentors):
+        j = assignment.right_mate(i)
+        if j >= len(free_mentees):
+            changed_count += mentor_id in current
+            continue
+
+        mentee_id = free_mentees[j]
+        matched_mentees.add(mentee_id)
+        changed_count += current.get(mentor_id) != mentee_id
+        score = inputs.score[(mentor_id, mentee_id)] / score_scale
+        classification = classify_exception(mentor_id, mentee_id, inputs)
+        matches.append(
+            {
+                "mentor_id": mentor_id,
+                "mentee_id": mentee_id,
+                "score": score,
+                "exception_flag": classification.exception_type != "",
+                "exception_type": classification.exception_type,
+                "exception_reason": classification.reason,
+            }
+        )
+        total_score += score
+
+    logger.info(
+        f"Repair completed with {len(matches)} matches, {changed_count} changed"
+    )
+
+    matched_mentors = {m["mentor_id"] for m in matches}
+    return RepairSolverResult(
+        success=True,
+        matches=matches,
+        total_score=total_score,
+        avg_score=total_score / len(matches) if matches else 0,
+        solve_time=solve_time,
+        changed_count=changed_count,
+        unmatched_mentor_ids=[m for m in free_mentors if m not in matched_mentors],
+        unmatched_mentee_ids=[t for t in free_mentees if t not in matched_mentees],
+        failure_report={},
+    )
+
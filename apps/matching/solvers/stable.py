@@ -0,0 +1,225 @@
+"""Stable mode solver - deferred acceptance on preference ranks."""
+
+import statistics
+import time
+import logging
+from collections import deque
+from typing import Dict, List, Tuple, Any, NamedTuple
+from ..data_prep import PreparedInputs
+from ..domain import find_blocking_pairs
+
+logger = logging.getLogger(__name__)
+
+PROPOSING_SIDES = ("MENTOR", "MENTEE")
+
+
+class StableSolverResult(NamedTuple):
+    """Result from stable solver."""
+
+    success: bool
+    matches: List[Dict[str, Any]]  # List of match dictionaries
+    total_score: float
+    avg_score: float
+    solve_time: float
+    proposing_side: str  # "MENTOR" or "MENTEE"
+    blocking_pairs: List[Tuple[int, int]]  # (mentor_id, mentee_id)
+    rank_stats: Dict[str, Dict[str, Any]]  # Per side: matched, mean rank, ...
+    unmatched_mentor_ids: List[int]
+    unmatched_mentee_ids: List[int]
+    failure_report: Dict[str, Any]  # Only populated when success=False
+
+
+def solve_stable(inputs: PreparedInputs) -> StableSolverResult:
+    """
+    Solve stable matching with Gale-Shapley deferred acceptance.
+
+    This is a pure function that operates only on in-memory data. The side in
+    ``stable_proposing_side`` proposes down its preference lists; the result
+    is stable and optimal for the proposing side. A pair is acceptable only
+    when both participants ranked each other and they are in different
+    organizations, so every match is policy compliant. Participants who run
+    out of acceptable partners stay unmatched. Runs in O(N^2).
+
+    Returns:
+        StableSolverResult with solution or failure report
+    """
+    proposing_side = str(inputs.config.get("stable_proposing_side", "MENTOR")).upper()
+    logger.info(
+        f"Solving {proposing_side.lower()}-proposing stable matching for "
+        f"{len(inputs.mentor_ids)} mentors and {len(inputs.mentee_ids)} mentees"
+    )
+
+    if proposing_side not in PROPOSING_SIDES:
+        return _failed(
+            proposing_side,
+            {
+                "reason": "INVALID_CONFIG",
+                "message": f"stable_proposing_side must be one of {', '.join(PROPOSING_SIDES)}",
+            },
+        )
+
+    if not inputs.mentor_ids or not inputs.mentee_ids:
+        return _failed(
+            proposing_side,
+            {
+                "reason": "NO_PARTICIPANTS",
+                "message": "No submitted participants found",
+            },
+        )
+
+    start_time = time.time()
+
+    if proposing_side == "MENTOR":
+        proposers, acceptors = inputs.mentor_ids, inputs.mentee_ids
+    else:
+        proposers, acceptors = inputs.mentee_ids, inputs.mentor_ids
+
+    def same_org(proposer_id: int, acceptor_id: int) -> bool:
+        if proposing_side == "MENTOR":
+            return inputs.same_org[(proposer_id, acceptor_id)]
+        return inputs.same_org[(acceptor_id, proposer_id)]
+
+    # Acceptors' rank of each proposer they ranked
+    acceptor_ranks = {
+        acceptor_id: dict(
+            zip(inputs.preference_lists.get(acceptor_id, []), range(len(acceptors)))
+        )
+        for acceptor_id in acceptors
+    }
+    empty: List[int] = []
+    proposal_lists = {
+        proposer_id: inputs.preference_lists.get(proposer_id, empty)
+        for proposer_id in proposers
+    }
+
+    # Deferred acceptance. Unacceptable entries are skipped as they come up,
+    # so the lists are never filtered up front.
+    next_choice = {proposer_id: 0 for proposer_id in proposers}
+    held: Dict[int, int] = {}  # acceptor_id -> proposer_id
+    free = deque(proposers)
+    while free:
+        proposer_id = free.popleft()
+        choices = proposal_lists[proposer_id]
+        position = next_choice[proposer_id]
+        while position < len(choices):
+            acceptor_id = choices[position]
+            position += 1
+            if proposer_id in acceptor_ranks[acceptor_id] and not same_org(
+                proposer_id, acceptor_id
+            ):
+                break
+        else:
+            next_choice[proposer_id] = position
+            continue  # Ran out of acceptable partners
+        next_choice[proposer_id] = position
+
+        ranks = acceptor_ranks[acceptor_id]
+        current = held.get(acceptor_id)
+        if current is None:
+            held[acceptor_id] = proposer_id
+        elif ranks[proposer_id] < ranks[current]:
+            held[acceptor_id] = proposer_id
+            free.append(current)
+        else:
+            free.append(proposer_id)
+
+    solve_time = time.time() - start_time
+
+    if proposing_side == "MENTOR":
+        pairs = sorted((mentor_id, mentee_id) for mentee_id, mentor_id in held.items())
+    else:
+        pairs = sorted(held.items())
+
+    if not pairs:
+        return _failed(
+            proposing_side,
+            {
+                "reason": "NO_ACCEPTABLE_PAIRS",
+                "message": "No mentor and mentee in different organizations ranked each other",
+                "solve_time": solve_time,
+            },
+            solve_time,
+        )
+
+    score_scale = inputs.config.get("score_scale", 1000)
+    matches = []
+    total_score = 0
+    for mentor_id, mentee_id in pairs:
+        score = inputs.score[(mentor_id, mentee_id)] / score_scale
+        matches.append(
+            {
+                "mentor_id": mentor_id,
+                "mentee_id": mentee_id,
+                "score": score,
+                "exception_flag": False,
+                "exception_type": "",
+                "exception_reason": "",
+            }
+        )
+        total_score += score
+
+    partner = dict(pairs)
+    partner.update((mentee_id, mentor_id) for mentor_id, mentee_id in pairs)
+    blocking_pairs = find_blocking_pairs(matches, inputs)
+
+    logger.info(
+        f"Stable matching completed in {solve_time:.3f}s with {len(matches)} matches, "
+        f"{len(blocking_pairs)} blocking pairs"
+    )
+
+    return StableSolverResult(
+        success=True,
+        matches=matches,
+        total_score=total_score,
+        avg_score=total_score / len(matches),
+        solve_time=solve_time,
+        proposing_side=proposing_side,
+        blocking_pairs=blocking_pairs,
+        rank_stats={
+            "mentor": _rank_statistics(inputs.mentor_ids, partner, inputs),
+            "mentee": _rank_statistics(inputs.mentee_ids, partner, inputs),
+        },
+        unmatched_mentor_ids=[m for m in inputs.mentor_ids if m not in partner],
+        unmatched_mentee_ids=[t for t in inputs.mentee_ids if t not in partner],
+        failure_report={},
+    )
+
+
+def _rank_statistics(
+    participant_ids: List[int], partner: Dict[int, int], inputs: PreparedInputs
+) -> Dict[str, Any]:
+    """Summarize the rank each participant gave their match (1 = first choice)."""
+    ranks = []
+    for participant_id in participant_ids:
+        if participant_id in partner:
+            ranks.append(
+                inputs.preference_lists[participant_id].index(partner[participant_id]) + 1
+            )
+
+    return {
+        "matched": len(ranks),
+        "unmatched": len(participant_ids) - len(ranks),
+        "first_choice": sum(1 for rank in ranks if rank == 1),
+        "mean_rank": round(statistics.mean(ranks), 2) if ranks else None,
+        "median_rank": statistics.median(ranks) if ranks else None,
+        "worst_rank": max(ranks) if ranks else None,
+    }
+
+
+def _failed(
+    proposing_side: str, failure_report: Dict[str, Any], solve_time: float = 0
+) -> StableSolverResult:
+    logger.info(f"Stable solve failed: {failure_report['reason']}")
+    return StableSolverResult(
+        success=False,
+        matches=[],
+        total_score=0,
+        avg_score=0,
+        solve_time=solve_time,
+        proposing_side=proposing_side,
+        blocking_pairs=[],
+        rank_stats={},
+        unmatched_mentor_ids=[],
+        unmatched_mentee_ids=[],
+        failure_report=failure_report,
+    )
@@ -2,9 +2,12 @@
 
 import time
 import logging
-from typing import Dict, List, Tuple, Any, NamedTuple
+from typing import Dict, List, Tuple, Any, NamedTuple, Optional
 from ortools.sat.python import cp_model
 from ..data_prep import PreparedInputs
+from ..presolve import PresolveResult, presolve_assignment
+from ..timing import span
+from .cpsat import SolutionListener, add_solver_stats, create_cp_solver, solve_streaming
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +21,25 @@ class StrictSolverResult(NamedTuple):
     avg_score: float
     solve_time: float
     failure_report: Dict[str, Any]  # Only populated when success=False
+    presolve: Dict[str, Any] = {}  # How much presolve shrank the problem
+    solver_log: str = ""  # CP-SAT search log, when solver_log_search is on
+    solver_stats: Dict[str, Any] = {}  # CP-SAT search statistics, see add_solver_stats
+    optimal: bool = False  # Whether the solution is proven optimal
+    unmatched_mentor_ids: List[int] = []  # Only with partial matching
+    unmatched_mentee_ids: List[int] = []  # Only with partial matching
 
 
-def solve_strict(inputs: PreparedInputs) -> StrictSolverResult:
+def solve_strict(
+    inputs: PreparedInputs, listener: Optional[SolutionListener] = None
+) -> StrictSolverResult:
     """
     Solve strict matching problem using OR-Tools CP-SAT.
 
     This is a pure function that operates only on in-memory data.
+    Unless ``strict_presolve`` is off, forced assignments are fixed and pairs
+    that fit in no perfect matching are dropped before the model is built.
+    With a ``listener``, each improving matching is handed to it during the
+    search, and the listener can stop the search early.
 
     Returns:
         StrictSolverResult with solution or failure report
@@ -71,70 +86,60 @@ def solve_strict(inputs: PreparedInputs) -> StrictSolverResult:
             },
         )
 
-    # Create the model
-    model = cp_model.CpModel()
-
-    # Create variables
-    x = {}  # x[i,j] = 1 if mentor i is matched to mentee j
-    mentor_index_map = {mid: i for i, mid in enumerate(inputs.mentor_ids)}
-    mentee_index_map = {mid: j for j, mid in enumerate(inputs.mentee_ids)}
-
-    for mentor_id in inputs.mentor_ids:
-        i = mentor_index_map[mentor_id]
-        for mentee_id in inputs.mentee_ids:
-            j = mentee_index_map[mentee_id]
-            if feasible_pairs[(mentor_id, mentee_id)]:
-                x[(i, j)] = model.NewBoolVar(f"x[{i},{j}]")
-            # For infeasible pairs, we don't create variables (implicitly 0)
-
-    # Assignment constraints
-    # Each mentor matched exactly once
-    for mentor_id in inputs.mentor_ids:
-        i = mentor_index_map[mentor_id]
-        feasible_mentee_indices = [
-            mentee_index_map[mentee_id]
+    # Shrink the problem before modelling it
+    allowed = {
+        mentor_id: [
+            mentee_id
             for mentee_id in inputs.mentee_ids
             if feasible_pairs[(mentor_id, mentee_id)]
         ]
-        if feasible_mentee_indices:
-            model.AddExactlyOne(x[(i, j)] for j in feasible_mentee_indices)
-        else:
-            # If no feasible mentees, add explicit infeasible constraint (0 = 1)
-            model.Add(sum([]) == 1)  # This makes the model infeasible
-
-    # Each mentee matched exactly once
-    for mentee_id in inputs.mentee_ids:
-        j = mentee_index_map[mentee_id]
-        feasible_mentor_indices = [
-            mentor_index_map[mentor_id]
-            for mentor_id in inputs.mentor_ids
-            if feasible_pairs[(mentor_id, mentee_id)]
-        ]
-        if feasible_mentor_indices:
-            model.AddExactlyOne(x[(i, j)] for i in feasible_mentor_indices)
-        else:
-            # If no feasible mentors, add explicit infeasible constraint (0 = 1)
-            model.Add(sum([]) == 1)  # This makes the model infeasible
-
-    # Objective: maximize total score
-    if x:  # Only if we have variables
-        model.Maximize(
-            sum(
-                x[(i, j)] * inputs.score[(mentor_id, mentee_id)]
-                for (i, j), var in x.items()
-                for mentor_id, mentee_id in [
-                    (inputs.mentor_ids[i], inputs.mentee_ids[j])
-                ]
-            )
+        for mentor_id in inputs.mentor_ids
+    }
+    if inputs.config.get("strict_presolve", True):
+        if listener is not None:
+            listener.on_phase("PRESOLVE")
+        with span("presolve"):
+            presolved = presolve_assignment(inputs.mentor_ids, inputs.mentee_ids, allowed)
+    else:
+        presolved = PresolveResult(
+            feasible=True,
+            forced_pairs=[],
+            mentor_ids=list(inputs.mentor_ids),
+            mentee_ids=list(inputs.mentee_ids),
+            allowed=allowed,
+            stats={},
         )
 
+    # Create the model
+    if listener is not None:
+        listener.on_phase("BUILD")
+    with span("build_model"):
+        model, x = _build_model(inputs, presolved)
+
     # Solve
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = inputs.config.get("strict_time_limit", 5)
+    solver_log: List[str] = []
+    solver = create_cp_solver(
+        inputs.config, inputs.config.get("strict_time_limit", 5), solver_log
+    )
 
     start_time = time.time()
-    status = solver.Solve(model)
+    with span("cpsat_solve"):
+        if listener is not None:
+            listener.on_phase("SOLVE")
+            status = solve_streaming(
+                solver,
+                model,
+                x,
+                listener,
+                lambda chosen: list(presolved.forced_pairs)
+                + [(inputs.mentor_ids[i], inputs.mentee_ids[j]) for i, j in chosen],
+                sum(inputs.score[pair] for pair in presolved.forced_pairs),
+            )
+        else:
+            status = solver.Solve(model)
     solve_time = time.time() - start_time
+    solver_stats: Dict[str, Any] = {}
+    add_solver_stats(solver_stats, solver, model, status)
 
     logger.info(f"Strict solver status: {status}, time: {solve_time:.2f}s")
 
@@ -143,17 +148,19 @@ def solve_strict(inputs: PreparedInputs) -> StrictSolverResult:
         matches = []
         total_score = 0
 
-        for (i, j), var in x.items():
-            if solver.Value(var) == 1:
-                mentor_id = inputs.mentor_ids[i]
-                mentee_id = inputs.mentee_ids[j]
-                score = inputs.score[(mentor_id, mentee_id)] / inputs.config.get(
-                    "score_scale", 1000
-                )
-                matches.append(
-                    {"mentor_id": mentor_id, "mentee_id": mentee_id, "score": score}
-                )
-                total_score += score
+        chosen = list(presolved.forced_pairs) + [
+            (inputs.mentor_ids[i], inputs.mentee_ids[j])
+            for (i, j), var in x.items()
+            if solver.Value(var) == 1
+        ]
+        for mentor_id, mentee_id in chosen:
+            score = inputs.score[(mentor_id, mentee_id)] / inputs.config.get(
+                "score_scale", 1000
+            )
+            matches.append(
+                {"mentor_id": mentor_id, "mentee_id": mentee_id, "score": score}
+            )
+            total_score += score
 
         avg_score = total_score / len(matches) if matches else 0
 
@@ -168,6 +175,10 @@ def solve_strict(inputs: PreparedInputs) -> StrictSolverResult:
             avg_score=avg_score,
             solve_time=solve_time,
             failure_report={},
+            presolve=presolved.stats,
+            solver_log="\n".join(solver_log),
+            solver_stats=solver_stats,
+            optimal=status == cp_model.OPTIMAL,
         )
 
     else:
@@ -179,6 +190,8 @@ def solve_strict(inputs: PreparedInputs) -> StrictSolverResult:
             "feasible_pairs_count": feasible_count,
             "solve_time": solve_time,
         }
+        if presolved.stats:
+            failure_report["presolve"] = presolved.stats
 
         # Add diagnostics about blockers
         # Count mentors/mentees with zero feasible options
@@ -214,9 +227,76 @@ def solve_strict(inputs: PreparedInputs) -> StrictSolverResult:
             avg_score=0,
             solve_time=solve_time,
             failure_report=failure_report,
+            solver_log="\n".join(solver_log),
+            solver_stats=solver_stats,
         )
 
 
+def _build_model(
+    inputs: PreparedInputs, presolved: PresolveResult
+) -> Tuple[cp_model.CpModel, Dict]:
+    """
+    Build the strict model over the pairs presolve left.
+
+    Returns:
+        Tuple of (model, x) where x[i, j] = 1 if mentor i is matched to mentee j
+    """
+    model = cp_model.CpModel()
+
+    # Create variables
+    x = {}  # x[i,j] = 1 if mentor i is matched to mentee j
+    mentor_index_map = {mid: i for i, mid in enumerate(inputs.mentor_ids)}
+    mentee_index_map = {mid: j for j, mid in enumerate(inputs.mentee_ids)}
+
+    for mentor_id in presolved.mentor_ids:
+        i = mentor_index_map[mentor_id]
+        for mentee_id in presolved.allowed[mentor_id]:
+            j = mentee_index_map[mentee_id]
+            x[(i, j)] = model.NewBoolVar(f"x[{i},{j}]")
+        # Pairs left out get no variable (implicitly 0)
+
+    # Assignment constraints
+    # Each mentor matched exactly once
+    mentor_vars = {mentor_index_map[m]: [] for m in presolved.mentor_ids}
+    mentee_vars = {mentee_index_map[t]: [] for t in presolved.mentee_ids}
+    for (i, j), var in x.items():
+        mentor_vars[i].append(var)
+        mentee_vars[j].append(var)
+
+    for variables in mentor_vars.values():
+        if variables:
+            model.AddExactlyOne(variables)
+        else:
+            # If no feasible mentees, add explicit infeasible constraint (0 = 1)
+            model.Add(sum([]) == 1)  # This makes the model infeasible
+
+    # Each mentee matched exactly once
+    for variables in mentee_vars.values():
+        if variables:
+            model.AddExactlyOne(variables)
+        else:
+            # If no feasible mentors, add explicit infeasible constraint (0 = 1)
+            model.Add(sum([]) == 1)  # This makes the model infeasible
+
+    if not presolved.feasible:
+        # Presolve found a participant who can't be matched
+        model.Add(sum([]) == 1)
+
+    # Objective: maximize total score
+    if x:  # Only if we have variables
+        model.Maximize(
+            sum(
+                x[(i, j)] * inputs.score[(mentor_id, mentee_id)]
+                for (i, j), var in x.items()
+                for mentor_id, mentee_id in [
+                    (inputs.mentor_ids[i], inputs.mentee_ids[j])
+                ]
+            )
+        )
+
+    return model, x
+
+
 def _get_strict_feasible_pairs(inputs: PreparedInputs) -> Dict[Tuple[int, int], bool]:
     """
     Determine which pairs are feasible in strict mode.
@@ -0,0 +1,227 @@
+"""Score-aware swap-chain suggestions for manual overrides.
+
+Overriding mentor M onto mentee T displaces T's current mentor M0 and M's
+current mentee T0. The suggestions repair that with either
+
+* a SWAP: M0 takes T0, or
+* a CYCLE: M0 takes Tx from a third pair (Mx, Tx) and Mx takes T0,
+
+ranked by exception impact and then by the change in total pair score.
+Cycle candidates come from per-mentor and per-mentee top-k score lists. These
+are read with two window queries and cached per cohort, so a suggestion only
+has to score O(k) candidates instead of scanning the whole score matrix.
+"""
+
+import logging
+from typing import Dict, List, NamedTuple, Set, Tuple
+from django.core.cache import cache
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from apps.core.models import Participant
+from apps.matching.domain import get_exception_priority
+from apps.matching.models import MatchRun, PairScore
+from apps.matching.override_engine import CohortIndex, get_cohort_index
+
+logger = logging.getLogger(__name__)
+
+# Candidates kept per mentor and per mentee
+SWAP_TOP_K = 20
+
+# Suggestions returned for one override
+SWAP_SUGGESTION_LIMIT = 5
+
+# Seconds the top-k lists stay cached
+SCORE_NEIGHBORS_TIMEOUT = 3600
+
+
+class ScoreNeighbors(NamedTuple):
+    """Best-scoring partners of every participant in a cohort."""
+
+    cohort_id: int
+    k: int
+    top_mentees: Dict[int, List[int]]  # mentor_id -> mentee ids, best first
+    top_mentors: Dict[int, List[int]]  # mentee_id -> mentor ids, best first
+
+
+class SwapSuggestion(NamedTuple):
+    """One way to re-pair the participants an override displaces."""
+
+    kind: str  # "SWAP" or "CYCLE"
+    pairs: List[Tuple[int, int]]  # (mentor_id, mentee_id) pairs besides the override
+    exception_types: List[str]  # Classification of each pair in ``pairs``
+    score_delta: float  # Total pair score after the move minus before
+    exception_delta: int  # Change in summed exception severity
+
+
+def build_score_neighbors(cohort_id: int, k: int = SWAP_TOP_K) -> ScoreNeighbors:
+    """Read the top-k partners of every mentor and mentee (two queries)."""
+
+    def top_k(partition: str, partner: str) -> Dict[int, List[int]]:
+        rows = (
+            PairScore.objects.filter(cohort_id=cohort_id)
+            .annotate(
+                position=Window(
+                    RowNumber(),
+                    partition_by=[F(partition)],
+                    order_by=[F("score").desc(), F(partner).asc()],
+                )
+            )
+            .filter(position__lte=k)
+            .order_by(partition, "position")
+            .values_list(partition, partner)
+        )
+        neighbors: Dict[int, List[int]] = {}
+        for owner_id, partner_id in rows:
+            neighbors.setdefault(owner_id, []).append(partner_id)
+        return neighbors
+
+    return ScoreNeighbors(
+        cohort_id=cohort_id,
+        k=k,
+        top_mentees=top_k("mentor_id", "mentee_id"),
+        top_mentors=top_k("mentee_id", "mentor_id"),
+    )
+
+
+def _version_key(cohort_id: int) -> str:
+    return f"matching:score-neighbors-version:{cohort_id}"
+
+
+def get_score_neighbors(cohort_id: int, k: int = SWAP_TOP_K) -> ScoreNeighbors:
+    """Return the cached top-k lists for a cohort, reading them on a miss."""
+    version = cache.get(_version_key(cohort_id), 0)
+    key = f"matching:score-neighbors:{cohort_id}:{k}:{version}"
+
+    neighbors = cache.get(key)
+    if neighbors is None:
+        neighbors = build_score_neighbors(cohort_id, k)
+        cache.set(key, neighbors, SCORE_NEIGHBORS_TIMEOUT)
+        logger.info(
+            f"Compiled top-{k} score lists for cohort {cohort_id} "
+            f"({len(neighbors.top_mentees)} mentors)"
+        )
+    return neighbors
+
+
+def invalidate_score_neighbors(cohort_id: int) -> None:
+    """Make the cached top-k lists of a cohort stale."""
+    key = _version_key(cohort_id)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add and incr
+        cache.set(key, 1, None)
+
+
+def suggest_swap_chains(
+    match_run: MatchRun,
+    mentor: Participant,
+    mentee: Participant,
+    limit: int = SWAP_SUGGESTION_LIMIT,
+    k: int = SWAP_TOP_K,
+) -> List[SwapSuggestion]:
+    """
+    Rank the SWAP and CYCLE moves that complete an override.
+
+    Suggestions are sorted by exception impact (lower first) and then by score
+    delta (higher first). Only overrides that displace someone on both sides
+    have anything to complete.
+
+    Returns:
+        Up to ``limit`` suggestions, best first
+    """
+    index = get_cohort_index(match_run)
+    mentor_id, mentee_id = mentor.id, mentee.id
+    partners = index.swap_partners(mentor_id, mentee_id)
+    if partners is None:
+        return []
+    displaced_mentor, displaced_mentee = partners
+
+    neighbors = get_score_neighbors(match_run.cohort_id, k)
+    excluded_mentors = {mentor_id, displaced_mentor}
+    excluded_mentees = {mentee_id, displaced_mentee}
+
+    # Third pairs whose mentee the displaced mentor likes, or whose mentor
+    # likes the displaced mentee
+    third_pairs: Set[Tuple[int, int]] = set()
+    for candidate in neighbors.top_mentees.get(displaced_mentor, []):
+        owner = index.mentee_to_mentor.get(candidate)
+        if owner is not None:
+            third_pairs.add((owner, candidate))
+    for candidate in neighbors.top_mentors.get(displaced_mentee, []):
+        current = index.mentor_to_mentee.get(candidate)
+        if current is not None:
+            third_pairs.add((candidate, current))
+    third_pairs = {
+        (m, t)
+        for m, t in third_pairs
+        if m not in excluded_mentors and t not in excluded_mentees
+    }
+
+    scores = _get_pair_scores(
+        match_run.cohort_id,
+        excluded_mentors | {m for m, _ in third_pairs},
+        excluded_mentees | {t for _, t in third_pairs},
+    )
+
+    # The override itself is common to every suggestion
+    base_removed = [(mentor_id, displaced_mentee), (displaced_mentor, mentee_id)]
+    base_added = [(mentor_id, mentee_id)]
+
+    moves = [("SWAP", [(displaced_mentor, displaced_mentee)], [])]
+    for third_mentor, third_mentee in sorted(third_pairs):
+        moves.append(
+            (
+                "CYCLE",
+                [(displaced_mentor, third_mentee), (third_mentor, displaced_mentee)],
+                [(third_mentor, third_mentee)],
+            )
+        )
+
+    suggestions = [
+        _build_suggestion(index, scores, kind, pairs, base_added, base_removed + removed)
+        for kind, pairs, removed in moves
+    ]
+    suggestions.sort(key=lambda s: (s.exception_delta, -s.score_delta))
+    return suggestions[:limit]
+
+
+def _get_pair_scores(
+    cohort_id: int, mentor_ids: Set[int], mentee_ids: Set[int]
+) -> Dict[Tuple[int, int], float]:
+    """Scores of every pair between a few mentors and mentees (one query)."""
+    return {
+        (m, t): score
+        for m, t, score in PairScore.objects.filter(
+            cohort_id=cohort_id,
+            mentor_id__in=mentor_ids,
+            mentee_id__in=mentee_ids,
+        ).values_list("mentor_id", "mentee_id", "score")
+    }
+
+
+def _build_suggestion(
+    index: CohortIndex,
+    scores: Dict[Tuple[int, int], float],
+    kind: str,
+    pairs: List[Tuple[int, int]],
+    added: List[Tuple[int, int]],
+    removed: List[Tuple[int, int]],
+) -> SwapSuggestion:
+    added = added + pairs
+    exception_types = [index.classify(m, t)[0] for m, t in pairs]
+    severity = sum(
+        get_exception_priority(index.classify(m, t)[0]) for m, t in added
+    ) - sum(get_exception_priority(index.classify(m, t)[0]) for m, t in removed)
+    score_delta = sum(scores.get(pair, 0.0) for pair in added) - sum(
+        scores.get(pair, 0.0) for pair in removed
+    )
+    return SwapSuggestion(
+        kind=kind,
+        pairs=pairs,
+        exception_types=exception_types,
+        score_delta=round(score_delta, 2),
+        exception_delta=severity,
+    )
+
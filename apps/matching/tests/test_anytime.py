@@ -0,0 +1,195 @@
+"""Tests for anytime solving with provisional snapshots."""
+
+import unittest
+from datetime import timedelta
+from django.test import TestCase, Client
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from apps.core.models import Cohort, Participant
+from apps.matching.data_prep import PreparedInputs
+from apps.matching.models import MatchRun
+from apps.matching.override_engine import get_cohort_index
+from apps.matching.service import (
+    STALE_RUN_SECONDS,
+    claim_next_match_run,
+    process_match_run,
+    queue_matching,
+    request_stop,
+)
+from apps.matching.solvers.cpsat import SolutionListener
+from apps.matching.solvers.exception import solve_exception
+from apps.matching.solvers.strict import solve_strict
+
+
+class RecordingListener(SolutionListener):
+    def __init__(self, stop=False):
+        self.solutions = []
+        self.stop = stop
+
+    def on_solution(self, pairs, objective, bound):
+        self.solutions.append((sorted(pairs), objective, bound))
+
+    def should_stop(self):
+        return self.stop
+
+
+def _inputs(**config):
+    mentor_ids = [1, 2, 3]
+    mentee_ids = [101, 102, 103]
+    pairs = [(m, t) for m in mentor_ids for t in mentee_ids]
+    base_config = {
+        "strict_time_limit": 5,
+        "exception_time_limit": 5,
+        "score_scale": 1000,
+        "penalty_org": 1000000,
+        "penalty_one_sided": 100000,
+        "penalty_neither": 300000,
+    }
+    base_config.update(config)
+    return PreparedInputs(
+        mentor_ids=mentor_ids,
+        mentee_ids=mentee_ids,
+        same_org={pair: pair == (1, 101) for pair in pairs},
+        acceptability={pair: "MUTUAL" for pair in pairs},
+        score={(m, t): 10000 * ((m * t) % 7) for m, t in pairs},
+        config=base_config,
+    )
+
+
+class TestSolutionStreaming(unittest.TestCase):
+    """Improving solutions reach the listener."""
+
+    def test_strict_streams_final_solution(self):
+        listener = RecordingListener()
+
+        result = solve_strict(_inputs(strict_presolve=False), listener)
+
+        self.assertTrue(result.success)
+        final_pairs, objective, bound = listener.solutions[-1]
+        self.assertEqual(final_pairs, sorted((m["mentor_id"], m["mentee_id"]) for m in result.matches))
+        self.assertEqual(objective, result.total_score * 1000)
+        self.assertEqual(bound, objective)
+
+    def test_strict_stream_includes_forced_pairs(self):
+        listener = RecordingListener()
+
+        result = solve_strict(_inputs(), listener)
+
+        final_pairs, objective, _ = listener.solutions[-1]
+        self.assertEqual(len(final_pairs), 3)
+        self.assertEqual(objective, result.total_score * 1000)
+
+    def test_exception_streams_and_stops(self):
+        listener = RecordingListener(stop=True)
+
+        result = solve_exception(_inputs(), listener)
+
+        self.assertTrue(result.success)
+        self.assertTrue(listener.solutions)
+        self.assertNotIn((1, 101), listener.solutions[-1][0])
+
+
+class AnytimeRunTest(TestCase):
+    """Test background runs with provisional snapshots."""
+
+    def setUp(self):
+        self.cohort = Cohort.objects.create(name="Anytime Cohort")
+        self.admin_user = User.objects.create_user("admin", "admin@test.com", "pass", is_staff=True)
+        for i, (name, role) in enumerate(
+            [("m1", "MENTOR"), ("m2", "MENTOR"), ("t1", "MENTEE"), ("t2", "MENTEE")]
+        ):
+            user = User.objects.create_user(name, f"{name}@test.com", "pass")
+            Participant.objects.create(
+                user=user,
+                cohort=self.cohort,
+                display_name=name.upper(),
+                role_in_cohort=role,
+                organization=f"Org{i}",
+                is_submitted=True,
+            )
+
+    def test_queued_run_streams_snapshots(self):
+        match_run = queue_matching(self.cohort, self.admin_user, "EXCEPTION", "CPSAT")
+        self.assertEqual(match_run.status, "QUEUED")
+
+        claimed = claim_next_match_run()
+        self.assertEqual(claimed.id, match_run.id)
+        self.assertEqual(claimed.status, "RUNNING")
+        self.assertIsNone(claim_next_match_run())
+
+        process_match_run(claimed)
+        match_run.refresh_from_db()
+
+        self.assertEqual(match_run.status, "SUCCESS")
+        self.assertGreaterEqual(match_run.progress["solutions"], 1)
+        self.assertEqual(match_run.progress["gap"], 0)
+        self.assertEqual(match_run.matches.count(), 2)
+
+    def test_final_matches_replace_cached_index(self):
+        match_run = queue_matching(self.cohort, self.admin_user, "EXCEPTION", "CPSAT")
+        claimed = claim_next_match_run()
+        self.assertEqual(get_cohort_index(claimed).mentor_to_mentee, {})
+
+        process_match_run(claimed)
+
+        index = get_cohort_index(MatchRun.objects.get(id=match_run.id))
+        self.assertEqual(
+            index.mentor_to_mentee,
+            dict(match_run.matches.values_list("mentor_id", "mentee_id")),
+        )
+        self.assertEqual(len(index.mentor_to_mentee), 2)
+
+    def test_stale_running_run_is_reclaimed(self):
+        match_run = queue_matching(self.cohort, self.admin_user, "EXCEPTION")
+        claim_next_match_run()
+
+        # The worker died without finishing; until it's stale no one takes over
+        self.assertIsNone(claim_next_match_run())
+
+        MatchRun.objects.filter(id=match_run.id).update(
+            updated_at=timezone.now() - timedelta(seconds=STALE_RUN_SECONDS + 1)
+        )
+        claimed = claim_next_match_run()
+        self.assertEqual(claimed.id, match_run.id)
+        self.assertIsNone(claim_next_match_run())
+
+        process_match_run(claimed)
+        match_run.refresh_from_db()
+        self.assertEqual(match_run.status, "SUCCESS")
+
+    def test_stop_before_start_cancels(self):
+        match_run = queue_matching(self.cohort, self.admin_user, "STRICT")
+
+        success, _ = request_stop(match_run)
+        process_match_run(claim_next_match_run())
+        match_run.refresh_from_db()
+
+        self.assertTrue(success)
+        self.assertEqual(match_run.status, "FAILED")
+        self.assertEqual(match_run.failure_report["reason"], "CANCELLED")
+
+    def test_finished_run_cannot_be_stopped(self):
+        match_run = MatchRun.objects.create(
+            cohort=self.cohort, created_by=self.admin_user, mode="STRICT", status="SUCCESS"
+        )
+
+        success, _ = request_stop(match_run)
+
+        self.assertFalse(success)
+
+    def test_views_queue_and_stop(self):
+        client = Client()
+        client.force_login(self.admin_user)
+
+        response = client.post(
+            reverse("admin_views:run_matching", args=[self.cohort.id]),
+            {"mode": "STRICT", "anytime": "1"},
+        )
+        match_run = MatchRun.objects.get(cohort=self.cohort)
+        self.assertRedirects(response, reverse("admin_views:match_results", args=[match_run.id]))
+        self.assertContains(client.get(response.url), 'data-testid="provisional-banner"')
+
+        client.post(reverse("admin_views:stop_match_run", args=[match_run.id]))
+        match_run.refresh_from_db()
+        self.assertTrue(match_run.stop_requested)
@@ -0,0 +1,125 @@
+"""Tests for the scale benchmark suite."""
+
+import unittest
+from collections import Counter
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.test import TestCase
+from apps.core.models import Participant
+from apps.matching.models import PairScore, Preference
+from benchmarks.cohorts import CohortSpec, generate_cohort
+from benchmarks.pipeline import compare_to_baseline, run_pipeline
+
+
+def _entry(size, **wall_times):
+    return {"size": size, "stages": {stage: {"wall_time": t} for stage, t in wall_times.items()}}
+
+
+class TestCompareToBaseline(unittest.TestCase):
+    """Test regression flagging."""
+
+    def test_flags_stage_over_tolerance(self):
+        regressions = compare_to_baseline(
+            [_entry(50, scoring=2.0, signature=1.1)],
+            [_entry(50, scoring=1.0, signature=1.0)],
+            tolerance=0.25,
+        )
+
+        self.assertEqual([(r["size"], r["stage"]) for r in regressions], [(50, "scoring")])
+        self.assertEqual(regressions[0]["slowdown"], 2.0)
+
+    def test_ignores_noise_on_fast_stages(self):
+        regressions = compare_to_baseline([_entry(50, persist=0.02)], [_entry(50, persist=0.01)])
+
+        self.assertEqual(regressions, [])
+
+    def test_ignores_sizes_and_stages_missing_from_baseline(self):
+        regressions = compare_to_baseline(
+            [_entry(50, solve=9.0), _entry(200, scoring=9.0)], [_entry(50, scoring=1.0)]
+        )
+
+        self.assertEqual(regressions, [])
+
+
+class GenerateCohortTest(TestCase):
+    """Test synthetic cohort generation."""
+
+    def test_sizes_and_list_lengths(self):
+        cohort = generate_cohort(CohortSpec(size=20, list_length=5))
+
+        participants = Participant.objects.filter(cohort=cohort)
+        self.assertEqual(participants.filter(role_in_cohort="MENTOR").count(), 20)
+        self.assertEqual(participants.filter(role_in_cohort="MENTEE").count(), 20)
+        counts = Counter(
+            Preference.objects.filter(from_participant__cohort=cohort).values_list(
+                "from_participant_id", flat=True
+            )
+        )
+        self.assertEqual(set(counts.values()), {5})
+
+    def test_unranked_participants_have_no_preferences(self):
+        cohort = generate_cohort(CohortSpec(size=10, unranked_rate=1.0))
+
+        self.assertFalse(Preference.objects.filter(from_participant__cohort=cohort).exists())
+
+    def test_skew_concentrates_preferences(self):
+        uniform = generate_cohort(CohortSpec(size=40, list_length=3, popularity_skew=0.0))
+        skewed = generate_cohort(CohortSpec(size=40, list_length=3, popularity_skew=2.0))
+
+        def top_share(cohort):
+            received = Counter(
+                Preference.objects.filter(from_participant__cohort=cohort).values_list(
+                    "to_participant_id", flat=True
+                )
+            )
+            return received.most_common(1)[0][1]
+
+        self.assertGreater(top_share(skewed), top_share(uniform))
+
+    def test_full_affinity_keeps_choices_in_org(self):
+        cohort = generate_cohort(CohortSpec(size=30, list_length=2, organizations=3, org_affinity=1.0))
+
+        cross_org = Preference.objects.filter(from_participant__cohort=cohort).exclude(
+            from_participant__organization=F("to_participant__organization")
+        )
+        self.assertFalse(cross_org.exists())
+
+    def test_full_reciprocity_ranks_admirers_back(self):
+        cohort = generate_cohort(CohortSpec(size=30, list_length=2, reciprocity=1.0))
+
+        mentees = set(
+            Participant.objects.filter(cohort=cohort, role_in_cohort="MENTEE").values_list(
+                "id", flat=True
+            )
+        )
+        pairs = set(
+            Preference.objects.filter(from_participant__cohort=cohort).values_list(
+                "from_participant_id", "to_participant_id"
+            )
+        )
+        admirers = Counter(target for chooser, target in pairs if target in mentees)
+        ranked_back = Counter(
+            chooser for chooser, target in pairs if chooser in mentees and (target, chooser) in pairs
+        )
+        # Each mentee fills its list with admirers while any are left
+        for mentee in mentees:
+            self.assertEqual(ranked_back[mentee], min(2, admirers[mentee]))
+
+
+class RunPipelineTest(TestCase):
+    """Test a small end-to-end benchmark run."""
+
+    def test_times_stages_and_skips_over_limit(self):
+        user = User.objects.create_user("bench", "bench@test.com", "pass")
+        spec = CohortSpec(size=4, list_length=4, config={"exception_time_limit": 2})
+
+        entry = run_pipeline(spec, user, limits={"scoring": 2, "STRICT": 2})
+
+        self.assertEqual(entry["skipped"], ["scoring", "STRICT"])
+        for stage in ("generate", "signature", "prepare_inputs", "EXCEPTION.solve", "EXCEPTION.persist"):
+            self.assertIn(stage, entry["stages"])
+            self.assertGreaterEqual(entry["stages"][stage]["wall_time"], 0)
+        self.assertEqual(entry["outcomes"]["EXCEPTION"]["status"], "SUCCESS")
+        self.assertIn("EXCEPTION.export", entry["stages"])
+        # Everyone ranks everyone, so every pair is seeded
+        self.assertEqual(PairScore.objects.count(), 16)
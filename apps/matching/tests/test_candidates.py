@@ -0,0 +1,130 @@
+"""Tests for top-k candidate sparsification of exception runs."""
+
+import unittest
+from unittest.mock import patch
+from apps.matching.data_prep import PreparedInputs
+from apps.matching.solvers.candidates import (
+    build_net_values,
+    find_reduced_cost_violations,
+    top_k_pairs,
+)
+from apps.matching.solvers import exception
+from apps.matching.solvers.exception import solve_exception
+
+
+def _inputs(scores, acceptability=None, **config):
+    mentor_ids = sorted({m for m, _ in scores})
+    mentee_ids = sorted({t for _, t in scores})
+    base_config = {
+        "exception_time_limit": 5,
+        "score_scale": 1000,
+        "penalty_org": 1000000,
+        "penalty_one_sided": 100000,
+        "penalty_neither": 300000,
+    }
+    base_config.update(config)
+    return PreparedInputs(
+        mentor_ids=mentor_ids,
+        mentee_ids=mentee_ids,
+        same_org={pair: False for pair in scores},
+        acceptability={pair: (acceptability or {}).get(pair, "MUTUAL") for pair in scores},
+        score=scores,
+        config=base_config,
+    )
+
+
+class TestCandidates(unittest.TestCase):
+    """Test candidate selection and the reduced-cost check."""
+
+    def test_net_values_subtract_penalties(self):
+        inputs = _inputs(
+            {(1, 101): 90000, (1, 102): 10000, (2, 101): 20000, (2, 102): 30000},
+            acceptability={(1, 101): "NEITHER"},
+        )
+
+        self.assertEqual(build_net_values(inputs), [[-210000, 10000], [20000, 30000]])
+
+    def test_top_k_takes_rows_and_columns(self):
+        values = [[9, 1, 0], [8, 2, 1], [7, 3, 2]]
+
+        # Row bests are all column 0; the other columns add their own best
+        self.assertEqual(top_k_pairs(values, 1), {(0, 0), (1, 0), (2, 0), (2, 1), (2, 2)})
+
+    def test_optimal_matching_has_no_violations(self):
+        values = [[9, 1], [1, 9]]
+
+        self.assertEqual(find_reduced_cost_violations(values, {(0, 0), (1, 1)}, [(0, 0), (1, 1)]), [])
+
+    def test_left_out_improvement_is_a_violation(self):
+        # Swapping to (0, 1) and (1, 0) gains 10
+        values = [[5, 10], [10, 5]]
+
+        violations = find_reduced_cost_violations(values, {(0, 0), (1, 1)}, [(0, 0), (1, 1)])
+
+        self.assertTrue(violations)
+        self.assertTrue(set(violations) <= {(0, 1), (1, 0)})
+
+    def test_suboptimal_matching_cannot_be_certified(self):
+        values = [[5, 10], [10, 5]]
+        candidates = {(0, 0), (0, 1), (1, 0), (1, 1)}
+
+        self.assertIsNone(find_reduced_cost_violations(values, candidates, [(0, 0), (1, 1)]))
+
+
+class TestSparseExceptionSolve(unittest.TestCase):
+    """Test sparsified exception solving end to end."""
+
+    def test_grows_k_until_optimal(self):
+        # Every participant's single best pair is with mentor 1 or mentee 101,
+        # so top-1 candidates have no perfect matching
+        scores = {
+            (1, 101): 99000, (1, 102): 90000, (1, 103): 80000,
+            (2, 101): 95000, (2, 102): 10000, (2, 103): 20000,
+            (3, 101): 85000, (3, 102): 30000, (3, 103): 40000,
+        }
+        sparse = solve_exception(_inputs(scores, exception_candidate_k=1))
+        full = solve_exception(_inputs(scores))
+
+        self.assertTrue(sparse.success)
+        self.assertTrue(sparse.optimal)
+        self.assertEqual(sparse.total_score, full.total_score)
+        self.assertTrue(sparse.sparsification["verified"])
+        self.assertGreater(len(sparse.sparsification["rounds"]), 1)
+        self.assertEqual(full.sparsification, {})
+
+    def test_verified_without_full_model(self):
+        scores = {
+            (m, t): 90000 if t - 100 == m else 10000 * ((m + t) % 3)
+            for m in range(1, 6)
+            for t in range(101, 106)
+        }
+
+        result = solve_exception(_inputs(scores, exception_candidate_k=1))
+
+        self.assertTrue(result.optimal)
+        self.assertEqual(result.sparsification["final_k"], 1)
+        self.assertEqual(len(result.sparsification["rounds"]), 1)
+        self.assertEqual(result.total_score, 450)
+
+    def test_deterministic_rounds_share_the_budget(self):
+        scores = {
+            (1, 101): 99000, (1, 102): 90000, (1, 103): 80000,
+            (2, 101): 95000, (2, 102): 10000, (2, 103): 20000,
+            (3, 101): 85000, (3, 102): 30000, (3, 103): 40000,
+        }
+        limits = []
+        create_cp_solver = exception.create_cp_solver
+
+        def record_limit(config, time_limit, log_lines=None):
+            limits.append(time_limit)
+            return create_cp_solver(config, time_limit, log_lines)
+
+        with patch.object(exception, "create_cp_solver", side_effect=record_limit):
+            result = solve_exception(
+                _inputs(scores, exception_candidate_k=1, solver_deterministic=True)
+            )
+
+        self.assertTrue(result.sparsification["verified"])
+        # k can grow 1 -> 2 -> 3, so each round gets a third of the 5 seconds
+        self.assertGreater(len(limits), 1)
+        self.assertEqual(set(limits), {5 / 3})
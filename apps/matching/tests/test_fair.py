@@ -0,0 +1,136 @@
+"""Tests for the fair (bottleneck) matching mode."""
+
+import unittest
+from django.test import TestCase
+from django.contrib.auth.models import User
+from apps.core.models import Cohort, Participant
+from apps.matching.data_prep import PreparedInputs
+from apps.matching.models import Preference
+from apps.matching.service import run_matching
+from apps.matching.solvers.fair import solve_fair
+
+
+def _inputs(scores, blocked=()):
+    mentor_ids = sorted({m for m, _ in scores})
+    mentee_ids = sorted({t for _, t in scores})
+    return PreparedInputs(
+        mentor_ids=mentor_ids,
+        mentee_ids=mentee_ids,
+        same_org={pair: False for pair in scores},
+        acceptability={
+            pair: "NEITHER" if pair in blocked else "MUTUAL" for pair in scores
+        },
+        score={pair: int(value * 1000) for pair, value in scores.items()},
+        config={"score_scale": 1000},
+    )
+
+
+class TestFairSolver(unittest.TestCase):
+    """Test cases for the bottleneck assignment solver."""
+
+    def test_raises_the_floor_before_the_total(self):
+        """The max-total matching leaves one poor match; fair mode avoids it."""
+        inputs = _inputs(
+            {
+                (1, 101): 100, (1, 102): 60,
+                (2, 101): 70, (2, 102): 10,
+            }
+        )
+
+        result = solve_fair(inputs)
+
+        self.assertTrue(result.success)
+        self.assertEqual(
+            [(m["mentor_id"], m["mentee_id"]) for m in result.matches],
+            [(1, 102), (2, 101)],
+        )
+        self.assertEqual(result.min_score, 60)
+        self.assertEqual(result.total_score, 130)
+
+    def test_maximizes_total_above_the_floor(self):
+        """Among matchings that reach the floor, the best total wins."""
+        inputs = _inputs(
+            {
+                (1, 101): 50, (1, 102): 90, (1, 103): 50,
+                (2, 101): 90, (2, 102): 50, (2, 103): 50,
+                (3, 101): 50, (3, 102): 50, (3, 103): 50,
+            }
+        )
+
+        result = solve_fair(inputs)
+
+        self.assertEqual(result.min_score, 50)
+        self.assertEqual(result.total_score, 230)
+
+    def test_only_strict_pairs_are_used(self):
+        """Pairs that aren't mutually ranked can't be matched."""
+        inputs = _inputs(
+            {(1, 101): 90, (1, 102): 20, (2, 101): 80, (2, 102): 30},
+            blocked={(1, 102)},
+        )
+
+        result = solve_fair(inputs)
+
+        self.assertEqual(
+            [(m["mentor_id"], m["mentee_id"]) for m in result.matches],
+            [(1, 101), (2, 102)],
+        )
+        self.assertEqual(result.min_score, 30)
+
+    def test_infeasible(self):
+        """Without a perfect matching the run fails like strict mode."""
+        inputs = _inputs(
+            {(1, 101): 90, (1, 102): 20, (2, 101): 80, (2, 102): 30},
+            blocked={(1, 102), (2, 102)},
+        )
+
+        result = solve_fair(inputs)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.failure_report["reason"], "INFEASIBLE")
+        self.assertEqual(result.failure_report["zero_mentee_options"], [{"id": 102}])
+
+
+class FairModeServiceTest(TestCase):
+    """Test running FAIR mode end to end."""
+
+    def test_run_matching_fair(self):
+        """Fair runs persist matches and the lowest matched score."""
+        cohort = Cohort.objects.create(name="Fair Cohort")
+        admin_user = User.objects.create_user("admin", "admin@test.com", "pass", is_staff=True)
+
+        participants = {}
+        for i, (name, role) in enumerate(
+            [("m1", "MENTOR"), ("m2", "MENTOR"), ("t1", "MENTEE"), ("t2", "MENTEE")]
+        ):
+            user = User.objects.create_user(name, f"{name}@test.com", "pass")
+            participants[name] = Participant.objects.create(
+                user=user,
+                cohort=cohort,
+                display_name=name.upper(),
+                role_in_cohort=role,
+                organization=f"Org{i}",
+                is_submitted=True,
+            )
+
+        for from_name, ranked in [
+            ("m1", ["t1", "t2"]),
+            ("m2", ["t1", "t2"]),
+            ("t1", ["m2", "m1"]),
+            ("t2", ["m1", "m2"]),
+        ]:
+            for rank, to_name in enumerate(ranked, start=1):
+                Preference.objects.create(
+                    from_participant=participants[from_name],
+                    to_participant=participants[to_name],
+                    rank=rank,
+                )
+
+        match_run = run_matching(cohort, admin_user, "FAIR")
+
+        self.assertEqual(match_run.status, "SUCCESS")
+        self.assertEqual(match_run.matches.count(), 2)
+        self.assertEqual(match_run.matches.filter(exception_flag=True).count(), 0)
+        lowest = min(match.score_percent for match in match_run.matches.all())
+        self.assertAlmostEqual(match_run.objective_summary["min_score"], lowest, places=1)
+        self.assertGreater(match_run.objective_summary["threshold_checks"], 0)
@@ -0,0 +1,165 @@
+"""Tests for mentor capacities and partial matching in the min-cost-flow backend."""
+
+import unittest
+from django.test import TestCase
+from django.contrib.auth.models import User
+from apps.core.models import Cohort, Participant
+from apps.matching.data_prep import PreparedInputs
+from apps.matching.models import MentorProfile
+from apps.matching.override import SHARED_MENTOR_MESSAGE, create_manual_override
+from apps.matching.service import run_matching
+from apps.matching.solvers.flow import needs_flow, solve_min_cost_flow
+
+
+def _inputs(mentor_ids, mentee_ids, scores, mentor_capacity=None, same_org_pairs=(), **config):
+    pairs = [(m, t) for m in mentor_ids for t in mentee_ids]
+    base_config = {
+        "score_scale": 1000,
+        "penalty_org": 1000000,
+        "penalty_one_sided": 100000,
+        "penalty_neither": 300000,
+    }
+    base_config.update(config)
+    return PreparedInputs(
+        mentor_ids=mentor_ids,
+        mentee_ids=mentee_ids,
+        same_org={pair: pair in same_org_pairs for pair in pairs},
+        acceptability={pair: "MUTUAL" for pair in pairs},
+        score={pair: scores.get(pair, 0) for pair in pairs},
+        config=base_config,
+        mentor_capacity=mentor_capacity or {},
+    )
+
+
+def _pairs(result):
+    return sorted((m["mentor_id"], m["mentee_id"]) for m in result.matches)
+
+
+class TestMentorCapacities(unittest.TestCase):
+    """Mentors with capacity take several mentees."""
+
+    SCORES = {
+        (1, 101): 90000, (1, 102): 80000, (1, 103): 70000,
+        (2, 101): 10000, (2, 102): 20000, (2, 103): 30000,
+    }
+
+    def test_capacity_lets_one_mentor_take_several_mentees(self):
+        inputs = _inputs([1, 2], [101, 102, 103], self.SCORES, mentor_capacity={1: 2})
+
+        result = solve_min_cost_flow(inputs, strict=True)
+
+        self.assertTrue(result.success)
+        self.assertEqual(_pairs(result), [(1, 101), (1, 102), (2, 103)])
+        self.assertEqual(result.total_score, 200)
+
+    def test_every_mentor_keeps_at_least_one_mentee(self):
+        """A generous capacity doesn't let the best mentor take everyone."""
+        inputs = _inputs([1, 2], [101, 102, 103], self.SCORES, mentor_capacity={1: 3})
+
+        result = solve_min_cost_flow(inputs, strict=True)
+
+        self.assertEqual(_pairs(result), [(1, 101), (1, 102), (2, 103)])
+
+    def test_default_capacity_from_config(self):
+        inputs = _inputs([1, 2], [101, 102, 103], self.SCORES)
+        inputs.config["mentor_capacity"] = 2
+
+        self.assertTrue(needs_flow(inputs))
+        self.assertTrue(solve_min_cost_flow(inputs, strict=True).success)
+
+    def test_too_little_capacity_is_count_mismatch(self):
+        inputs = _inputs([1, 2], [101, 102, 103], self.SCORES)
+
+        result = solve_min_cost_flow(inputs, strict=True)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.failure_report["reason"], "COUNT_MISMATCH")
+        self.assertEqual(result.failure_report["mentor_capacity"], 2)
+
+    def test_invalid_capacity(self):
+        inputs = _inputs([1, 2], [101, 102], self.SCORES, mentor_capacity={1: 0})
+
+        result = solve_min_cost_flow(inputs, strict=False)
+
+        self.assertEqual(result.failure_report["reason"], "INVALID_CONFIG")
+
+
+class TestPartialMatching(unittest.TestCase):
+    """Partial matching matches as many participants as it can."""
+
+    def test_unbalanced_cohort_reports_unmatched(self):
+        scores = {(1, 101): 50000, (1, 102): 90000, (1, 103): 10000}
+        inputs = _inputs([1], [101, 102, 103], scores, allow_partial_matching=True)
+
+        result = solve_min_cost_flow(inputs, strict=True)
+
+        self.assertTrue(result.success)
+        self.assertEqual(_pairs(result), [(1, 102)])
+        self.assertEqual(result.unmatched_mentor_ids, [])
+        self.assertEqual(result.unmatched_mentee_ids, [101, 103])
+
+    def test_maximizes_matches_before_score(self):
+        """Strict mode skips forbidden pairs and still matches everyone it can."""
+        scores = {(1, 101): 90000, (1, 102): 10000, (2, 101): 20000}
+        inputs = _inputs(
+            [1, 2, 3],
+            [101, 102],
+            scores,
+            same_org_pairs={(3, 101), (3, 102)},
+            allow_partial_matching=True,
+        )
+
+        result = solve_min_cost_flow(inputs, strict=True)
+
+        self.assertEqual(_pairs(result), [(1, 101), (2, 102)])
+        self.assertEqual(result.unmatched_mentor_ids, [3])
+
+
+class CapacityServiceTest(TestCase):
+    """Test capacity runs through run_matching."""
+
+    def setUp(self):
+        self.cohort = Cohort.objects.create(name="Capacity Cohort")
+        self.admin_user = User.objects.create_user("admin", "admin@test.com", "pass", is_staff=True)
+        self.participants = {}
+        for i, (name, role) in enumerate(
+            [("m1", "MENTOR"), ("m2", "MENTOR"), ("t1", "MENTEE"), ("t2", "MENTEE"), ("t3", "MENTEE")]
+        ):
+            user = User.objects.create_user(name, f"{name}@test.com", "pass")
+            self.participants[name] = Participant.objects.create(
+                user=user,
+                cohort=self.cohort,
+                display_name=name.upper(),
+                role_in_cohort=role,
+                organization=f"Org{i}",
+                is_submitted=True,
+            )
+        MentorProfile.objects.create(participant=self.participants["m1"], max_mentees=2)
+
+    def test_profile_capacity_routes_to_flow(self):
+        match_run = run_matching(self.cohort, self.admin_user, "EXCEPTION", "CPSAT")
+
+        self.assertEqual(match_run.status, "SUCCESS")
+        self.assertEqual(match_run.objective_summary["backend"], "MIN_COST_FLOW")
+        self.assertEqual(match_run.objective_summary["max_mentor_load"], 2)
+        self.assertEqual(match_run.matches.count(), 3)
+        self.assertEqual(match_run.matches.filter(mentor=self.participants["m1"]).count(), 2)
+
+    def test_overrides_refused_for_shared_mentors(self):
+        match_run = run_matching(self.cohort, self.admin_user, "EXCEPTION")
+
+        success, message, _ = create_manual_override(
+            match_run, self.participants["m2"], self.participants["t1"], "test", self.admin_user
+        )
+
+        self.assertFalse(success)
+        self.assertEqual(message, SHARED_MENTOR_MESSAGE)
+
+    def test_lexicographic_objective_rejected(self):
+        self.cohort.cohort_config = {"exception_objective": "LEXICOGRAPHIC"}
+        self.cohort.save()
+
+        match_run = run_matching(self.cohort, self.admin_user, "EXCEPTION")
+
+        self.assertEqual(match_run.status, "FAILED")
+        self.assertEqual(match_run.failure_report["reason"], "INVALID_CONFIG")
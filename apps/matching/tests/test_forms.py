@@ -86,3 +86,92 @@ class PreferencesFormTest(TestCase):
         ranks = list(preferences.values_list("rank", flat=True))
         self.assertIn(1, ranks)
         self.assertIn(2, ranks)
+
+    def test_save_writes_only_changed_rows(self):
+        """Re-saving applies a diff and records the exact change set."""
+        field1 = "candidate_{}".format(self.mentee1.id)
+        field2 = "candidate_{}".format(self.mentee2.id)
+
+        form = PreferencesForm(
+            data={field1: 1, field2: 2}, participant=self.mentor, candidates=self.candidates
+        )
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.assertEqual(
+            form.change_set.inserted, {self.mentee1.id: 1, self.mentee2.id: 2}
+        )
+        original_ids = set(
+            Preference.objects.filter(from_participant=self.mentor).values_list(
+                "id", flat=True
+            )
+        )
+
+        # Swap the ranks: two updates, no inserts or deletes
+        form = PreferencesForm(
+            data={field1: 2, field2: 1}, participant=self.mentor, candidates=self.candidates
+        )
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.assertEqual(
+            form.change_set.updated,
+            {self.mentee1.id: (1, 2), self.mentee2.id: (2, 1)},
+        )
+        self.assertEqual(form.change_set.inserted, {})
+        self.assertEqual(form.change_set.deleted, {})
+        self.assertEqual(
+            set(
+                Preference.objects.filter(from_participant=self.mentor).values_list(
+                    "id", flat=True
+                )
+            ),
+            original_ids,
+        )
+
+        # Clear one rank: a single delete
+        form = PreferencesForm(
+            data={field2: 1}, participant=self.mentor, candidates=self.candidates
+        )
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.assertEqual(form.change_set.deleted, {self.mentee1.id: 2})
+        self.assertEqual(form.change_set.changed_candidate_ids, [self.mentee1.id])
+
+    def test_unchanged_save_is_a_no_op(self):
+        """Saving identical ranks writes nothing; real changes send the signal."""
+        from apps.matching.signals import preferences_changed
+
+        field1 = "candidate_{}".format(self.mentee1.id)
+        Preference.objects.create(
+            from_participant=self.mentor, to_participant=self.mentee1, rank=1
+        )
+        received = []
+        preferences_changed.connect(
+            lambda sender, change_set, **kwargs: received.append(change_set),
+            weak=False,
+            dispatch_uid="test_unchanged_save",
+        )
+        self.addCleanup(
+            preferences_changed.disconnect, dispatch_uid="test_unchanged_save"
+        )
+
+        form = PreferencesForm(
+            data={field1: 1}, participant=self.mentor, candidates=self.candidates
+        )
+        self.assertTrue(form.is_valid())
+        with self.captureOnCommitCallbacks(execute=True):
+            # Savepoint, participant lock, read existing rows, release savepoint
+            with self.assertNumQueries(4):
+                form.save()
+
+        self.assertTrue(form.change_set.is_empty)
+        self.assertEqual(received, [])
+
+        form = PreferencesForm(
+            data={field1: 1, "candidate_{}".format(self.mentee2.id): 2},
+            participant=self.mentor,
+            candidates=self.candidates,
+        )
+        self.assertTrue(form.is_valid())
+        with self.captureOnCommitCallbacks(execute=True):
+            form.save()
+        self.assertEqual(received, [form.change_set])
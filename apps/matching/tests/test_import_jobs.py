@@ -0,0 +1,162 @@
+"""Tests for background mentor import jobs."""
+
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from apps.core.models import Cohort, Participant
+from apps.matching.models import ImportJob, MentorProfile
+from apps.matching.mentor_import import MENTOR_CSV_HEADERS, parse_mentor_csv
+from apps.matching import import_jobs
+
+
+class ImportJobTest(TestCase):
+    """Test cases for import job validation, import and resumption."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pass")
+        self.cohort = Cohort.objects.create(name="Job Cohort")
+        self.mentors = []
+        for i in range(6):
+            user = User.objects.create_user(
+                f"mentor{i}", f"mentor{i}@example.com", "pass"
+            )
+            self.mentors.append(
+                Participant.objects.create(
+                    cohort=self.cohort,
+                    user=user,
+                    role_in_cohort="MENTOR",
+                    display_name=f"Mentor {i}",
+                    organization="OrgA",
+                )
+            )
+
+        lines = [",".join(MENTOR_CSV_HEADERS)]
+        for i in range(6):
+            lines.append(
+                f"mentor{i}@example.com,OrgA,Engineer {i},Eng,backend,EN,NYC,{i},topics,Bio"
+            )
+        lines.append("ghost@example.com,OrgA,Engineer,Eng,backend,EN,NYC,1,topics,Bio")
+        upload = SimpleUploadedFile("mentors.csv", ("\n".join(lines) + "\n").encode())
+        self.job = import_jobs.create_mentor_import_job(upload, self.admin)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _run_next(self):
+        job = import_jobs.claim_next_import_job()
+        self.assertIsNotNone(job)
+        return import_jobs.process_import_job(job)
+
+    def test_validation_pass_ends_in_preview(self):
+        """The first pass counts rows and writes no profiles."""
+        job = self._run_next()
+
+        self.assertEqual(job.status, "PREVIEW")
+        self.assertEqual(job.total_rows, 7)
+        self.assertEqual(job.valid_rows, 6)
+        self.assertEqual(job.invalid_rows, 1)
+        self.assertEqual(job.row_errors[0]["row_number"], 8)
+        self.assertEqual(MentorProfile.objects.count(), 0)
+        self.assertIsNone(import_jobs.claim_next_import_job())
+
+    def test_confirmed_job_imports_profiles(self):
+        """Confirming a preview queues the import pass."""
+        job = self._run_next()
+        success, _ = import_jobs.confirm_import_job(job)
+        self.assertTrue(success)
+
+        job = self._run_next()
+
+        self.assertEqual(job.status, "COMPLETED")
+        self.assertEqual(job.processed_rows, 7)
+        self.assertEqual(job.imported_rows, 6)
+        self.assertEqual(MentorProfile.objects.count(), 6)
+        self.assertFalse(default_storage.exists(job.file_path))
+
+    def test_preview_keeps_upload(self):
+        """The upload survives validation so the import pass can re-read it."""
+        job = self._run_next()
+        self.assertTrue(default_storage.exists(job.file_path))
+
+    def test_failed_job_deletes_upload(self):
+        """Failed jobs don't leave their upload behind."""
+        with patch.object(import_jobs, "parse_mentor_csv", side_effect=ValueError("bad")):
+            job = self._run_next()
+
+        self.assertEqual(job.status, "FAILED")
+        self.assertFalse(default_storage.exists(job.file_path))
+
+    def test_confirm_requires_preview(self):
+        """Jobs that have not been validated cannot be confirmed."""
+        success, message = import_jobs.confirm_import_job(self.job)
+        self.assertFalse(success)
+        self.assertIn("previewed", message)
+
+    def test_crashed_import_resumes_after_last_committed_chunk(self):
+        """A stale PROCESSING job restarts from processed_rows."""
+        import_jobs.confirm_import_job(self._run_next())
+        job = import_jobs.claim_next_import_job()
+
+        real_upsert = import_jobs.upsert_mentor_profiles
+        calls = []
+
+        def crash_on_second_chunk(rows):
+            calls.append(len(rows))
+            if len(calls) == 2:
+                raise KeyboardInterrupt("worker killed")
+            return real_upsert(rows)
+
+        with patch.object(import_jobs, "parse_mentor_csv") as mock_parse, patch.object(
+            import_jobs, "upsert_mentor_profiles", side_effect=crash_on_second_chunk
+        ):
+            mock_parse.side_effect = lambda f, skip_rows=0: parse_mentor_csv(
+                f, chunk_size=3, skip_rows=skip_rows
+            )
+            with self.assertRaises(KeyboardInterrupt):
+                import_jobs.process_import_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "PROCESSING")
+        self.assertEqual(job.processed_rows, 3)
+        self.assertEqual(MentorProfile.objects.count(), 3)
+
+        # Not stale yet, so no worker picks it up
+        self.assertIsNone(import_jobs.claim_next_import_job())
+
+        ImportJob.objects.filter(id=job.id).update(
+            updated_at=timezone.now()
+            - timedelta(seconds=import_jobs.STALE_JOB_SECONDS + 1)
+        )
+        job = self._run_next()
+
+        self.assertEqual(job.status, "COMPLETED")
+        self.assertEqual(job.processed_rows, 7)
+        self.assertEqual(job.imported_rows, 6)
+        self.assertEqual(MentorProfile.objects.count(), 6)
+
+    def test_missing_file_marks_job_failed(self):
+        """Storage errors fail the job instead of crashing the worker."""
+        ImportJob.objects.filter(id=self.job.id).update(file_path="imports/missing.csv")
+        job = self._run_next()
+        self.assertEqual(job.status, "FAILED")
+        self.assertTrue(job.error_message)
+
+    def test_progress_summary(self):
+        """Progress reports percent once the total is known."""
+        job = self._run_next()
+        progress = import_jobs.get_import_job_progress(job)
+        self.assertEqual(progress["percent"], 100.0)
+        self.assertTrue(progress["is_finished"])
+        self.assertEqual(progress["phase"], "validation")
@@ -0,0 +1,122 @@
+"""Tests for the lexicographic (staged) exception objective."""
+
+import unittest
+from django.test import TestCase
+from django.contrib.auth.models import User
+from apps.core.models import Cohort, Participant
+from apps.matching.data_prep import PreparedInputs
+from apps.matching.service import run_matching
+from apps.matching.solvers.exception import solve_exception
+
+
+def _inputs(objective, same_org_pairs=(), acceptability=None, scores=None, **config):
+    mentor_ids = [1, 2]
+    mentee_ids = [101, 102]
+    pairs = [(m, t) for m in mentor_ids for t in mentee_ids]
+    base_config = {
+        "exception_time_limit": 5,
+        "score_scale": 1000,
+        "penalty_org": 1000000,
+        "penalty_one_sided": 100000,
+        "penalty_neither": 300000,
+        "exception_objective": objective,
+    }
+    base_config.update(config)
+    return PreparedInputs(
+        mentor_ids=mentor_ids,
+        mentee_ids=mentee_ids,
+        same_org={pair: pair in same_org_pairs for pair in pairs},
+        acceptability={pair: (acceptability or {}).get(pair, "MUTUAL") for pair in pairs},
+        score={pair: (scores or {}).get(pair, 50000) for pair in pairs},
+        config=base_config,
+    )
+
+
+class TestLexicographicObjective(unittest.TestCase):
+    """Test cases for staged exception solving."""
+
+    def _pairs(self, result):
+        return sorted((m["mentor_id"], m["mentee_id"]) for m in result.matches)
+
+    def test_severity_beats_penalty_weights(self):
+        """Any number of E2s is preferred to one E3, whatever the penalties."""
+        kwargs = dict(
+            same_org_pairs={(1, 101)},
+            acceptability={(1, 102): "NEITHER", (2, 101): "NEITHER"},
+            penalty_org=100,
+        )
+
+        weighted = solve_exception(_inputs("WEIGHTED", **kwargs))
+        staged = solve_exception(_inputs("LEXICOGRAPHIC", **kwargs))
+
+        self.assertEqual(self._pairs(weighted), [(1, 101), (2, 102)])
+        self.assertEqual(self._pairs(staged), [(1, 102), (2, 101)])
+        self.assertEqual(staged.exception_summary, {"E1": 0, "E2": 2, "E3": 0})
+
+    def test_score_is_maximized_last(self):
+        """With exception counts tied, the higher-scoring matching wins."""
+        result = solve_exception(
+            _inputs(
+                "LEXICOGRAPHIC",
+                scores={(1, 101): 10000, (2, 102): 10000, (1, 102): 90000, (2, 101): 80000},
+            )
+        )
+
+        self.assertEqual(self._pairs(result), [(1, 102), (2, 101)])
+        self.assertEqual(result.total_score, 170)
+
+    def test_stages_are_reported(self):
+        """Each stage records its optimum and timing; empty stages are skipped."""
+        result = solve_exception(
+            _inputs("LEXICOGRAPHIC", acceptability={(1, 101): "ONE_SIDED_MENTOR_ONLY"})
+        )
+
+        self.assertEqual([s["stage"] for s in result.stages], ["E3", "E2", "E1", "SCORE"])
+        self.assertEqual(result.stages[0]["status"], "SKIPPED")
+        self.assertEqual(result.stages[2]["status"], "OPTIMAL")
+        self.assertEqual(result.stages[2]["value"], 0)
+        self.assertEqual(result.stages[3]["value"], 100000)
+        self.assertTrue(all(s["solve_time"] >= 0 for s in result.stages))
+
+    def test_weighted_has_no_stages(self):
+        """The default objective solves once."""
+        result = solve_exception(_inputs("WEIGHTED"))
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.stages, [])
+
+    def test_invalid_objective(self):
+        """Unknown objectives are rejected."""
+        result = solve_exception(_inputs("NEWEST"))
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.failure_report["reason"], "INVALID_CONFIG")
+
+
+class LexicographicServiceTest(TestCase):
+    """Test staged exception solving end to end."""
+
+    def test_run_matching_records_stages(self):
+        """Exception runs with the staged objective store stage timings."""
+        cohort = Cohort.objects.create(
+            name="Staged Cohort", cohort_config={"exception_objective": "LEXICOGRAPHIC"}
+        )
+        admin_user = User.objects.create_user("admin", "admin@test.com", "pass", is_staff=True)
+        for name, role in [("m1", "MENTOR"), ("m2", "MENTOR"), ("t1", "MENTEE"), ("t2", "MENTEE")]:
+            user = User.objects.create_user(name, f"{name}@test.com", "pass")
+            Participant.objects.create(
+                user=user,
+                cohort=cohort,
+                display_name=name.upper(),
+                role_in_cohort=role,
+                organization="Org",
+                is_submitted=True,
+            )
+
+        match_run = run_matching(cohort, admin_user, "EXCEPTION")
+
+        self.assertEqual(match_run.status, "SUCCESS")
+        stages = match_run.objective_summary["stages"]
+        self.assertEqual([s["stage"] for s in stages], ["E3", "E2", "E1", "SCORE"])
+        self.assertEqual(stages[0]["value"], 2)
+        self.assertEqual(match_run.objective_summary["exception_summary"]["E3"], 2)
@@ -0,0 +1,103 @@
+"""Tests for the bulk mentor CSV import pipeline."""
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from apps.core.models import Cohort, Participant
+from apps.matching.models import MentorProfile
+from apps.matching.mentor_import import (
+    MENTOR_CSV_HEADERS,
+    parse_mentor_csv,
+    upsert_mentor_profiles,
+)
+
+
+class MentorImportPipelineTest(TestCase):
+    """Test cases for chunked validation and bulk upserts."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.cohort = Cohort.objects.create(name="Import Cohort")
+        self.mentors = []
+        for i in range(5):
+            user = User.objects.create_user(
+                f"mentor{i}", f"mentor{i}@example.com", "pass"
+            )
+            self.mentors.append(
+                Participant.objects.create(
+                    cohort=self.cohort,
+                    user=user,
+                    role_in_cohort="MENTOR",
+                    display_name=f"Mentor {i}",
+                    organization="OrgA",
+                )
+            )
+
+    def _csv(self, emails, years="5"):
+        lines = [",".join(MENTOR_CSV_HEADERS)]
+        for email in emails:
+            lines.append(
+                f"{email},OrgA,Engineer,Engineering,backend,EN,NYC,{years},leadership,Bio"
+            )
+        content = "\n".join(lines) + "\n"
+        return SimpleUploadedFile("mentors.csv", content.encode(), content_type="text/csv")
+
+    def test_one_lookup_query_per_chunk(self):
+        """Email resolution issues one query per chunk, not one per row."""
+        emails = [f"mentor{i}@example.com" for i in range(5)]
+        error, chunks = parse_mentor_csv(self._csv(emails), chunk_size=2)
+        self.assertIsNone(error)
+
+        with self.assertNumQueries(3):
+            results = list(chunks)
+
+        valid = [row for valid_rows, _ in results for row in valid_rows]
+        self.assertEqual(len(valid), 5)
+        self.assertEqual(valid[0]["participant_id"], self.mentors[0].id)
+
+    def test_unknown_email_is_invalid(self):
+        """Rows with unknown emails are reported with their row number."""
+        error, chunks = parse_mentor_csv(self._csv(["nobody@example.com"]))
+        self.assertIsNone(error)
+        _, invalid_rows = next(chunks)
+        self.assertEqual(invalid_rows[0]["row_number"], 2)
+        self.assertIn(
+            "No mentor found with email nobody@example.com",
+            invalid_rows[0]["errors_list"],
+        )
+
+    def test_missing_headers(self):
+        """A header row without required columns is rejected up front."""
+        csv_file = SimpleUploadedFile("bad.csv", b"mentor_email\nx@example.com\n")
+        error, chunks = parse_mentor_csv(csv_file)
+        self.assertIn("Missing required headers", error)
+        self.assertEqual(list(chunks), [])
+
+    def test_upsert_creates_and_updates_profiles(self):
+        """Profiles are inserted on first import and updated on the next."""
+        existing = MentorProfile.objects.create(
+            participant=self.mentors[0], job_title="Old Title", bio="Old"
+        )
+        rows = [
+            {"participant_id": mentor.id, "job_title": "Engineer", "years_experience": "7"}
+            for mentor in self.mentors
+        ]
+
+        imported = upsert_mentor_profiles(rows, batch_size=2)
+
+        self.assertEqual(imported, 5)
+        self.assertEqual(MentorProfile.objects.count(), 5)
+        existing.refresh_from_db()
+        self.assertEqual(existing.job_title, "Engineer")
+        self.assertEqual(existing.years_experience, 7)
+        self.assertEqual(existing.bio, "")
+
+    def test_upsert_last_duplicate_row_wins(self):
+        """Repeated rows for one participant keep the last values."""
+        rows = [
+            {"participant_id": self.mentors[0].id, "job_title": "First"},
+            {"participant_id": self.mentors[0].id, "job_title": "Second"},
+        ]
+        upsert_mentor_profiles(rows)
+        profile = MentorProfile.objects.get(participant=self.mentors[0])
+        self.assertEqual(profile.job_title, "Second")
@@ -0,0 +1,327 @@
+"""Tests for the compiled override index."""
+
+import os
+from unittest.mock import patch
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from apps.core.models import Cohort, Participant
+from apps.matching.models import Preference, MatchRun, Match
+from apps.matching.exceptions import classify_exception
+from apps.matching.override_engine import (
+    build_cohort_index,
+    get_cohort_index,
+    invalidate_match_run_index,
+)
+from apps.matching.preference_changes import apply_preference_ranks
+from apps.matching import override
+
+
+# An in-process cache, so cache hits don't show up in query counts
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class OverrideEngineTest(TestCase):
+    """Test cases for index-backed override checks."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.cohort = Cohort.objects.create(name="Override Engine Cohort")
+        self.admin_user = User.objects.create_user(
+            "admin", "admin@test.com", "pass", is_staff=True
+        )
+
+        self.p = {}
+        for username, org, role in [
+            ("m1", "OrgA", "MENTOR"),
+            ("m2", "OrgB", "MENTOR"),
+            ("m3", "OrgC", "MENTOR"),
+            ("t1", "OrgA", "MENTEE"),
+            ("t2", "OrgC", "MENTEE"),
+            ("t3", "OrgB", "MENTEE"),
+        ]:
+            user = User.objects.create_user(username, f"{username}@test.com", "pass")
+            self.p[username] = Participant.objects.create(
+                user=user,
+                cohort=self.cohort,
+                display_name=username.upper(),
+                role_in_cohort=role,
+                organization=org,
+                is_submitted=True,
+            )
+
+        for from_name, to_name in [("m1", "t2"), ("t2", "m1"), ("m2", "t1"), ("t3", "m3")]:
+            Preference.objects.create(
+                from_participant=self.p[from_name], to_participant=self.p[to_name], rank=1
+            )
+
+        self.match_run = MatchRun.objects.create(
+            cohort=self.cohort, created_by=self.admin_user, mode="EXCEPTION", status="SUCCESS"
+        )
+        for mentor, mentee in [("m1", "t2"), ("m2", "t1"), ("m3", "t3")]:
+            Match.objects.create(
+                match_run=self.match_run,
+                mentor=self.p[mentor],
+                mentee=self.p[mentee],
+                score_percent=80,
+            )
+
+    def test_classification_matches_legacy(self):
+        """Index classification agrees with the query-based classifier."""
+        with self.assertNumQueries(3):
+            index = build_cohort_index(self.match_run)
+
+        mentors = [self.p[name] for name in ("m1", "m2", "m3")]
+        mentees = [self.p[name] for name in ("t1", "t2", "t3")]
+        for mentor in mentors:
+            for mentee in mentees:
+                self.assertEqual(
+                    index.classify(mentor.id, mentee.id),
+                    classify_exception(mentor, mentee, mentors, mentees),
+                )
+
+    def test_cached_index_is_reused_and_updated(self):
+        """Overrides update the cached index instead of recompiling it."""
+        get_cohort_index(self.match_run)
+        with self.assertNumQueries(0):
+            index = get_cohort_index(self.match_run)
+        self.assertEqual(index.mentor_to_mentee[self.p["m1"].id], self.p["t2"].id)
+
+        success, message, match_obj = override.create_manual_override(
+            self.match_run, self.p["m1"], self.p["t1"], "Stakeholder request", self.admin_user
+        )
+        self.assertTrue(success, message)
+
+        with self.assertNumQueries(0):
+            index = get_cohort_index(self.match_run)
+        self.assertEqual(index.mentor_to_mentee[self.p["m1"].id], self.p["t1"].id)
+        self.assertNotIn(self.p["m2"].id, index.mentor_to_mentee)
+        self.assertNotIn(self.p["t2"].id, index.mentee_to_mentor)
+
+    def test_match_rewrite_invalidates_run_index(self):
+        """Match rows rewritten outside the engine are recompiled after a bump."""
+        get_cohort_index(self.match_run)
+        Match.objects.filter(match_run=self.match_run, mentor=self.p["m1"]).delete()
+
+        invalidate_match_run_index(self.match_run.id)
+
+        index = get_cohort_index(self.match_run)
+        self.assertNotIn(self.p["m1"].id, index.mentor_to_mentee)
+
+    def test_unfinished_run_rejects_overrides(self):
+        """Runs still being solved keep rewriting their matches."""
+        self.match_run.status = "RUNNING"
+        before = self._pairs()
+
+        success, message, _ = override.create_manual_override(
+            self.match_run, self.p["m1"], self.p["t1"], "Early", self.admin_user
+        )
+        self.assertFalse(success)
+        self.assertEqual(message, override.UNFINISHED_RUN_MESSAGE)
+
+        result = override.apply_batch_overrides(
+            self.match_run, [(self.p["m1"].id, self.p["t1"].id, "Early")], self.admin_user
+        )
+        self.assertFalse(result.success)
+        self.assertEqual(result.message, override.UNFINISHED_RUN_MESSAGE)
+        self.assertEqual(self._pairs(), before)
+
+    def test_override_onto_matched_mentee(self):
+        """Taking a matched mentee frees it first and records the exception."""
+        suggestion = override.get_swap_suggestion(
+            self.p["m1"], self.p["t3"], self.match_run
+        )
+        self.assertEqual(suggestion, (self.p["m3"], self.p["t2"]))
+
+        success, message, match_obj = override.create_manual_override(
+            self.match_run, self.p["m1"], self.p["t3"], "Reviewed", self.admin_user
+        )
+
+        self.assertTrue(success, message)
+        self.assertEqual(match_obj.exception_type, "E2")
+        self.assertFalse(
+            Match.objects.filter(match_run=self.match_run, mentor=self.p["m3"]).exists()
+        )
+        self.assertEqual(
+            Match.objects.get(match_run=self.match_run, mentee=self.p["t3"]).mentor,
+            self.p["m1"],
+        )
+
+    def test_preference_changes_invalidate_index(self):
+        """A committed preference change makes the next lookup recompile."""
+        index = get_cohort_index(self.match_run)
+        self.assertFalse(index.ranked(self.p["t1"].id, self.p["m2"].id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_preference_ranks(self.p["t1"], {self.p["m2"].id: 1})
+
+        index = get_cohort_index(self.match_run)
+        self.assertTrue(index.ranked(self.p["t1"].id, self.p["m2"].id))
+        self.assertEqual(index.classify(self.p["m2"].id, self.p["t1"].id), ("", "No exception"))
+
+    def _pairs(self):
+        return set(
+            Match.objects.filter(match_run=self.match_run).values_list(
+                "mentor__display_name", "mentee__display_name"
+            )
+        )
+
+    def test_batch_override_completes_swaps(self):
+        """Displaced partners are paired with each other in the same transaction."""
+        result = override.apply_batch_overrides(
+            self.match_run,
+            [(self.p["m1"].id, self.p["t3"].id, "Stakeholder review")],
+            self.admin_user,
+        )
+
+        self.assertTrue(result.success, result.errors)
+        self.assertEqual(result.results[0]["exception_type"], "E2")
+        self.assertEqual(result.results[0]["displaced_mentor_id"], self.p["m3"].id)
+        self.assertEqual(result.results[0]["displaced_mentee_id"], self.p["t2"].id)
+        self.assertEqual(
+            [(s["mentor_id"], s["mentee_id"]) for s in result.swaps],
+            [(self.p["m3"].id, self.p["t2"].id)],
+        )
+        self.assertEqual(self._pairs(), {("M1", "T3"), ("M3", "T2"), ("M2", "T1")})
+        self.assertEqual(result.unmatched_mentor_ids, [])
+        # Only the requested pair is pinned for repair
+        self.assertEqual(
+            set(
+                Match.objects.filter(
+                    match_run=self.match_run, is_manual_override=True
+                ).values_list("mentor__display_name", flat=True)
+            ),
+            {"M1"},
+        )
+
+        index = get_cohort_index(self.match_run)
+        self.assertEqual(index.mentor_to_mentee[self.p["m3"].id], self.p["t2"].id)
+
+    def test_batch_override_applies_rotation(self):
+        """A full rotation is valid even though each step conflicts on its own."""
+        rotation = [("m1", "t1"), ("m2", "t3"), ("m3", "t2")]
+        result = override.apply_batch_overrides(
+            self.match_run,
+            [(self.p[m].id, self.p[t].id, "Rotation") for m, t in rotation],
+            self.admin_user,
+        )
+
+        self.assertTrue(result.success, result.errors)
+        self.assertEqual(result.swaps, [])
+        self.assertEqual(self._pairs(), {("M1", "T1"), ("M2", "T3"), ("M3", "T2")})
+        self.assertEqual(
+            [r["exception_type"] for r in result.results], ["E3", "E3", "E3"]
+        )
+        self.assertTrue(
+            all(
+                Match.objects.filter(match_run=self.match_run).values_list(
+                    "is_manual_override", flat=True
+                )
+            )
+        )
+
+    def test_batch_override_rejects_invalid_set(self):
+        """Repeated participants and missing reasons reject the whole batch."""
+        before = self._pairs()
+        result = override.apply_batch_overrides(
+            self.match_run,
+            [
+                (self.p["m2"].id, self.p["t3"].id, "ok"),
+                (self.p["m1"].id, self.p["t3"].id, "again"),
+                (self.p["m3"].id, self.p["t1"].id, ""),
+                (self.p["t1"].id, self.p["m1"].id, "swapped roles"),
+            ],
+            self.admin_user,
+        )
+
+        self.assertFalse(result.success)
+        self.assertEqual(
+            [(e["index"], e["error"]) for e in result.errors],
+            [
+                (1, "Mentee already overridden in pair 0"),
+                (2, "Override reason is required when creating an exception match"),
+                (3, "First participant must be a mentor"),
+            ],
+        )
+        self.assertEqual(self._pairs(), before)
+
+    def test_repair_rematches_around_overrides(self):
+        """Repair keeps overrides and re-pairs everyone else optimally."""
+        success, message, _ = override.create_manual_override(
+            self.match_run, self.p["m1"], self.p["t3"], "Reviewed", self.admin_user
+        )
+        self.assertTrue(success, message)
+        # M3 and T2 are orphaned; M2 -> T1 is one-sided
+        self.assertEqual(self._pairs(), {("M1", "T3"), ("M2", "T1")})
+        get_cohort_index(self.match_run)
+
+        success, message, summary = override.repair_match_run(
+            self.match_run, self.admin_user
+        )
+
+        self.assertTrue(success, message)
+        # Two cross-org E2 pairs beat an E1 pair plus a same-org E3 pair
+        self.assertEqual(self._pairs(), {("M1", "T3"), ("M2", "T2"), ("M3", "T1")})
+        self.assertEqual(summary["pinned_count"], 1)
+        self.assertEqual(summary["changed_count"], 2)
+        self.assertTrue(
+            Match.objects.get(match_run=self.match_run, mentor=self.p["m1"]).is_manual_override
+        )
+        self.assertEqual(
+            Match.objects.get(match_run=self.match_run, mentor=self.p["m3"]).exception_type,
+            "E2",
+        )
+
+        self.match_run.refresh_from_db()
+        self.assertEqual(self.match_run.objective_summary["match_count"], 3)
+        self.assertEqual(
+            self.match_run.objective_summary["exception_summary"],
+            {"E1": 0, "E2": 3, "E3": 0},
+        )
+
+        index = get_cohort_index(self.match_run)
+        self.assertEqual(index.mentor_to_mentee[self.p["m3"].id], self.p["t1"].id)
+
+    def test_repair_leaves_optimal_run_unchanged(self):
+        """Without overrides an optimal run has nothing to repair."""
+        before = set(Match.objects.filter(match_run=self.match_run).values_list("id", flat=True))
+
+        success, message, summary = override.repair_match_run(
+            self.match_run, self.admin_user
+        )
+
+        self.assertTrue(success, message)
+        self.assertEqual(summary["changed_count"], 0)
+        self.assertEqual(
+            set(Match.objects.filter(match_run=self.match_run).values_list("id", flat=True)),
+            before,
+        )
+
+    def test_repair_strict_run_infeasible(self):
+        """A strict run whose free participants have no mutual pairs is left alone."""
+        self.match_run.mode = "STRICT"
+        self.match_run.save()
+        before = self._pairs()
+
+        success, message, failure_report = override.repair_match_run(
+            self.match_run, self.admin_user
+        )
+
+        self.assertFalse(success)
+        self.assertEqual(failure_report["reason"], "INFEASIBLE")
+        self.assertEqual(self._pairs(), before)
+
+
+class FixtureLoadingTest(TestCase):
+    """Loading fixtures leaves the cache alone."""
+
+    def test_raw_participant_saves_skip_invalidation(self):
+        fixture = os.path.join(settings.BASE_DIR, "fixtures", "cohort_3x3.json")
+        with patch("apps.matching.receivers.invalidate_cohort_indexes") as invalidate:
+            call_command("loaddata", fixture, verbosity=0)
+
+        self.assertEqual(Participant.objects.count(), 6)
+        invalidate.assert_not_called()
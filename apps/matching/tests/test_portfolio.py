@@ -0,0 +1,165 @@
+"""Tests for the solver backends and portfolio racing."""
+
+import unittest
+from django.test import TestCase
+from django.contrib.auth.models import User
+from apps.core.models import Cohort, Participant
+from apps.matching.data_prep import PreparedInputs
+from apps.matching.service import run_matching
+from apps.matching.solvers.repair import solve_repair
+from apps.matching.solvers.portfolio import BACKENDS, solve_portfolio, solve_with_backend
+
+
+def _inputs(same_org_pairs=(), acceptability=None, **config):
+    mentor_ids = [1, 2, 3]
+    mentee_ids = [101, 102, 103]
+    pairs = [(m, t) for m in mentor_ids for t in mentee_ids]
+    scores = {
+        (1, 101): 90000, (1, 102): 40000, (1, 103): 10000,
+        (2, 101): 85000, (2, 102): 20000, (2, 103): 30000,
+        (3, 101): 50000, (3, 102): 60000, (3, 103): 70000,
+    }
+    base_config = {
+        "strict_time_limit": 5,
+        "exception_time_limit": 5,
+        "score_scale": 1000,
+        "penalty_org": 1000000,
+        "penalty_one_sided": 100000,
+        "penalty_neither": 300000,
+    }
+    base_config.update(config)
+    return PreparedInputs(
+        mentor_ids=mentor_ids,
+        mentee_ids=mentee_ids,
+        same_org={pair: pair in same_org_pairs for pair in pairs},
+        acceptability={pair: (acceptability or {}).get(pair, "MUTUAL") for pair in pairs},
+        score=scores,
+        config=base_config,
+    )
+
+
+def _pairs(result):
+    return sorted((m["mentor_id"], m["mentee_id"]) for m in result.matches)
+
+
+class TestBackends(unittest.TestCase):
+    """Every backend solves the same objective."""
+
+    def test_backends_agree_in_strict_mode(self):
+        inputs = _inputs(same_org_pairs={(1, 101)})
+
+        results = {backend: solve_with_backend(inputs, "STRICT", backend) for backend in BACKENDS}
+
+        for backend, result in results.items():
+            self.assertTrue(result.success, backend)
+            self.assertEqual(_pairs(result), [(1, 102), (2, 101), (3, 103)], backend)
+            self.assertTrue(result.optimal, backend)
+
+    def test_strict_ignores_zero_penalties(self):
+        """Zero penalties in the cohort config don't admit exception pairs."""
+        inputs = _inputs(
+            same_org_pairs={(1, 101)},
+            acceptability={(2, 101): "ONE_SIDED_MENTOR_ONLY"},
+            penalty_org=0,
+            penalty_one_sided=0,
+        )
+
+        results = {backend: solve_with_backend(inputs, "STRICT", backend) for backend in BACKENDS}
+
+        for backend, result in results.items():
+            self.assertTrue(result.success, backend)
+            self.assertEqual(_pairs(result), [(1, 102), (2, 103), (3, 101)], backend)
+
+    def test_strict_repair_ignores_zero_penalties(self):
+        """Strict repair keeps exception pairs out whatever their penalty."""
+        inputs = _inputs(
+            same_org_pairs={(3, 102)},
+            acceptability={(2, 101): "ONE_SIDED_MENTEE_ONLY"},
+            penalty_org=0,
+            penalty_one_sided=0,
+        )
+
+        result = solve_repair(inputs, {1: 103}, {}, strict=True)
+
+        self.assertTrue(result.success)
+        self.assertEqual(_pairs(result), [(2, 102), (3, 101)])
+
+    def test_backends_agree_in_exception_mode(self):
+        inputs = _inputs(
+            acceptability={
+                (1, 101): "NEITHER",
+                (2, 101): "ONE_SIDED_MENTEE_ONLY",
+                (2, 103): "NEITHER",
+            }
+        )
+
+        results = {backend: solve_with_backend(inputs, "EXCEPTION", backend) for backend in BACKENDS}
+
+        for backend, result in results.items():
+            self.assertEqual(_pairs(result), [(1, 102), (2, 101), (3, 103)], backend)
+            self.assertEqual(result.exception_summary, {"E1": 1, "E2": 0, "E3": 0}, backend)
+            self.assertEqual(
+                [m["exception_type"] for m in sorted(result.matches, key=lambda m: m["mentor_id"])],
+                ["", "E1", ""],
+                backend,
+            )
+
+    def test_backends_report_infeasible(self):
+        """A participant without any allowed partner fails every backend."""
+        inputs = _inputs(same_org_pairs={(1, 101), (1, 102), (1, 103)})
+
+        for backend in BACKENDS:
+            result = solve_with_backend(inputs, "STRICT", backend)
+            self.assertFalse(result.success, backend)
+            self.assertEqual(result.failure_report["reason"], "INFEASIBLE", backend)
+        self.assertEqual(
+            solve_with_backend(inputs, "STRICT", "ASSIGNMENT").failure_report["zero_mentor_options"],
+            [{"id": 1}],
+        )
+
+    def test_portfolio_keeps_first_proof(self):
+        outcome = solve_portfolio(_inputs(), "STRICT")
+
+        self.assertIn(outcome.winner, BACKENDS)
+        self.assertTrue(outcome.result.optimal)
+        self.assertEqual(_pairs(outcome.result), [(1, 102), (2, 101), (3, 103)])
+        self.assertEqual(set(outcome.race), set(BACKENDS))
+        self.assertEqual(outcome.race[outcome.winner]["status"], "OPTIMAL")
+
+
+class BackendServiceTest(TestCase):
+    """Test choosing backends through run_matching."""
+
+    def setUp(self):
+        self.cohort = Cohort.objects.create(name="Backend Cohort")
+        self.admin_user = User.objects.create_user("admin", "admin@test.com", "pass", is_staff=True)
+        for i, (name, role) in enumerate(
+            [("m1", "MENTOR"), ("m2", "MENTOR"), ("t1", "MENTEE"), ("t2", "MENTEE")]
+        ):
+            user = User.objects.create_user(name, f"{name}@test.com", "pass")
+            Participant.objects.create(
+                user=user,
+                cohort=self.cohort,
+                display_name=name.upper(),
+                role_in_cohort=role,
+                organization=f"Org{i}",
+                is_submitted=True,
+            )
+
+    def test_portfolio_records_winner(self):
+        match_run = run_matching(self.cohort, self.admin_user, "EXCEPTION", "PORTFOLIO")
+
+        self.assertEqual(match_run.status, "SUCCESS")
+        self.assertIn(match_run.objective_summary["backend"], BACKENDS)
+        self.assertEqual(set(match_run.objective_summary["portfolio"]), set(BACKENDS))
+        self.assertEqual(match_run.matches.count(), 2)
+
+    def test_backend_from_cohort_config(self):
+        self.cohort.cohort_config = {"solver_backend": "MIN_COST_FLOW"}
+        self.cohort.save()
+
+        match_run = run_matching(self.cohort, self.admin_user, "EXCEPTION")
+
+        self.assertEqual(match_run.status, "SUCCESS")
+        self.assertEqual(match_run.objective_summary["backend"], "MIN_COST_FLOW")
+        self.assertEqual(match_run.solver_settings, {})
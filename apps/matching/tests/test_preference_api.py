@@ -0,0 +1,137 @@
+"""Tests for the paged candidates API and rank PATCH endpoint."""
+
+import json
+from unittest import mock
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from apps.core.models import Cohort, Participant
+from apps.matching.models import Preference
+
+
+class PreferenceApiTest(TestCase):
+    """Test cases for preference entry through the JSON API."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.cohort = Cohort.objects.create(name="API Cohort", status="OPEN")
+        self.mentee = self._participant("mentee", "MENTEE", "OrgA")
+        self.mentors = [
+            self._participant(f"mentor{i:02d}", "MENTOR", "OrgB" if i % 2 else "OrgC")
+            for i in range(6)
+        ]
+        self.same_org_mentor = self._participant("mentor_same", "MENTOR", "OrgA")
+
+        self.client = Client()
+        self.client.login(username="mentee", password="pass")
+        self.list_url = reverse("matching:candidates_api", args=[self.cohort.id])
+
+    def _participant(self, username, role, organization):
+        user = User.objects.create_user(username, f"{username}@example.com", "pass")
+        return Participant.objects.create(
+            cohort=self.cohort,
+            user=user,
+            role_in_cohort=role,
+            display_name=username,
+            organization=organization,
+        )
+
+    def _patch(self, candidate, rank):
+        return self.client.patch(
+            reverse("matching:candidate_rank_api", args=[self.cohort.id, candidate.id]),
+            data=json.dumps({"rank": rank}),
+            content_type="application/json",
+        )
+
+    def _order(self):
+        return list(
+            Preference.objects.filter(from_participant=self.mentee)
+            .order_by("rank")
+            .values_list("to_participant__display_name", flat=True)
+        )
+
+    def test_candidates_are_paged_and_filtered(self):
+        """Pages, search and organization filters narrow the candidate list."""
+        data = self.client.get(self.list_url, {"page_size": 4}).json()
+        self.assertEqual(data["count"], 6)  # Same-organization mentor is hidden
+        self.assertEqual(data["num_pages"], 2)
+        self.assertEqual(len(data["results"]), 4)
+
+        data = self.client.get(self.list_url, {"organization": "OrgB"}).json()
+        self.assertEqual(
+            [c["display_name"] for c in data["results"]],
+            ["mentor01", "mentor03", "mentor05"],
+        )
+
+        data = self.client.get(self.list_url, {"q": "mentor04"}).json()
+        self.assertEqual([c["id"] for c in data["results"]], [self.mentors[4].id])
+
+        data = self.client.get(self.list_url, {"show_blocked": "true"}).json()
+        self.assertEqual(data["count"], 7)
+        blocked = [c for c in data["results"] if c["is_blocked"]]
+        self.assertEqual([c["id"] for c in blocked], [self.same_org_mentor.id])
+
+    def test_ranked_candidates_come_first(self):
+        """Ranked candidates are listed in rank order ahead of unranked ones."""
+        Preference.objects.create(
+            from_participant=self.mentee, to_participant=self.mentors[3], rank=1
+        )
+        data = self.client.get(self.list_url).json()
+        self.assertEqual(data["results"][0]["id"], self.mentors[3].id)
+        self.assertEqual(data["results"][0]["rank"], 1)
+        self.assertIsNone(data["results"][1]["rank"])
+        self.assertEqual(data["ranked_count"], 1)
+
+        data = self.client.get(self.list_url, {"ranked": "false"}).json()
+        self.assertEqual(data["count"], 5)
+
+    def test_page_query_count_is_flat(self):
+        """Listing a page does not issue per-candidate queries."""
+        for i in range(30):
+            self._participant(f"extra{i}", "MENTOR", "OrgD")
+
+        # Session, user, cohort, participant, count, page, ranked count
+        with self.assertNumQueries(7):
+            data = self.client.get(self.list_url, {"page_size": 25}).json()
+        self.assertEqual(len(data["results"]), 25)
+
+    def test_patch_moves_and_removes_candidates(self):
+        """PATCH inserts at a position, shifts the rest, and null removes."""
+        for mentor in self.mentors[:3]:
+            response = self._patch(mentor, 99)
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._order(), ["mentor00", "mentor01", "mentor02"])
+
+        response = self._patch(self.mentors[2], 1)
+        data = response.json()
+        self.assertEqual(data["rank"], 1)
+        self.assertEqual(data["ranked_count"], 3)
+        self.assertEqual(self._order(), ["mentor02", "mentor00", "mentor01"])
+
+        data = self._patch(self.mentors[0], None).json()
+        self.assertIsNone(data["rank"])
+        self.assertEqual(data["changes"]["deleted"], [self.mentors[0].id])
+        self.assertEqual(self._order(), ["mentor02", "mentor01"])
+
+    def test_patch_rejects_invalid_requests(self):
+        """Bad ranks, wrong-role candidates and submitted participants fail."""
+        self.assertEqual(self._patch(self.mentors[0], 0).status_code, 400)
+        self.assertEqual(self._patch(self.mentors[0], "1").status_code, 400)
+
+        other_mentee = self._participant("mentee2", "MENTEE", "OrgB")
+        self.assertEqual(self._patch(other_mentee, 1).status_code, 404)
+
+        self.mentee.is_submitted = True
+        self.mentee.save()
+        self.assertEqual(self._patch(self.mentors[0], 1).status_code, 403)
+        self.assertFalse(Preference.objects.exists())
+
+    def test_large_pools_render_paged_page(self):
+        """Above the form threshold the page renders no per-candidate fields."""
+        url = reverse("matching:preferences", args=[self.cohort.id])
+        with mock.patch("apps.matching.views.PREFERENCE_FORM_MAX_CANDIDATES", 3):
+            response = self.client.get(url)
+
+        self.assertTemplateUsed(response, "matching/preferences_paged.html")
+        self.assertNotContains(response, 'name="candidate_')
+        self.assertContains(response, self.list_url)
@@ -0,0 +1,139 @@
+"""Tests for bulk preference import."""
+
+import json
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from apps.core.models import Cohort, Participant
+from apps.matching.domain import normalize_ranks
+from apps.matching.models import Preference
+from apps.matching.preference_import import import_preferences
+
+
+class PreferenceImportTest(TestCase):
+    """Test cases for validating and loading preference files."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.cohort = Cohort.objects.create(name="Preference Import Cohort")
+        self.mentors = [self._participant(f"mentor{i}", "MENTOR") for i in range(3)]
+        self.mentees = [self._participant(f"mentee{i}", "MENTEE") for i in range(2)]
+
+    def _participant(self, username, role):
+        user = User.objects.create_user(username, f"{username}@example.com", "pass")
+        return Participant.objects.create(
+            cohort=self.cohort,
+            user=user,
+            role_in_cohort=role,
+            display_name=username,
+            organization="OrgA",
+        )
+
+    def _csv(self, rows):
+        lines = ["from_email,to_email,rank"] + [",".join(map(str, row)) for row in rows]
+        content = "\n".join(lines) + "\n"
+        return SimpleUploadedFile("prefs.csv", content.encode(), content_type="text/csv")
+
+    def _ranks(self, participant):
+        return list(
+            Preference.objects.filter(from_participant=participant)
+            .order_by("rank")
+            .values_list("to_participant__user__username", "rank")
+        )
+
+    def test_normalize_ranks_renumbers_duplicates(self):
+        """Shared ranks are ordered by candidate ID and pushed down."""
+        duplicate_warning, normalized = normalize_ranks([(2, 30), (1, 20), (1, 10)])
+        self.assertTrue(duplicate_warning)
+        self.assertEqual(normalized, {1: 10, 2: 20, 3: 30})
+
+        duplicate_warning, normalized = normalize_ranks([(5, 10), (2, 20)])
+        self.assertFalse(duplicate_warning)
+        self.assertEqual(normalized, {1: 20, 2: 10})
+
+    def test_csv_import_replaces_lists_and_renumbers(self):
+        """Listed participants get exactly the file's ranks, normalized."""
+        Preference.objects.create(
+            from_participant=self.mentees[0], to_participant=self.mentors[2], rank=1
+        )
+        Preference.objects.create(
+            from_participant=self.mentees[1], to_participant=self.mentors[2], rank=1
+        )
+
+        result = import_preferences(
+            self.cohort,
+            self._csv(
+                [
+                    ("mentee0@example.com", "mentor1@example.com", 3),
+                    ("mentee0@example.com", "mentor0@example.com", 3),
+                    ("mentor0@example.com", "mentee1@example.com", 7),
+                ]
+            ),
+            "csv",
+        )
+
+        self.assertTrue(result.success, result.message)
+        self.assertEqual(result.participant_count, 2)
+        self.assertEqual(result.renumbered_participants, [self.mentees[0].id])
+        self.assertEqual((result.inserted, result.deleted), (3, 1))
+        self.assertEqual(self._ranks(self.mentees[0]), [("mentor0", 1), ("mentor1", 2)])
+        self.assertEqual(self._ranks(self.mentors[0]), [("mentee1", 1)])
+        # Participants absent from the file keep their preferences
+        self.assertEqual(self._ranks(self.mentees[1]), [("mentor2", 1)])
+
+    def test_jsonl_import_updates_changed_ranks(self):
+        """JSONL rows update existing preferences in place."""
+        Preference.objects.create(
+            from_participant=self.mentees[0], to_participant=self.mentors[0], rank=1
+        )
+        Preference.objects.create(
+            from_participant=self.mentees[0], to_participant=self.mentors[1], rank=2
+        )
+        lines = [
+            {"from_email": "mentee0@example.com", "to_email": "mentor1@example.com", "rank": 1},
+            {"from_email": "mentee0@example.com", "to_email": "mentor0@example.com", "rank": 2},
+        ]
+        content = "\n".join(json.dumps(line) for line in lines) + "\n"
+        jsonl_file = SimpleUploadedFile("prefs.jsonl", content.encode())
+
+        result = import_preferences(self.cohort, jsonl_file, "jsonl")
+
+        self.assertTrue(result.success, result.message)
+        self.assertEqual((result.inserted, result.updated, result.deleted), (0, 2, 0))
+        self.assertEqual(self._ranks(self.mentees[0]), [("mentor1", 1), ("mentor0", 2)])
+
+    def test_invalid_rows_abort_import(self):
+        """Any invalid row reports errors and writes nothing."""
+        result = import_preferences(
+            self.cohort,
+            self._csv(
+                [
+                    ("mentee0@example.com", "mentor0@example.com", 1),
+                    ("mentee0@example.com", "mentee1@example.com", 2),
+                    ("mentee0@example.com", "ghost@example.com", 3),
+                    ("mentee1@example.com", "mentor0@example.com", "first"),
+                    ("mentee0@example.com", "mentor0@example.com", 4),
+                ]
+            ),
+            "csv",
+        )
+
+        self.assertFalse(result.success)
+        self.assertEqual([e["row_number"] for e in result.errors], [3, 4, 5, 6])
+        self.assertIn("cannot rank", result.errors[0]["errors"][0])
+        self.assertIn("ghost@example.com", result.errors[1]["errors"][0])
+        self.assertIn("Duplicate preference", result.errors[3]["errors"][0])
+        self.assertFalse(Preference.objects.exists())
+
+    def test_dry_run_writes_nothing(self):
+        """A dry run validates and counts without loading."""
+        result = import_preferences(
+            self.cohort,
+            self._csv([("mentee0@example.com", "mentor0@example.com", 1)]),
+            "csv",
+            dry_run=True,
+        )
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.preference_count, 1)
+        self.assertFalse(Preference.objects.exists())
@@ -0,0 +1,93 @@
+"""Tests for the perfect-matching presolve."""
+
+import unittest
+from apps.matching.data_prep import PreparedInputs
+from apps.matching.presolve import presolve_assignment
+from apps.matching.solvers.strict import solve_strict
+
+
+class TestPresolve(unittest.TestCase):
+    """Test cases for forced assignments and pair elimination."""
+
+    def test_forced_assignments_cascade(self):
+        """Fixing one forced pair can force the next."""
+        result = presolve_assignment(
+            [1, 2, 3],
+            [101, 102, 103],
+            {1: [101], 2: [101, 102], 3: [101, 102, 103]},
+        )
+
+        self.assertTrue(result.feasible)
+        self.assertEqual(sorted(result.forced_pairs), [(1, 101), (2, 102), (3, 103)])
+        self.assertEqual(result.mentor_ids, [])
+        self.assertEqual(result.stats["forced_count"], 3)
+        self.assertEqual(result.stats["remaining_pairs"], 0)
+
+    def test_pairs_outside_every_perfect_matching_are_eliminated(self):
+        """Mentors 1 and 2 must take 101 and 102, so 3 can't use them."""
+        result = presolve_assignment(
+            [1, 2, 3, 4],
+            [101, 102, 103, 104],
+            {
+                1: [101, 102],
+                2: [101, 102],
+                3: [101, 103, 104],
+                4: [102, 103, 104],
+            },
+        )
+
+        self.assertTrue(result.feasible)
+        self.assertEqual(result.forced_pairs, [])
+        self.assertEqual(result.allowed, {1: [101, 102], 2: [101, 102], 3: [103, 104], 4: [103, 104]})
+        self.assertEqual(result.stats["eliminated_pairs"], 2)
+        self.assertEqual(result.stats["original_pairs"], 10)
+        self.assertEqual(result.stats["remaining_pairs"], 8)
+
+    def test_elimination_exposes_forced_pairs(self):
+        """After elimination, a participant left with one option is fixed."""
+        result = presolve_assignment(
+            [1, 2, 3, 4, 5],
+            [101, 102, 103, 104, 105],
+            {
+                1: [101, 103],
+                2: [102, 104, 105],
+                3: [101, 104, 105],
+                4: [101, 102, 103],
+                5: [101, 103],
+            },
+        )
+
+        # 1 and 5 hold 101 and 103, so 4 can only take 102
+        self.assertEqual(result.forced_pairs, [(4, 102)])
+        self.assertEqual(result.stats["eliminated_pairs"], 4)
+        self.assertEqual(
+            result.allowed, {1: [101, 103], 2: [104, 105], 3: [104, 105], 5: [101, 103]}
+        )
+
+    def test_infeasible(self):
+        """Two mentors competing for one mentee can't both be matched."""
+        result = presolve_assignment([1, 2], [101, 102], {1: [101], 2: [101]})
+
+        self.assertFalse(result.feasible)
+
+    def test_strict_solver_reports_presolve(self):
+        """Strict solves through presolve and records the shrink stats."""
+        pairs = [(m, t) for m in (1, 2) for t in (101, 102)]
+        inputs = PreparedInputs(
+            mentor_ids=[1, 2],
+            mentee_ids=[101, 102],
+            same_org={pair: pair == (1, 102) for pair in pairs},
+            acceptability={pair: "MUTUAL" for pair in pairs},
+            score={(1, 101): 90000, (1, 102): 10000, (2, 101): 50000, (2, 102): 60000},
+            config={"strict_time_limit": 5, "score_scale": 1000},
+        )
+
+        result = solve_strict(inputs)
+
+        self.assertTrue(result.success)
+        self.assertEqual(
+            sorted((m["mentor_id"], m["mentee_id"]) for m in result.matches),
+            [(1, 101), (2, 102)],
+        )
+        self.assertEqual(result.presolve["forced_count"], 2)
+        self.assertEqual(result.presolve["remaining_mentors"], 0)
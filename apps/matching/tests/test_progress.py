@@ -0,0 +1,140 @@
+"""Tests for the background run progress feed."""
+
+import json
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from apps.core.models import Cohort, Participant
+from apps.matching.models import MatchRun
+from apps.matching.progress import format_event, publish_progress, subscribe_progress
+from apps.matching.service import claim_next_match_run, process_match_run, queue_matching
+from apps.matching.solvers.cpsat import SolutionListener
+from apps.matching.solvers.strict import solve_strict
+from apps.matching.tests.test_anytime import _inputs
+
+
+class PhaseListener(SolutionListener):
+    def __init__(self):
+        self.phases = []
+
+    def on_phase(self, phase):
+        self.phases.append(phase)
+
+
+class ProgressFeedTest(TestCase):
+    """Test publishing and subscribing to run progress."""
+
+    def setUp(self):
+        self.cohort = Cohort.objects.create(name="Progress Cohort")
+        self.admin_user = User.objects.create_user("admin", "admin@test.com", "pass", is_staff=True)
+        for i, (name, role) in enumerate(
+            [("m1", "MENTOR"), ("m2", "MENTOR"), ("t1", "MENTEE"), ("t2", "MENTEE")]
+        ):
+            user = User.objects.create_user(name, f"{name}@test.com", "pass")
+            Participant.objects.create(
+                user=user,
+                cohort=self.cohort,
+                display_name=name.upper(),
+                role_in_cohort=role,
+                organization=f"Org{i}",
+                is_submitted=True,
+            )
+
+    def test_solver_reports_phases(self):
+        listener = PhaseListener()
+
+        solve_strict(_inputs(), listener)
+
+        self.assertEqual(listener.phases, ["PRESOLVE", "BUILD", "SOLVE"])
+
+    def test_publish_bumps_sequence(self):
+        match_run = queue_matching(self.cohort, self.admin_user, "STRICT")
+
+        publish_progress(match_run, phase="PREPARE")
+        publish_progress(match_run, phase="SOLVE", elapsed=1.5)
+        match_run.refresh_from_db()
+
+        self.assertEqual(match_run.progress["seq"], 2)
+        self.assertEqual(match_run.progress["phase"], "SOLVE")
+        self.assertEqual(match_run.progress["elapsed"], 1.5)
+
+    def test_finished_run_reports_done(self):
+        match_run = queue_matching(self.cohort, self.admin_user, "EXCEPTION", "CPSAT")
+
+        process_match_run(claim_next_match_run())
+        match_run.refresh_from_db()
+
+        self.assertEqual(match_run.status, "SUCCESS")
+        self.assertEqual(match_run.progress["phase"], "DONE")
+        self.assertGreater(match_run.progress["seq"], 4)
+
+    def test_format_event(self):
+        self.assertEqual(format_event(None), ": keep-alive\n\n")
+        event = format_event({"seq": 3, "phase": "SOLVE"})
+        self.assertTrue(event.startswith("id: 3\nevent: progress\ndata: "))
+        self.assertEqual(json.loads(event.split("data: ")[1]), {"seq": 3, "phase": "SOLVE"})
+
+    async def test_subscription_ends_with_the_run(self):
+        match_run = await MatchRun.objects.acreate(
+            cohort=self.cohort,
+            created_by=self.admin_user,
+            mode="STRICT",
+            status="SUCCESS",
+            progress={"phase": "DONE", "seq": 7},
+        )
+
+        states = [state async for state in subscribe_progress(match_run.id)]
+
+        self.assertEqual(states, [{"phase": "DONE", "seq": 7, "status": "SUCCESS"}])
+
+    async def test_events_view_streams_progress(self):
+        match_run = await MatchRun.objects.acreate(
+            cohort=self.cohort,
+            created_by=self.admin_user,
+            mode="STRICT",
+            status="FAILED",
+            progress={"phase": "DONE", "seq": 2},
+        )
+        await self.async_client.aforce_login(self.admin_user)
+
+        response = await self.async_client.get(
+            reverse("admin_views:match_run_events", args=[match_run.id])
+        )
+        content = b"".join([chunk async for chunk in response.streaming_content]).decode()
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertIn("event: progress", content)
+        self.assertIn('"status": "FAILED"', content)
+
+    async def test_asgi_results_page_streams(self):
+        match_run = await MatchRun.objects.acreate(
+            cohort=self.cohort, created_by=self.admin_user, mode="STRICT", status="RUNNING"
+        )
+        await self.async_client.aforce_login(self.admin_user)
+
+        response = await self.async_client.get(
+            reverse("admin_views:match_results", args=[match_run.id])
+        )
+
+        self.assertContains(response, "EventSource")
+
+    def test_wsgi_clients_poll_instead_of_streaming(self):
+        match_run = queue_matching(self.cohort, self.admin_user, "STRICT")
+        publish_progress(match_run, phase="SOLVE", elapsed=1.5)
+        self.client.force_login(self.admin_user)
+
+        response = self.client.get(reverse("admin_views:match_run_events", args=[match_run.id]))
+        self.assertEqual(response.status_code, 204)
+
+        response = self.client.get(
+            reverse("admin_views:match_run_progress", args=[match_run.id])
+        )
+        self.assertEqual(
+            response.json(), {"phase": "SOLVE", "elapsed": 1.5, "seq": 1, "status": "QUEUED"}
+        )
+
+        response = self.client.get(reverse("admin_views:match_results", args=[match_run.id]))
+        self.assertContains(
+            response, reverse("admin_views:match_run_progress", args=[match_run.id])
+        )
+        self.assertNotContains(response, "EventSource")
@@ -258,6 +258,7 @@ class TestRefactoredModules(unittest.TestCase):
             patch("apps.matching.data_prep.Participant") as mock_participant,
             patch("apps.matching.data_prep.Preference"),
             patch("apps.matching.data_prep.PairScore"),
+            patch("apps.matching.data_prep.MentorProfile"),
         ):
             # Mock participants
             mentor1 = Mock()
@@ -0,0 +1,128 @@
+"""Tests for offline input snapshots and the snapshot commands."""
+
+import io
+import os
+import tempfile
+import unittest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from apps.core.models import Cohort, Participant
+from apps.matching.data_prep import PreparedInputs
+from apps.matching.models import Preference
+from apps.matching.service import run_matching
+from apps.matching.snapshot import SnapshotError, read_snapshot, write_snapshot
+
+
+class TestSnapshotRoundTrip(unittest.TestCase):
+    """Snapshots reproduce their inputs exactly."""
+
+    def _round_trip(self, inputs):
+        buffer = io.BytesIO()
+        write_snapshot(buffer, inputs, {"cohort_id": 7})
+        buffer.seek(0)
+        return read_snapshot(buffer)
+
+    def test_inputs_survive_round_trip(self):
+        inputs = PreparedInputs(
+            mentor_ids=[3, 1],
+            mentee_ids=[10, 12, 11],
+            same_org={(3, 10): True, (3, 12): False, (1, 11): False},
+            acceptability={
+                (3, 10): "MUTUAL",
+                (3, 12): "ONE_SIDED_MENTEE_ONLY",
+                (1, 11): "NEITHER",
+            },
+            score={(3, 10): 90000, (3, 12): -5, (1, 11): 0},
+            config={"strict_time_limit": 5, "solver_backend": "CPSAT"},
+            preference_lists={3: [10, 12], 11: [], 10: [3, 1]},
+            mentor_capacity={3: 2},
+        )
+
+        loaded, metadata = self._round_trip(inputs)
+
+        self.assertEqual(loaded, inputs)
+        self.assertEqual(metadata, {"cohort_id": 7})
+
+    def test_empty_inputs(self):
+        inputs = PreparedInputs([], [], {}, {}, {}, {})
+
+        loaded, _ = self._round_trip(inputs)
+
+        self.assertEqual(loaded, inputs)
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(SnapshotError):
+            read_snapshot(io.BytesIO(b"mentor_id,mentee_id\n1,2\n"))
+
+
+class SnapshotCommandTest(TestCase):
+    """Test exporting a cohort and solving the snapshot offline."""
+
+    def setUp(self):
+        self.cohort = Cohort.objects.create(name="Snapshot Cohort")
+        self.admin_user = User.objects.create_user("admin", "admin@test.com", is_staff=True)
+        participants = []
+        for i, role in enumerate(["MENTOR", "MENTOR", "MENTEE", "MENTEE"]):
+            user = User.objects.create_user(f"user{i}", f"user{i}@test.com")
+            participants.append(
+                Participant.objects.create(
+                    user=user,
+                    cohort=self.cohort,
+                    display_name=f"User {i}",
+                    role_in_cohort=role,
+                    organization=f"Org{i}",
+                    is_submitted=True,
+                )
+            )
+        mentors, mentees = participants[:2], participants[2:]
+        for mentor, mentee in zip(mentors, mentees):
+            Preference.objects.create(from_participant=mentor, to_participant=mentee, rank=1)
+            Preference.objects.create(from_participant=mentee, to_participant=mentor, rank=1)
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        self.path = os.path.join(directory, "inputs.npz")
+        self.addCleanup(lambda: os.path.exists(self.path) and os.remove(self.path))
+
+    def test_export_and_solve_without_queries(self):
+        call_command(
+            "export_match_inputs", str(self.cohort.id), output=self.path, stdout=io.StringIO()
+        )
+
+        stdout = io.StringIO()
+        with self.assertNumQueries(0):
+            call_command("solve_snapshot", self.path, mode="EXCEPTION", stdout=stdout)
+
+        match_run = run_matching(self.cohort, self.admin_user, "EXCEPTION")
+        output = stdout.getvalue()
+        self.assertIn("Snapshot Cohort", output)
+        self.assertIn("EXCEPTION with CPSAT", output)
+        self.assertIn(
+            f"2 matches, total score {match_run.objective_summary['total_score']:.1f}", output
+        )
+
+    def test_backend_and_config_overrides(self):
+        call_command(
+            "export_match_inputs", self.cohort.name, output=self.path, stdout=io.StringIO()
+        )
+
+        stdout = io.StringIO()
+        call_command(
+            "solve_snapshot",
+            self.path,
+            mode="STRICT",
+            backend="ASSIGNMENT",
+            set=["strict_time_limit=1"],
+            repeat=2,
+            stdout=stdout,
+        )
+
+        output = stdout.getvalue()
+        self.assertIn("STRICT with ASSIGNMENT", output)
+        self.assertIn("Solve time over 2 runs", output)
+
+    def test_unknown_cohort(self):
+        with self.assertRaises(CommandError):
+            call_command("export_match_inputs", "999", output=self.path)
@@ -0,0 +1,111 @@
+"""Tests for cohort-level CP-SAT settings."""
+
+import random
+import unittest
+from django.test import TestCase
+from django.contrib.auth.models import User
+from apps.core.models import Cohort, Participant
+from apps.matching.data_prep import PreparedInputs
+from apps.matching.service import run_matching
+from apps.matching.solvers.cpsat import (
+    DETERMINISTIC_WORKERS,
+    create_cp_solver,
+    get_solver_settings,
+)
+from apps.matching.solvers.strict import solve_strict
+
+
+def _random_inputs(n, seed, **config):
+    rng = random.Random(seed)
+    mentor_ids = list(range(1, n + 1))
+    mentee_ids = list(range(1001, 1001 + n))
+    pairs = [(m, t) for m in mentor_ids for t in mentee_ids]
+    base_config = {"strict_time_limit": 2, "score_scale": 1000, "strict_presolve": False}
+    base_config.update(config)
+    return PreparedInputs(
+        mentor_ids=mentor_ids,
+        mentee_ids=mentee_ids,
+        same_org={pair: False for pair in pairs},
+        acceptability={pair: "MUTUAL" for pair in pairs},
+        score={pair: rng.randint(0, 100000) for pair in pairs},
+        config=base_config,
+    )
+
+
+class TestSolverSettings(unittest.TestCase):
+    """Test cases for CP-SAT parameter handling."""
+
+    def test_defaults(self):
+        """Without settings CP-SAT picks the worker count itself."""
+        settings = get_solver_settings({})
+
+        self.assertEqual(settings["num_workers"], 0)
+        self.assertFalse(settings["deterministic"])
+
+        solver = create_cp_solver({}, 3)
+        self.assertEqual(solver.parameters.max_time_in_seconds, 3)
+        self.assertFalse(solver.parameters.interleave_search)
+
+    def test_deterministic_mode(self):
+        """Deterministic runs fix the worker count and use deterministic time."""
+        config = {"solver_deterministic": True, "solver_random_seed": 7, "solver_relative_gap_limit": 0.01}
+
+        solver = create_cp_solver(config, 3)
+
+        self.assertEqual(get_solver_settings(config)["num_workers"], DETERMINISTIC_WORKERS)
+        self.assertEqual(solver.parameters.num_workers, DETERMINISTIC_WORKERS)
+        self.assertEqual(solver.parameters.random_seed, 7)
+        self.assertTrue(solver.parameters.interleave_search)
+        self.assertEqual(solver.parameters.max_deterministic_time, 3)
+        self.assertAlmostEqual(solver.parameters.relative_gap_limit, 0.01)
+
+    def test_deterministic_runs_repeat(self):
+        """The same inputs and settings give the same matching."""
+        config = {"solver_deterministic": True, "solver_num_workers": 4}
+
+        first = solve_strict(_random_inputs(30, 1, **config))
+        second = solve_strict(_random_inputs(30, 1, **config))
+
+        self.assertTrue(first.success)
+        self.assertEqual(first.matches, second.matches)
+
+    def test_log_capture(self):
+        """Search logs are captured instead of printed."""
+        result = solve_strict(_random_inputs(5, 2, solver_log_search=True))
+        self.assertIn("CP-SAT", result.solver_log)
+
+        result = solve_strict(_random_inputs(5, 2))
+        self.assertEqual(result.solver_log, "")
+
+
+class SolverSettingsServiceTest(TestCase):
+    """Test that runs record the settings they used."""
+
+    def test_run_records_settings(self):
+        cohort = Cohort.objects.create(
+            name="Seeded Cohort",
+            cohort_config={"solver_random_seed": 42, "solver_log_search": True},
+        )
+        admin_user = User.objects.create_user("admin", "admin@test.com", "pass", is_staff=True)
+        for i, (name, role) in enumerate(
+            [("m1", "MENTOR"), ("m2", "MENTOR"), ("t1", "MENTEE"), ("t2", "MENTEE")]
+        ):
+            user = User.objects.create_user(name, f"{name}@test.com", "pass")
+            Participant.objects.create(
+                user=user,
+                cohort=cohort,
+                display_name=name.upper(),
+                role_in_cohort=role,
+                organization=f"Org{i}",
+                is_submitted=True,
+            )
+
+        match_run = run_matching(cohort, admin_user, "EXCEPTION")
+
+        match_run.refresh_from_db()
+        self.assertEqual(match_run.solver_settings["random_seed"], 42)
+        self.assertEqual(match_run.solver_settings["num_workers"], 0)
+        self.assertIn("CP-SAT", match_run.solver_log)
+
+        stable_run = run_matching(cohort, admin_user, "STABLE")
+        self.assertEqual(stable_run.solver_settings, {})
@@ -0,0 +1,118 @@
+"""Tests for CP-SAT search statistics and the solver trend page."""
+
+import unittest
+from django.test import TestCase, Client
+from django.contrib.auth.models import User
+from django.urls import reverse
+from apps.core.models import Cohort, Participant
+from apps.matching.data_prep import PreparedInputs
+from apps.matching.models import SolverStats
+from apps.matching.service import run_matching
+from apps.matching.solvers.exception import solve_exception
+from apps.matching.solvers.strict import solve_strict
+
+
+def _inputs(**config):
+    mentor_ids = [1, 2, 3]
+    mentee_ids = [101, 102, 103]
+    pairs = [(m, t) for m in mentor_ids for t in mentee_ids]
+    base_config = {
+        "strict_time_limit": 5,
+        "exception_time_limit": 5,
+        "score_scale": 1000,
+        "penalty_org": 1000000,
+        "penalty_one_sided": 100000,
+        "penalty_neither": 300000,
+        "strict_presolve": False,
+    }
+    base_config.update(config)
+    return PreparedInputs(
+        mentor_ids=mentor_ids,
+        mentee_ids=mentee_ids,
+        same_org={pair: pair == (1, 101) for pair in pairs},
+        acceptability={pair: "MUTUAL" for pair in pairs},
+        score={(m, t): 10000 * ((m * t) % 7) for m, t in pairs},
+        config=base_config,
+    )
+
+
+class TestSolverStatsCapture(unittest.TestCase):
+    """Search statistics come back with solver results."""
+
+    def test_strict_reports_model_size_and_search(self):
+        result = solve_strict(_inputs())
+
+        stats = result.solver_stats
+        self.assertEqual(stats["status"], "OPTIMAL")
+        self.assertEqual(stats["num_solves"], 1)
+        # The same-org pair (1, 101) isn't modelled
+        self.assertEqual(stats["num_variables"], 8)
+        self.assertEqual(stats["num_constraints"], 6)
+        self.assertEqual(stats["objective_value"], stats["best_objective_bound"])
+        for key in ("num_conflicts", "num_branches", "presolved_booleans", "fixed_booleans"):
+            self.assertGreaterEqual(stats[key], 0)
+        self.assertGreater(stats["wall_time"], 0)
+
+    def test_lexicographic_stages_add_up(self):
+        result = solve_exception(_inputs(exception_objective="LEXICOGRAPHIC"))
+
+        solved_stages = [s for s in result.stages if s["status"] != "SKIPPED"]
+        self.assertEqual(result.solver_stats["num_solves"], len(solved_stages))
+        self.assertGreater(len(solved_stages), 1)
+
+
+class SolverTrendsTest(TestCase):
+    """Test stored statistics and the trend page."""
+
+    def setUp(self):
+        self.cohort = Cohort.objects.create(name="Trend Cohort")
+        self.admin_user = User.objects.create_user("admin", "admin@test.com", "pass", is_staff=True)
+        for i, (name, role) in enumerate(
+            [("m1", "MENTOR"), ("m2", "MENTOR"), ("t1", "MENTEE"), ("t2", "MENTEE")]
+        ):
+            user = User.objects.create_user(name, f"{name}@test.com", "pass")
+            Participant.objects.create(
+                user=user,
+                cohort=self.cohort,
+                display_name=name.upper(),
+                role_in_cohort=role,
+                organization=f"Org{i}",
+                is_submitted=True,
+            )
+
+    def test_cpsat_run_saves_stats(self):
+        match_run = run_matching(self.cohort, self.admin_user, "EXCEPTION")
+
+        stats = SolverStats.objects.get(match_run=match_run)
+        self.assertEqual(stats.cohort_size, 4)
+        self.assertEqual(stats.time_limit, 10)
+        self.assertEqual(stats.status, "OPTIMAL")
+        self.assertEqual(stats.relative_gap, 0)
+        self.assertLess(stats.time_limit_used, 1)
+
+    def test_other_backends_save_no_stats(self):
+        match_run = run_matching(self.cohort, self.admin_user, "EXCEPTION", "ASSIGNMENT")
+
+        self.assertFalse(SolverStats.objects.filter(match_run=match_run).exists())
+
+    def test_trend_page_charts_runs_and_flags_near_limit(self):
+        match_run = run_matching(self.cohort, self.admin_user, "STRICT")
+        SolverStats.objects.filter(match_run=match_run).update(wall_time=4.5, time_limit=5)
+        client = Client()
+        client.force_login(self.admin_user)
+
+        response = client.get(reverse("admin_views:solver_trends"), {"metric": "num_conflicts"})
+
+        self.assertContains(response, 'data-testid="chart-by-cohort-size"')
+        self.assertContains(response, 'data-testid="chart-by-run"')
+        self.assertContains(response, 'data-testid="near-limit-warning"')
+        self.assertContains(response, f"Run {match_run.id} (Trend Cohort)")
+        self.assertEqual(response.context["metric"], "num_conflicts")
+
+    def test_trend_page_needs_staff(self):
+        client = Client()
+        client.force_login(User.objects.get(username="m1"))
+
+        response = client.get(reverse("admin_views:solver_trends"))
+
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,138 @@
+"""Tests for the stable (deferred acceptance) matching mode."""
+
+import unittest
+from django.test import TestCase
+from django.contrib.auth.models import User
+from apps.core.models import Cohort, Participant
+from apps.matching.data_prep import PreparedInputs
+from apps.matching.domain import find_blocking_pairs
+from apps.matching.models import Preference
+from apps.matching.service import run_matching
+from apps.matching.solvers.stable import solve_stable
+
+
+def _inputs(preference_lists, same_org_pairs=(), **config):
+    mentor_ids, mentee_ids = [1, 2, 3], [101, 102, 103]
+    pairs = [(m, t) for m in mentor_ids for t in mentee_ids]
+    return PreparedInputs(
+        mentor_ids=mentor_ids,
+        mentee_ids=mentee_ids,
+        same_org={pair: pair in same_org_pairs for pair in pairs},
+        acceptability={pair: "MUTUAL" for pair in pairs},
+        score={pair: 50000 for pair in pairs},
+        config={"score_scale": 1000, **config},
+        preference_lists=preference_lists,
+    )
+
+
+PREFERENCES = {
+    1: [101, 102, 103],
+    2: [102, 101, 103],
+    3: [101, 102, 103],
+    101: [2, 1, 3],
+    102: [1, 2, 3],
+    103: [1, 2, 3],
+}
+
+
+class TestStableSolver(unittest.TestCase):
+    """Test cases for the pure stable solver."""
+
+    def _pairs(self, result):
+        return [(m["mentor_id"], m["mentee_id"]) for m in result.matches]
+
+    def test_mentor_proposing(self):
+        """Mentor-proposing deferred acceptance gives the mentor-optimal matching."""
+        result = solve_stable(_inputs(PREFERENCES))
+
+        self.assertTrue(result.success)
+        self.assertEqual(self._pairs(result), [(1, 101), (2, 102), (3, 103)])
+        self.assertEqual(result.blocking_pairs, [])
+        self.assertEqual(result.rank_stats["mentor"]["first_choice"], 2)
+        self.assertEqual(result.rank_stats["mentor"]["worst_rank"], 3)
+        self.assertEqual(result.total_score, 150)
+
+    def test_mentee_proposing(self):
+        """Mentee-proposing deferred acceptance gives the mentee-optimal matching."""
+        result = solve_stable(_inputs(PREFERENCES, stable_proposing_side="MENTEE"))
+
+        self.assertEqual(result.proposing_side, "MENTEE")
+        self.assertEqual(self._pairs(result), [(1, 102), (2, 101), (3, 103)])
+        self.assertEqual(result.blocking_pairs, [])
+        self.assertEqual(result.rank_stats["mentee"]["first_choice"], 2)
+
+    def test_same_org_pairs_stay_unmatched(self):
+        """Same-organization pairs are never acceptable."""
+        result = solve_stable(_inputs(PREFERENCES, same_org_pairs={(3, 103)}))
+
+        self.assertEqual(self._pairs(result), [(1, 101), (2, 102)])
+        self.assertEqual(result.unmatched_mentor_ids, [3])
+        self.assertEqual(result.unmatched_mentee_ids, [103])
+        self.assertEqual(result.rank_stats["mentor"]["unmatched"], 1)
+
+    def test_find_blocking_pairs(self):
+        """Pairs who both prefer each other to their partners are reported."""
+        matches = [
+            {"mentor_id": 1, "mentee_id": 103},
+            {"mentor_id": 2, "mentee_id": 102},
+            {"mentor_id": 3, "mentee_id": 101},
+        ]
+
+        self.assertEqual(
+            find_blocking_pairs(matches, _inputs(PREFERENCES)), [(1, 101), (1, 102)]
+        )
+
+    def test_invalid_proposing_side(self):
+        """An unknown proposing side fails with a config report."""
+        result = solve_stable(_inputs(PREFERENCES, stable_proposing_side="BOTH"))
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.failure_report["reason"], "INVALID_CONFIG")
+
+
+class StableModeServiceTest(TestCase):
+    """Test running STABLE mode end to end."""
+
+    def test_run_matching_stable(self):
+        """Stable runs persist matches and a stability summary."""
+        cohort = Cohort.objects.create(name="Stable Cohort")
+        admin_user = User.objects.create_user("admin", "admin@test.com", "pass", is_staff=True)
+
+        participants = {}
+        for i, (name, role) in enumerate(
+            [("m1", "MENTOR"), ("m2", "MENTOR"), ("t1", "MENTEE"), ("t2", "MENTEE")]
+        ):
+            user = User.objects.create_user(name, f"{name}@test.com", "pass")
+            participants[name] = Participant.objects.create(
+                user=user,
+                cohort=cohort,
+                display_name=name.upper(),
+                role_in_cohort=role,
+                organization=f"Org{i}",
+                is_submitted=True,
+            )
+
+        for from_name, ranked in [
+            ("m1", ["t1", "t2"]),
+            ("m2", ["t1", "t2"]),
+            ("t1", ["m2", "m1"]),
+            ("t2", ["m1"]),
+        ]:
+            for rank, to_name in enumerate(ranked, start=1):
+                Preference.objects.create(
+                    from_participant=participants[from_name],
+                    to_participant=participants[to_name],
+                    rank=rank,
+                )
+
+        match_run = run_matching(cohort, admin_user, "STABLE")
+
+        self.assertEqual(match_run.status, "SUCCESS")
+        self.assertEqual(
+            set(match_run.matches.values_list("mentor__display_name", "mentee__display_name")),
+            {("M1", "T2"), ("M2", "T1")},
+        )
+        stability = match_run.objective_summary["stability"]
+        self.assertEqual(stability["proposing_side"], "MENTOR")
+        self.assertEqual(stability["blocking_pair_count"], 0)
+        self.assertEqual(stability["rank_stats"]["mentee"]["first_choice"], 2)
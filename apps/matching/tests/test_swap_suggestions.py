@@ -0,0 +1,122 @@
+"""Tests for score-aware swap-chain suggestions."""
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from apps.core.models import Cohort, Participant
+from apps.matching.models import Preference, PairScore, MatchRun, Match
+from apps.matching.swap_suggestions import get_score_neighbors, suggest_swap_chains
+
+
+# An in-process cache, so cache hits don't show up in query counts
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class SwapSuggestionTest(TestCase):
+    """Test cases for ranked SWAP and CYCLE suggestions."""
+
+    SCORES = {
+        "m1": {"t1": 90, "t2": 50, "t3": 10, "t4": 10},
+        "m2": {"t1": 20, "t2": 90, "t3": 80, "t4": 10},
+        "m3": {"t1": 85, "t2": 10, "t3": 70, "t4": 10},
+        "m4": {"t1": 10, "t2": 10, "t3": 10, "t4": 60},
+    }
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.cohort = Cohort.objects.create(name="Swap Cohort")
+        self.admin_user = User.objects.create_user(
+            "admin", "admin@test.com", "pass", is_staff=True
+        )
+
+        self.p = {}
+        for i, username in enumerate(["m1", "m2", "m3", "m4", "t1", "t2", "t3", "t4"]):
+            user = User.objects.create_user(username, f"{username}@test.com", "pass")
+            self.p[username] = Participant.objects.create(
+                user=user,
+                cohort=self.cohort,
+                display_name=username.upper(),
+                role_in_cohort="MENTOR" if username.startswith("m") else "MENTEE",
+                organization=f"Org{i}",
+                is_submitted=True,
+            )
+
+        for mentor, row in self.SCORES.items():
+            for mentee, score in row.items():
+                PairScore.objects.create(
+                    cohort=self.cohort,
+                    mentor=self.p[mentor],
+                    mentee=self.p[mentee],
+                    score=score,
+                )
+                Preference.objects.create(
+                    from_participant=self.p[mentor], to_participant=self.p[mentee], rank=1
+                )
+                Preference.objects.create(
+                    from_participant=self.p[mentee], to_participant=self.p[mentor], rank=1
+                )
+
+        self.match_run = MatchRun.objects.create(
+            cohort=self.cohort, created_by=self.admin_user, mode="STRICT", status="SUCCESS"
+        )
+        for mentor, mentee in [("m1", "t1"), ("m2", "t2"), ("m3", "t3"), ("m4", "t4")]:
+            Match.objects.create(
+                match_run=self.match_run,
+                mentor=self.p[mentor],
+                mentee=self.p[mentee],
+                score_percent=self.SCORES[mentor][mentee],
+            )
+
+    def _summarize(self, suggestions):
+        names = {p.id: name for name, p in self.p.items()}
+        return [
+            (s.kind, [(names[m], names[t]) for m, t in s.pairs], s.score_delta)
+            for s in suggestions
+        ]
+
+    def test_ranked_by_score_delta(self):
+        """A three-cycle through a better third pair beats the plain swap."""
+        suggestions = suggest_swap_chains(self.match_run, self.p["m1"], self.p["t2"])
+
+        self.assertEqual(
+            self._summarize(suggestions),
+            [
+                ("CYCLE", [("m2", "t3"), ("m3", "t1")], -35.0),
+                ("SWAP", [("m2", "t1")], -110.0),
+                ("CYCLE", [("m2", "t4"), ("m4", "t1")], -170.0),
+            ],
+        )
+        self.assertTrue(all(s.exception_delta == 0 for s in suggestions))
+
+        # Cached lists and index leave one query for the candidate scores
+        with self.assertNumQueries(1):
+            suggest_swap_chains(self.match_run, self.p["m1"], self.p["t2"])
+
+    def test_candidates_come_from_top_k(self):
+        """Only third pairs reachable through the top-k lists are scored."""
+        neighbors = get_score_neighbors(self.cohort.id, k=2)
+        self.assertEqual(
+            neighbors.top_mentees[self.p["m2"].id], [self.p["t2"].id, self.p["t3"].id]
+        )
+
+        suggestions = suggest_swap_chains(self.match_run, self.p["m1"], self.p["t2"], k=2)
+
+        self.assertEqual([s.kind for s in suggestions], ["CYCLE", "SWAP"])
+
+    def test_exception_impact_ranks_first(self):
+        """A cycle that creates a same-organization pair drops below the swap."""
+        self.p["m3"].organization = self.p["t1"].organization
+        self.p["m3"].save()
+
+        suggestions = suggest_swap_chains(self.match_run, self.p["m1"], self.p["t2"])
+
+        self.assertEqual(suggestions[0].kind, "SWAP")
+        self.assertEqual(suggestions[-1].exception_types, ["", "E3"])
+        self.assertEqual(suggestions[-1].exception_delta, 3)
+
+    def test_no_suggestions_without_displacement(self):
+        """Confirming an existing pair has nothing to complete."""
+        self.assertEqual(
+            suggest_swap_chains(self.match_run, self.p["m1"], self.p["t1"]), []
+        )
@@ -0,0 +1,119 @@
+"""Tests for per-phase timing spans."""
+
+import tracemalloc
+import unittest
+from django.test import TestCase, Client
+from django.contrib.auth.models import User
+from django.urls import reverse
+from apps.core.models import Cohort, Participant
+from apps.matching.service import run_matching
+from apps.matching.timing import record_spans, span
+
+
+class TestSpanRecorder(unittest.TestCase):
+    """Test span nesting outside of any match run."""
+
+    def test_span_without_recorder_is_a_no_op(self):
+        with span("outside"):
+            value = 1
+
+        self.assertEqual(value, 1)
+
+    def test_nested_spans_record_depth_in_start_order(self):
+        with record_spans() as recorder:
+            with span("outer"):
+                with span("inner"):
+                    pass
+            with span("second"):
+                pass
+
+        self.assertEqual(
+            [(s["name"], s["depth"]) for s in recorder.spans],
+            [("outer", 0), ("inner", 1), ("second", 0)],
+        )
+        outer, inner, _ = recorder.spans
+        self.assertGreaterEqual(outer["wall_time"], inner["wall_time"])
+        self.assertGreater(outer["max_rss_kb"], 0)
+        self.assertGreaterEqual(outer["rss_growth_kb"], 0)
+        self.assertNotIn("peak_traced_kb", outer)
+
+    def test_trace_memory_records_allocations(self):
+        with record_spans(trace_memory=True) as recorder:
+            with span("outer"):
+                with span("allocating"):
+                    data = bytearray(4 * 1024 * 1024)
+                del data
+
+        outer, inner = recorder.spans
+        self.assertGreaterEqual(inner["peak_traced_kb"], 4096)
+        self.assertGreaterEqual(outer["peak_traced_kb"], inner["peak_traced_kb"])
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_span_is_closed_when_phase_raises(self):
+        with record_spans() as recorder:
+            with self.assertRaises(ValueError):
+                with span("failing"):
+                    raise ValueError("boom")
+
+        self.assertIn("wall_time", recorder.spans[0])
+
+
+class SpanRecordingTest(TestCase):
+    """Test spans recorded and shown for a match run."""
+
+    def setUp(self):
+        self.cohort = Cohort.objects.create(name="Timing Cohort")
+        self.admin_user = User.objects.create_user("admin", "admin@test.com", "pass", is_staff=True)
+        for i, (name, role) in enumerate(
+            [("m1", "MENTOR"), ("m2", "MENTOR"), ("t1", "MENTEE"), ("t2", "MENTEE")]
+        ):
+            user = User.objects.create_user(name, f"{name}@test.com", "pass")
+            Participant.objects.create(
+                user=user,
+                cohort=self.cohort,
+                display_name=name.upper(),
+                role_in_cohort=role,
+                organization=f"Org{i}",
+                is_submitted=True,
+            )
+
+    def test_queries_are_counted_per_span(self):
+        with record_spans() as recorder:
+            with span("outer"):
+                Cohort.objects.count()
+                with span("inner"):
+                    Participant.objects.count()
+
+        outer, inner = recorder.spans
+        self.assertEqual(inner["queries"], 1)
+        self.assertEqual(outer["queries"], 2)
+
+    def test_run_saves_phase_spans(self):
+        match_run = run_matching(self.cohort, self.admin_user, "EXCEPTION")
+        match_run.refresh_from_db()
+
+        names = [s["name"] for s in match_run.timing_spans]
+        for name in (
+            "input_signature",
+            "prepare_inputs",
+            "prepare_inputs.acceptability",
+            "solve",
+            "cpsat_solve",
+            "ambiguity_detection",
+            "persist",
+        ):
+            self.assertIn(name, names)
+        by_name = {s["name"]: s for s in match_run.timing_spans}
+        self.assertEqual(by_name["prepare_inputs.acceptability"]["depth"], 1)
+        self.assertGreater(by_name["prepare_inputs"]["queries"], 0)
+        self.assertGreater(by_name["persist"]["queries"], 0)
+
+    def test_results_page_shows_timing(self):
+        match_run = run_matching(self.cohort, self.admin_user, "STRICT")
+        client = Client()
+        client.force_login(self.admin_user)
+
+        response = client.get(reverse("admin_views:match_results", args=[match_run.id]))
+
+        self.assertContains(response, 'data-testid="timing-table"')
+        self.assertContains(response, "prepare_inputs")
@@ -0,0 +1,115 @@
+"""Per-phase timing spans for matching runs.
+
+``record_spans()`` activates a recorder for the current context, and code
+anywhere below it (service, data prep, solvers) wraps a phase in
+``span(name)``. Without an active recorder ``span`` does nothing, so the
+pure solver and data-prep functions can be instrumented without taking a
+new parameter.
+
+Each span records wall time, CPU time, database queries and memory.
+CPU time is process-wide, so it includes CP-SAT's worker threads. The
+kernel only reports the process's lifetime maximum resident size, so a span
+records that maximum when it ends (``max_rss_kb``) and how far the span
+raised it (``rss_growth_kb``); a span that stays under an earlier high-water
+mark shows no growth. With ``record_spans(trace_memory=True)`` spans also
+record the peak of Python allocations made within them
+(``peak_traced_kb``), at the cost of slower allocation while tracing.
+"""
+
+import contextvars
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from django.db import connection
+
+_active_recorder: contextvars.ContextVar[Optional["SpanRecorder"]] = contextvars.ContextVar(
+    "matching_span_recorder", default=None
+)
+
+
+class SpanRecorder:
+    """Collects the spans of one match run in the order they started."""
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        record: Dict[str, Any] = {"name": name, "depth": len(self._stack)}
+        self.spans.append(record)
+        frame = {"queries": 0, "child_peak": 0}
+        self._stack.append(frame)
+
+        def count_query(execute, sql, params, many, context):
+            frame["queries"] += 1
+            return execute(sql, params, many, context)
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            frame["outer_peak"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+        rss_start = _max_rss_kb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            with connection.execute_wrapper(count_query):
+                yield
+        finally:
+            max_rss = _max_rss_kb()
+            record.update(
+                {
+                    "wall_time": time.perf_counter() - wall_start,
+                    "cpu_time": time.process_time() - cpu_start,
+                    "queries": frame["queries"],
+                    "max_rss_kb": max_rss,
+                    "rss_growth_kb": max_rss - rss_start,
+                }
+            )
+            self._stack.pop()
+            if tracing and tracemalloc.is_tracing():
+                peak = max(tracemalloc.get_traced_memory()[1], frame["child_peak"])
+                record["peak_traced_kb"] = peak // 1024
+                # reset_peak() hid the peak from enclosing spans; hand it back
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent["child_peak"] = max(parent["child_peak"], peak, frame["outer_peak"])
+
+
+def _max_rss_kb() -> int:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+@contextmanager
+def record_spans(trace_memory: bool = False) -> Iterator[SpanRecorder]:
+    """
+    Activate a new recorder for the spans opened in this context.
+
+    With ``trace_memory``, ``tracemalloc`` is started for the duration unless
+    something else is already tracing.
+    """
+    recorder = SpanRecorder()
+    token = _active_recorder.set(recorder)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        yield recorder
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _active_recorder.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a phase under the active recorder, if there is one."""
+    recorder = _active_recorder.get()
+    if recorder is None:
+        yield
+        return
+    with recorder.span(name):
+        yield
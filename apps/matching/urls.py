@@ -14,4 +14,14 @@ urlpatterns = [
         views.submit_preferences_view,
         name="submit_preferences",
     ),
+    path(
+        "cohorts/<int:cohort_id>/preferences/candidates/",
+        views.candidates_api_view,
+        name="candidates_api",
+    ),
+    path(
+        "cohorts/<int:cohort_id>/preferences/candidates/<int:candidate_id>/",
+        views.candidate_rank_api_view,
+        name="candidate_rank_api",
+    ),
 ]
@@ -1,14 +1,22 @@
+import json
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseForbidden, JsonResponse
+from django.views.decorators.http import require_GET, require_http_methods
 from apps.core.models import Cohort, Participant
 from .models import Preference
 from .forms import PreferencesForm
+from .candidates import get_candidate_page, get_opposite_role
+from .preference_changes import set_candidate_rank
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Above this many candidates the preferences page loads candidates page by
+# page from the JSON API instead of rendering one form field per candidate
+PREFERENCE_FORM_MAX_CANDIDATES = 100
+
 
 @login_required
 def preferences_view(request, cohort_id):
@@ -27,10 +35,14 @@ def preferences_view(request, cohort_id):
         return _show_readonly_preferences(request, participant, cohort)
 
     # Determine opposite role
-    if participant.role_in_cohort == "MENTOR":
-        opposite_role = "MENTEE"
-    else:
-        opposite_role = "MENTOR"
+    opposite_role = get_opposite_role(participant)
+
+    # Large pools are ranked through the paged candidates API
+    candidate_count = Participant.objects.filter(
+        cohort=cohort, role_in_cohort=opposite_role
+    ).count()
+    if candidate_count > PREFERENCE_FORM_MAX_CANDIDATES:
+        return _show_paged_preferences(request, participant, cohort, opposite_role)
 
     # Get candidates (participants in same cohort with opposite role)
     candidates = (
@@ -80,10 +92,11 @@ def preferences_view(request, cohort_id):
     else:
         # Pre-populate form with existing preferences
         initial_data = {}
-        existing_preferences = Preference.objects.filter(from_participant=participant)
-        for pref in existing_preferences:
-            field_name = f"candidate_{pref.to_participant.id}"
-            initial_data[field_name] = pref.rank
+        existing_preferences = Preference.objects.filter(
+            from_participant=participant
+        ).values_list("to_participant_id", "rank")
+        for to_participant_id, rank in existing_preferences:
+            initial_data[f"candidate_{to_participant_id}"] = rank
 
         form = PreferencesForm(
             participant=participant, candidates=candidates, initial=initial_data
@@ -133,24 +146,21 @@ def submit_preferences_view(request, cohort_id):
 
 def _show_readonly_preferences(request, participant, cohort):
     """Show read-only view of preferences after submission."""
-    # Determine opposite role
-    if participant.role_in_cohort == "MENTOR":
-        opposite_role = "MENTEE"
-    else:
-        opposite_role = "MENTOR"
-
     # Get all candidates for display
-    candidates = Participant.objects.filter(
-        cohort=cohort, role_in_cohort=opposite_role
-    ).order_by("display_name")
-
-    # Get existing preferences
-    preferences = Preference.objects.filter(
-        from_participant=participant
-    ).select_related("to_participant")
+    candidates = (
+        Participant.objects.filter(
+            cohort=cohort, role_in_cohort=get_opposite_role(participant)
+        )
+        .only("id", "display_name", "organization")
+        .order_by("display_name")
+    )
 
-    # Create a mapping for easy lookup
-    preference_dict = {pref.to_participant.id: pref.rank for pref in preferences}
+    # Map candidate ID -> rank without loading the candidates again
+    preference_dict = dict(
+        Preference.objects.filter(from_participant=participant).values_list(
+            "to_participant_id", "rank"
+        )
+    )
 
     return render(
         request,
@@ -162,3 +172,105 @@ def _show_readonly_preferences(request, participant, cohort):
             "preference_dict": preference_dict,
         },
     )
+
+
+def _show_paged_preferences(request, participant, cohort, opposite_role):
+    """Render the API-driven preferences page used for large candidate pools."""
+    organizations = (
+        Participant.objects.filter(cohort=cohort, role_in_cohort=opposite_role)
+        .order_by("organization")
+        .values_list("organization", flat=True)
+        .distinct()
+    )
+
+    return render(
+        request,
+        "matching/preferences_paged.html",
+        {
+            "cohort": cohort,
+            "participant": participant,
+            "organizations": organizations,
+            "ranked_count": Preference.objects.filter(
+                from_participant=participant
+            ).count(),
+        },
+    )
+
+
+def _get_api_participant(request, cohort_id):
+    """Return the requesting participant, or None when they are not in the cohort."""
+    cohort = get_object_or_404(Cohort, id=cohort_id)
+    return Participant.objects.filter(user=request.user, cohort=cohort).first()
+
+
+@login_required
+@require_GET
+def candidates_api_view(request, cohort_id):
+    """List candidates with the participant's ranks as paged JSON."""
+    participant = _get_api_participant(request, cohort_id)
+    if participant is None:
+        return JsonResponse(
+            {"error": "You are not a participant in this cohort."}, status=403
+        )
+
+    return JsonResponse(get_candidate_page(participant, request.GET))
+
+
+@login_required
+@require_http_methods(["PATCH"])
+def candidate_rank_api_view(request, cohort_id, candidate_id):
+    """Set or clear one candidate's rank: body ``{"rank": <int or null>}``."""
+    participant = _get_api_participant(request, cohort_id)
+    if participant is None:
+        return JsonResponse(
+            {"error": "You are not a participant in this cohort."}, status=403
+        )
+    if participant.is_submitted:
+        return JsonResponse(
+            {"error": "Preferences have already been submitted."}, status=403
+        )
+
+    candidate_exists = Participant.objects.filter(
+        id=candidate_id,
+        cohort_id=participant.cohort_id,
+        role_in_cohort=get_opposite_role(participant),
+    ).exists()
+    if not candidate_exists:
+        return JsonResponse({"error": "Candidate not found."}, status=404)
+
+    try:
+        rank = json.loads(request.body or b"{}").get("rank")
+    except (ValueError, AttributeError):
+        return JsonResponse({"error": "Body must be a JSON object."}, status=400)
+    if rank is not None and (
+        isinstance(rank, bool) or not isinstance(rank, int) or rank < 1
+    ):
+        return JsonResponse(
+            {"error": "Rank must be a positive integer or null."}, status=400
+        )
+
+    change_set = set_candidate_rank(participant, candidate_id, rank)
+    new_rank = (
+        Preference.objects.filter(
+            from_participant=participant, to_participant_id=candidate_id
+        )
+        .values_list("rank", flat=True)
+        .first()
+    )
+
+    return JsonResponse(
+        {
+            "candidate_id": candidate_id,
+            "rank": new_rank,
+            "ranked_count": Preference.objects.filter(
+                from_participant=participant
+            ).count(),
+            "changes": {
+                "inserted": change_set.inserted,
+                "updated": {
+                    to_id: new for to_id, (_, new) in change_set.updated.items()
+                },
+                "deleted": list(change_set.deleted),
+            },
+        }
+    )
@@ -0,0 +1,4 @@
+"""Scale benchmarks for the matching pipeline.
+
+Run with ``python manage.py run_benchmarks``; see benchmarks/README.md.
+"""
@@ -0,0 +1,169 @@
+"""Synthetic cohort generation for the scale benchmarks.
+
+Extends the scenarios of ``artifacts/datasets/generate_E_dataset.py`` (baseline,
+contention, sparse preferences) to cohorts of thousands of participants. The
+E scripts write JSON fixtures, which stop being practical to load well before
+N=5000, so these cohorts are written straight to the database with bulk
+inserts.
+
+Every knob maps to one of the E scenarios:
+
+- ``unranked_rate`` is E3's sparse rate: the share of participants who rank
+  nobody, and ``list_length`` caps everyone else's list
+- ``popularity_skew`` generalises E2's contention: targets are drawn with
+  Zipf weights, so 0 is uniform and larger values pile preferences onto the
+  same few participants
+- ``organizations`` and ``org_affinity`` cluster participants into
+  organizations and make them prefer their own, which is what produces
+  same-org conflicts for strict matching
+- ``reciprocity`` is the share of a mentee's choices that rank back a mentor
+  who ranked them. Independent lists of a few names almost never overlap at
+  scale, so without it strict matching has no mutual pairs to work with; the
+  E fixtures are small enough that random lists overlap anyway
+"""
+
+import random
+import time
+from itertools import accumulate
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from django.contrib.auth.models import User
+from apps.core.models import Cohort, Participant
+from apps.matching.models import Preference
+
+# Rows per bulk insert
+BATCH_SIZE = 2000
+
+# Draws per wanted preference before a participant's list is cut short
+MAX_DRAWS_PER_PREFERENCE = 20
+
+
+class CohortSpec(NamedTuple):
+    """Shape of a synthetic cohort."""
+
+    size: int  # Mentors, and mentees, in the cohort
+    list_length: int = 10  # Preferences per participant who ranks anyone
+    unranked_rate: float = 0.0  # Share of participants who rank nobody
+    organizations: int = 8
+    org_affinity: float = 0.0  # Chance each choice is drawn from the participant's own org
+    popularity_skew: float = 0.0  # Zipf exponent of target popularity
+    reciprocity: float = 0.0  # Chance each mentee choice is a mentor who ranked them
+    seed: int = 42
+    config: Dict[str, Any] = {}  # Cohort config, e.g. solver time limits
+
+
+def generate_cohort(spec: CohortSpec) -> Cohort:
+    """
+    Create a cohort of submitted participants with preferences shaped by ``spec``.
+
+    Returns:
+        The new cohort
+    """
+    rng = random.Random(spec.seed)
+    token = time.time_ns()
+    cohort = Cohort.objects.create(
+        name=f"benchmark-N{spec.size}-{token}", status="OPEN", cohort_config=dict(spec.config)
+    )
+
+    users = User.objects.bulk_create(
+        [
+            User(username=f"bench_{token}_{i}", email=f"bench_{token}_{i}@example.com")
+            for i in range(2 * spec.size)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    # Organizations get Zipf-like sizes too, so a few of them dominate
+    org_weights = list(accumulate(1 / (i + 1) for i in range(max(spec.organizations, 1))))
+    participants = Participant.objects.bulk_create(
+        [
+            Participant(
+                cohort=cohort,
+                user=user,
+                role_in_cohort="MENTOR" if i < spec.size else "MENTEE",
+                display_name=user.username,
+                organization=f"Org{rng.choices(range(len(org_weights)), cum_weights=org_weights)[0]}",
+                is_submitted=True,
+            )
+            for i, user in enumerate(users)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    mentors = participants[: spec.size]
+    mentees = participants[spec.size :]
+
+    preferences = []
+    # Mentors who ranked each mentee, for mentees to rank back
+    admirers: Dict[int, List[int]] = {}
+    for choosers, targets in ((mentors, mentees), (mentees, mentors)):
+        pools = _build_pools(rng, targets, spec.popularity_skew)
+        for chooser in choosers:
+            if rng.random() < spec.unranked_rate:
+                continue
+            own_pool = pools.get(chooser.organization) if spec.org_affinity else None
+            chosen = _draw_targets(
+                rng, pools[None], own_pool, admirers.get(chooser.id, []), spec
+            )
+            if chooser.role_in_cohort == "MENTOR":
+                for target_id in chosen:
+                    admirers.setdefault(target_id, []).append(chooser.id)
+            preferences.extend(
+                Preference(from_participant=chooser, to_participant_id=target_id, rank=rank)
+                for rank, target_id in enumerate(chosen, 1)
+            )
+    Preference.objects.bulk_create(preferences, batch_size=BATCH_SIZE)
+
+    return cohort
+
+
+def _build_pools(
+    rng: random.Random, targets: List[Participant], skew: float
+) -> Dict[Optional[str], Tuple[List[int], List[float]]]:
+    """
+    Cumulative popularity weights over all targets (key None) and per organization.
+
+    Returns:
+        Dict of organization -> (target ids, cumulative weights)
+    """
+    order = list(targets)
+    rng.shuffle(order)  # Popularity doesn't follow creation order
+    weights = {target.id: 1 / (position + 1) ** skew for position, target in enumerate(order)}
+
+    members: Dict[Optional[str], List[Participant]] = {None: order}
+    for target in order:
+        members.setdefault(target.organization, []).append(target)
+    return {
+        org: ([t.id for t in group], list(accumulate(weights[t.id] for t in group)))
+        for org, group in members.items()
+    }
+
+
+def _draw_targets(
+    rng: random.Random,
+    pool: Tuple[List[int], List[float]],
+    own_pool: Optional[Tuple[List[int], List[float]]],
+    admirers: List[int],
+    spec: CohortSpec,
+) -> List[int]:
+    """
+    Draw distinct targets by popularity, preferring the chooser's org at ``org_affinity``.
+
+    At ``reciprocity``, a choice is instead one of ``admirers`` (those who
+    ranked the chooser) not drawn yet, while any are left.
+
+    Returns:
+        Target ids in rank order
+    """
+    length = min(spec.list_length, len(pool[0]))
+    chosen: List[int] = []
+    seen = set()
+    for _ in range(length * MAX_DRAWS_PER_PREFERENCE):
+        if len(chosen) == length:
+            break
+        if spec.reciprocity and admirers and rng.random() < spec.reciprocity:
+            target_id = admirers.pop(rng.randrange(len(admirers)))
+        else:
+            ids, cum_weights = own_pool if own_pool and rng.random() < spec.org_affinity else pool
+            target_id = rng.choices(ids, cum_weights=cum_weights)[0]
+        if target_id not in seen:
+            seen.add(target_id)
+            chosen.append(target_id)
+    return chosen
@@ -0,0 +1,206 @@
+"""Timed runs of the matching pipeline over synthetic cohorts.
+
+Each stage runs under a ``timing.record_spans`` recorder, so a benchmark
+reports the same wall time, CPU time, query count and memory a match run
+stores, and a matching run's own phase spans (solve, ambiguity
+detection, persistence) become benchmark stages.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from django.conf import settings
+from django.contrib.auth.models import User
+from apps.core.models import Cohort
+from apps.matching.data_prep import prepare_inputs
+from apps.matching.export import export_match_run_xlsx
+from apps.matching.models import PairScore, Preference
+from apps.matching.scoring import compute_all_pair_scores, compute_rank_score, get_cohort_config
+from apps.matching.service import _get_input_signature, run_matching
+from apps.matching.timing import record_spans, span
+from .cohorts import BATCH_SIZE, CohortSpec, generate_cohort
+
+# Largest cohort size (mentors per side) each stage runs at by default.
+# compute_all_pair_scores issues several queries per pair, and the dense
+# solver inputs hold every pair in memory (about 2 GB at N=2000), so larger
+# cohorts skip them.
+STAGE_SIZE_LIMITS = {
+    "scoring": 200,
+    "prepare_inputs": 2000,
+    "STRICT": 2000,
+    "EXCEPTION": 2000,
+}
+
+# Matching modes benchmarked, each through run_matching
+BENCHMARK_MODES = ("STRICT", "EXCEPTION")
+
+# Spans of a matching run reported as stages of its mode
+RUN_PHASES = ("solve", "ambiguity_detection", "persist")
+
+# Slowdown over the baseline flagged as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Seconds a stage must slow down by before it counts, so timer noise on
+# fast stages isn't flagged
+MIN_REGRESSION_SECONDS = 0.05
+
+
+def run_pipeline(
+    spec: CohortSpec, user: User, limits: Optional[Dict[str, int]] = None
+) -> Dict[str, Any]:
+    """
+    Generate a cohort and time each pipeline stage on it.
+
+    Stages whose size limit is below ``spec.size`` are listed as skipped.
+    When scoring is skipped but a solver still runs, pair scores are seeded
+    directly from the preference ranks, which is what scoring computes for
+    participants without profiles. Only the non-zero scores are stored, so
+    reading them back costs far less than after compute_all_pair_scores,
+    which stores a row for every pair.
+
+    Returns:
+        Dict with size, spec, stages (name -> span metrics), skipped stage
+        names and per-mode outcomes
+    """
+    limits = {**STAGE_SIZE_LIMITS, **(limits or {})}
+
+    def runs(stage: str) -> bool:
+        return spec.size <= limits.get(stage, spec.size)
+
+    stages: Dict[str, Dict[str, Any]] = {}
+    skipped: List[str] = []
+    outcomes: Dict[str, Any] = {}
+
+    with record_spans(settings.MATCHING_TRACE_MEMORY) as recorder:
+        with span("generate"):
+            cohort = generate_cohort(spec)
+
+        if runs("scoring"):
+            with span("scoring"):
+                compute_all_pair_scores(cohort)
+        else:
+            skipped.append("scoring")
+            if any(runs(mode) for mode in BENCHMARK_MODES):
+                _seed_pair_scores(cohort)
+
+        with span("signature"):
+            _get_input_signature(cohort)
+
+        if runs("prepare_inputs"):
+            with span("prepare_inputs"):
+                prepare_inputs(cohort)
+        else:
+            skipped.append("prepare_inputs")
+    stages.update(_top_level(recorder.spans))
+
+    for mode in BENCHMARK_MODES:
+        if not runs(mode):
+            skipped.append(mode)
+            continue
+        match_run = run_matching(cohort, user, mode)
+        phases = _top_level(match_run.timing_spans)
+        for phase in RUN_PHASES:
+            if phase in phases:
+                stages[f"{mode}.{phase}"] = phases[phase]
+        outcomes[mode] = {
+            "status": match_run.status,
+            "reason": match_run.failure_report.get("reason", ""),
+            "matches": match_run.matches.count(),
+        }
+        if match_run.status == "SUCCESS":
+            with record_spans(settings.MATCHING_TRACE_MEMORY) as recorder:
+                with span(f"{mode}.export"):
+                    export_match_run_xlsx(match_run)
+            stages.update(_top_level(recorder.spans))
+
+    return {
+        "size": spec.size,
+        "spec": {key: value for key, value in spec._asdict().items() if key != "size"},
+        "stages": stages,
+        "skipped": skipped,
+        "outcomes": outcomes,
+    }
+
+
+def compare_to_baseline(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Dict[str, Any]]:
+    """
+    Find stages that got slower than the baseline at the same cohort size.
+
+    A stage regresses when its wall time exceeds the baseline's by more than
+    ``tolerance`` and by at least MIN_REGRESSION_SECONDS. Stages missing
+    from either side are not compared.
+
+    Returns:
+        List of regressions with size, stage, baseline and current seconds
+    """
+    baseline_stages = {entry["size"]: entry["stages"] for entry in baseline}
+    regressions = []
+    for entry in results:
+        previous = baseline_stages.get(entry["size"], {})
+        for stage, metrics in entry["stages"].items():
+            if stage not in previous:
+                continue
+            before = previous[stage]["wall_time"]
+            after = metrics["wall_time"]
+            if after > before * (1 + tolerance) and after - before >= MIN_REGRESSION_SECONDS:
+                regressions.append(
+                    {
+                        "size": entry["size"],
+                        "stage": stage,
+                        "baseline": before,
+                        "current": after,
+                        "slowdown": after / before if before else None,
+                    }
+                )
+    return regressions
+
+
+def _top_level(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Metrics of the outermost spans, keyed by name."""
+    return {
+        record["name"]: {
+            key: value for key, value in record.items() if key not in ("name", "depth")
+        }
+        for record in spans
+        if record["depth"] == 0
+    }
+
+
+def _seed_pair_scores(cohort: Cohort) -> None:
+    """Store rank-based scores for every mutually ranked pair of a cohort."""
+    rank_weight = get_cohort_config(cohort)["rank_weight"]
+    ranks: Dict[int, Dict[int, int]] = defaultdict(dict)
+    roles = {}
+    preferences = Preference.objects.filter(from_participant__cohort=cohort).values_list(
+        "from_participant_id", "to_participant_id", "rank", "from_participant__role_in_cohort"
+    )
+    for from_id, to_id, rank, role in preferences:
+        ranks[from_id][to_id] = rank
+        roles[from_id] = role
+    max_rank = {participant_id: max(ranked.values()) for participant_id, ranked in ranks.items()}
+
+    scores = []
+    for mentor_id, ranked in ranks.items():
+        if roles[mentor_id] != "MENTOR":
+            continue
+        for mentee_id, rank in ranked.items():
+            mentee_rank = ranks.get(mentee_id, {}).get(mentor_id)
+            if mentee_rank is None:
+                continue
+            rank_score = (
+                compute_rank_score(rank, max_rank[mentor_id])
+                + compute_rank_score(mentee_rank, max_rank[mentee_id])
+            ) / 2
+            scores.append(
+                PairScore(
+                    cohort=cohort,
+                    mentor_id=mentor_id,
+                    mentee_id=mentee_id,
+                    score=rank_score * rank_weight,
+                    score_breakdown={"rank_score": round(rank_score, 2)},
+                )
+            )
+    PairScore.objects.bulk_create(scores, batch_size=BATCH_SIZE)
@@ -58,6 +58,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.admin_views.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -141,6 +142,28 @@ STATICFILES_DIRS = [
 # Ensure static files are collected properly
 STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
 
+# Uploaded files (CSV imports processed by the background worker)
+MEDIA_URL = "/media/"
+MEDIA_ROOT = Path(os.environ.get("DJANGO_MEDIA_ROOT", BASE_DIR / "media"))
+
+# Shared by every web process and worker, so cached override indexes and
+# their versions stay consistent. Create the table with createcachetable.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "matching_cache",
+        # Culling can drop version keys and resurrect stale indexes
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
+# Per-request profiling for staff (?profile=cprofile or ?profile=sample)
+REQUEST_PROFILING = os.environ.get("DJANGO_REQUEST_PROFILING", "False") == "True"
+PROFILE_ROOT = Path(os.environ.get("DJANGO_PROFILE_ROOT", BASE_DIR / "profiles"))
+
+# Trace Python allocations in match run phase timings (slows runs down)
+MATCHING_TRACE_MEMORY = os.environ.get("DJANGO_MATCHING_TRACE_MEMORY", "False") == "True"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/6.0/ref/settings/#default-auto-field
 